@@ -19,6 +19,17 @@ class TypeFormat:
     Double = '<d'
 
 
+# Precompiled structs of the scalars
+ByteStruct = struct.Struct(TypeFormat.Byte)
+Int16Struct = struct.Struct(TypeFormat.Int16)
+UInt16Struct = struct.Struct(TypeFormat.UInt16)
+UInt32Struct = struct.Struct(TypeFormat.UInt32)
+SingleStruct = struct.Struct(TypeFormat.Single)
+
+# Vertex structs by layout
+vertexStructs = {}
+
+
 def roundToMultiple(numToRound, multiple):
     remainder = numToRound % multiple
     if (remainder == 0):
@@ -27,60 +38,83 @@ def roundToMultiple(numToRound, multiple):
 
 
 def readByte(file):
-    numberBin = file.read(1)
-    number = struct.unpack(TypeFormat.Byte, numberBin)[0]
+    number = ByteStruct.unpack(file.read(1))[0]
     return number
 
 
 def writeByte(number):
-    bytesBin = struct.pack(TypeFormat.Byte, number)
+    bytesBin = ByteStruct.pack(number)
     return bytesBin
 
 
 def readUInt16(file):
-    numberBin = file.read(2)
-    number = struct.unpack(TypeFormat.UInt16, numberBin)[0]
+    number = UInt16Struct.unpack(file.read(2))[0]
     return number
 
 
 def writeUInt16(number):
-    uInt16 = struct.pack(TypeFormat.UInt16, number)
+    uInt16 = UInt16Struct.pack(number)
     return uInt16
 
 
 def readInt16(file):
-    numberBin = file.read(2)
-    number = struct.unpack(TypeFormat.Int16, numberBin)[0]
+    number = Int16Struct.unpack(file.read(2))[0]
     return number
 
 
 def writeInt16(number):
-    int16 = struct.pack(TypeFormat.Int16, number)
+    int16 = Int16Struct.pack(number)
     return int16
 
 
 def readUInt32(file):
-    numberBin = file.read(4)
-    number = struct.unpack(TypeFormat.UInt32, numberBin)[0]
+    number = UInt32Struct.unpack(file.read(4))[0]
     return number
 
 
 def writeUInt32(number):
-    uInt32 = struct.pack(TypeFormat.UInt32, number)
+    uInt32 = UInt32Struct.pack(number)
     return uInt32
 
 
 def readSingle(file):
-    numberBin = file.read(4)
-    single = struct.unpack(TypeFormat.Single, numberBin)[0]
+    single = SingleStruct.unpack(file.read(4))[0]
     return single
 
 
 def writeSingle(number):
-    single = struct.pack(TypeFormat.Single, number)
+    single = SingleStruct.pack(number)
     return single
 
 
+def vertexStruct(uvLayerCount, hasTangent, hasBones):
+    # Coords, normal, color, uvs (with tangents), bone indices and weights
+    key = (uvLayerCount, hasTangent, hasBones)
+    vertStruct = vertexStructs.get(key)
+    if vertStruct is None:
+        uvFormat = '2f4f' if hasTangent else '2f'
+        boneFormat = '4h4f' if hasBones else ''
+        vertStruct = struct.Struct(
+            '<3f3f4B' + uvFormat * uvLayerCount + boneFormat)
+        vertexStructs[key] = vertStruct
+    return vertStruct
+
+
+def readVertexBlock(file, vertStruct, count):
+    # One read for all the vertices, unpacked record by record
+    data = file.read(vertStruct.size * count)
+    return vertStruct.iter_unpack(data)
+
+
+def readUInt32Block(file, count):
+    data = file.read(4 * count)
+    return struct.unpack('<%dI' % count, data)
+
+
+def writeUInt32Block(numbers):
+    return struct.pack('<%dI' % len(numbers), *numbers)
+
+
 def readString(file, length):
     try:
         pos1 = file.tell()
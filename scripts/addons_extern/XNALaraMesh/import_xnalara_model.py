@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import collections
 import copy
+import itertools
 import math
 import operator
 import os
@@ -549,15 +551,30 @@ def makeUvs(mesh_da, faces, uvData, vertColors):
     if xpsSettings.vColors:
         mesh_da.vertex_colors.new()
 
+    # Original vertex of every loop
+    loopVerts = list(itertools.chain.from_iterable(faces))
+
     # Assign UVCoords
-    for faceId, face in enumerate(faces):
-        for vertId, faceVert in enumerate(face):
-            loopdId = (faceId * 3) + vertId
-            if xpsSettings.vColors:
-                mesh_da.vertex_colors[0].data[loopdId].color = vertColors[faceVert]
-            for layerIdx, uvLayer in enumerate(mesh_da.uv_layers):
-                uvCoor = uvData[faceVert][layerIdx]
-                uvLayer.data[loopdId].uv = Vector(uvCoor)
+    if xpsSettings.vColors:
+        colors = [value for faceVert in loopVerts for value in vertColors[faceVert]]
+        mesh_da.vertex_colors[0].data.foreach_set('color', colors)
+    for layerIdx, uvLayer in enumerate(mesh_da.uv_layers):
+        uvCoords = [value for faceVert in loopVerts for value in uvData[faceVert][layerIdx]]
+        uvLayer.data.foreach_set('uv', uvCoords)
+
+
+def makeGeometry(mesh_da, coords, faces):
+    # same as from_pydata for triangles but with bulk foreach_set
+    faceCount = len(faces)
+    mesh_da.vertices.add(len(coords))
+    mesh_da.vertices.foreach_set('co', list(itertools.chain.from_iterable(coords)))
+    mesh_da.loops.add(faceCount * 3)
+    mesh_da.loops.foreach_set('vertex_index', list(itertools.chain.from_iterable(faces)))
+    mesh_da.polygons.add(faceCount)
+    mesh_da.polygons.foreach_set('loop_start', list(range(0, faceCount * 3, 3)))
+    mesh_da.polygons.foreach_set('loop_total', [3] * faceCount)
+    mesh_da.polygons.foreach_set('use_smooth', [True] * faceCount)
+    mesh_da.update(calc_edges=True)
 
 
 def createJoinedMeshes():
@@ -732,23 +749,12 @@ def importMesh(armature_ob, meshInfo):
         bpy.context.scene.objects.active = mesh_ob
         mesh_da = mesh_ob.data
 
-        coords = []
-        normals = []
-        vrtxList = []
-        nbVrtx = []
-
-        for vertex in vertices:
-            unitnormal = Vector(vertex.norm).normalized()
-            coords.append(coordTransform(vertex.co))
-            normals.append(coordTransform(unitnormal))
-            # vertColors.append(vertex.vColor)
-            # uvLayers.append(uvTransformLayers(vertex.uv))
+        coords = [coordTransform(vertex.co) for vertex in vertices]
+        normals = [coordTransform(Vector(vertex.norm).normalized()) for vertex in vertices]
 
         # Create Faces
         faces = list(faceTransformList(facesList))
-        mesh_da.from_pydata(coords, [], faces)
-        mesh_da.polygons.foreach_set(
-            "use_smooth", [True] * len(mesh_da.polygons))
+        makeGeometry(mesh_da, coords, faces)
 
         # speedup!!!!
         if xpsSettings.markSeams:
@@ -881,24 +887,29 @@ def makeVertexGroups(mesh_ob, vertices):
     '''Make vertex groups and assign weights'''
     # blender limits vertexGroupNames to 63 chars
     #armatures = [mesh_ob.find_armature()]
-    armatures = mesh_ob.find_armature()
+    # vertices with the same bone and weight are added at once
+    weightedVerts = collections.OrderedDict()
     for vertex in vertices:
-        assignVertexGroup(vertex, armatures, mesh_ob)
-
-
-def assignVertexGroup(vert, armature, mesh_ob):
-    for i in range(len(vert.boneWeights)):
-        vertBoneWeight = vert.boneWeights[i]
+        assignVertexGroup(vertex, weightedVerts)
+
+    for (boneIdx, vertexWeight), vertIds in weightedVerts.items():
+        # use original index to get current bone name in blender
+        boneName = getBoneName(boneIdx)
+        if boneName:
+            vertGroup = mesh_ob.vertex_groups.get(boneName)
+            if not vertGroup:
+                vertGroup = mesh_ob.vertex_groups.new(boneName)
+            vertGroup.add(vertIds, vertexWeight, 'REPLACE')
+
+
+def assignVertexGroup(vert, weightedVerts):
+    # the last weight of a bone is kept like with 'REPLACE'
+    boneWeights = {bw.id: bw.weight for bw in vert.boneWeights if bw.weight != 0}
+    for vertBoneWeight in vert.boneWeights:
         boneIdx = vertBoneWeight.id
-        vertexWeight = vertBoneWeight.weight
+        vertexWeight = boneWeights.pop(boneIdx, 0)
         if vertexWeight != 0:
-            # use original index to get current bone name in blender
-            boneName = getBoneName(boneIdx)
-            if boneName:
-                vertGroup = mesh_ob.vertex_groups.get(boneName)
-                if not vertGroup:
-                    vertGroup = mesh_ob.vertex_groups.new(boneName)
-                vertGroup.add([vert.id], vertexWeight, 'REPLACE')
+            weightedVerts.setdefault((boneIdx, vertexWeight), []).append(vert.id)
 
 
 def makeBoneGroups(armature_ob, mesh_ob):
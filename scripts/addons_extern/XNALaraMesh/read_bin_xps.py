@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import gc
 import io
 import ntpath
 
@@ -96,6 +97,8 @@ def readHeader(file):
     # File-->File
     filesString = readFilesString(file)
     xpsPoseData = None
+    # Settings are kept as they are so that they can be written back
+    settingsStart = file.tell()
 
     # print('*'*80)
     if (version_mayor <= 1 and version_minor <= 12):
@@ -157,6 +160,9 @@ def readHeader(file):
     header.user = userName
     header.files = filesString
     header.pose = xpsPoseData
+    settingsEnd = file.tell()
+    file.seek(settingsStart)
+    header.settings = file.read(settingsEnd - settingsStart)
     return header
 
 
@@ -242,38 +248,33 @@ def readMeshes(file, xpsHeader, hasBones):
         # Vertices
         vertex = []
         vertexCount = bin_ops.readUInt32(file)
-
-        for vertexId in range(vertexCount):
-            coord = readXYZ(file)
-            normal = readXYZ(file)
-            vertexColor = readVertexColor(file)
-
-            uvs = []
-            for uvLayerId in range(uvLayerCount):
-                uvVert = readUvVert(file)
-                uvs.append(uvVert)
-                if not hasHeader or hasTangent:
-                    tangent = read4Float(file)
+        # All the vertices of the mesh have the same layout
+        readTangent = not hasHeader or hasTangent
+        vertStruct = bin_ops.vertexStruct(uvLayerCount, readTangent, hasBones)
+        uvStride = 6 if readTangent else 2
+        uvEnd = 10 + uvStride * uvLayerCount
+        vertexBlock = bin_ops.readVertexBlock(file, vertStruct, vertexCount)
+
+        for vertexId, values in enumerate(vertexBlock):
+            coord = list(values[0:3])
+            normal = list(values[3:6])
+            vertexColor = list(values[6:10])
+            uvs = [list(values[i:i + 2]) for i in range(10, uvEnd, uvStride)]
 
             boneWeights = []
             if hasBones:
                 # if cero bones dont have weights to read
-                boneIdx = read4Int16(file)
-                boneWeight = read4Float(file)
-
-                for idx in range(len(boneIdx)):
-                    boneWeights.append(
-                        xps_types.BoneWeight(boneIdx[idx], boneWeight[idx]))
+                boneWeights = [
+                    xps_types.BoneWeight(values[uvEnd + idx], values[uvEnd + 4 + idx])
+                    for idx in range(4)]
             xpsVertex = xps_types.XpsVertex(
                 vertexId, coord, normal, vertexColor, uvs, boneWeights)
             vertex.append(xpsVertex)
 
         # Faces
-        faces = []
         triCount = bin_ops.readUInt32(file)
-        for i in range(triCount):
-            triIdxs = readTriIdxs(file)
-            faces.append(triIdxs)
+        triIdxs = bin_ops.readUInt32Block(file, triCount * 3)
+        faces = [list(triIdxs[i:i + 3]) for i in range(0, triCount * 3, 3)]
         xpsMesh = xps_types.XpsMesh(
             meshName, textures, vertex, faces, uvLayerCount)
         meshes.append(xpsMesh)
@@ -290,15 +291,23 @@ def readXpsModel(filename):
     print('File:', filename)
 
     ioStream = readIoStream(filename)
-    print('Reading Header')
-    xpsHeader = findHeader(ioStream)
-    print('Reading Bones')
-    bones = readBones(ioStream)
-    hasBones = bool(bones)
-    print('Read', len(bones), 'Bones')
-    print('Reading Meshes')
-    meshes = readMeshes(ioStream, xpsHeader, hasBones)
-    print('Read', len(meshes), 'Meshes')
+    # The garbage collector would scan the objects of all the vertices
+    # read so far again and again, nothing read has reference cycles
+    gcEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        print('Reading Header')
+        xpsHeader = findHeader(ioStream)
+        print('Reading Bones')
+        bones = readBones(ioStream)
+        hasBones = bool(bones)
+        print('Read', len(bones), 'Bones')
+        print('Reading Meshes')
+        meshes = readMeshes(ioStream, xpsHeader, hasBones)
+        print('Read', len(meshes), 'Meshes')
+    finally:
+        if gcEnabled:
+            gc.enable()
 
     xpsData = xps_types.XpsData(xpsHeader, bones, meshes)
     return xpsData
@@ -1,12 +1,92 @@
 # -*- coding: utf-8 -*-
 import os
 import io
+import random
 import struct
-import xps_types
-import read_ascii_xps
-import read_bin_xps
-import write_ascii_xps
-import write_bin_xps
+import sys
+import tempfile
+import time
+from XNALaraMesh import xps_const
+from XNALaraMesh import xps_types
+from XNALaraMesh import read_ascii_xps
+from XNALaraMesh import read_bin_xps
+from XNALaraMesh import write_ascii_xps
+from XNALaraMesh import write_bin_xps
+
+
+def timed(label, function, *args):
+    time1 = time.time()
+    ret = function(*args)
+    time2 = time.time()
+    print('%s took %0.3f s' % (label, time2 - time1))
+    return ret, time2 - time1
+
+
+def modelSize(xpsData):
+    vertexCount = sum(len(mesh.vertices) for mesh in xpsData.meshes)
+    faceCount = sum(len(mesh.faces) for mesh in xpsData.meshes)
+    return vertexCount, faceCount
+
+
+def mockCharacter(meshCount, vertexCount, boneCount=120, uvCount=1):
+    # Random model with the layout of a skinned character
+    random.seed(0)
+    settings = struct.pack('<2I', 0, 0)  # hash and 0 items
+    header = xps_types.XpsHeader(
+        xps_const.MAGIC_NUMBER, xps_const.XPS_VERSION_MAYOR,
+        xps_const.XPS_VERSION_MINOR, xps_const.XNA_ARAL, len(settings) // 4,
+        'machine', 'user', 'files', settings, None)
+    bones = [xps_types.XpsBone(boneId, 'bone %d' % boneId,
+                               [random.random() for i in range(3)], boneId - 1)
+             for boneId in range(boneCount)]
+    meshes = []
+    for meshId in range(meshCount):
+        vertices = []
+        for vertexId in range(vertexCount):
+            coord = [random.uniform(-1, 1) for i in range(3)]
+            normal = [random.uniform(-1, 1) for i in range(3)]
+            vColor = [random.randrange(256) for i in range(4)]
+            uvs = [[random.random(), random.random()] for i in range(uvCount)]
+            boneWeights = [xps_types.BoneWeight(random.randrange(boneCount), random.random())
+                           for i in range(4)]
+            vertices.append(xps_types.XpsVertex(
+                vertexId, coord, normal, vColor, uvs, boneWeights))
+        faces = [[random.randrange(vertexCount) for i in range(3)]
+                 for faceId in range(vertexCount * 2)]
+        textures = [xps_types.XpsTexture(0, 'texture %d.png' % meshId, 0)]
+        meshes.append(xps_types.XpsMesh(
+            'mesh %d' % meshId, textures, vertices, faces, uvCount))
+    return xps_types.XpsData(header, bones, meshes)
+
+
+def benchmark(readfilename, writefilename, repeat=3):
+    fileSize = os.path.getsize(readfilename)
+    readTimes = []
+    writeTimes = []
+    for i in range(repeat):
+        xpsData, readTime = timed('read', read_bin_xps.readXpsModel, readfilename)
+        readTimes.append(readTime)
+        ret, writeTime = timed('write', write_bin_xps.writeXpsModel, writefilename, xpsData)
+        writeTimes.append(writeTime)
+
+    # Round trip: the written file has to give the same file again
+    with open(writefilename, 'rb') as a_file:
+        writtenBytes = a_file.read()
+    roundTripFilename = writefilename + '.roundtrip'
+    write_bin_xps.writeXpsModel(roundTripFilename, read_bin_xps.readXpsModel(writefilename))
+    with open(roundTripFilename, 'rb') as a_file:
+        roundTripOk = a_file.read() == writtenBytes
+    os.remove(roundTripFilename)
+
+    vertexCount, faceCount = modelSize(xpsData)
+    print('----BENCHMARK----')
+    print('File: %s (%0.1f MB)' % (readfilename, fileSize / 2**20))
+    print('Meshes: %d Vertices: %d Faces: %d' % (len(xpsData.meshes), vertexCount, faceCount))
+    print('Best read: %0.3f s (%0.1f MB/s)' % (min(readTimes), fileSize / 2**20 / max(min(readTimes), 1e-9)))
+    print('Best write: %0.3f s' % min(writeTimes))
+    print('Round trip:', 'OK' if roundTripOk else 'FAILED')
+    return roundTripOk
+
 
 if __name__ == "__main__":
     import imp
@@ -20,9 +100,19 @@ if __name__ == "__main__":
 
     writefilename = r'G:\3DModeling\XNALara\XNALara_XPS\data\TESTING\Alice Returns - Mods\Alice 001 Fetish Cat\write.mesh'
 
-    print('----READ START----')
-    xpsData = read_bin_xps.readXpsModel(readfilename)
-    print('----READ END----')
-    print('----WRITE START----')
-    write_bin_xps.writeXpsModel(writefilename, xpsData)
-    print('----WRITlE END----')
+    # Usage: bin_bin_xps.py [read.mesh [write.mesh]]
+    # without an existing file a large character model is generated first
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
+    if argv:
+        readfilename = argv[0]
+        writefilename = argv[1] if len(argv) > 1 else readfilename + '.write.mesh'
+    if not os.path.exists(readfilename):
+        readfilename = os.path.join(tempfile.gettempdir(), 'mock_character.mesh')
+        writefilename = os.path.join(tempfile.gettempdir(), 'mock_character_write.mesh')
+        print('----MOCK START----')
+        write_bin_xps.writeXpsModel(readfilename, mockCharacter(20, 10000))
+        print('----MOCK END----')
+
+    print('----BENCHMARK START----')
+    benchmark(readfilename, writefilename)
+    print('----BENCHMARK END----')
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import io
+import itertools
 import operator
 import os
 
@@ -178,30 +179,30 @@ def writeMeshes(meshes):
 
         # Vertices
         meshesArray.extend(bin_ops.writeUInt32(len(mesh.vertices)))
+        vertStruct = bin_ops.vertexStruct(mesh.uvCount, False, True)
+        vertexBlock = bytearray(vertStruct.size * len(mesh.vertices))
+        offset = 0
         for vertex in mesh.vertices:
-            meshesArray.extend(writeXYZ(vertex.co))
-            meshesArray.extend(writeXYZ(vertex.norm))
-            meshesArray.extend(writeVertexColor(vertex.vColor))
-
-            for uv in vertex.uv:
-                meshesArray.extend(writeUvVert(uv))
-                # if ????
-                # tangent????
-                # meshesArray.extend(write4float(xxx))
-
-            # Sort first the biggest weights
+            # Sort first the biggest weights, only 4 are written
             boneWeights = sorted(
                 vertex.boneWeights,
                 key=lambda bw: bw.weight,
-                reverse=True)
-
-            meshesArray.extend(write4UInt16([bw.id for bw in boneWeights]))
-            meshesArray.extend(write4Float([bw.weight for bw in boneWeights]))
+                reverse=True)[:4]
+
+            vertStruct.pack_into(
+                vertexBlock, offset,
+                *itertools.chain(
+                    vertex.co, vertex.norm, vertex.vColor,
+                    itertools.chain.from_iterable(vertex.uv),
+                    [bw.id for bw in boneWeights],
+                    [bw.weight for bw in boneWeights]))
+            offset += vertStruct.size
+        meshesArray.extend(vertexBlock)
 
         # Faces
         meshesArray.extend(bin_ops.writeUInt32(len(mesh.faces)))
-        for face in mesh.faces:
-            meshesArray.extend(writeTriIdxs(face))
+        meshesArray.extend(bin_ops.writeUInt32Block(
+            list(itertools.chain.from_iterable(mesh.faces))))
 
     return meshesArray
 
@@ -0,0 +1,146 @@
+import numpy
+from itertools import product
+
+'''
+Radius queries for many search points at once.
+The points are sorted by the cell of a uniform grid they are in, so every
+cell is a range in the sorted order. A query only has to look at the 27 cells
+around it when the cell size is at least as big as the search radius.
+All queries of a call are processed together with numpy instead of one by one.
+'''
+
+maxCellsPerAxis = 2**20
+queryChunkSize = 2**15
+columnOffsets = numpy.array([(x, y, 0) for x, y in product((-1, 0, 1), repeat = 2)], dtype = numpy.int64)
+
+class PointGrid:
+    def __init__(self, points, cellSize):
+        self.points = toPointArray(points)
+        self.pointAmount = len(self.points)
+        if self.pointAmount == 0:
+            self.origin = numpy.zeros(3)
+            extent = 0
+        else:
+            self.origin = self.points.min(axis = 0)
+            extent = (self.points.max(axis = 0) - self.origin).max()
+
+        # bigger cells when the grid would not fit into 64 bit keys
+        self.cellSize = max(cellSize, extent / (maxCellsPerAxis - 4), 1e-9)
+
+        keys = self.getKeys(self.getCells(self.points))
+        self.order = numpy.argsort(keys, kind = "mergesort")
+        self.sortedKeys = keys[self.order]
+
+    def getCells(self, points):
+        # the points are in the cells 1 to maxCellsPerAxis - 3 so that the cells
+        # around them and the neighbors of clipped cells are always empty
+        cells = numpy.floor((points - self.origin) / self.cellSize) + 1
+        return numpy.clip(cells, -1, maxCellsPerAxis - 1).astype(numpy.int64)
+
+    def getKeys(self, cells):
+        return (cells[:, 0] * maxCellsPerAxis + cells[:, 1]) * maxCellsPerAxis + cells[:, 2]
+
+    def findInRadius(self, searchPoints, radius):
+        '''
+        Finds all points whose distance to a search point is <= radius.
+        Returns three arrays: search point indices, point indices and distances,
+        sorted by search point and then by distance.
+        '''
+        searchPoints = toPointArray(searchPoints)
+        if radius > self.cellSize:
+            raise ValueError("the radius must not be bigger than the cell size")
+
+        # cells are found much faster when the queries are sorted like the cells
+        queryOrder = numpy.argsort(self.getKeys(self.getCells(searchPoints)), kind = "mergesort")
+
+        results = [emptyResult()]
+        for start in range(0, len(searchPoints), queryChunkSize):
+            chunkIndices = queryOrder[start:start + queryChunkSize]
+            chunk = searchPoints[chunkIndices]
+            searchIndices, pointIndices = self.getCandidates(chunk)
+            distances = numpy.sqrt(((self.points[pointIndices] - chunk[searchIndices])**2).sum(axis = 1))
+            inside = distances <= radius
+            results.append((chunkIndices[searchIndices[inside]], pointIndices[inside], distances[inside]))
+
+        searchIndices, pointIndices, distances = map(numpy.concatenate, zip(*results))
+        order = numpy.lexsort((distances, searchIndices))
+        return searchIndices[order], pointIndices[order], distances[order]
+
+    def getCandidates(self, searchPoints):
+        '''
+        Pairs of search point and point indices for all points
+        in the cells around the search points
+        '''
+        searchCells = self.getCells(searchPoints)
+        allSearchIndices, allPointIndices = [emptyIndices()], [emptyIndices()]
+
+        # the three cells of a column (same x and y) have consecutive keys,
+        # so their points are one range in the sorted order
+        for offset in columnOffsets:
+            cells = searchCells + offset
+            isInGrid = ((cells[:, :2] >= 0) & (cells[:, :2] < maxCellsPerAxis)).all(axis = 1)
+            keys = self.getKeys(cells[isInGrid])
+            searchIndices = numpy.nonzero(isInGrid)[0]
+
+            starts = numpy.searchsorted(self.sortedKeys, keys - 1, side = "left")
+            ends = numpy.searchsorted(self.sortedKeys, keys + 1, side = "right")
+            counts = ends - starts
+
+            # expand every (search point, column) pair to all points in the column
+            total = counts.sum()
+            if total == 0: continue
+            firstOfRun = numpy.cumsum(counts) - counts
+            sortedIndices = numpy.arange(total) + numpy.repeat(starts - firstOfRun, counts)
+            allSearchIndices.append(numpy.repeat(searchIndices, counts))
+            allPointIndices.append(self.order[sortedIndices])
+
+        return numpy.concatenate(allSearchIndices), numpy.concatenate(allPointIndices)
+
+    def findPairsInRange(self, searchIndices, minDistance, maxDistance, maxAmount):
+        '''
+        Connects the points at searchIndices to at most maxAmount of their
+        nearest other points with minDistance < distance <= maxDistance.
+        Returns an integer array with shape (n, 2) of unique
+        edges where the first index is the lower one.
+        '''
+        searchIndices = numpy.asarray(searchIndices, dtype = numpy.int64)
+        if maxAmount <= 0 or len(searchIndices) == 0 or maxDistance <= minDistance:
+            return numpy.zeros((0, 2), dtype = numpy.int64)
+
+        searchPositions, pointIndices, distances = self.findInRadius(self.points[searchIndices], maxDistance)
+        sourceIndices = searchIndices[searchPositions]
+        valid = (pointIndices != sourceIndices) & (distances > minDistance)
+        sourceIndices, pointIndices = sourceIndices[valid], pointIndices[valid]
+        searchPositions = searchPositions[valid]
+
+        # the results are sorted by distance for every search point
+        ranks = numpy.arange(len(searchPositions)) - getRunStarts(searchPositions)
+        isNearEnough = ranks < maxAmount
+        sourceIndices, pointIndices = sourceIndices[isNearEnough], pointIndices[isNearEnough]
+
+        low = numpy.minimum(sourceIndices, pointIndices)
+        high = numpy.maximum(sourceIndices, pointIndices)
+        edgeKeys = numpy.unique(low * self.pointAmount + high)
+        return numpy.column_stack((edgeKeys // self.pointAmount, edgeKeys % self.pointAmount))
+
+
+def getRunStarts(sortedValues):
+    '''
+    For every element the index where its run of equal values starts
+    '''
+    if len(sortedValues) == 0: return numpy.zeros(0, dtype = numpy.int64)
+    isStart = numpy.empty(len(sortedValues), dtype = bool)
+    isStart[0] = True
+    isStart[1:] = sortedValues[1:] != sortedValues[:-1]
+    starts = numpy.nonzero(isStart)[0]
+    return numpy.repeat(starts, numpy.diff(numpy.append(starts, len(sortedValues))))
+
+def toPointArray(points):
+    if len(points) == 0: return numpy.zeros((0, 3))
+    return numpy.asarray(points, dtype = float).reshape(-1, 3)
+
+def emptyIndices():
+    return numpy.zeros(0, dtype = numpy.int64)
+
+def emptyResult():
+    return emptyIndices(), emptyIndices(), numpy.zeros(0)
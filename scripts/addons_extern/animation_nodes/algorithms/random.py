@@ -3,10 +3,48 @@ import random
 from mathutils import Vector, Color
 from .. utils.timing import measureTime
 
-randomNumberCache = []
+# The random numbers are the ones of
+#     numpy.random.seed(1234); numpy.random.random(cacheSize)
+# which older versions computed when the addon was loaded. They are now
+# generated lazily in blocks, in order, up to the highest index that was
+# used, so saved files still get the same values.
+
 cacheSize = int(2e7)
-numpy.random.seed(1234)
-randomNumberCache = numpy.random.random(cacheSize)
+tableSeed = 1234
+blockBits = 16
+blockSize = 2**blockBits
+blockMask = blockSize - 1
+
+# randomNumberCache[-1] is used by the perlin noise, this value avoids
+# generating the whole sequence for it
+lastTableNumber = 0.4928643531010789
+
+class RandomNumberCache:
+    '''
+    Behaves like the precomputed table that was used before:
+    indexable with -len(cache) <= index < len(cache)
+    '''
+    def __init__(self):
+        self.generator = numpy.random.RandomState(tableSeed)
+        self.blocks = []
+
+    def __len__(self):
+        return cacheSize
+
+    def __getitem__(self, index):
+        if index < 0: index += cacheSize
+        blockIndex = index >> blockBits
+        if 0 <= blockIndex < len(self.blocks):
+            return float(self.blocks[blockIndex][index & blockMask])
+
+        if not 0 <= index < cacheSize: raise IndexError("random number index out of range")
+        if index == cacheSize - 1: return lastTableNumber
+        # the sequence can only be generated in order
+        while len(self.blocks) <= blockIndex:
+            self.blocks.append(self.generator.random_sample(blockSize))
+        return float(self.blocks[blockIndex][index & blockMask])
+
+randomNumberCache = RandomNumberCache()
 
 def getRandomNumberCache():
     return randomNumberCache
@@ -0,0 +1,48 @@
+'''
+Compares the lazy random number source with the table that was
+precomputed when the addon was loaded.
+Run it in the Python console of Blender:
+
+    import animation_nodes.algorithms.random_benchmark as b; b.run()
+'''
+
+import numpy
+from time import perf_counter
+from . import random as anRandom
+
+def run(samples = 100000, batchSize = 100000):
+    results = {}
+
+    start = perf_counter()
+    numpy.random.seed(1234)
+    table = numpy.random.random(anRandom.cacheSize)
+    results["table startup"] = perf_counter() - start
+    results["table memory (MB)"] = table.nbytes / 2**20
+
+    start = perf_counter()
+    cache = anRandom.RandomNumberCache()
+    results["lazy startup"] = perf_counter() - start
+
+    # consecutive seeds like in loops and seeds scattered over the whole range
+    for pattern, step in (("consecutive", 1), ("scattered", 123259)):
+        indices = [(i * step) % anRandom.cacheSize for i in range(samples)]
+        results["table per sample, " + pattern] = timePerSample(table, indices)
+        results["lazy per sample, " + pattern] = timePerSample(cache, indices)
+    results["lazy memory (MB)"] = len(cache.blocks) * anRandom.blockSize * 8 / 2**20
+    results["lazy equals table"] = float(all(cache[i] == table[i] for i in indices[:1000]))
+    del table
+
+    start = perf_counter()
+    anRandom.getRandomVectors(0, batchSize)
+    results["vectors per vector"] = (perf_counter() - start) / batchSize
+
+    for name, value in results.items():
+        if "memory" in name or "equals" in name: print("{:<36} {:10.2f}".format(name, value))
+        else: print("{:<36} {:10.3f} us".format(name, value * 1e6))
+    return results
+
+def timePerSample(cache, indices):
+    start = perf_counter()
+    for index in indices:
+        cache[index]
+    return (perf_counter() - start) / len(indices)
@@ -25,11 +25,22 @@ class AnimationNode:
     def useNetworkColorChanged(self, context):
         colorAllNodes()
 
+    def useResultCacheChanged(self, context):
+        from .. events import executionCodeChanged
+        from .. execution.cache import removeCachedResults
+        removeCachedResults(self.identifier)
+        executionCodeChanged()
+
     # unique string for each node; don't change it at all
     identifier = StringProperty(name = "Identifier", default = "")
     inInvalidNetwork = BoolProperty(name = "In Invalid Network", default = False)
     useNetworkColor = BoolProperty(name = "Use Network Color", default = True, update = useNetworkColorChanged)
 
+    # skip the execution when the outputs for the same inputs are cached
+    useResultCache = BoolProperty(name = "Cache Results", default = False,
+        description = "Reuse the outputs of earlier executions with the same inputs and settings",
+        update = useResultCacheChanged)
+
     # used for the listboxes in the sidebar
     activeInputIndex = IntProperty()
     activeOutputIndex = IntProperty()
@@ -42,6 +53,10 @@ class AnimationNode:
     # can be "NONE", "ALWAYS" or "HIDDEN_ONLY"
     dynamicLabelType = "NONE"
 
+    # nodes that read the current frame or other scene state,
+    # their results are never cached
+    isTimeDependent = False
+
     @classmethod
     def poll(cls, nodeTree):
         return nodeTree.bl_idname == "an_AnimationNodeTree"
@@ -315,6 +330,19 @@ class AnimationNode:
     def linkedOutputs(self):
         return tuple(iterLinkedOutputSockets(self))
 
+    @property
+    def canCacheResults(self):
+        # the cache key only contains the inputs
+        if self.isTimeDependent: return False
+        if not any(socket.dataType != "Node Control" for socket in self.inputs): return False
+        if len(self.outputs) == 0: return False
+        return all(socket.storable for socket in self.outputs)
+
+    def drawResultCacheSettings(self, layout):
+        col = layout.column()
+        col.active = self.canCacheResults
+        col.prop(self, "useResultCache")
+
     @property
     def activeInputSocket(self):
         if len(self.inputs) == 0: return None
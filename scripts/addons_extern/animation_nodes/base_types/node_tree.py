@@ -49,7 +49,7 @@ class AnimationNodeTree(bpy.types.NodeTree):
     editNodeLabels = BoolProperty(name = "Edit Node Labels", default = False)
 
     def update(self):
-        treeChanged()
+        treeChanged(self)
 
     def canAutoExecute(self, events):
         def isAnimationPlaying():
@@ -130,6 +130,20 @@ class AutoExecutionProperties(bpy.types.PropertyGroup):
 
     lastExecutionTimestamp = FloatProperty(default = 0.0)
 
+    def usePlaybackBufferChanged(self, context):
+        from .. execution.playback_buffer import clearPlaybackBuffer
+        clearPlaybackBuffer(self.id_data.name)
+
+    usePlaybackBuffer = BoolProperty(default = False, name = "Use Playback Buffer",
+        description = "Replay the baked outputs of the node tree instead of executing it (only for baked frames)",
+        update = usePlaybackBufferChanged)
+
+    playbackStartFrame = IntProperty(name = "Start", default = 1,
+        description = "First frame that is baked into the playback buffer")
+
+    playbackEndFrame = IntProperty(name = "End", default = 250,
+        description = "Last frame that is baked into the playback buffer")
+
 
 class AddAutoExecutionTrigger(bpy.types.Operator):
     bl_idname = "an.add_auto_execution_trigger"
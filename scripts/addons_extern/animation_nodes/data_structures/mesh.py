@@ -1,21 +1,122 @@
 import bpy
 import bmesh
+import numpy
 import itertools
 from mathutils import Vector
 
 class MeshData:
-    __slots__ = ("vertices", "edges", "polygons")
+    '''
+    The data can be stored as lists (vertices: Vectors, edges and polygons: tuples)
+    or as numpy arrays. Arrays are only converted to lists when the list properties
+    are accessed, afterwards the lists are used and the arrays are discarded.
+    Use the get...Array functions to get the data in a form that can be
+    passed to foreach_set directly.
+    '''
+    __slots__ = ("_vertices", "_edges", "_polygons",
+                 "_vertexArray", "_edgeArray", "_polygonIndices", "_polygonLengths")
 
     def __init__(self, vertices, edges, polygons):
         self.vertices = vertices
         self.edges = edges
         self.polygons = polygons
 
+    @staticmethod
+    def fromArrays(vertices, edges, polygonIndices, polygonLengths):
+        '''
+        vertices: float array with shape (n, 3)
+        edges: integer array with shape (m, 2)
+        polygonIndices: flat integer array with the indices of all polygons
+        polygonLengths: integer array with the amount of indices per polygon
+        '''
+        meshData = MeshData.__new__(MeshData)
+        meshData._vertices = meshData._edges = meshData._polygons = None
+        meshData._vertexArray = numpy.asarray(vertices, dtype = numpy.float32).reshape(-1, 3)
+        meshData._edgeArray = numpy.asarray(edges, dtype = numpy.int32).reshape(-1, 2)
+        meshData._polygonIndices = numpy.asarray(polygonIndices, dtype = numpy.int32).ravel()
+        meshData._polygonLengths = numpy.asarray(polygonLengths, dtype = numpy.int32).ravel()
+        return meshData
+
+    @property
+    def vertices(self):
+        if self._vertices is None:
+            self._vertices = [Vector(co) for co in self._vertexArray.tolist()]
+            self._vertexArray = None
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices):
+        self._vertices = vertices
+        self._vertexArray = None
+
+    @property
+    def edges(self):
+        if self._edges is None:
+            self._edges = [tuple(edge) for edge in self._edgeArray.tolist()]
+            self._edgeArray = None
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges):
+        self._edges = edges
+        self._edgeArray = None
+
+    @property
+    def polygons(self):
+        if self._polygons is None:
+            indices = self._polygonIndices.tolist()
+            ends = numpy.cumsum(self._polygonLengths).tolist()
+            self._polygons = [tuple(indices[end - length:end])
+                              for end, length in zip(ends, self._polygonLengths.tolist())]
+            self._polygonIndices = self._polygonLengths = None
+        return self._polygons
+
+    @polygons.setter
+    def polygons(self, polygons):
+        self._polygons = polygons
+        self._polygonIndices = self._polygonLengths = None
+
+    def getVertexArray(self):
+        if self._vertices is None: return self._vertexArray
+        if len(self._vertices) == 0: return numpy.zeros((0, 3), dtype = numpy.float32)
+        return numpy.array(self._vertices, dtype = numpy.float32).reshape(-1, 3)
+
+    def getEdgeArray(self):
+        if self._edges is None: return self._edgeArray
+        return numpy.array(list(itertools.chain.from_iterable(self._edges)), dtype = numpy.int32).reshape(-1, 2)
+
+    def getPolygonArrays(self):
+        '''
+        Returns the flat polygon indices and the amount of indices per polygon
+        '''
+        if self._polygons is None: return self._polygonIndices, self._polygonLengths
+        indices = numpy.array(list(itertools.chain.from_iterable(self._polygons)), dtype = numpy.int32)
+        lengths = numpy.array(list(map(len, self._polygons)), dtype = numpy.int32)
+        return indices, lengths
+
+    @property
+    def isArrayBased(self):
+        return self._vertices is None or self._edges is None or self._polygons is None
+
+    def getVertexAmount(self):
+        if self._vertices is None: return len(self._vertexArray)
+        return len(self._vertices)
+
+    def getEdgeAmount(self):
+        if self._edges is None: return len(self._edgeArray)
+        return len(self._edges)
+
+    def getPolygonAmount(self):
+        if self._polygons is None: return len(self._polygonLengths)
+        return len(self._polygons)
+
     def __repr__(self):
         return "<AN Mesh Data Object: Vertices: {}, Edges: {}, Polygons: {}>".format(
-                len(self.vertices), len(self.edges), len(self.polygons))
+                self.getVertexAmount(), self.getEdgeAmount(), self.getPolygonAmount())
 
     def copy(self):
+        if self.isArrayBased:
+            return MeshData.fromArrays(self.getVertexArray().copy(), self.getEdgeArray().copy(),
+                                       *[array.copy() for array in self.getPolygonArrays()])
         return MeshData(copyVectorList(self.vertices), copy2dList(self.edges), copy2dList(self.polygons))
 
     def isValid(self, checkTupleLengths = True, checkIndices = True):
@@ -30,15 +131,24 @@ class MeshData:
         return True
 
     def hasValidEdgeTupleLengths(self):
+        # the shape of the array guarantees it
+        if self._edges is None: return True
         checkTuple = tuple([2] * len(self.edges))
         edgeTupleLengths = tuple(map(len, self.edges))
         return checkTuple == edgeTupleLengths
 
     def hasValidPolygonTupleLengths(self):
+        if self._polygons is None:
+            return bool((self._polygonLengths >= 3).all())
         polygonTupleLengths = set(map(len, self.polygons))
         return all(amount >= 3 for amount in polygonTupleLengths)
 
     def hasValidIndices(self):
+        if self.isArrayBased:
+            indices = numpy.concatenate((self.getEdgeArray().ravel(), self.getPolygonArrays()[0]))
+            if len(indices) == 0: return True
+            return indices.max() < self.getVertexAmount() and indices.min() >= 0
+
         maxEdgeIndex = max(itertools.chain([-1], *self.edges))
         maxPolygonIndex = max(itertools.chain([-1], *self.polygons))
 
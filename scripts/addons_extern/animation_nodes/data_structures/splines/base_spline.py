@@ -1,6 +1,7 @@
 import copy
+import numpy
 from mathutils import Vector
-from . utils import findNearestParameterOnLine
+from . utils import findNearestParameterOnLine, toVectorList
 
 '''
 How to use Splines:
@@ -9,6 +10,7 @@ How to use Splines:
 - call the update function on the spline before evaluation, projection, ...
 - check the isEvaluable after updating the spline. There may be exceptions when you evaluate the spline when it isn't evaluable
 - call the ensureUniformConverter function before converting normal parameters to parameters which have the same distances
+- the ...Batch functions take a list or numpy array of parameters and return numpy arrays
 '''
 
 class Spline:
@@ -51,46 +53,59 @@ class Spline:
         return Vector((0, 0, 1))
 
 
+    # subclasses should implement faster versions
+    def evaluateBatch(self, parameters):
+        return numpy.array([tuple(self.evaluate(float(p))) for p in parameters], dtype = float).reshape(-1, 3)
+
+    def evaluateTangentBatch(self, parameters):
+        return numpy.array([tuple(self.evaluateTangent(float(p))) for p in parameters], dtype = float).reshape(-1, 3)
+
+
     def appendPoints(self, points):
         for point in points:
             self.appendPoint(point)
 
 
     def getSamples(self, amount, start = 0.0, end = 1.0):
-        parameters = self.getParameters(amount, start, end)
-        return [self.evaluate(par) for par in parameters]
+        return toVectorList(self.getSampleArray(amount, start, end))
 
     def getTangentSamples(self, amount, start = 0.0, end = 1.0):
-        parameters = self.getParameters(amount, start, end)
-        return [self.evaluateTangent(par) for par in parameters]
+        parameters = self.getParameterArray(amount, start, end)
+        return toVectorList(self.evaluateTangentBatch(parameters))
 
     def getUniformSamples(self, amount, start = 0.0, end = 1.0, resolution = 100):
         self.ensureUniformConverter(resolution)
-        parameters = self.toUniformParameters(amount, start, end)
-        return [self.evaluate(par) for par in parameters]
+        parameters = self.uniformConverter.lookUpBatch(self.getParameterArray(amount, start, end))
+        return toVectorList(self.evaluateBatch(parameters))
 
     def getUniformTangentSamples(self, amount, start = 0.0, end = 1.0, resolution = 100):
         self.ensureUniformConverter(resolution)
-        parameters = self.toUniformParameters(amount, start, end)
-        return [self.evaluateTangent(par) for par in parameters]
+        parameters = self.uniformConverter.lookUpBatch(self.getParameterArray(amount, start, end))
+        return toVectorList(self.evaluateTangentBatch(parameters))
+
+    def getSampleArray(self, amount, start = 0.0, end = 1.0):
+        return self.evaluateBatch(self.getParameterArray(amount, start, end))
 
 
     def toUniformParameters(self, amount, start = 0.0, end = 1.0):
-        return [self.toUniformParameter(par) for par in self.getParameters(amount, start, end)]
+        return self.uniformConverter.lookUpBatch(self.getParameterArray(amount, start, end)).tolist()
 
     def getParameters(self, amount, start = 0.0, end = 1.0):
+        return self.getParameterArray(amount, start, end).tolist()
+
+    def getParameterArray(self, amount, start = 0.0, end = 1.0):
         start = min(max(start, 0.0), 1.0)
         end = min(max(end, 0.0), 1.0)
 
-        if amount == 0: return []
-        if amount == 1: return [(start + end) / 2]
+        if amount <= 0: return numpy.zeros(0)
+        if amount == 1: return numpy.array([(start + end) / 2])
 
         if start > end: start, end = end, start
         stepDivisor = amount - 1
         if self.isCyclic and start <= 0 and end >= 1:
             stepDivisor = amount
         step = (end - start) / stepDivisor
-        return [i * step + start for i in range(amount)]
+        return numpy.arange(amount) * step + start
 
     # call ensureUniformConverter first
     def toUniformParameter(self, parameter):
@@ -104,8 +119,8 @@ class Spline:
 
     def getPartialLength(self, resolution = 50, start = 0.0, end = 1.0):
         if not self.isEvaluable: return 0.0
-        samples = self.getSamples(resolution, start, end)
-        return self.calculateDistanceSum(samples)
+        samples = self.getSampleArray(resolution, start, end)
+        return float(numpy.sqrt((numpy.diff(samples, axis = 0)**2).sum(axis = 1)).sum())
 
     def calculateDistanceSum(self, vectors):
         distance = 0.0
@@ -117,9 +132,9 @@ class Spline:
     # it's enough when a subclass implements 'getProjectedParameters'
     def project(self, coordinates):
         parameters = self.getProjectedParameters(coordinates)
-        sampledData = [(par, (coordinates - self.evaluate(par)).length_squared) for par in parameters]
-        if len(sampledData) > 0: return min(sampledData, key = lambda item: item[1])[0]
-        else: return 0.0
+        if len(parameters) == 0: return 0.0
+        distances = ((self.evaluateBatch(parameters) - tuple(coordinates))**2).sum(axis = 1)
+        return parameters[int(distances.argmin())]
     def getProjectedParameters(self, coordinates):
         return [i / 100 for i in range(101)]
 
@@ -172,23 +187,17 @@ class Spline:
             self.newUniformConverter(resolution)
 
     def newUniformConverter(self, resolution = 100):
-        from . poly_spline import PolySpline
-        samples = self.getSamples(resolution)
-
-        polySpline = PolySpline()
-        polySpline.appendPoints(samples)
-        polySpline.update()
-
-        uniformPolySpline = PolySpline()
-        equalDistanceParameters = polySpline.getEqualDistanceParameters(resolution)
-        converter = ParameterConverter(equalDistanceParameters)
-        self.uniformConverter = converter
+        from . poly_spline import getEqualDistanceParameters
+        samples = self.getSampleArray(resolution)
+        equalDistanceParameters = getEqualDistanceParameters(samples, resolution)
+        self.uniformConverter = ParameterConverter(equalDistanceParameters)
 
 # Mainly used to get parameters which have the same distance on the spline
 class ParameterConverter:
     def __init__(self, parameterList):
-        self.parameters = parameterList
-        self.length = len(parameterList)
+        self.parameters = list(parameterList)
+        self.parameterArray = numpy.array(self.parameters, dtype = float)
+        self.length = len(self.parameters)
 
     def lookUp(self, parameter):
         maxIndex = self.length - 1
@@ -198,6 +207,11 @@ class ParameterConverter:
         influence = p - before
         return self.parameters[before] * (1 - influence) + self.parameters[after] * influence
 
+    def lookUpBatch(self, parameters):
+        maxIndex = self.length - 1
+        positions = numpy.asarray(parameters, dtype = float) * maxIndex
+        return numpy.interp(positions, numpy.arange(self.length), self.parameterArray)
+
     @property
     def resolution(self):
         return self.length - 1
@@ -2,6 +2,7 @@ import numpy
 from mathutils import Vector, Matrix
 from numpy.polynomial import Polynomial
 from . base_spline import Spline
+from . utils import toSegmentIndicesAndParameters
 
 
 class BezierSpline(Spline):
@@ -11,6 +12,7 @@ class BezierSpline(Spline):
         self.isCyclic = False
         self.segments = []
         self.segmentAmount = 0
+        self.coefficients = None
         self.isChanged = True
 
     @staticmethod
@@ -53,16 +55,18 @@ class BezierSpline(Spline):
 
         if self.isChanged:
             recreateSegments()
+            self.coefficients = getSegmentCoefficients(self.segments)
             self.isEvaluable = len(self.segments) > 0
             self.uniformParameterConverter = None
             self.isChanged = False
 
     def getProjectedParameters(self, coordinates):
-        parameters = []
-        for i, segment in enumerate(self.segments):
-            for parameter in segment.findRootParameters(coordinates):
-                parameters.append((parameter + i) / len(self.segments))
-        return parameters
+        if self.segmentAmount == 0: return []
+        polynomials = getProjectionPolynomials(self.coefficients, numpy.array(tuple(coordinates)))
+        roots = findPolynomialRoots(polynomials)
+        roots = numpy.clip(roots.real, 0, 1)
+        indices = numpy.arange(self.segmentAmount)[:, numpy.newaxis]
+        return ((roots + indices) / self.segmentAmount).ravel().tolist()
 
     def calculateSmoothHandles(self, strength = 0.3333):
         neighborSegments = self.getNeighborSegments()
@@ -103,6 +107,68 @@ class BezierSpline(Spline):
         else:
             return self.segmentAmount - 1, 1
 
+    def evaluateBatch(self, parameters):
+        indices, t = toSegmentIndicesAndParameters(parameters, self.segmentAmount)
+        c = self.coefficients[indices]
+        t = t[:, numpy.newaxis]
+        return c[:, 0] + t * (c[:, 1] + t * (c[:, 2] + t * c[:, 3]))
+
+    def evaluateTangentBatch(self, parameters):
+        indices, t = toSegmentIndicesAndParameters(parameters, self.segmentAmount)
+        c = self.coefficients[indices]
+        t = t[:, numpy.newaxis]
+        return c[:, 1] + t * (c[:, 2] * 2 + t * c[:, 3] * 3)
+
+
+def getSegmentCoefficients(segments):
+    '''
+    Polynomial coefficients of all segments in an array with shape (segments, 4, 3)
+    '''
+    coefficients = numpy.zeros((len(segments), 4, 3))
+    for i, segment in enumerate(segments):
+        coefficients[i] = segment.coeffs
+    return coefficients
+
+def getProjectionPolynomials(coefficients, coordinates):
+    '''
+    Same polynomials as in BezierSegment.findRootParameters for all segments,
+    the coefficients of the result have the shape (segments, 6)
+    '''
+    c0, c1, c2, c3 = (coefficients[:, i] for i in range(4))
+    p0 = c0 - coordinates
+    dot = lambda x, y: (x * y).sum(axis = 1)
+
+    polynomials = numpy.empty((len(coefficients), 6))
+    polynomials[:, 0] = dot(c1, p0)
+    polynomials[:, 1] = dot(c1, c1) + dot(c2, p0) * 2.0
+    polynomials[:, 2] = dot(c2, c1) * 3.0 + dot(c3, p0) * 3.0
+    polynomials[:, 3] = dot(c3, c1) * 4.0 + dot(c2, c2) * 2.0
+    polynomials[:, 4] = dot(c3, c2) * 5.0
+    polynomials[:, 5] = dot(c3, c3) * 3.0
+    return polynomials
+
+def findPolynomialRoots(polynomials):
+    '''
+    Roots of many quintic polynomials (lowest coefficient first) with shape (n, 6),
+    the eigenvalues of the companion matrices are calculated in one call.
+    Polynomials with a lower degree are padded with the root 0.
+    '''
+    amount = len(polynomials)
+    roots = numpy.zeros((amount, 5), dtype = complex)
+
+    isQuintic = numpy.abs(polynomials[:, 5]) > 1e-12
+    quintics = polynomials[isQuintic]
+    if len(quintics) > 0:
+        companions = numpy.zeros((len(quintics), 5, 5))
+        companions[:, 1:, :-1] = numpy.eye(4)
+        companions[:, :, -1] = -quintics[:, :5] / quintics[:, 5:]
+        roots[isQuintic] = numpy.linalg.eigvals(companions)
+
+    for i in numpy.nonzero(~isQuintic)[0]:
+        polynomialRoots = numpy.roots(polynomials[i, ::-1])
+        roots[i, :len(polynomialRoots)] = polynomialRoots
+    return roots
+
 
 class BezierPoint:
     __slots__ = ("location", "leftHandle", "rightHandle")
@@ -1,5 +1,6 @@
+import numpy
 from . base_spline import Spline
-from . utils import findNearestParameterOnLine
+from . utils import findNearestParameterOnLine, toPointArray, toSegmentIndicesAndParameters
 
 
 class PolySpline(Spline):
@@ -9,6 +10,7 @@ class PolySpline(Spline):
         self.isCyclic = False
         self.segments = []
         self.segmentAmount = 0
+        self.pointArray = None
         self.isChanged = True
 
     @staticmethod
@@ -50,22 +52,30 @@ class PolySpline(Spline):
 
         if self.isChanged:
             recreateSegments()
+            self.pointArray = toPointArray(self.points)
             self.isEvaluable = len(self.segments) > 0
             self.uniformParameterConverter = None
             self.isChanged = False
 
     def getLength(self, resolution = 0):
-        length = 0
-        for segment in self.segments:
-            length += segment.getLength()
-        return length
+        if self.segmentAmount == 0: return 0
+        left, right = self.getSegmentPointArrays()
+        return float(numpy.sqrt(((right - left)**2).sum(axis = 1)).sum())
 
     def getProjectedParameters(self, coordinates):
-        parameters = []
-        for i, segment in enumerate(self.segments):
-            parameter = segment.project(coordinates)
-            parameters.append((parameter + i) / len(self.segments))
-        return parameters
+        if self.segmentAmount == 0: return []
+        left, right = self.getSegmentPointArrays()
+        directions = right - left
+        lengthsSquared = (directions**2).sum(axis = 1)
+        dots = ((numpy.array(tuple(coordinates)) - left) * directions).sum(axis = 1)
+        parameters = dots / numpy.where(lengthsSquared == 0, 1, lengthsSquared)
+        parameters[lengthsSquared == 0] = 0
+        return ((parameters + numpy.arange(self.segmentAmount)) / self.segmentAmount).tolist()
+
+    def getSegmentPointArrays(self):
+        indices = numpy.arange(self.segmentAmount)
+        points = self.pointArray
+        return points[indices], points[(indices + 1) % len(points)]
 
 
     # evaluation
@@ -87,57 +97,54 @@ class PolySpline(Spline):
         else:
             return self.segmentAmount - 1, 1
 
+    def evaluateBatch(self, parameters):
+        indices, factors = toSegmentIndicesAndParameters(parameters, self.segmentAmount)
+        points = self.pointArray
+        left, right = points[indices], points[(indices + 1) % len(points)]
+        factors = factors[:, numpy.newaxis]
+        return left * (1 - factors) + right * factors
+
+    def evaluateTangentBatch(self, parameters):
+        indices, _ = toSegmentIndicesAndParameters(parameters, self.segmentAmount)
+        points = self.pointArray
+        return points[(indices + 1) % len(points)] - points[indices]
+
 
     # point distribution
     #############################
 
     def getEqualDistanceParameters(self, amount):
-        if amount < 2: return [0.0]
         if not self.isEvaluable: return [0.0]
+        return getEqualDistanceParameters(self.pointArray, amount)
+
+
+def getEqualDistanceParameters(points, amount):
+    '''
+    Parameters of the open polyline through the points (n, 3) where
+    the distances between the evaluated locations are equal
+    '''
+    if amount < 2 or len(points) < 2: return [0.0]
+
+    segmentLengths = numpy.sqrt((numpy.diff(points, axis = 0)**2).sum(axis = 1))
+    totalLength = segmentLengths.sum()
+    if totalLength < 0.0001: return [0.0] * amount
+    distancePerStep = totalLength / amount
+
+    startDistances = numpy.concatenate(([0.0], numpy.cumsum(segmentLengths)))
+    distances = numpy.arange(1, amount + 1) * distancePerStep
+    indices = numpy.searchsorted(startDistances, distances, side = "left") - 1
+    indices = numpy.clip(indices, 0, len(segmentLengths) - 1)
+
+    lengths = segmentLengths[indices]
+    factors = (distances - startDistances[indices]) / numpy.where(lengths > 0, lengths, 1)
+    factors = numpy.clip(factors, 0.0, 1.0)
+
+    parameters = [0.0] + ((indices + factors) / len(segmentLengths)).tolist()
 
-        totalLength = self.getLength()
-        if totalLength < 0.0001: return [0.0] * amount
-        distancePerStep = totalLength / amount
-
-        parameters = [0.0]
-        lastControlPoint = self.points[0]
-        lastVector = self.points[0]
-        previousDistance = 0.0
-
-        targetPoints = self.points[1:]
-        targetPointAmount = len(targetPoints)
-
-        for i, point in enumerate(targetPoints):
-            if point == lastVector: continue
-
-            while True:
-                distanceToLastVector = (point - lastVector).length
-                totalDistance = distanceToLastVector + previousDistance
-                if totalDistance >= distancePerStep:
-                    # find vector with correct distance
-                    surplusDistance = totalDistance - distancePerStep
-                    influence = surplusDistance / distanceToLastVector
-                    sampledVector = lastVector * influence + point * (1 - influence)
-
-                    # calculate parameter of the sampled vector
-                    d1 = (sampledVector - lastControlPoint).length
-                    d2 = (point - lastControlPoint).length
-
-                    parameter = (i + d1 / d2) / targetPointAmount
-                    parameters.append(parameter)
-
-                    previousDistance = 0.0
-                    lastVector = sampledVector
-                else:
-                    previousDistance += distanceToLastVector
-                    lastVector = point
-                    break
-            lastControlPoint = point
-
-        # append parameter 1.0 sometimes because of math inaccuracy
-        if parameters[-1] < 0.999999:
-            parameters.append(1.0)
-        return parameters
+    # append parameter 1.0 sometimes because of math inaccuracy
+    if parameters[-1] < 0.999999:
+        parameters.append(1.0)
+    return parameters
 
 
 class PolySegment:
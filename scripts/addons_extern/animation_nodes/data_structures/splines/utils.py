@@ -1,6 +1,27 @@
+import numpy
+from mathutils import Vector
+
 def findNearestParameterOnLine(linePosition, lineDirection, point):
     directionLength = lineDirection.length
     lineDirection = lineDirection.normalized()
     if directionLength == 0: return 0
     parameter = (lineDirection.dot(point - linePosition)) / directionLength
     return parameter
+
+def toVectorList(array):
+    return [Vector(row) for row in array.tolist()]
+
+def toPointArray(vectors):
+    if len(vectors) == 0: return numpy.zeros((0, 3))
+    return numpy.array([tuple(vector) for vector in vectors], dtype = float)
+
+def toSegmentIndicesAndParameters(parameters, segmentAmount):
+    '''
+    Vectorized version of toSegmentsIndexAndParameter
+    '''
+    p = numpy.maximum(numpy.asarray(parameters, dtype = float), 0.0) * segmentAmount
+    floorP = p.astype(int)
+    isInside = floorP < segmentAmount
+    indices = numpy.where(isInside, floorP, segmentAmount - 1)
+    factors = numpy.where(isInside, p - floorP, 1.0)
+    return indices, factors
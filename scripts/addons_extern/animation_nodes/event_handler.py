@@ -1,11 +1,13 @@
 import bpy
 import itertools
 from . import problems
+from . import tree_info
 from . update import updateEverything
 from . utils.recursion import noRecursion
 from . tree_info import iterSocketsThatNeedUpdate
 from . utils.nodes import iterNodesInAnimationNodeTrees, getAnimationNodeTrees
 from . execution.units import setupExecutionUnits, finishExecutionUnits
+from . execution.playback_buffer import invalidatePlaybackBuffers, isBaking
 from . execution.auto_execution import iterAutoExecutionNodeTrees, executeNodeTrees, afterExecution
 
 @noRecursion
@@ -14,11 +16,21 @@ def update(events):
         print("Skip event: cannot write to ID classes")
         return
 
-    if didNameChange() or events.intersection({"File", "Addon", "Tree"}):
+    namesChanged = didNameChange()
+    if namesChanged:
+        # renamed nodes are not reported by the trees
+        tree_info.treeChanged()
+
+    if namesChanged or events.intersection({"File", "Addon", "Tree"}):
         updateEverything()
+        invalidatePlaybackBuffers()
+    elif "Property" in events or didSceneChange(events):
+        invalidatePlaybackBuffers()
 
     updateProperties()
 
+    global executedLastUpdate
+    executedLastUpdate = False
     if problems.canAutoExecute():
         nodeTrees = list(iterAutoExecutionNodeTrees(events))
         if len(nodeTrees) > 0:
@@ -26,6 +38,7 @@ def update(events):
             executeNodeTrees(nodeTrees)
             afterExecution()
             finishExecutionUnits()
+            executedLastUpdate = True
 
 
 def failsToWriteToIDClasses():
@@ -37,6 +50,29 @@ def failsToWriteToIDClasses():
         return False
     except: return True
 
+executedLastUpdate = False
+oldSceneName = None
+
+def didSceneChange(events):
+    '''
+    True when another scene is active or blender data changed in a way the
+    playback buffers can depend on. Updates caused by frame changes, baking
+    or the last execution of the trees themselves are ignored.
+    '''
+    global oldSceneName
+    sceneName = getattr(bpy.context.scene, "name", None)
+    if sceneName != oldSceneName:
+        oldSceneName = sceneName
+        return True
+    if "Scene" not in events or "Frame" in events: return False
+    if executedLastUpdate or isBaking(): return False
+    return isDepsgraphUpdated()
+
+def isDepsgraphUpdated():
+    data = bpy.data
+    return any(collection.is_updated for collection in (
+        data.objects, data.meshes, data.curves, data.materials, data.groups))
+
 oldNamesHash = 0
 
 def didNameChange():
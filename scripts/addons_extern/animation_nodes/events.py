@@ -64,14 +64,19 @@ def addonChanged():
     treeChanged()
 
 def executionCodeChanged(self = None, context = None):
-    treeChanged()
+    treeChanged(self)
 
 def networkChanged(self = None, context = None):
-    treeChanged()
+    treeChanged(self)
 
 def treeChanged(self = None, context = None):
     event.treeChanged = True
-    tree_info.treeChanged()
+    # self is the changed tree or a node/socket in it, when it is known
+    tree = getattr(self, "id_data", None)
+    if getattr(tree, "bl_idname", "") == "an_AnimationNodeTree":
+        tree_info.treeChanged(tree.name)
+    else:
+        tree_info.treeChanged()
 
 
 @eventHandler("RENDER_INIT")
@@ -3,16 +3,19 @@ from .. import problems
 from .. preferences import getPreferences
 from .. utils.blender_ui import redrawAll
 from .. utils.nodes import getAnimationNodeTrees
+from . playback_buffer import canReplay, replayPlaybackBuffer, isBaking
 
 def iterAutoExecutionNodeTrees(events):
     if not problems.canExecute(): return
     for nodeTree in getAnimationNodeTrees():
+        if isBaking(nodeTree): continue
         if nodeTree.canAutoExecute(events):
             yield nodeTree
 
 def executeNodeTrees(nodeTrees):
     for nodeTree in nodeTrees:
-        nodeTree.autoExecute()
+        if canReplay(nodeTree): replayPlaybackBuffer(nodeTree)
+        else: nodeTree.autoExecute()
 
 def afterExecution():
     prefs = getPreferences()
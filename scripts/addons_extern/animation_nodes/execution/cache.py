@@ -1,4 +1,193 @@
+import sys
+import bpy
+from collections import OrderedDict
 from .. utils import fcurve
+from .. utils.hash import hashValues
+from .. utils.operators import makeOperator
 
 def clearExecutionCache():
     fcurve.clearCache()
+
+
+# Result Cache
+##########################################
+# Outputs of nodes that have 'Cache Results' enabled (and of Invoke
+# Subprogram nodes in the 'Once per Input' mode) keyed by the node and a
+# digest of the input values. The entries live across frames and are
+# evicted least recently used first when the memory budget is exceeded.
+
+class ResultCache:
+    def __init__(self, budget = 256 * 2**20):
+        self.entries = OrderedDict()
+        self.budget = budget
+        self.size = 0
+        self.resetStatistics()
+
+    def resetStatistics(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        if key is None: return None
+        try:
+            entry = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        # move to the most recently used end
+        self.entries[key] = entry
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value):
+        if key is None: return
+        self.pop(key)
+        size = estimateSize(value)
+        if size > self.budget: return
+        self.entries[key] = (value, size)
+        self.size += size
+        self.trim()
+
+    def trim(self):
+        while self.size > self.budget:
+            _, (_, oldSize) = self.entries.popitem(last = False)
+            self.size -= oldSize
+            self.evictions += 1
+
+    def pop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def removeWhere(self, condition):
+        for key in [key for key in self.entries if condition(key)]:
+            self.pop(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+resultCache = ResultCache()
+
+def getNodeCacheKey(node, inputs):
+    '''
+    Key of a node execution, None if an input can not be hashed.
+    The node properties are part of the key because changing them does
+    not always regenerate the execution code.
+    '''
+    digest = hashValues((getNodePropertyValues(node), inputs))
+    if digest is None: return None
+    return (node.identifier, digest)
+
+def getSubprogramCacheKey(subprogramIdentifier, inputs):
+    digest = hashValues(inputs)
+    if digest is None: return None
+    return (subprogramIdentifier, digest)
+
+def getCachedResult(key):
+    return resultCache.get(key)
+
+def setCachedResult(key, value):
+    resultCache.set(key, value)
+
+def removeCachedResults(identifier):
+    resultCache.removeWhere(lambda key: key[0] == identifier)
+
+@makeOperator("an.clear_result_cache", "Clear Result Cache", redraw = True)
+def clearResultCache():
+    resultCache.clear()
+    resultCache.resetStatistics()
+
+def setResultCacheBudget(megabytes):
+    resultCache.budget = megabytes * 2**20
+    resultCache.trim()
+
+def getResultCacheStatistics():
+    return {
+        "entries" : len(resultCache),
+        "size" : resultCache.size,
+        "budget" : resultCache.budget,
+        "hits" : resultCache.hits,
+        "misses" : resultCache.misses,
+        "evictions" : resultCache.evictions }
+
+
+# Index Cache
+##########################################
+# Spatial indices (KD and BVH trees, point grids) that nodes build from
+# their inputs. Only the last index of every node is kept and reused in
+# later frames as long as the inputs have the same content.
+
+_indexByOwner = {}
+
+def getCachedIndex(owner, inputs, createIndex):
+    digest = hashValues(inputs)
+    if digest is None: return createIndex()
+
+    entry = _indexByOwner.get(owner)
+    if entry is not None and entry[0] == digest:
+        return entry[1]
+
+    index = createIndex()
+    _indexByOwner[owner] = (digest, index)
+    return index
+
+def clearIndexCache():
+    _indexByOwner.clear()
+
+# Node Properties
+##########################################
+
+_propertyNamesByIdName = {}
+_ignoredPropertyNames = {"identifier", "inInvalidNetwork", "useNetworkColor",
+                         "activeInputIndex", "activeOutputIndex", "useResultCache"}
+
+def getNodePropertyValues(node):
+    names = _propertyNamesByIdName.get(node.bl_idname)
+    if names is None:
+        names = _propertyNamesByIdName[node.bl_idname] = getNodePropertyNames(node)
+    values = []
+    for name in names:
+        value = getattr(node, name)
+        if isinstance(value, set): value = tuple(sorted(value))
+        elif not isinstance(value, (bool, int, float, str)): value = tuple(value)
+        values.append(value)
+    return tuple(values)
+
+def getNodePropertyNames(node):
+    baseNames = {prop.identifier for prop in bpy.types.Node.bl_rna.properties}
+    names = []
+    for prop in node.bl_rna.properties:
+        name = prop.identifier
+        if name in baseNames or name in _ignoredPropertyNames: continue
+        if prop.type in ("POINTER", "COLLECTION"): continue
+        names.append(name)
+    return tuple(names)
+
+
+# Size Estimation
+##########################################
+
+def estimateSize(value, depth = 0):
+    '''
+    Approximate memory of a value in bytes, long lists are sampled
+    '''
+    size = sys.getsizeof(value)
+    if depth > 4: return size
+    if isinstance(value, (list, tuple)):
+        length = len(value)
+        if length == 0: return size
+        if length <= 100:
+            return size + sum(estimateSize(item, depth + 1) for item in value)
+        step = length // 100
+        sample = sum(estimateSize(value[i], depth + 1) for i in range(0, length, step)) / len(range(0, length, step))
+        return size + int(sample * length)
+    if isinstance(value, dict):
+        return size + sum(estimateSize(k, depth + 1) + estimateSize(v, depth + 1) for k, v in value.items())
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int): return max(size, nbytes)
+    return size
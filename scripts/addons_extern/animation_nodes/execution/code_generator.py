@@ -170,9 +170,14 @@ def iterInputCopyLines(node, variables):
             yield line
 
 def iterRealNodeExecutionLines(node, variables):
+    if getattr(node, "isPlaybackOutput", False):
+        yield getPlaybackRecordLine(node, variables)
     localCode = node.getLocalExecutionCode()
     globalCode = makeGlobalExecutionCode(localCode, node, variables)
-    yield from globalCode.splitlines()
+    if usesResultCache(node):
+        yield from iterCachedExecutionLines(node, globalCode.splitlines(), variables)
+    else:
+        yield from globalCode.splitlines()
 
 def iterNodeBakeLines(node, variables):
     localCode = node.getLocalBakeCode()
@@ -195,6 +200,41 @@ def replaceVariableName(code, oldName, newName):
     return re.sub(pattern, r"\1{}".format(newName), code)
 
 
+def usesResultCache(node):
+    return node.useResultCache and node.canCacheResults and len(node.linkedOutputs) > 0
+
+def iterCachedExecutionLines(node, lines, variables):
+    '''
+    Only execute the node when the result for its inputs is not cached yet.
+    Copyable outputs are copied into and out of the cache, because the
+    following nodes might change them.
+    '''
+    inputNames = [variables[socket] for socket in node.inputs if socket.dataType != "Node Control"]
+    outputs = node.linkedOutputs
+
+    yield "_cache_key = animation_nodes.execution.cache.getNodeCacheKey({}, ({}))".format(
+        node.identifier, "".join(name + ", " for name in inputNames))
+    yield "_cached_result = animation_nodes.execution.cache.getCachedResult(_cache_key)"
+    yield "if _cached_result is None:"
+    for line in lines:
+        yield "    " + line
+    storedValues = [getResultCacheCopyExpression(socket, variables[socket]) for socket in outputs]
+    yield "    animation_nodes.execution.cache.setCachedResult(_cache_key, ({}))".format(
+        "".join(value + ", " for value in storedValues))
+    yield "else:"
+    for i, socket in enumerate(outputs):
+        cachedValue = "_cached_result[{}]".format(i)
+        yield "    {} = {}".format(variables[socket], getResultCacheCopyExpression(socket, cachedValue))
+
+def getResultCacheCopyExpression(socket, name):
+    if not socket.isCopyable(): return name
+    return socket.getCopyExpression().replace("value", name)
+
+def getPlaybackRecordLine(node, variables):
+    inputNames = [variables[socket] for socket in node.inputs if socket.dataType != "Node Control"]
+    return "if animation_nodes.execution.playback_buffer.isRecording: animation_nodes.execution.playback_buffer.record({}, ({}))".format(
+        repr(node.identifier), "".join(name + ", " for name in inputNames))
+
 def handleExecutionCodeCreationException(node):
     print("\n"*5)
     traceback.print_exc()
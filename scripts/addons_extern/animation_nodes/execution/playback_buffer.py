@@ -0,0 +1,260 @@
+import bpy
+import sys
+import numpy
+from array import array
+from itertools import chain
+from mathutils import Vector, Matrix, Quaternion, Euler
+from .. preferences import addonName
+from .. tree_info import getNodeByIdentifier
+from .. utils.operators import makeOperator
+from .. data_structures.mesh import MeshData
+
+
+# Playback Buffer
+##########################################
+# The inputs of the output nodes (matrices, transforms, mesh data, splines, ...)
+# of a node tree are recorded for a frame range ahead of time. During playback
+# only the output nodes run with the recorded values instead of the whole tree.
+# The buffers become invalid when the tree or its properties change, or when
+# the scene changes otherwise. Baking runs frame by frame in a modal operator.
+
+isRecording = False
+_recordedFrame = None
+_bakingTreeName = None
+_bakingBuffer = None
+
+_bufferByTreeName = {}
+_replayFunctionByIdentifier = {}
+
+class PlaybackBuffer:
+    def __init__(self, startFrame, endFrame):
+        self.startFrame = startFrame
+        self.endFrame = endFrame
+        self.frames = {}
+        self.isValid = True
+        self.size = 0
+        self.unsupportedNodes = set()
+
+    def setFrame(self, frame, records):
+        self.frames[frame] = records
+        self.size += sum(estimatePackedSize(values) for _, values in records)
+
+    def hasFrame(self, frame):
+        return self.isValid and frame in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+def getPlaybackBuffer(nodeTree):
+    return _bufferByTreeName.get(nodeTree.name)
+
+def canReplay(nodeTree):
+    if not nodeTree.autoExecution.usePlaybackBuffer: return False
+    buffer = _bufferByTreeName.get(nodeTree.name)
+    if buffer is None: return False
+    return buffer.hasFrame(nodeTree.scene.frame_current)
+
+def isBaking(nodeTree = None):
+    if nodeTree is None: return _bakingTreeName is not None
+    return nodeTree.name == _bakingTreeName
+
+def invalidatePlaybackBuffers():
+    for buffer in _bufferByTreeName.values():
+        buffer.isValid = False
+    if _bakingBuffer is not None:
+        _bakingBuffer.isValid = False
+    _replayFunctionByIdentifier.clear()
+
+@makeOperator("an.clear_playback_buffer", "Clear Playback Buffer", arguments = ["String"], redraw = True)
+def clearPlaybackBuffer(treeName = ""):
+    if treeName == "": _bufferByTreeName.clear()
+    else: _bufferByTreeName.pop(treeName, None)
+    _replayFunctionByIdentifier.clear()
+
+
+# Recording
+##########################################
+
+def startBaking(nodeTree, startFrame, endFrame):
+    global _bakingTreeName, _bakingBuffer
+    clearPlaybackBuffer(nodeTree.name)
+    _bakingBuffer = PlaybackBuffer(startFrame, endFrame)
+    _bakingBuffer.unsupportedNodes = set(iterUnsupportedOutputNodes(nodeTree))
+    _bakingTreeName = nodeTree.name
+    return _bakingBuffer
+
+def bakeFrame(frame, executeFrame):
+    '''
+    executeFrame(frame) has to set the frame and execute the tree,
+    the output nodes report their inputs while it runs.
+    '''
+    global isRecording, _recordedFrame
+    records = _recordedFrame = []
+    isRecording = True
+    try: executeFrame(frame)
+    finally:
+        isRecording = False
+        _recordedFrame = None
+    _bakingBuffer.setFrame(frame, records)
+
+def finishBaking():
+    '''
+    Store the buffer of the baking tree, also when it was cancelled
+    because every baked frame is complete.
+    '''
+    global _bakingTreeName, _bakingBuffer
+    buffer = _bakingBuffer
+    _bufferByTreeName[_bakingTreeName] = buffer
+    _bakingTreeName = None
+    _bakingBuffer = None
+    return buffer
+
+def record(identifier, values):
+    if _recordedFrame is None: return
+    try: packedValues = tuple(pack(value) for value in values)
+    except UnpackableValue: return
+    _recordedFrame.append((identifier, packedValues))
+
+def iterRecordedSockets(node):
+    for socket in node.inputs:
+        if socket.dataType != "Node Control":
+            yield socket
+
+def iterUnsupportedOutputNodes(nodeTree):
+    '''
+    Nodes that change the scene but cannot be replayed. Trees that contain
+    them can still be buffered, but these nodes will not be updated.
+    '''
+    for network in nodeTree.networks:
+        if network.type != "Main": continue
+        for node in network.getAnimationNodes():
+            if node.bl_idname.endswith("OutputNode") and not getattr(node, "isPlaybackOutput", False):
+                yield node.name
+
+
+# Replay
+##########################################
+
+def replayPlaybackBuffer(nodeTree):
+    buffer = _bufferByTreeName[nodeTree.name]
+    for identifier, values in buffer.frames[nodeTree.scene.frame_current]:
+        try: node = getNodeByIdentifier(identifier)
+        except: continue
+        function = _replayFunctionByIdentifier.get(identifier)
+        if function is None:
+            function = _replayFunctionByIdentifier[identifier] = createReplayFunction(node)
+        function(node, *[unpack(value) for value in values])
+
+def createReplayFunction(node):
+    inputVariables = node.inputVariables
+    parameters = [inputVariables[socket.identifier] for socket in iterRecordedSockets(node)]
+    lines = node.getLocalExecutionCode().splitlines() or ["pass"]
+
+    code = "def replay(self, {}):\n".format(", ".join(parameters))
+    code += "\n".join("    " + line for line in lines) + "\n    pass"
+
+    namespace = {"bpy" : bpy, "sys" : sys, "Vector" : Vector, "Matrix" : Matrix,
+                 "Quaternion" : Quaternion, "Euler" : Euler,
+                 "animation_nodes" : sys.modules.get(addonName)}
+    for moduleName in node.getUsedModules():
+        namespace[moduleName] = __import__(moduleName)
+    exec(code, namespace)
+    return namespace["replay"]
+
+
+# Compact Values
+##########################################
+
+class UnpackableValue(Exception):
+    pass
+
+class PackedMatrix:
+    __slots__ = ("size", "data")
+
+    def __init__(self, matrix):
+        self.size = len(matrix.row)
+        self.data = array("f", chain.from_iterable(matrix))
+
+    def unpack(self):
+        size, data = self.size, self.data
+        return Matrix([data[i:i + size] for i in range(0, size * size, size)])
+
+class PackedVectorList:
+    __slots__ = ("data", )
+
+    def __init__(self, vectors):
+        self.data = array("f", chain.from_iterable(vectors))
+
+    def unpack(self):
+        data = self.data
+        return [Vector(data[i:i + 3]) for i in range(0, len(data), 3)]
+
+class PackedNumberList:
+    __slots__ = ("data", )
+
+    def __init__(self, numbers, typecode):
+        self.data = array(typecode, numbers)
+
+    def unpack(self):
+        return self.data.tolist()
+
+class PackedMeshData:
+    __slots__ = ("vertices", "edges", "polygonIndices", "polygonLengths")
+
+    def __init__(self, meshData):
+        # copies, the arrays of the mesh data can be used by other nodes
+        self.vertices = numpy.array(meshData.getVertexArray())
+        self.edges = numpy.array(meshData.getEdgeArray())
+        self.polygonIndices, self.polygonLengths = map(numpy.array, meshData.getPolygonArrays())
+
+    def unpack(self):
+        # the output node only reads the arrays, so they don't have to be copied
+        return MeshData.fromArrays(self.vertices, self.edges, self.polygonIndices, self.polygonLengths)
+
+class ObjectReference:
+    __slots__ = ("name", )
+
+    def __init__(self, object):
+        self.name = object.name
+
+    def unpack(self):
+        return bpy.data.objects.get(self.name)
+
+packedTypes = (PackedMatrix, PackedVectorList, PackedNumberList, PackedMeshData, ObjectReference)
+
+def pack(value):
+    valueType = type(value)
+    if value is None or valueType in (bool, int, float, str): return value
+    if valueType is Matrix: return PackedMatrix(value)
+    if valueType in (Vector, Euler, Quaternion): return value.copy()
+    if valueType is MeshData: return PackedMeshData(value)
+    if isinstance(value, bpy.types.Object): return ObjectReference(value)
+    if valueType is list:
+        if len(value) > 0:
+            firstType = type(value[0])
+            if firstType is Vector and all(type(v) is Vector and len(v) == 3 for v in value):
+                return PackedVectorList(value)
+            if firstType in (int, float) and all(type(v) is firstType for v in value):
+                try: return PackedNumberList(value, "d" if firstType is float else "l")
+                except OverflowError: pass
+        return [pack(element) for element in value]
+    if isinstance(value, bpy.types.ID): raise UnpackableValue()
+    if hasattr(value, "copy"): return value.copy()
+    raise UnpackableValue()
+
+def unpack(value):
+    if isinstance(value, packedTypes): return value.unpack()
+    if type(value) is list: return [unpack(element) for element in value]
+    # splines and bmeshes can be changed by the output node
+    if hasattr(value, "copy"): return value.copy()
+    return value
+
+def estimatePackedSize(value):
+    if isinstance(value, PackedMeshData):
+        return (value.vertices.nbytes + value.edges.nbytes +
+                value.polygonIndices.nbytes + value.polygonLengths.nbytes)
+    if isinstance(value, (PackedMatrix, PackedVectorList, PackedNumberList)):
+        return sys.getsizeof(value.data)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimatePackedSize(element) for element in value)
+    return sys.getsizeof(value)
@@ -1,7 +1,8 @@
 import traceback
 from .. import problems
 from collections import defaultdict
-from . cache import clearExecutionCache
+from .. preferences import getPreferences
+from . cache import clearExecutionCache, clearResultCache, clearIndexCache, setResultCacheBudget
 from . measurements import resetMeasurements
 from . main_execution_unit import MainExecutionUnit
 from . loop_execution_unit import LoopExecutionUnit
@@ -26,6 +27,8 @@ def createExecutionUnits(nodeByID):
 
 def reset():
     resetMeasurements()
+    clearResultCache()
+    clearIndexCache()
     _mainUnitsByNodeTree.clear()
     _subprogramUnitsByIdentifier.clear()
 
@@ -54,6 +57,7 @@ def setupExecutionUnits():
         if len(getAnimationNodeTrees()) == 0: return
         if not problems.canExecute(): return
 
+        setResultCacheBudget(getPreferences().resultCacheSize)
         for unit in getExecutionUnits():
             unit.setup()
 
@@ -5,6 +5,7 @@ class TimeInfoNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_TimeInfoNode"
     bl_label = "Time Info"
     searchTags = ["Frame"]
+    isTimeDependent = True
 
     def create(self):
         self.newInput("Scene", "Scene", "scene", hide = True)
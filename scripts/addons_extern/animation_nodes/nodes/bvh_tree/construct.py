@@ -5,6 +5,7 @@ from ... events import isRendering
 from mathutils.bvhtree import BVHTree
 from ... tree_info import keepNodeState
 from ... base_types.node import AnimationNode
+from ... execution.cache import getCachedIndex
 
 sourceTypeItems = [
     ("MESH_DATA", "Mesh Data", "", "", 0),
@@ -50,12 +51,18 @@ class ConstructBVHTreeNode(bpy.types.Node, AnimationNode):
         return ["mathutils"]
 
     def fromMeshData(self, vectorList, polygonsIndices, epsilon):
-        maxPolygonIndex = max(itertools.chain([-1], *polygonsIndices))
-        minPolygonIndex = min(itertools.chain([0], *polygonsIndices))
-
-        if 0 <= minPolygonIndex and maxPolygonIndex < len(vectorList):
-            return BVHTree.FromPolygons(vectorList, polygonsIndices, epsilon = epsilon)
-        return BVHTree.FromPolygons([], [], epsilon = epsilon)
+        # the tree is reused in other frames while the inputs don't change
+        return getCachedIndex(self.identifier, (vectorList, polygonsIndices, epsilon),
+                              lambda: createFromMeshData(vectorList, polygonsIndices, epsilon))
 
     def fromBMesh(self, bm, epsilon):
         return BVHTree.FromBMesh(bm, epsilon = epsilon)
+
+
+def createFromMeshData(vectorList, polygonsIndices, epsilon):
+    maxPolygonIndex = max(itertools.chain([-1], *polygonsIndices))
+    minPolygonIndex = min(itertools.chain([0], *polygonsIndices))
+
+    if 0 <= minPolygonIndex and maxPolygonIndex < len(vectorList):
+        return BVHTree.FromPolygons(vectorList, polygonsIndices, epsilon = epsilon)
+    return BVHTree.FromPolygons([], [], epsilon = epsilon)
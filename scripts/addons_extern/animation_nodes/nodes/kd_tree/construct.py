@@ -1,5 +1,7 @@
 import bpy
+from mathutils.kdtree import KDTree
 from ... base_types.node import AnimationNode
+from ... execution.cache import getCachedIndex
 
 class ConstructKDTreeNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ConstructKDTreeNode"
@@ -10,9 +12,16 @@ class ConstructKDTreeNode(bpy.types.Node, AnimationNode):
         self.newOutput("KDTree", "KDTree", "kdTree")
 
     def getExecutionCode(self):
-        yield "kdTree = mathutils.kdtree.KDTree(len(vectorList))"
-        yield "for i, vector in enumerate(vectorList): kdTree.insert(vector, i)"
-        yield "kdTree.balance()"
+        yield "kdTree = self.getKDTree(vectorList)"
 
-    def getUsedModules(self):
-        return ["mathutils"]
+    def getKDTree(self, vectorList):
+        # the tree is reused in other frames while the vectors don't change
+        return getCachedIndex(self.identifier, vectorList, lambda: createKDTree(vectorList))
+
+
+def createKDTree(vectorList):
+    kdTree = KDTree(len(vectorList))
+    for i, vector in enumerate(vectorList):
+        kdTree.insert(vector, i)
+    kdTree.balance()
+    return kdTree
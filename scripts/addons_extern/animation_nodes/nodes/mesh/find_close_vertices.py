@@ -1,6 +1,8 @@
 import bpy
-from mathutils.kdtree import KDTree
+import numpy
 from ... base_types.node import AnimationNode
+from ... algorithms.point_grid import PointGrid
+from ... execution.cache import getCachedIndex
 
 class FindCloseVerticesNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FindCloseVerticesNode"
@@ -18,22 +20,11 @@ class FindCloseVerticesNode(bpy.types.Node, AnimationNode):
         minDistance = max(0, minDistance)
         maxDistance = max(minDistance, maxDistance)
 
-        verticesAmount = len(vertices)
-        kdTree = KDTree(verticesAmount)
-        for i, vector in enumerate(vertices):
-            kdTree.insert(vector, i)
-        kdTree.balance()
-        edges = []
-        for searchIndex in range(min(verticesAmount, clusters)):
-            added = 0
-            for (vector, foundIndex, distance) in kdTree.find_range(vertices[searchIndex], maxDistance):
-                if searchIndex != foundIndex and distance > minDistance:
-                    if added >= connections: break
-                    if foundIndex > searchIndex:
-                        edge = (searchIndex, foundIndex)
-                    else:
-                        edge = (foundIndex, searchIndex)
-                    edges.append(edge)
-                    added += 1
+        searchAmount = min(len(vertices), clusters)
+        if searchAmount <= 0 or connections <= 0: return []
 
-        return list(set(edges))
+        # every vertex is connected to its nearest vertices first
+        grid = getCachedIndex(self.identifier, (vertices, maxDistance),
+                              lambda: PointGrid(vertices, maxDistance))
+        edges = grid.findPairsInRange(numpy.arange(searchAmount), minDistance, maxDistance, connections)
+        return list(map(tuple, edges.tolist()))
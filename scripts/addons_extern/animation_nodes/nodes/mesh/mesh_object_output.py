@@ -1,5 +1,6 @@
 import bpy
 import bmesh
+import numpy
 import itertools
 from bpy.props import *
 from ... utils.layout import writeText
@@ -18,6 +19,7 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
     searchTags = [("Set Mesh Data on Object (old)", {"meshDataType" : repr("MESH_DATA")}),
                   ("Set BMesh on Object (old)", {"meshDataType" : repr("BMESH")}),
                   ("Set Vertices on Object (old)", {"meshDataType" : repr("VERTICES")}) ]
+    isPlaybackOutput = True
 
     def meshDataTypeChanged(self, context):
         self.recreateInputs()
@@ -107,7 +109,7 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
             checkIndices = self.checkIndices)
 
         if isValidData:
-            mesh.from_pydata(meshData.vertices, meshData.edges, meshData.polygons)
+            setMeshDataFromArrays(mesh, meshData)
         else:
             self.errorMessage = "The mesh data is invalid"
 
@@ -133,3 +135,28 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
         allMaterialIndices = list(itertools.islice(itertools.cycle(materialIndices), len(mesh.polygons)))
         mesh.polygons.foreach_set("material_index", allMaterialIndices)
         mesh.polygons[0].material_index = materialIndices[0]
+
+def setMeshDataFromArrays(mesh, meshData):
+    '''
+    Faster than mesh.from_pydata because the arrays are passed to
+    foreach_set as they are instead of iterating over every element
+    '''
+    vertices = meshData.getVertexArray()
+    edges = meshData.getEdgeArray()
+    polygonIndices, polygonLengths = meshData.getPolygonArrays()
+
+    mesh.vertices.add(len(vertices))
+    mesh.edges.add(len(edges))
+    mesh.loops.add(len(polygonIndices))
+    mesh.polygons.add(len(polygonLengths))
+
+    mesh.vertices.foreach_set("co", vertices.ravel())
+    mesh.edges.foreach_set("vertices", edges.ravel())
+    mesh.loops.foreach_set("vertex_index", polygonIndices)
+
+    loopStarts = numpy.zeros(len(polygonLengths), dtype = numpy.int32)
+    loopStarts[1:] = numpy.cumsum(polygonLengths[:-1])
+    mesh.polygons.foreach_set("loop_start", loopStarts)
+    mesh.polygons.foreach_set("loop_total", polygonLengths)
+
+    mesh.update(calc_edges = len(edges) > 0 or len(polygonLengths) > 0)
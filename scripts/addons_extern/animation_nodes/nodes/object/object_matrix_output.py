@@ -11,6 +11,7 @@ outputItems = [	("BASIS", "Basis", "", "NONE", 0),
 class ObjectMatrixOutputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectMatrixOutputNode"
     bl_label = "Object Matrix Output"
+    isPlaybackOutput = True
 
     outputType = EnumProperty(items = outputItems, update = executionCodeChanged, default = "WORLD")
 
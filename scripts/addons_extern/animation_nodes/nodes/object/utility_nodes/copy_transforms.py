@@ -10,6 +10,7 @@ frameTypeItems = [
 class CopyTransformsNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CopyTransformsNode"
     bl_label = "Copy Transforms"
+    isTimeDependent = True
     bl_width_default = 170
 
     def useCurrentTransformsChanged(self, context):
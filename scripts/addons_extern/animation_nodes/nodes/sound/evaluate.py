@@ -14,6 +14,7 @@ soundTypeItems = [
 class EvaluateSoundNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_EvaluateSoundNode"
     bl_label = "Evaluate Sound"
+    isTimeDependent = True
     bl_width_default = 185
 
     def frameTypeChanged(self, context):
@@ -6,17 +6,17 @@ from ... base_types.node import AnimationNode
 from ... utils.blender_ui import getDpiFactor
 from ... utils.enum_items import enumItemsFromDicts
 from ... utils.nodes import newNodeAtCursor, invokeTranslation
+from ... execution.cache import getSubprogramCacheKey, getCachedResult, setCachedResult, removeCachedResults
 from ... tree_info import getSubprogramNetworks, getNodeByIdentifier, getNetworkByIdentifier
 
 cacheTypeItems = [
     ("DISABLED", "Disabled", ""),
     ("ONE_TIME", "One Time", "Cache the result one time and output it always."),
     ("FRAME_BASED", "Once per Frame", ""),
-    ("INPUT_BASED", "Once per Input", "")]
+    ("INPUT_BASED", "Once per Input", "Cache the result for every set of input values, shared by all nodes invoking the subprogram")]
 
 oneTimeCache = {}
 frameBasedCache = {}
-inputBasedCache = {}
 
 class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_InvokeSubprogramNode"
@@ -79,8 +79,8 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
             try: return True, frameBasedCache[self.identifier][str(self.nodeTree.scene.frame_current)]
             except: pass
         if self.cacheType == "INPUT_BASED":
-            try: return True, inputBasedCache[self.subprogramIdentifier][self.getArgsHash(args)]
-            except: pass
+            result = getCachedResult(getSubprogramCacheKey(self.subprogramIdentifier, args))
+            if result is not None: return True, result[0]
 
         return False, None
 
@@ -90,11 +90,8 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
             if self.identifier not in frameBasedCache: frameBasedCache[self.identifier] = {}
             frameBasedCache[self.identifier][str(self.nodeTree.scene.frame_current)] = data
         elif self.cacheType == "INPUT_BASED":
-            if self.subprogramIdentifier not in inputBasedCache: inputBasedCache[self.subprogramIdentifier] = {}
-            inputBasedCache[self.subprogramIdentifier][self.getArgsHash(args)] = data
-
-    def getArgsHash(self, *args):
-        return tuple(hash(arg) for arg in args)
+            # wrapped because subprograms without outputs return None
+            setCachedResult(getSubprogramCacheKey(self.subprogramIdentifier, args), (data, ))
 
 
     def draw(self, layout):
@@ -132,7 +129,6 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
             col = layout.column(align = True)
             col.label("This caching method is not available:")
             if not self.isOutputStorable: col.label("  - The output is not storable")
-            if not self.isInputComparable: col.label("  - The input is not comparable")
         self.invokeFunction(layout, "clearCache", text = "Clear Cache")
 
 
@@ -152,7 +148,7 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
     def clearCache(self):
         oneTimeCache.pop(self.identifier, None)
         frameBasedCache.pop(self.identifier, None)
-        inputBasedCache.pop(self.subprogramIdentifier, None)
+        removeCachedResults(self.subprogramIdentifier)
 
 
     @property
@@ -168,7 +164,8 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
     def canCache(self):
         if self.cacheType == "DISABLED": return True
         if self.cacheType in ("ONE_TIME", "FRAME_BASED") and self.isOutputStorable: return True
-        if self.cacheType == "INPUT_BASED" and self.isInputComparable and self.isOutputStorable: return True
+        # inputs are hashed by value, executions with unhashable values are not cached
+        if self.cacheType == "INPUT_BASED" and self.isOutputStorable: return True
         return False
 
 
@@ -0,0 +1,101 @@
+import bpy
+from bpy.props import *
+from .. problems import canExecute
+from .. utils.blender_ui import redrawAll
+from .. execution.playback_buffer import startBaking, bakeFrame, finishBaking
+from .. execution.units import setupExecutionUnits, finishExecutionUnits
+
+class BakePlaybackBuffer(bpy.types.Operator):
+    bl_idname = "an.bake_playback_buffer"
+    bl_label = "Bake Playback Buffer"
+    bl_description = "Execute the node tree for every frame in the range and store the inputs of the output nodes for playback (Esc to cancel)"
+
+    name = StringProperty(name = "Node Tree Name")
+
+    @classmethod
+    def poll(cls, context):
+        return canExecute()
+
+    def invoke(self, context, event):
+        if not self.start(): return {"CANCELLED"}
+
+        windowManager = context.window_manager
+        windowManager.progress_begin(self.startFrame, self.endFrame)
+        windowManager.modal_handler_add(self)
+        self.timer = windowManager.event_timer_add(0.001, context.window)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        if event.type in {"RIGHTMOUSE", "ESC"}:
+            return self.finish(cancelled = True)
+
+        if event.type == "TIMER":
+            try: self.bakeNextFrame()
+            except:
+                self.finish(cancelled = True)
+                raise
+            context.window_manager.progress_update(self.frame)
+            if self.frame > self.endFrame:
+                return self.finish()
+
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        # without invoke, e.g. from scripts, all frames are baked at once
+        if not self.start(): return {"CANCELLED"}
+        self.timer = None
+        try:
+            while self.frame <= self.endFrame:
+                self.bakeNextFrame()
+        finally:
+            result = self.finish(cancelled = self.frame <= self.endFrame)
+        return result
+
+    def start(self):
+        nodeTree = bpy.data.node_groups.get(self.name)
+        if getattr(nodeTree, "bl_idname", "") != "an_AnimationNodeTree":
+            self.report({"ERROR"}, "{} is no animation nodes tree".format(repr(self.name)))
+            return False
+
+        settings = nodeTree.autoExecution
+        self.startFrame, self.endFrame = settings.playbackStartFrame, settings.playbackEndFrame
+        if self.endFrame < self.startFrame:
+            self.report({"ERROR"}, "The end frame is before the start frame")
+            return False
+
+        # enabling it clears the old buffer
+        settings.usePlaybackBuffer = True
+
+        self.scene = nodeTree.scene
+        self.oldFrame = self.scene.frame_current
+        self.frame = self.startFrame
+        startBaking(nodeTree, self.startFrame, self.endFrame)
+        return True
+
+    def bakeNextFrame(self):
+        nodeTree = bpy.data.node_groups[self.name]
+
+        def executeFrame(frame):
+            self.scene.frame_set(frame)
+            setupExecutionUnits()
+            nodeTree._execute()
+            finishExecutionUnits()
+
+        bakeFrame(self.frame, executeFrame)
+        self.frame += 1
+
+    def finish(self, cancelled = False):
+        windowManager = bpy.context.window_manager
+        if self.timer is not None:
+            windowManager.event_timer_remove(self.timer)
+            windowManager.progress_end()
+
+        buffer = finishBaking()
+        self.scene.frame_set(self.oldFrame)
+
+        if cancelled:
+            self.report({"INFO"}, "Baking cancelled after {} frames".format(len(buffer)))
+        elif len(buffer.unsupportedNodes) > 0:
+            self.report({"WARNING"}, "These nodes are not replayed: " + ", ".join(sorted(buffer.unsupportedNodes)))
+        redrawAll()
+        return {"CANCELLED"} if cancelled else {"FINISHED"}
@@ -108,6 +108,14 @@ class AddonPreferences(bpy.types.AddonPreferences):
     sceneUpdateAfterAutoExecution = BoolProperty(
         name = "Scene Update After Auto Execution", default = True)
 
+    def resultCacheSizeChanged(self, context):
+        from . execution.cache import setResultCacheBudget
+        setResultCacheBudget(self.resultCacheSize)
+
+    resultCacheSize = IntProperty(name = "Result Cache Size (MB)", default = 256, min = 1,
+        description = "Memory budget for cached node and subprogram results",
+        update = resultCacheSizeChanged)
+
     nodeColors = PointerProperty(type = NodeColorProperties)
     developer = PointerProperty(type = DeveloperProperties)
     executionCode = PointerProperty(type = ExecutionCodeProperties)
@@ -124,6 +132,11 @@ class AddonPreferences(bpy.types.AddonPreferences):
         subcol.prop(self, "redrawAllAfterAutoExecution", text = "Redraw All")
         subcol.prop(self, "sceneUpdateAfterAutoExecution", text = "Scene Update")
 
+        subcol = col.column(align = True)
+        subcol.label("Result Cache:")
+        subcol.prop(self, "resultCacheSize", text = "Size (MB)")
+        subcol.operator("an.clear_result_cache", text = "Clear")
+
         col = row.column()
 
         subcol = col.column(align = True)
@@ -1,5 +1,6 @@
 from .. utils.timing import measureTime
 from .. utils.handlers import eventHandler
+from .. utils.operators import makeOperator
 from .. utils.nodes import idToNode, idToSocket, createNodeByIdDict
 
 
@@ -7,9 +8,10 @@ def __setup():
     from . forest_data import ForestData
     from . networks import NodeNetworks
 
-    global _needsUpdate, _forestData, _networks
+    global _needsUpdate, _changedTreeNames, _forestData, _networks
 
     _needsUpdate = True
+    _changedTreeNames = None
     _forestData = ForestData()
     _networks = NodeNetworks()
 
@@ -19,7 +21,7 @@ def updateAndRetryOnException(function):
         try:
             output = function(*args, **kwargs)
         except:
-            update()
+            rebuild()
             output = function(*args, **kwargs)
         return output
     return wrapper
@@ -28,26 +30,45 @@ def updateAndRetryOnException(function):
 # Public API
 ##################################
 
-@eventHandler("FILE_LOAD_POST")
 @measureTime
 def update():
-    _forestData.update()
+    global _needsUpdate, _changedTreeNames
+
+    # only the trees that reported a change are read again
+    _forestData.update(_changedTreeNames)
 
     nodeByID = createNodeByIdDict()
     _networks.update(_forestData, nodeByID)
     nodeByID.clear()
 
-    global _needsUpdate
     _needsUpdate = False
+    _changedTreeNames = set()
+
+@eventHandler("FILE_LOAD_POST")
+def rebuild():
+    _forestData._reset()
+    treeChanged()
+    update()
 
 def updateIfNecessary():
     if _needsUpdate:
         update()
 
-def treeChanged():
-    global _needsUpdate
+def treeChanged(treeName = None):
+    '''
+    treeName: name of the changed tree, None when it is unknown
+    '''
+    global _needsUpdate, _changedTreeNames
     _needsUpdate = True
+    if treeName is None: _changedTreeNames = None
+    elif _changedTreeNames is not None: _changedTreeNames.add(treeName)
+
+def getForestDataStatistics():
+    return dict(_forestData.statistics)
 
+@makeOperator("an.reset_forest_data_statistics", "Reset Tree Analysis Statistics", redraw = True)
+def resetForestDataStatistics():
+    _forestData.resetStatistics()
 
 
 def getNodeByIdentifier(identifier):
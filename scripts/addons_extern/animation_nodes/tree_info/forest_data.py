@@ -1,16 +1,25 @@
+import time
 from itertools import chain
-from collections import defaultdict
-from .. utils.nodes import getAnimationNodeTrees, iterAnimationNodesSockets
+from collections import defaultdict, OrderedDict
+from .. utils.nodes import getAnimationNodeTrees
 
 class ForestData:
+    '''
+    Nodes, sockets and links of all animation node trees.
+    Only trees that might have changed are read again and the differences
+    to the last state are applied. The links skipping reroutes are only
+    derived again for the sockets that are affected by the changes.
+    '''
     def __init__(self):
         self._reset()
+        self.resetStatistics()
 
     def _reset(self):
         self.nodes = []
         self.nodesByType = defaultdict(set)
         self.typeByNode = defaultdict(None)
         self.nodeByIdentifier = defaultdict(None)
+        self.nodesByIdentifier = defaultdict(set)
         self.animationNodes = set()
 
         self.socketsByNode = defaultdict(lambda: ([], []))
@@ -22,87 +31,229 @@ class ForestData:
         self.dataTypeBySocket = dict()
         self.socketsThatNeedUpdate = set()
 
-    def update(self):
-        self._reset()
-        self.insertNodeTrees()
         self.rerouteNodes = self.nodesByType["NodeReroute"]
-        self.findLinksSkippingReroutes()
-
-    def insertNodeTrees(self):
-        for tree in getAnimationNodeTrees():
-            self.insertNodes(tree.nodes, tree.name)
-            self.insertLinks(tree.links, tree.name)
-
-    def insertNodes(self, nodes, treeName):
-        appendNode = self.nodes.append
-        nodesByType = self.nodesByType
-        typeByNode = self.typeByNode
-        nodeByIdentifier = self.nodeByIdentifier
-        socketsByNode = self.socketsByNode
-        reroutePairs = self.reroutePairs
-        dataTypeBySocket = self.dataTypeBySocket
-        animationNodes = self.animationNodes
-        socketsThatNeedUpdate = self.socketsThatNeedUpdate
 
-        for node in nodes:
-            nodeID = (treeName, node.name)
+        # last known state of every tree
+        self.nodeRecordsByTree = {}
+        self.linksByTree = {}
 
-            inputIDs = [(nodeID, False, socket.identifier) for socket in node.inputs]
-            outputIDs = [(nodeID, True, socket.identifier) for socket in node.outputs]
+    def resetStatistics(self):
+        self.statistics = {
+            "updates" : 0,
+            "checkedTrees" : 0,
+            "skippedTrees" : 0,
+            "insertedNodes" : 0,
+            "removedNodes" : 0,
+            "changedLinks" : 0,
+            "rederivedSockets" : 0,
+            "fullTreeDerivations" : 0,
+            "lastTime" : 0.0,
+            "totalTime" : 0.0 }
 
-            appendNode(nodeID)
-            typeByNode[nodeID] = node.bl_idname
-            nodesByType[node.bl_idname].add(nodeID)
+    def update(self, changedTrees = None):
+        '''
+        changedTrees: names of the trees that might have changed,
+        all trees are checked when it is None
+        '''
+        start = time.clock()
 
-            socketsByNode[nodeID] = (inputIDs, outputIDs)
+        trees = getAnimationNodeTrees()
+        treeNames = {tree.name for tree in trees}
+        for treeName in list(self.nodeRecordsByTree):
+            if treeName not in treeNames:
+                self.removeTree(treeName)
 
-            if node.bl_idname == "NodeReroute":
-                reroutePairs[inputIDs[0]] = outputIDs[0]
-                reroutePairs[outputIDs[0]] = inputIDs[0]
-            elif node.bl_idname == "NodeFrame":
-                pass
+        statistics = self.statistics
+        for tree in trees:
+            if changedTrees is None or tree.name in changedTrees or tree.name not in self.nodeRecordsByTree:
+                self.updateTree(tree)
+                statistics["checkedTrees"] += 1
             else:
-                if node.bl_idname != "NodeUndefined":
-                    animationNodes.add(nodeID)
-                    nodeByIdentifier[node.identifier] = nodeID
+                statistics["skippedTrees"] += 1
 
-                chainedSockets = chain(node.inputs, node.outputs)
-                chainedSocketIDs = chain(inputIDs, outputIDs)
-                for socket, socketID in zip(chainedSockets, chainedSocketIDs):
-                        dataTypeBySocket[socketID] = socket.dataType
-                        if hasattr(socket, "updateProperty"):
-                            socketsThatNeedUpdate.add(socketID)
+        self.nodes = list(chain.from_iterable(self.nodeRecordsByTree[tree.name] for tree in trees))
 
+        duration = time.clock() - start
+        statistics["updates"] += 1
+        statistics["lastTime"] = duration
+        statistics["totalTime"] += duration
 
-    def insertLinks(self, links, treeName):
-        linkedSocketsWithReroutes = self.linkedSocketsWithReroutes
+    def updateTree(self, tree):
+        treeName = tree.name
+        oldRecords = self.nodeRecordsByTree.get(treeName, OrderedDict())
+        oldLinks = self.linksByTree.get(treeName, set())
 
-        for link in links:
-            originSocket = link.from_socket
-            targetSocket = link.to_socket
-            originID = ((treeName, link.from_node.name), originSocket.is_output, originSocket.identifier)
-            targetID = ((treeName, link.to_node.name), targetSocket.is_output, targetSocket.identifier)
+        newRecords = OrderedDict()
+        for node in tree.nodes:
+            newRecords[(treeName, node.name)] = getNodeRecord(node)
+        newLinks = set(iterLinkIDs(tree.links, treeName))
 
-            linkedSocketsWithReroutes[originID].append(targetID)
-            linkedSocketsWithReroutes[targetID].append(originID)
+        removedNodes = [nodeID for nodeID, record in oldRecords.items() if newRecords.get(nodeID) != record]
+        insertedNodes = [nodeID for nodeID, record in newRecords.items() if oldRecords.get(nodeID) != record]
+        removedLinks = oldLinks - newLinks
+        insertedLinks = newLinks - oldLinks
 
-    def findLinksSkippingReroutes(self):
+        self.nodeRecordsByTree[treeName] = newRecords
+        self.linksByTree[treeName] = newLinks
+        if not (removedNodes or insertedNodes or removedLinks or insertedLinks): return
+
+        # reroutes can change the links between many sockets
         rerouteNodes = self.rerouteNodes
-        nonRerouteNodes = filter(lambda n: n not in rerouteNodes, self.nodes)
+        changedReroutes = any(oldRecords[nodeID][0] == "NodeReroute" for nodeID in removedNodes) or \
+                          any(newRecords[nodeID][0] == "NodeReroute" for nodeID in insertedNodes)
+
+        affectedSockets = set()
+        removedSockets = set()
+        for nodeID in removedNodes:
+            sockets = self.socketsByNode[nodeID]
+            removedSockets.update(chain(*sockets))
+            self.removeNode(nodeID, oldRecords[nodeID])
+        for link in removedLinks:
+            self.removeLink(link)
+        for nodeID in insertedNodes:
+            self.insertNode(nodeID, newRecords[nodeID])
+            affectedSockets.update(chain(*self.socketsByNode[nodeID]))
+        for link in insertedLinks:
+            self.insertLink(link)
+
+        for originID, targetID in chain(removedLinks, insertedLinks):
+            if originID[0] in rerouteNodes or targetID[0] in rerouteNodes:
+                changedReroutes = True
+            affectedSockets.add(originID)
+            affectedSockets.add(targetID)
+
+        statistics = self.statistics
+        statistics["insertedNodes"] += len(insertedNodes)
+        statistics["removedNodes"] += len(removedNodes)
+        statistics["changedLinks"] += len(removedLinks) + len(insertedLinks)
+
+        # sockets of changed nodes are in both sets
+        linkedSockets = self.linkedSockets
+        for socketID in removedSockets:
+            affectedSockets.update(linkedSockets.pop(socketID, ()))
+        affectedSockets.difference_update(removedSockets - set(chain.from_iterable(
+            chain(*self.socketsByNode[nodeID]) for nodeID in insertedNodes)))
+
+        if changedReroutes:
+            self.findLinksSkippingReroutes(newRecords)
+            statistics["fullTreeDerivations"] += 1
+        else:
+            self.updateLinksSkippingReroutes(affectedSockets)
+
+    def removeTree(self, treeName):
+        records = self.nodeRecordsByTree.pop(treeName)
+        links = self.linksByTree.pop(treeName)
+        for nodeID, record in records.items():
+            for socketID in chain(*self.socketsByNode[nodeID]):
+                self.linkedSockets.pop(socketID, None)
+            self.removeNode(nodeID, record)
+        for link in links:
+            self.removeLink(link)
+        self.statistics["removedNodes"] += len(records)
+
+    def insertNode(self, nodeID, record):
+        idName, identifier, inputs, outputs = record
+
+        inputIDs = [(nodeID, False, socket[0]) for socket in inputs]
+        outputIDs = [(nodeID, True, socket[0]) for socket in outputs]
+
+        self.typeByNode[nodeID] = idName
+        self.nodesByType[idName].add(nodeID)
+        self.socketsByNode[nodeID] = (inputIDs, outputIDs)
+
+        if idName == "NodeReroute":
+            self.reroutePairs[inputIDs[0]] = outputIDs[0]
+            self.reroutePairs[outputIDs[0]] = inputIDs[0]
+        elif idName == "NodeFrame":
+            pass
+        else:
+            if idName != "NodeUndefined":
+                self.animationNodes.add(nodeID)
+                self.nodeByIdentifier[identifier] = nodeID
+                self.nodesByIdentifier[identifier].add(nodeID)
+
+            dataTypeBySocket = self.dataTypeBySocket
+            socketsThatNeedUpdate = self.socketsThatNeedUpdate
+            for socketID, (_, dataType, needsUpdate) in zip(chain(inputIDs, outputIDs), chain(inputs, outputs)):
+                dataTypeBySocket[socketID] = dataType
+                if needsUpdate:
+                    socketsThatNeedUpdate.add(socketID)
 
+    def removeNode(self, nodeID, record):
+        idName, identifier, inputs, outputs = record
+        inputIDs, outputIDs = self.socketsByNode.pop(nodeID)
+
+        self.typeByNode.pop(nodeID, None)
+        self.nodesByType[idName].discard(nodeID)
+
+        if idName == "NodeReroute":
+            self.reroutePairs.pop(inputIDs[0], None)
+            self.reroutePairs.pop(outputIDs[0], None)
+        elif idName != "NodeFrame":
+            if idName != "NodeUndefined":
+                self.animationNodes.discard(nodeID)
+                nodeIDs = self.nodesByIdentifier[identifier]
+                nodeIDs.discard(nodeID)
+                if len(nodeIDs) == 0:
+                    del self.nodesByIdentifier[identifier]
+                    self.nodeByIdentifier.pop(identifier, None)
+                elif self.nodeByIdentifier.get(identifier) == nodeID:
+                    self.nodeByIdentifier[identifier] = next(iter(nodeIDs))
+
+            for socketID in chain(inputIDs, outputIDs):
+                self.dataTypeBySocket.pop(socketID, None)
+                self.socketsThatNeedUpdate.discard(socketID)
+
+    def insertLink(self, link):
+        originID, targetID = link
+        self.linkedSocketsWithReroutes[originID].append(targetID)
+        self.linkedSocketsWithReroutes[targetID].append(originID)
+
+    def removeLink(self, link):
+        originID, targetID = link
+        for socketID, linkedID in ((originID, targetID), (targetID, originID)):
+            linkedIDs = self.linkedSocketsWithReroutes.get(socketID)
+            if linkedIDs is None: continue
+            if linkedID in linkedIDs: linkedIDs.remove(linkedID)
+            if len(linkedIDs) == 0: del self.linkedSocketsWithReroutes[socketID]
+
+    def findLinksSkippingReroutes(self, nodeRecords):
+        rerouteNodes = self.rerouteNodes
         socketsByNode = self.socketsByNode
         linkedSockets = self.linkedSockets
         iterLinkedSockets = self.iterLinkedSockets
-        chainIterable = chain.from_iterable
 
-        for node in nonRerouteNodes:
-            for socket in chainIterable(socketsByNode[node]):
+        amount = 0
+        for node in nodeRecords:
+            if node in rerouteNodes: continue
+            for socket in chain.from_iterable(socketsByNode[node]):
                 linkedSockets[socket] = tuple(iterLinkedSockets(socket, set()))
+                amount += 1
+        self.statistics["rederivedSockets"] += amount
+
+    def updateLinksSkippingReroutes(self, affectedSockets):
+        '''
+        Without changed reroutes only the affected sockets and the
+        sockets they were or are linked with can have different links
+        '''
+        rerouteNodes = self.rerouteNodes
+        linkedSockets = self.linkedSockets
+        iterLinkedSockets = self.iterLinkedSockets
+
+        socketsToUpdate = set()
+        for socket in affectedSockets:
+            if socket[0] in rerouteNodes: continue
+            socketsToUpdate.add(socket)
+            socketsToUpdate.update(linkedSockets.get(socket, ()))
+
+        for socket in socketsToUpdate:
+            linkedSockets[socket] = tuple(iterLinkedSockets(socket, set()))
+        self.statistics["rederivedSockets"] += len(socketsToUpdate)
 
     def iterLinkedSockets(self, socket, visitedReroutes):
         """If the socket is linked to a reroute node the function
         tries to find the next socket that is linked to the reroute"""
-        for socket in self.linkedSocketsWithReroutes[socket]:
+        for socket in self.linkedSocketsWithReroutes.get(socket, ()):
             if socket[0] in self.rerouteNodes:
                 if socket[0] in visitedReroutes:
                     print("Reroute recursion detected in: {}".format(repr(socket[0][0])))
@@ -111,3 +262,27 @@ class ForestData:
                 yield from self.iterLinkedSockets(self.reroutePairs[socket], visitedReroutes)
             else:
                 yield socket
+
+
+def getNodeRecord(node):
+    '''
+    Everything the forest data stores about a node,
+    nodes with equal records do not have to be inserted again
+    '''
+    idName = node.bl_idname
+    if idName in ("NodeReroute", "NodeFrame", "NodeUndefined"):
+        inputs = tuple((socket.identifier, getattr(socket, "dataType", None), False) for socket in node.inputs)
+        outputs = tuple((socket.identifier, getattr(socket, "dataType", None), False) for socket in node.outputs)
+        return (idName, None, inputs, outputs)
+
+    inputs = tuple((socket.identifier, socket.dataType, hasattr(socket, "updateProperty")) for socket in node.inputs)
+    outputs = tuple((socket.identifier, socket.dataType, hasattr(socket, "updateProperty")) for socket in node.outputs)
+    return (idName, node.identifier, inputs, outputs)
+
+def iterLinkIDs(links, treeName):
+    for link in links:
+        originSocket = link.from_socket
+        targetSocket = link.to_socket
+        originID = ((treeName, link.from_node.name), originSocket.is_output, originSocket.identifier)
+        targetID = ((treeName, link.to_node.name), targetSocket.is_output, targetSocket.identifier)
+        yield (originID, targetID)
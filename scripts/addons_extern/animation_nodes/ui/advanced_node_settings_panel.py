@@ -14,4 +14,5 @@ class NodeSettingsPanel(bpy.types.Panel):
 
     def draw(self, context):
         node = bpy.context.active_node
+        node.drawResultCacheSettings(self.layout)
         node.drawAdvanced(self.layout)
@@ -24,6 +24,7 @@ class FloatingAdvancedPanel(bpy.types.Operator):
     def draw(self, context):
         try:
             node = getNodeByIdentifier(self.nodeIdentifier)
+            node.drawResultCacheSettings(self.layout)
             node.drawAdvanced(self.layout)
         except:
             self.layout.label("An error occured during drawing of the advanced panel", icon = "INFO")
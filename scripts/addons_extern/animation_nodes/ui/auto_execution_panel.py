@@ -2,6 +2,7 @@ import bpy
 from .. problems import canExecute
 from .. utils.layout import writeText
 from .. utils.blender_ui import isViewportRendering
+from .. execution.playback_buffer import getPlaybackBuffer
 
 class AutoExecutionPanel(bpy.types.Panel):
     bl_idname = "an_auto_execution_panel"
@@ -46,6 +47,8 @@ class AutoExecutionPanel(bpy.types.Panel):
 
         layout.prop(autoExecution, "minTimeDifference", slider = True)
 
+        self.drawPlaybackBuffer(layout, tree)
+
         col = layout.column()
         col.operator("an.add_auto_execution_trigger", text = "New Trigger", icon = "ZOOMIN")
         customTriggers = autoExecution.customTriggers
@@ -54,6 +57,33 @@ class AutoExecutionPanel(bpy.types.Panel):
         for i, monitorPropertyTrigger in enumerate(customTriggers.monitorPropertyTriggers):
             monitorPropertyTrigger.draw(subcol, i)
 
+    def drawPlaybackBuffer(self, layout, tree):
+        autoExecution = tree.autoExecution
+        box = layout.box()
+        box.prop(autoExecution, "usePlaybackBuffer")
+
+        col = box.column(align = True)
+        col.active = autoExecution.usePlaybackBuffer
+        row = col.row(align = True)
+        row.prop(autoExecution, "playbackStartFrame")
+        row.prop(autoExecution, "playbackEndFrame")
+        row = col.row(align = True)
+        props = row.operator("an.bake_playback_buffer", icon = "REC")
+        props.name = tree.name
+        props = row.operator("an.clear_playback_buffer", icon = "X", text = "")
+        props.treeName = tree.name
+
+        buffer = getPlaybackBuffer(tree)
+        if buffer is None:
+            col.label("Not baked")
+        elif not buffer.isValid:
+            col.label("Outdated, bake again", icon = "ERROR")
+        else:
+            col.label("{} frames, {:.2f} MB".format(len(buffer), buffer.size / 2**20))
+            if len(buffer.unsupportedNodes) > 0:
+                writeText(col, "Not replayed: " + ", ".join(sorted(buffer.unsupportedNodes)),
+                    width = 25, icon = "INFO")
+
     @classmethod
     def getTree(cls):
         return bpy.context.space_data.edit_tree
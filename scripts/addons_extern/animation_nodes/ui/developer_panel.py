@@ -1,5 +1,7 @@
 import bpy
 from .. preferences import getPreferences
+from .. tree_info import getForestDataStatistics
+from .. utils.timing import prettyTime
 from .. operators.output_execution_code import setupTextEditorCallback, executionCodeTextBlockName
 
 
@@ -32,6 +34,11 @@ class DeveloperPanel(bpy.types.Panel):
 
         layout.separator()
 
+        col = layout.column()
+        self.drawTreeAnalysisStatistics(col)
+
+        layout.separator()
+
         layout.prop(preferences.nodeColors, "nodeColorMode", text = "Color Mode")
 
     def drawExecutionCodeSettings(self, layout, preferences):
@@ -52,6 +59,23 @@ class DeveloperPanel(bpy.types.Panel):
         subrow.active = executionCodeTextBlockName in bpy.data.texts
         subrow.operator("an.select_area", text = "", icon = "ZOOM_SELECTED").callback = setupTextEditorCallback
 
+    def drawTreeAnalysisStatistics(self, layout):
+        statistics = getForestDataStatistics()
+
+        row = layout.row(align = True)
+        row.label("Tree Analysis:")
+        row.operator("an.reset_forest_data_statistics", text = "", icon = "RECOVER_LAST")
+
+        col = layout.column(align = True)
+        col.label("Last: {}, Total: {} ({} updates)".format(
+            prettyTime(statistics["lastTime"]), prettyTime(statistics["totalTime"]), statistics["updates"]))
+        col.label("Trees: {} checked, {} skipped".format(
+            statistics["checkedTrees"], statistics["skippedTrees"]))
+        col.label("Nodes: {} inserted, {} removed".format(
+            statistics["insertedNodes"], statistics["removedNodes"]))
+        col.label("Links: {} changed, {} sockets derived".format(
+            statistics["changedLinks"], statistics["rederivedSockets"]))
+
     def drawProfilingSettings(self, layout, preferences):
         profiling = preferences.developer.profiling
 
@@ -1,4 +1,11 @@
+import struct
 import hashlib
+from array import array
+from itertools import chain
+from mathutils import Vector, Matrix, Quaternion, Euler, Color
+
+try: import numpy
+except: numpy = None
 
 # Changing this function can result in broken files
 def hashStringToNumber(text):
@@ -6,3 +13,65 @@ def hashStringToNumber(text):
     md5.update(text.encode("utf-8"))
     number = int(int(md5.hexdigest(), 16) % 1e8)
     return number
+
+
+class UnhashableValue(Exception):
+    pass
+
+def hashValues(values):
+    '''
+    Digest of the content of values (nested lists/tuples of numbers,
+    strings, mathutils types and numpy arrays).
+    Returns None when a value can not be hashed by content
+    (e.g. Blender data blocks whose data can change in place).
+    '''
+    md5 = hashlib.md5()
+    try: feedValue(md5, values)
+    except UnhashableValue: return None
+    return md5.digest()
+
+floatVectorTypes = (Vector, Quaternion, Euler, Color)
+typeTags = {Vector : b"V", Quaternion : b"Q", Euler : b"E", Color : b"C", Matrix : b"M"}
+
+def feedValue(md5, value):
+    valueType = type(value)
+    if value is None: md5.update(b"N")
+    elif valueType is bool: md5.update(b"T" if value else b"F")
+    elif valueType is int: md5.update(b"i" + str(value).encode())
+    elif valueType is float: md5.update(b"f" + struct.pack("d", value))
+    elif valueType is str:
+        data = value.encode("utf-8")
+        md5.update(b"s" + struct.pack("Q", len(data)) + data)
+    elif valueType in (list, tuple): feedSequence(md5, value)
+    elif valueType in floatVectorTypes:
+        md5.update(typeTags[valueType] + struct.pack("B", len(value)) + array("d", value).tobytes())
+    elif valueType is Matrix:
+        md5.update(b"M" + struct.pack("BB", len(value.row), len(value.col)))
+        md5.update(array("d", chain.from_iterable(value)).tobytes())
+    elif numpy is not None and valueType is numpy.ndarray:
+        if value.dtype.hasobject: raise UnhashableValue()
+        md5.update(b"A" + value.dtype.str.encode() + str(value.shape).encode())
+        md5.update(numpy.ascontiguousarray(value).tobytes())
+    else:
+        raise UnhashableValue()
+
+def feedSequence(md5, sequence):
+    md5.update(b"l" + struct.pack("Q", len(sequence)))
+    if len(sequence) == 0: return
+
+    # fast paths for homogeneous lists of numbers and vectors
+    firstType = type(sequence[0])
+    if firstType in (float, int) and all(type(v) is firstType for v in sequence):
+        try: data = array("d" if firstType is float else "q", sequence).tobytes()
+        except OverflowError:
+            for value in sequence: feedValue(md5, value)
+        else: md5.update((b"d" if firstType is float else b"q") + data)
+    elif firstType in floatVectorTypes and all(type(v) is firstType for v in sequence):
+        size = len(sequence[0])
+        if all(len(v) == size for v in sequence):
+            md5.update(typeTags[firstType] + struct.pack("B", size))
+            md5.update(array("d", chain.from_iterable(sequence)).tobytes())
+        else:
+            for value in sequence: feedValue(md5, value)
+    else:
+        for value in sequence: feedValue(md5, value)
@@ -34,11 +34,12 @@ from bpy.types import Operator, Panel, UIList
 from bpy.props import FloatVectorProperty, IntProperty, StringProperty, FloatProperty, BoolProperty, CollectionProperty
 from bpy_extras.object_utils import AddObjectHelper, object_data_add
 from mathutils import Vector
-import bmesh
 import sys
 from cubesurfer import mciso
 import time
 import ctypes
+import hashlib
+import numpy
 from mathutils.geometry import barycentric_transform as barycentric
 
 tmframe = 'init'
@@ -152,6 +153,120 @@ def isosurf_frame(context):
         isosurf(context)
 
 
+def particle_time(scene):
+    # the frame map is used by Molecular to subdivide frames into substeps
+    frame = scene.frame_current + scene.frame_subframe
+    return frame * scene.render.frame_map_old / scene.render.frame_map_new
+
+
+def read_particles(psys, sizem, time):
+    """Location, size and props (velocity, IsoLocalUV, speed) of the alive particles as arrays"""
+    particles = psys.particles
+    psysize = len(particles)
+    loc = numpy.zeros(psysize * 3, dtype=numpy.float32)
+    vel = numpy.zeros(psysize * 3, dtype=numpy.float32)
+    size = numpy.zeros(psysize, dtype=numpy.float32)
+    birth = numpy.zeros(psysize, dtype=numpy.float32)
+    die = numpy.zeros(psysize, dtype=numpy.float32)
+    particles.foreach_get('location', loc)
+    particles.foreach_get('velocity', vel)
+    particles.foreach_get('size', size)
+    # alive_state can't be read with foreach_get, it follows from the birth and death times
+    particles.foreach_get('birth_time', birth)
+    particles.foreach_get('die_time', die)
+    alive = (birth <= time) & (die > time)
+
+    loc = loc.reshape(-1, 3)[alive]
+    vel = vel.reshape(-1, 3)[alive]
+    uv = numpy.array(psys.settings['IsoLocalUV'].to_list(), dtype=numpy.float32).reshape(-1, 3)[alive]
+    speed = numpy.sqrt((vel * vel).sum(axis=1)).reshape(-1, 1)
+    return loc, size[alive] * sizem, numpy.hstack((vel, uv, speed))
+
+
+def weld_vertices(verts, dist):
+    """Index of the merged vertex for every vertex and the indices of the kept vertices.
+    Vertices are merged when they are in the same cell of a grid with dist spacing."""
+    if dist > 0:
+        cells = numpy.floor(verts / dist).astype(numpy.int64)
+    else:
+        cells = verts
+    order = numpy.lexsort((cells[:, 2], cells[:, 1], cells[:, 0]))
+    sortedcells = cells[order]
+    isfirst = numpy.ones(len(verts), dtype=bool)
+    isfirst[1:] = (sortedcells[1:] != sortedcells[:-1]).any(axis=1)
+    merged = numpy.empty(len(verts), dtype=numpy.int64)
+    merged[order] = numpy.cumsum(isfirst) - 1
+    return merged, order[isfirst]
+
+
+def build_isosurf_mesh(obsurf, a, b, res, preview):
+    """Replaces the mesh of obsurf with the triangles of mciso, with
+    the IsoSurf_mb shape key and the IsoSurf_prop uv layers"""
+    corners = numpy.array(a, dtype=numpy.float32).reshape(-1, 3)
+    props = numpy.array(b, dtype=numpy.float32).reshape(-1, 7)
+
+    if preview:
+        merged = numpy.arange(len(corners))
+        kept = merged
+    else:
+        merged, kept = weld_vertices(corners, res / 100)
+    # triangles that collapsed when their corners were merged
+    tris = merged.reshape(-1, 3)
+    valid = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 2] != tris[:, 0])
+    tris = tris[valid]
+    loopprops = props.reshape(-1, 3, 7)[valid].reshape(-1, 7)
+
+    verts = corners[kept]
+    shape = verts + props[kept, 0:3]
+    nverts = len(verts)
+    ntris = len(tris)
+
+    oldmesh = obsurf.data
+    mesurf = bpy.data.meshes.new(oldmesh.name)
+    for mat in oldmesh.materials:
+        mesurf.materials.append(mat)
+    mesurf.vertices.add(nverts)
+    mesurf.vertices.foreach_set('co', verts.ravel())
+    mesurf.loops.add(ntris * 3)
+    mesurf.loops.foreach_set('vertex_index', tris.ravel().astype(numpy.int32))
+    mesurf.polygons.add(ntris)
+    mesurf.polygons.foreach_set('loop_start', numpy.arange(0, ntris * 3, 3, dtype=numpy.int32))
+    mesurf.polygons.foreach_set('loop_total', numpy.full(ntris, 3, dtype=numpy.int32))
+    mesurf.polygons.foreach_set('use_smooth', numpy.ones(ntris, dtype=bool))
+
+    for name, columns in (("IsoSurf_prop1", slice(3, 5)), ("IsoSurf_prop2", slice(5, 7))):
+        mesurf.uv_textures.new(name)
+        mesurf.uv_layers[name].data.foreach_set('uv', numpy.ascontiguousarray(loopprops[:, columns]).ravel())
+
+    mesurf.update(calc_edges=True)
+
+    obsurf.data = mesurf
+    if oldmesh.users == 0:
+        oldname = oldmesh.name
+        bpy.data.meshes.remove(oldmesh)
+        mesurf.name = oldname
+
+    obsurf.shape_key_add(name="Base", from_mix=False)
+    keyblock = obsurf.shape_key_add(name="IsoSurf_mb", from_mix=False)
+    keyblock.data.foreach_set('co', shape.ravel())
+    return mesurf
+
+
+def key_isosurf_motion(scn, mesurf):
+    mesurf.shape_keys.animation_data_clear()
+    mesurf.shape_keys.key_blocks['IsoSurf_mb'].slider_min = -1.0
+    mesurf.shape_keys.key_blocks['IsoSurf_mb'].value = 1 / scn.render.fps
+    mesurf.shape_keys.key_blocks['IsoSurf_mb'].keyframe_insert("value", frame=scn.frame_current + 1)
+    mesurf.shape_keys.key_blocks['IsoSurf_mb'].value = -1 / scn.render.fps
+    mesurf.shape_keys.key_blocks['IsoSurf_mb'].keyframe_insert("value", frame=scn.frame_current - 1)
+    mesurf.shape_keys.key_blocks['IsoSurf_mb'].value = 0.0
+    mesurf.shape_keys.key_blocks['IsoSurf_mb'].keyframe_insert("value", frame=scn.frame_current)
+
+
+# digest of the inputs of the last mesh built for every surface object
+surf_cache = {}
+
+
 def isosurf(context):
     global tmframe
     scn = bpy.context.scene
@@ -175,30 +290,16 @@ def isosurf(context):
                             SurfList[i].append((item.obj, item.psys, item.sizem))
             i += 1
 
+    ptime = particle_time(scn)
     for surfobj in SurfList:
         print("Start calculation of isosurface...frame:", bpy.context.scene.frame_current)
-        # print(bpy.context)
-        # print(bpy.context.screen)
-        # print(bpy.context.window)
-        # print(bpy.context.area)
-        # print(surfobj)
         obsurf, mesurf, res, preview = surfobj[0]
-        # print(obsurf,mesurf)
-        # print(surfobj[1][0])
         ploc = []
         psize = []
         pprop = []
         stime = time.clock()
-        xmin = 10000000000
-        xmax = -10000000000
-        ymin = 10000000000
-        ymax = -10000000000
-        zmin = 10000000000
-        zmax = -10000000000
         for obj, psys, sizem in surfobj[1:]:
-            # print(obj,psys,res,sizem)
             psys = bpy.data.objects[obj].particle_systems[psys]
-            # print(psys)
             if 'IsoLocalUV' not in psys.settings:
                 print("  WARNING: no IsoLocalUV prop found")
                 psys.settings['IsoLocalUV'] = [0, 0, 0]
@@ -206,116 +307,41 @@ def isosurf(context):
             if len(psys.settings['IsoLocalUV']) != (psysize * 3):
                 print("  WARNING: not same numbers of props found")
                 psys.settings['IsoLocalUV'] = [0] * psysize * 3
-            for par in range(psysize):
-                if psys.particles[par].alive_state == 'ALIVE':
-                    size = psys.particles[par].size * sizem
-                    ploc.append(psys.particles[par].location)
-                    uvx = psys.settings['IsoLocalUV'][par * 3]  # psys.particles[par].location.x -
-                    uvy = psys.settings['IsoLocalUV'][par * 3 + 1]  # psys.particles[par].location.y -
-                    uvz = psys.settings['IsoLocalUV'][par * 3 + 2]  # psys.particles[par].location.z -
-                    pprop.append(psys.particles[par].velocity.to_tuple() + (uvx, uvy, uvz, psys.particles[par].velocity.magnitude))
-                    psize.append(size)
-
-        if len(psize) > 0:
+            loc, size, prop = read_particles(psys, sizem, ptime)
+            ploc.append(loc)
+            psize.append(size)
+            pprop.append(prop)
+
+        if sum(len(size) for size in psize) > 0:
+            ploc = numpy.concatenate(ploc)
+            psize = numpy.concatenate(psize)
+            pprop = numpy.concatenate(pprop)
 
             isolevel = 0.0
             print('  pack particles:', time.clock() - stime, 'sec')
 
-            a, b = mciso.isosurface(res, isolevel, ploc, psize, pprop)
+            digest = hashlib.md5()
+            for data in (ploc, psize, pprop, numpy.array((res, isolevel, preview), dtype=numpy.float64)):
+                digest.update(data.tobytes())
+            digest = digest.hexdigest()
+            if scn.IsoSurf_context == "RENDER" and surf_cache.get(obsurf.name) == digest and mesurf.shape_keys:
+                # already built, e.g. by the frame change before the render of this frame
+                key_isosurf_motion(scn, mesurf)
+                scn.update()
+                print('  unchanged, reused the mesh:', time.clock() - stime, 'sec')
+                continue
+
+            a, b = mciso.isosurface(res, isolevel, ploc.tolist(), psize.tolist(), pprop.tolist())
             print('  mciso:', time.clock() - stime, 'sec')
             stime = time.clock()
 
-            # if "myMesh" in bpy.data.meshes:
-            #mesurf = bpy.data.meshes['myMesh']
-            # else:
-            #mesurf = bpy.data.meshes.new('myMesh')
-
-            # if "myObject" in bpy.data.objects:
-            #obsurf = bpy.data.objects['myObject']
-            # else:
-            #obsurf = bpy.data.objects.new('myObject', mesurf)
-            # bpy.context.scene.objects.link(obsurf)
-
-            #obsurf.show_name = True
-
-            bm = bmesh.new()
-            #print("   new bmesh")
-            bm.from_mesh(mesurf)
-            #print("   from_mesh bmesh")
-            bm.clear()
-            #print("   clear bmesh")
-            sh = bm.verts.layers.shape.new("IsoSurf_mb")
-            #print("   shape bmesh")
-            p1 = bm.loops.layers.uv.new("IsoSurf_prop1")
-            #print("   uv1 bmesh")
-            p2 = bm.loops.layers.uv.new("IsoSurf_prop2")
-            #print("   uv2 bmesh")
-            lprop = 3 * 7
-            for i in range(int(len(a) / 9)):
-
-                vertex1 = bm.verts.new((a[i * 9], a[i * 9 + 1], a[i * 9 + 2]))
-                vertex2 = bm.verts.new((a[i * 9 + 3], a[i * 9 + 4], a[i * 9 + 5]))
-                vertex3 = bm.verts.new((a[i * 9 + 6], a[i * 9 + 7], a[i * 9 + 8]))
-
-                vertex1[sh] = (a[i * 9] + b[i * lprop], a[i * 9 + 1] + b[i * lprop + 1], a[i * 9 + 2] + b[i * lprop + 2])
-                vertex2[sh] = (a[i * 9 + 3] + b[i * lprop + 7], a[i * 9 + 4] + b[i * lprop + 8], a[i * 9 + 5] + b[i * lprop + 9])
-                vertex3[sh] = (a[i * 9 + 6] + b[i * lprop + 14], a[i * 9 + 7] + b[i * lprop + 15], a[i * 9 + 8] + b[i * lprop + 16])
-
-                # TEST---
-                #vertex1[sh] = (a[i*9]-b[i*lprop+3],a[i*9+1]-b[i*lprop+4],a[i*9+2]-b[i*lprop+5])
-                #vertex2[sh] = (a[i*9+3]-b[i*lprop+9], a[i*9+4]-b[i*lprop+10],a[i*9+5]-b[i*lprop+11])
-                #vertex3[sh] = (a[i*9+6]-b[i*lprop+15],a[i*9+7]-b[i*lprop+16],a[i*9+8]-b[i*lprop+17])
-
-                #vertex1[sh] = (b[i*lprop+3],b[i*lprop+4],b[i*lprop+5])
-                #vertex2[sh] = (b[i*lprop+9], b[i*lprop+10],b[i*lprop+11])
-                #vertex3[sh] = (b[i*lprop+15],b[i*lprop+16],b[i*lprop+17])
-                #---TEST
-                bm.faces.new((vertex1, vertex2, vertex3)).smooth = True
-
-            # print(preview)
-            # bm.verts.ensure_lookup_table()
-            #print("   verts lookuptable bmesh")
-            bm.faces.ensure_lookup_table()
-            #print("   face lookuptable bmesh")
-            for i in range(int(len(a) / 9)):
-                bm.faces[i].loops[0][p1].uv = (b[i * lprop + 3], b[i * lprop + 4])
-                bm.faces[i].loops[0][p2].uv = (b[i * lprop + 5], b[i * lprop + 6])
-                bm.faces[i].loops[1][p1].uv = (b[i * lprop + 10], b[i * lprop + 11])
-                bm.faces[i].loops[1][p2].uv = (b[i * lprop + 12], b[i * lprop + 13])
-                bm.faces[i].loops[2][p1].uv = (b[i * lprop + 17], b[i * lprop + 18])
-                bm.faces[i].loops[2][p2].uv = (b[i * lprop + 19], b[i * lprop + 20])
-                #bm.faces[i].loops[0][p1].uv = (a[i*9]-b[i*lprop+3],a[i*9+1]-b[i*lprop+4])
-                #bm.faces[i].loops[0][p2].uv = (a[i*9+2]-b[i*lprop+5],0.0)
-                #bm.faces[i].loops[1][p1].uv = (a[i*9+3]-b[i*lprop+9], a[i*9+4]-b[i*lprop+10])
-                #bm.faces[i].loops[1][p2].uv = (a[i*9+5]-b[i*lprop+11], 0.0)
-                #bm.faces[i].loops[2][p1].uv = (a[i*9+6]-b[i*lprop+15],a[i*9+7]-b[i*lprop+16])
-                #bm.faces[i].loops[2][p2].uv = (a[i*9+8]-b[i*lprop+17],0.0)
-            #print("   uv loop bmesh")
-            if preview == False:
-                # print(preview)
-                bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=res / 100)
-            #print("   remove doubles bmesh")
-            bm.to_mesh(mesurf)
-            #print("   to_mesh bmesh")
-            bm.free()
-            #print("   free bmesh")
+            mesurf = build_isosurf_mesh(obsurf, a, b, res, preview)
             scn.update()
-            #print("   scene update")
-            mesurf.shape_keys.animation_data_clear()
-            mesurf.shape_keys.key_blocks['IsoSurf_mb'].slider_min = -1.0
-            mesurf.shape_keys.key_blocks['IsoSurf_mb'].value = 1 / scn.render.fps
-            mesurf.shape_keys.key_blocks['IsoSurf_mb'].keyframe_insert("value", frame=scn.frame_current + 1)
-            mesurf.shape_keys.key_blocks['IsoSurf_mb'].value = -1 / scn.render.fps
-            mesurf.shape_keys.key_blocks['IsoSurf_mb'].keyframe_insert("value", frame=scn.frame_current - 1)
-            mesurf.shape_keys.key_blocks['IsoSurf_mb'].value = 0.0
-            mesurf.shape_keys.key_blocks['IsoSurf_mb'].keyframe_insert("value", frame=scn.frame_current)
+            key_isosurf_motion(scn, mesurf)
             scn.update()
+            surf_cache[obsurf.name] = digest
 
-            print('  Bmesh:', time.clock() - stime, 'sec')
-
-            # bpy.context.scene.objects.unlink(obsurf)
-            # bpy.data.objects.remove(obsurf)
-            # bpy.data.meshes.remove(mesurf)
+            print('  Mesh:', time.clock() - stime, 'sec')
 
 
 class OBJECT_UL_IsoSurf(UIList):
@@ -420,11 +420,9 @@ class DEM(Raster):
         self.subStats = None
 
     def getStats(self, subBox=False):
-        pixels = self.img.pixels[:]  # [r,g,b,a,r,g,b,a,r,g,b,a, .... ] counting from bottom to up and left to right
         nbBands = self.img.channels
-        # Get Numpy array
-        a = np.array(pixels)  # [r,g,b,a,r,g,b,a,r,g,b,a, .... ]
-        a = a.reshape(len(a) / nbBands, nbBands)  # [[r,g,b,a],[r,g,b,a],[r,g,b,a],[r,g,b,a]...]
+        # Get Numpy array, float32 like Blender stores pixels
+        a = np.array(self.img.pixels[:], dtype=np.float32)  # [r,g,b,a,r,g,b,a,r,g,b,a, .... ] counting from bottom to up and left to right
         a = a.reshape(self.size.y, self.size.x, nbBands)  # In numpy fist dimension is lines (y) and second dimension is cols (x)
         a = np.flipud(a)  # now origine is topleft
         a = a.swapaxes(0, 1)  # now first axis is x, second y
@@ -634,6 +632,38 @@ class DEM_GDAL():
                 outBand.WriteArray(data, j - startx, i - starty)
         data = None
 
+    def readWindow(self, subBoxPx, decimation=1, tileRows=256):
+        """
+        Read the pixels of subBoxPx (bounds included, rows counting from top) at a decimation level:
+        only about every decimation'th pixel in both directions is kept
+        Reading is done by strips of tileRows output rows and GDAL uses the raster overviews
+        if there are some, so neither the whole raster nor the whole window at full resolution is loaded
+        Return elevations array (rows, cols) and the pixel positions of its columns and rows
+        """
+        xmin, ymin = subBoxPx.xmin, subBoxPx.ymin
+        width = min(subBoxPx.xmax, self.size.x - 1) - xmin + 1
+        height = min(subBoxPx.ymax, self.size.y - 1) - ymin + 1
+        nbCols = max(2, int(math.ceil(width / decimation)))
+        nbRows = max(2, int(math.ceil(height / decimation)))
+        z = np.empty((nbRows, nbCols), dtype=np.float32)
+        # Loop over strips
+        for r0 in range(0, nbRows, tileRows):
+            r1 = min(r0 + tileRows, nbRows)
+            y0 = ymin + int(round(r0 * height / nbRows))
+            y1 = ymin + int(round(r1 * height / nbRows))
+            data = self.band1.ReadAsArray(xmin, y0, width, max(y1 - y0, 1), nbCols, r1 - r0)
+            z[r0:r1] = data
+        data = None
+        # noData pixels get the lowest elevation
+        if self.noData is not None:
+            noData = (z == self.noData)
+            if noData.any() and not noData.all():
+                z[noData] = z[~noData].min()
+        # position of the output pixels centers in source pixels
+        colsPx = xmin + (np.arange(nbCols) + 0.5) * width / nbCols - 0.5
+        rowsPx = ymin + (np.arange(nbRows) + 0.5) * height / nbRows - 0.5
+        return z, colsPx, rowsPx
+
     def getOutDS(self, outFile, dx, dy):
         # Output datasource
         if os.path.isfile(outFile):
@@ -822,6 +852,46 @@ def overlap(bb1, bb2):
     return test_overlap(bb1.xmin, bb1.xmax, bb2.xmin, bb2.xmax) and test_overlap(bb1.ymin, bb1.ymax, bb2.ymin, bb2.ymax)
 
 
+def buildGridMesh(name, x, y, z):
+    """
+    Create a mesh of quads from 2d arrays (rows, cols) of vertices coords
+    Rows are expected to be ordered from top to bottom
+    """
+    nbRows, nbCols = z.shape
+    nbVerts = nbRows * nbCols
+    # vertices
+    verts = np.empty((nbVerts, 3), dtype=np.float32)
+    verts[:, 0] = x.ravel()
+    verts[:, 1] = y.ravel()
+    verts[:, 2] = z.ravel()
+    # faces : upper left, bottom left, bottom right, upper right (anticlockwise --> face up)
+    idx = np.arange(nbVerts, dtype=np.int32).reshape(nbRows, nbCols)
+    quads = np.empty((nbRows - 1, nbCols - 1, 4), dtype=np.int32)
+    quads[:, :, 0] = idx[:-1, :-1]
+    quads[:, :, 1] = idx[1:, :-1]
+    quads[:, :, 2] = idx[1:, 1:]
+    quads[:, :, 3] = idx[:-1, 1:]
+    quads = quads.ravel()
+    nbFaces = len(quads) // 4
+    #
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(nbVerts)
+    mesh.vertices.foreach_set('co', verts.ravel())
+    mesh.loops.add(len(quads))
+    mesh.loops.foreach_set('vertex_index', quads)
+    mesh.polygons.add(nbFaces)
+    mesh.polygons.foreach_set('loop_start', np.arange(0, len(quads), 4, dtype=np.int32))
+    mesh.polygons.foreach_set('loop_total', np.full(nbFaces, 4, dtype=np.int32))
+    # uv map over the whole grid
+    mesh.uv_textures.new('demUVmap')
+    u = idx % nbCols / (nbCols - 1)
+    v = 1 - idx // nbCols / (nbRows - 1)
+    uvs = np.column_stack((u.ravel()[quads], v.ravel()[quads])).astype(np.float32)
+    mesh.uv_layers.active.data.foreach_set('uv', uvs.ravel())
+    mesh.update(calc_edges=True)
+    return mesh
+
+
 def geoRastUVmap(obj, mesh, uvTxtLayer, img, wf, dx, dy):
     uvTxtLayer.active = True
     # Assign image texture for every face
@@ -914,7 +984,8 @@ class IMPORT_GEORAST(Operator, ImportHelper):
                            ('bkg', 'As background', "Place raster as background image"),
                            ('mesh', 'On mesh', "UV map raster on an existing mesh"),
                            ('DEM', 'As DEM', "Use DEM raster GRID to wrap an existing mesh"),
-                           ('DEM_GDAL', 'As DEM (GDAL)', "Use DEM raster GRID to wrap an existing mesh")]
+                           ('DEM_GDAL', 'As DEM (GDAL)', "Use DEM raster GRID to wrap an existing mesh"),
+                           ('DEM_GRID', 'As DEM grid (GDAL)', "Build a terrain mesh from the DEM raster GRID")]
     )
     # Use previous object translation
     useGeoref = BoolProperty(
@@ -976,6 +1047,25 @@ class IMPORT_GEORAST(Operator, ImportHelper):
         description="Will convert decimal degrees coordinates to meters",
         default=False
     )
+    # DEM grid options
+    clipToObject = BoolProperty(
+        name="Clip to object",
+        description="Only read the part of the DEM under the selected object",
+        default=False
+    )
+    decimation = IntProperty(
+        name="Decimation",
+        description="Keep one DEM pixel over n in both directions",
+        min=1,
+        default=1
+    )
+    lodLevels = IntProperty(
+        name="LOD levels",
+        description="Number of meshes to build, each one with a decimation twice as big as the previous one",
+        min=1,
+        max=8,
+        default=1
+    )
     # GDAL mode (python binding or binary)
     gdalMode = EnumProperty(
         name="GDAL mode",
@@ -1060,6 +1150,25 @@ class IMPORT_GEORAST(Operator, ImportHelper):
                 self.useGeoref = False
                 layout.label("There isn't georef mesh to apply DEM on")
 
+        if self.importMode == 'DEM_GRID':
+            if not GDAL_PY:
+                layout.label("GDAL Python binding isn't installed")
+            else:
+                if isGeoref:
+                    layout.prop(self, 'useGeoref')
+                else:
+                    self.useGeoref = False
+                if isGeoref and len(self.objectsLst) > 0:
+                    layout.prop(self, 'clipToObject')
+                    if self.clipToObject:
+                        layout.prop(self, 'objectsLst')
+                else:
+                    self.clipToObject = False
+                layout.prop(self, 'decimation')
+                layout.prop(self, 'lodLevels')
+                layout.prop(self, 'angCoords')
+                layout.prop(self, 'adjust3dView')
+
     def err(self, msg):
         self.report({'ERROR'}, msg)
         print(msg)
@@ -1083,6 +1192,8 @@ class IMPORT_GEORAST(Operator, ImportHelper):
                 return self.err("GDAL Python binding isn't installed")
             if self.gdalMode == "BINARY" and not GDAL_BIN:
                 return self.err("GDAL binaries executables aren't installed")
+        if self.importMode == 'DEM_GRID' and not GDAL_PY:
+            return self.err("GDAL Python binding isn't installed")
         # Get bbox of reference plane
         if self.importMode in ['mesh', 'DEM', 'DEM_GDAL']:  # on mesh or as DEM
             if not self.useGeoref:
@@ -1259,6 +1370,48 @@ class IMPORT_GEORAST(Operator, ImportHelper):
             if not dsp:
                 return self.err("Alt min == alt max, unable to config displacer")
 
+        ######################################
+        if self.importMode == 'DEM_GRID':
+            ds = DEM_GDAL(filePath, self.angCoords)
+            wf = ds.wf
+            # decimal degrees to meters
+            k = ellpsGRS80.perimeter / 360 if self.angCoords else 1
+            # Get georef data
+            if self.useGeoref:
+                dx, dy = scn["Georef X"], scn["Georef Y"]
+            else:
+                dx, dy = wf.center.x * k, wf.center.y * k
+                scn["Georef X"], scn["Georef Y"] = dx, dy
+            # Window to read
+            if self.clipToObject:
+                obj = scn.objects[int(self.objectsLst)]
+                bb = getBBox(obj)
+                loc = obj.location
+                subBox = bbox(bb.xmin + dx + loc.x, bb.xmax + dx + loc.x, bb.ymin + dy + loc.y, bb.ymax + dy + loc.y)
+                if self.angCoords:
+                    subBox = subBox.meters2degrees()
+                if not overlap(wf.bbox, subBox):
+                    return self.err("Non overlap data")
+                subBoxPx = getSubBoxPx(wf, subBox, reverseY=False)
+            else:
+                subBoxPx = bbox(0, ds.size.x - 1, 0, ds.size.y - 1)
+            # Build one mesh per level of detail, the coarsest is displayed
+            lodObjs = []
+            for level in range(self.lodLevels):
+                decimation = self.decimation * 2**level
+                z, colsPx, rowsPx = ds.readWindow(subBoxPx, decimation)
+                pts = wf.geoFromPx(colsPx[np.newaxis, :], rowsPx[:, np.newaxis])
+                x = np.broadcast_arrays(pts.x, z)[0] * k - dx
+                y = np.broadcast_arrays(pts.y, z)[0] * k - dy
+                objName = name if self.lodLevels == 1 else name + '_LOD' + str(level)
+                mesh = buildGridMesh(objName, x, y, z)
+                z = x = y = None
+                obj = placeObj(mesh, objName)
+                lodObjs.append(obj)
+            del ds
+            for lodObj in lodObjs[:-1]:
+                lodObj.hide = True
+
         ######################################
         # Adjust 3d view
         if self.adjust3dView:
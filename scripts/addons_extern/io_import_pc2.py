@@ -36,19 +36,23 @@ from bpy.props import (StringProperty,
                        )
 from bpy_extras.io_utils import ImportHelper
 from struct import unpack
+import os
+import numpy
 
 
-def pc2_import(filepath, ob, scene, PREF_OFFSET=0, PREF_JUMP=1):
+def pc2_import(filepath, ob, scene, PREF_OFFSET=0, PREF_JUMP=1,
+               PREF_START=0, PREF_END=-1):
+    """Import the samples PREF_START to PREF_END (-1 for the last one)
+    of the cache, every PREF_JUMP'th of them, as shape keys of ob."""
 
     print('\n\nimporting pointcache "%s"' % filepath)
 
     bpy.ops.object.mode_set(mode='OBJECT')
 
-    file = open(filepath, 'rb')
-
-    # Read info from the file header
-    headerFormat = '<12ciiffi'
-    header = unpack(headerFormat, file.read(32))
+    with open(filepath, 'rb') as file:
+        # Read info from the file header
+        headerFormat = '<12ciiffi'
+        header = unpack(headerFormat, file.read(32))
 
     # fileVersion = header[12]
     numPoints = header[13]
@@ -59,6 +63,25 @@ def pc2_import(filepath, ob, scene, PREF_OFFSET=0, PREF_JUMP=1):
     print('\tnumPoints:%d startFrame:%d sampleRate:%d numSamples:%d'
           % (numPoints, startFrame, sampleRate, numSamples))
 
+    if numPoints != len(ob.data.vertices):
+        raise ValueError("The cache has %d points, the mesh %d vertices"
+                         % (numPoints, len(ob.data.vertices)))
+
+    # 12 is the size of 3 floats, ignore a truncated last sample
+    frameSize = numPoints * 12
+    numSamples = min(numSamples, (os.path.getsize(filepath) - 32) // max(frameSize, 1))
+    if PREF_END < 0 or PREF_END >= numSamples:
+        PREF_END = numSamples - 1
+    samples = range(max(PREF_START, 0), PREF_END + 1, max(PREF_JUMP, 1))
+    if len(samples) == 0 or numPoints == 0:
+        print('nothing to import')
+        return
+
+    # Only the pages of the samples that are read get loaded,
+    # so caches bigger than the memory can be imported
+    cache = numpy.memmap(filepath, dtype='<f4', mode='r', offset=32,
+                         shape=(numSamples, numPoints * 3))
+
     # If target object doesn't have Basis shape key, create it.
     try:
         len(ob.data.shape_keys.key_blocks)
@@ -66,45 +89,27 @@ def pc2_import(filepath, ob, scene, PREF_OFFSET=0, PREF_JUMP=1):
         ob.shape_key_add('Basis')
         ob.data.update()
 
-    scene.frame_current = startFrame + PREF_OFFSET
-
-    def updateMesh(ob, fr):
+    baseFrame = startFrame + PREF_OFFSET
+    step = samples.step
 
+    for i in samples:
         # Insert new shape key.
-        # new_shapekey =
-        ob.shape_key_add('frame_%.4d' % fr)
-        # new_shapekey_name = new_shapekey.name
-
-        index = len(ob.data.shape_keys.key_blocks) - 1
-        ob.active_shape_key_index = index
+        keyBlock = ob.shape_key_add('frame_%.4d' % i, from_mix=False)
+        keyBlock.data.foreach_set('co', numpy.ascontiguousarray(cache[i], dtype=numpy.float32))
 
-        shapeKeys = ob.data.shape_keys
-        verts = shapeKeys.key_blocks[index].data
+        # Insert keyframes, the neighbouring imported samples blend into it
+        frame = baseFrame + i
+        keyBlock.value = 0.0
+        keyBlock.keyframe_insert('value', frame=frame - step)
+        keyBlock.keyframe_insert('value', frame=frame + step)
+        keyBlock.value = 1.0
+        keyBlock.keyframe_insert('value', frame=frame)
 
-        for v in verts:
-            # 12 is the size of 3 floats
-            x, y, z = unpack('<3f', file.read(12))
-            v.co[:] = x, y, z
+    del cache
+    ob.active_shape_key_index = len(ob.data.shape_keys.key_blocks) - 1
+    ob.data.update()
 
-        # Insert keyframes
-        scene.frame_current -= 1
-        shapeKeys.key_blocks[index].value = 0.0
-        shapeKeys.key_blocks[index].keyframe_insert('value')
-
-        scene.frame_current += 1
-        shapeKeys.key_blocks[index].value = 1.0
-        shapeKeys.key_blocks[index].keyframe_insert('value')
-
-        scene.frame_current += 1
-        shapeKeys.key_blocks[index].value = 0.0
-        shapeKeys.key_blocks[index].keyframe_insert('value')
-
-        ob.data.update()
-
-    for i in range(numSamples):
-        updateMesh(ob, i)
-
-    scene.frame_current = startFrame + PREF_OFFSET
+    scene.frame_current = baseFrame
 
     print('done')
 
@@ -131,6 +136,21 @@ class Import_pc2(bpy.types.Operator, ImportHelper):
         description="Amount of frames to offset the cache animation",
         min=minframe, max=maxframe, default=0,
     )
+    sampleStart = IntProperty(
+        name="First sample",
+        description="First sample of the cache to import",
+        min=0, default=0,
+    )
+    sampleEnd = IntProperty(
+        name="Last sample",
+        description="Last sample of the cache to import, -1 for the last one",
+        min=-1, default=-1,
+    )
+    sampleStep = IntProperty(
+        name="Sample step",
+        description="Only import every n'th sample of the cache",
+        min=1, default=1,
+    )
     filename_ext = ".pc2"
     filter_glob = StringProperty(default="*.pc2", options={'HIDDEN'})
 
@@ -143,8 +163,14 @@ class Import_pc2(bpy.types.Operator, ImportHelper):
         if not self.properties.filepath:
             raise Exception("filename not set")
 
-        pc2_import(self.properties.filepath, context.active_object,
-                   context.scene, self.properties.frameOffset)
+        try:
+            pc2_import(self.properties.filepath, context.active_object,
+                       context.scene, self.properties.frameOffset,
+                       self.properties.sampleStep, self.properties.sampleStart,
+                       self.properties.sampleEnd)
+        except ValueError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
 
         return {'FINISHED'}
 
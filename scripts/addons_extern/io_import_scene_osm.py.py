@@ -25,6 +25,7 @@ from bpy_extras.io_utils import ImportHelper
 import sys
 import os
 import math
+import numpy
 
 # see conversion formulas at
 # http://en.wikipedia.org/wiki/Transverse_Mercator_projection
@@ -53,6 +54,17 @@ class TransverseMercator:
         y = self.k * self.radius * (math.atan(math.tan(lat) / math.cos(lon)) - self.latInRadians)
         return (x, y)
 
+    def fromGeographicArrays(self, lat, lon):
+        """
+        Same as fromGeographic for numpy arrays of latitudes and longitudes
+        """
+        lat = numpy.radians(lat)
+        lon = numpy.radians(lon - self.lon)
+        B = numpy.sin(lon) * numpy.cos(lat)
+        x = 0.5 * self.k * self.radius * numpy.log((1 + B) / (1 - B))
+        y = self.k * self.radius * (numpy.arctan(numpy.tan(lat) / numpy.cos(lon)) - self.latInRadians)
+        return (x, y)
+
     def toGeographic(self, x, y):
         x = x / (self.k * self.radius)
         y = y / (self.k * self.radius)
@@ -65,6 +77,7 @@ class TransverseMercator:
         return (lat, lon)
 
 import xml.etree.cElementTree as etree
+from array import array
 import inspect
 import importlib
 
@@ -91,10 +104,79 @@ def prepareHandlers(kwArgs):
     return (nodeHandlers if len(nodeHandlers) else None, wayHandlers if len(wayHandlers) else None)
 
 
+class OsmNodes:
+    """
+    Coordinates of the nodes of an .osm file in compact arrays, looked up by integer id.
+    Nodes with tags are additionally kept as entries in self.tagged.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.lats = array("d")
+        self.lons = array("d")
+        self.tagged = {}
+        self.isSorted = True
+
+    def append(self, _id, lat, lon):
+        ids = self.ids
+        if self.isSorted and ids and ids[-1] >= _id:
+            self.isSorted = False
+        ids.append(_id)
+        self.lats.append(lat)
+        self.lons.append(lon)
+
+    def finalize(self):
+        """
+        Converts the arrays to numpy arrays sorted by id
+        """
+        self.ids = toNumpy(self.ids, numpy.int64)
+        self.lats = toNumpy(self.lats, numpy.float64)
+        self.lons = toNumpy(self.lons, numpy.float64)
+        if not self.isSorted:
+            order = numpy.argsort(self.ids, kind="mergesort")
+            self.ids = self.ids[order]
+            self.lats = self.lats[order]
+            self.lons = self.lons[order]
+            self.isSorted = True
+
+    def getIndices(self, ids):
+        """
+        Returns the array indices of the given node ids and a mask of the ids that were found
+        """
+        ids = numpy.asarray(ids, dtype=numpy.int64)
+        indices = numpy.searchsorted(self.ids, ids)
+        indices[indices == len(self.ids)] = 0
+        found = (self.ids[indices] == ids) if len(self.ids) else numpy.zeros(len(ids), dtype=bool)
+        return indices, found
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, _id):
+        return bool(self.getIndices((int(_id),))[1][0])
+
+    def __getitem__(self, _id):
+        # entries as in earlier versions, for handlers that look up single nodes
+        _id = int(_id)
+        if _id in self.tagged:
+            return self.tagged[_id]
+        indices, found = self.getIndices((_id,))
+        if not found[0]:
+            raise KeyError(_id)
+        index = indices[0]
+        return dict(id=_id, lat=float(self.lats[index]), lon=float(self.lons[index]))
+
+
 class OsmParser:
+    """
+    Streams the .osm file with iterparse, so only one element is in memory at a time.
+    Node coordinates are kept in OsmNodes, ways only if a way handler accepts their tags.
+    If bbox=(minLat, minLon, maxLat, maxLon) is given, only the nodes inside of it
+    and the ways whose nodes are all inside of it are kept.
+    """
 
-    def __init__(self, filename, **kwargs):
-        self.nodes = {}
+    def __init__(self, filename, bbox=None, **kwargs):
+        self.nodes = OsmNodes()
         self.ways = {}
         self.relations = {}
         self.minLat = 90
@@ -103,76 +185,94 @@ class OsmParser:
         self.maxLon = -180
         # self.bounds contains the attributes of the bounds tag of the .osm file if available
         self.bounds = None
+        self.bbox = bbox
 
         (self.nodeHandlers, self.wayHandlers) = prepareHandlers(kwargs)
 
-        self.doc = etree.parse(filename)
-        self.osm = self.doc.getroot()
-        self.prepare()
+        self.prepare(filename)
 
-    def prepare(self):
-        allowedTags = set(("node", "way", "bounds"))
-        for e in self.osm:  # e stands for element
-            attrs = e.attrib
-            if e.tag not in allowedTags:
+    def prepare(self, filename):
+        nodes = self.nodes
+        nodeHandlers = self.nodeHandlers
+        wayHandlers = self.wayHandlers
+        if self.bbox:
+            minLat, minLon, maxLat, maxLon = self.bbox
+
+        context = etree.iterparse(filename, events=("start", "end"))
+        _, root = next(context)
+        for event, e in context:
+            if event != "end":
                 continue
-            if "action" in attrs and attrs["action"] == "delete":
+            tag = e.tag
+            if tag in ("tag", "nd", "member"):
+                # children are processed with their parent
                 continue
-            if e.tag == "node":
-                _id = attrs["id"]
-                tags = None
-                for c in e:
-                    if c.tag == "tag":
-                        if not tags:
-                            tags = {}
-                        tags[c.get("k")] = c.get("v")
+            attrs = e.attrib
+            if attrs.get("action") == "delete":
+                pass
+            elif tag == "node":
                 lat = float(attrs["lat"])
                 lon = float(attrs["lon"])
-                # calculating minLat, maxLat, minLon, maxLon
-                # commented out: only imported objects take part in the extent calculation
-                # if lat<self.minLat: self.minLat = lat
-                # elif lat>self.maxLat: self.maxLat = lat
-                # if lon<self.minLon: self.minLon = lon
-                # elif lon>self.maxLon: self.maxLon = lon
-                # creating entry
-                entry = dict(
-                    id=_id,
-                    e=e,
-                    lat=lat,
-                    lon=lon
-                )
-                if tags:
-                    entry["tags"] = tags
-                self.nodes[_id] = entry
-            elif e.tag == "way":
-                _id = attrs["id"]
-                nodes = []
-                tags = None
-                for c in e:
-                    if c.tag == "nd":
-                        nodes.append(c.get("ref"))
-                    elif c.tag == "tag":
-                        if not tags:
-                            tags = {}
-                        tags[c.get("k")] = c.get("v")
-                # ignore ways without tags
-                if tags:
-                    self.ways[_id] = dict(
-                        id=_id,
-                        e=e,
-                        nodes=nodes,
+                if not self.bbox or (minLat <= lat <= maxLat and minLon <= lon <= maxLon):
+                    _id = int(attrs["id"])
+                    nodes.append(_id, lat, lon)
+                    if nodeHandlers and len(e):
+                        tags = getTags(e)
+                        if tags:
+                            entry = dict(id=_id, lat=lat, lon=lon, tags=tags)
+                            if any(handler.condition(tags, entry) for handler in nodeHandlers):
+                                nodes.tagged[_id] = entry
+            elif tag == "way":
+                tags = getTags(e)
+                # ignore ways without tags and ways no handler is interested in
+                if tags and wayHandlers:
+                    _id = int(attrs["id"])
+                    way = dict(
+                        id=attrs["id"],
+                        nodes=array("q", (int(c.get("ref")) for c in e if c.tag == "nd")),
                         tags=tags
                     )
-            elif e.tag == "bounds":
+                    if any(handler.condition(tags, way) for handler in wayHandlers):
+                        self.ways[_id] = way
+            elif tag == "bounds":
                 self.bounds = {
                     "minLat": float(attrs["minlat"]),
                     "minLon": float(attrs["minlon"]),
                     "maxLat": float(attrs["maxlat"]),
                     "maxLon": float(attrs["maxlon"])
                 }
+            # the element isn't needed anymore
+            e.clear()
+            root.clear()
 
+        nodes.finalize()
+        self.resolveWays()
         self.calculateExtent()
 
+    def resolveWays(self):
+        """
+        Finds the array indices of the nodes of all ways at once,
+        ways with nodes that aren't available are dropped
+        """
+        ways = list(self.ways.values())
+        if not ways:
+            return
+        counts = numpy.array([len(way["nodes"]) for way in ways], dtype=numpy.int64)
+        ways = [way for way, count in zip(ways, counts) if count > 0]
+        counts = counts[counts > 0]
+        if not ways:
+            self.ways = {}
+            return
+        refs = numpy.concatenate([toNumpy(way["nodes"], numpy.int64) for way in ways])
+        indices, found = self.nodes.getIndices(refs)
+        starts = numpy.cumsum(counts) - counts
+        complete = numpy.minimum.reduceat(found, starts)
+        self.ways = {}
+        for way, start, count, isComplete in zip(ways, starts, counts, complete):
+            if isComplete:
+                way["nodeIndices"] = indices[start:start + count]
+                self.ways[int(way["id"])] = way
+
     def iterate(self, wayFunction, nodeFunction):
         nodeHandlers = self.nodeHandlers
         wayHandlers = self.wayHandlers
@@ -187,40 +287,80 @@ class OsmParser:
                             continue
 
         if nodeHandlers:
-            for _id in self.nodes:
-                node = self.nodes[_id]
+            for _id in self.nodes.tagged:
+                node = self.nodes.tagged[_id]
                 if "tags" in node:
                     for handler in nodeHandlers:
                         if handler.condition(node["tags"], node):
                             nodeFunction(node, handler)
                             continue
 
-    def parse(self, **kwargs):
+    def parse(self, batchSize=10000, **kwargs):
+        """
+        Handlers with a batchHandler method get the ways they accept in lists of batchSize ways
+        """
+        batches = {}
+
         def wayFunction(way, handler):
-            handler.handler(way, self, kwargs)
+            if hasattr(handler, "batchHandler"):
+                batch = batches.setdefault(handler, [])
+                batch.append(way)
+                if len(batch) >= batchSize:
+                    handler.batchHandler(batch, self, kwargs)
+                    batch.clear()
+            else:
+                handler.handler(way, self, kwargs)
 
         def nodeFunction(node, handler):
             handler.handler(node, self, kwargs)
         self.iterate(wayFunction, nodeFunction)
 
+        for handler, batch in batches.items():
+            if batch:
+                handler.batchHandler(batch, self, kwargs)
+
+    def getCoordinates(self, way, projection):
+        """
+        Projected coordinates of all nodes of the way as numpy arrays x and y
+        """
+        indices = way["nodeIndices"]
+        return projection.fromGeographicArrays(self.nodes.lats[indices], self.nodes.lons[indices])
+
     def calculateExtent(self):
-        def wayFunction(way, handler):
-            wayNodes = way["nodes"]
-            for node in range(len(wayNodes) - 1):  # skip the last node which is the same as the first ones
-                nodeFunction(self.nodes[wayNodes[node]])
-
-        def nodeFunction(node, handler=None):
-            lon = node["lon"]
-            lat = node["lat"]
-            if lat < self.minLat:
-                self.minLat = lat
-            elif lat > self.maxLat:
-                self.maxLat = lat
-            if lon < self.minLon:
-                self.minLon = lon
-            elif lon > self.maxLon:
-                self.maxLon = lon
-        self.iterate(wayFunction, nodeFunction)
+        indices = []
+        for way in self.ways.values():
+            # skip the last node which is the same as the first ones
+            indices.append(way["nodeIndices"][:-1])
+        nodes = self.nodes
+        if indices:
+            indices = numpy.concatenate(indices)
+        if len(indices):
+            lats = nodes.lats[indices]
+            lons = nodes.lons[indices]
+            self.minLat = min(self.minLat, lats.min())
+            self.maxLat = max(self.maxLat, lats.max())
+            self.minLon = min(self.minLon, lons.min())
+            self.maxLon = max(self.maxLon, lons.max())
+        for node in nodes.tagged.values():
+            self.minLat = min(self.minLat, node["lat"])
+            self.maxLat = max(self.maxLat, node["lat"])
+            self.minLon = min(self.minLon, node["lon"])
+            self.maxLon = max(self.maxLon, node["lon"])
+
+
+def toNumpy(values, dtype):
+    # numpy.frombuffer doesn't accept empty buffers
+    return numpy.frombuffer(values, dtype=dtype) if len(values) else numpy.zeros(0, dtype=dtype)
+
+
+def getTags(e):
+    tags = None
+    for c in e:
+        if c.tag == "tag":
+            if not tags:
+                tags = {}
+            tags[c.get("k")] = c.get("v")
+    return tags
 
 import os
 import math
@@ -243,6 +383,23 @@ def assignTags(obj, tags):
         obj[key] = tags[key]
 
 
+def createPolygonMesh(name, coords, counts):
+    """
+    Mesh with polygons of counts[i] consecutive vertices from the flat coords array
+    """
+    mesh = bpy.data.meshes.new(name)
+    numVerts = len(coords)
+    mesh.vertices.add(numVerts)
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.loops.add(numVerts)
+    mesh.loops.foreach_set("vertex_index", numpy.arange(numVerts, dtype=numpy.int32))
+    mesh.polygons.add(len(counts))
+    mesh.polygons.foreach_set("loop_start", (numpy.cumsum(counts) - counts).astype(numpy.int32))
+    mesh.polygons.foreach_set("loop_total", numpy.asarray(counts, dtype=numpy.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+
 class buildings:
 
     @staticmethod
@@ -251,15 +408,34 @@ class buildings:
 
     @staticmethod
     def handler(way, parser, kwargs):
-        wayNodes = way["nodes"]
-        numNodes = len(wayNodes) - 1  # we need to skip the last node which is the same as the first ones
-        # a polygon must have at least 3 vertices
-        if numNodes < 3:
+        buildings.batchHandler([way], parser, kwargs)
+
+    @staticmethod
+    def batchHandler(ways, parser, kwargs):
+        # we need to skip the last node which is the same as the first ones
+        # a polygon must have at least 3 vertices, ways that pass through
+        # a node twice would give a polygon with duplicate vertices
+        ways = [way for way in ways
+                if len(way["nodes"]) - 1 >= 3 and len(set(way["nodes"][:-1])) == len(way["nodes"]) - 1]
+        if not ways:
             return
 
-        if not kwargs["bm"]:  # not a single mesh
+        counts = numpy.array([len(way["nodes"]) - 1 for way in ways], dtype=numpy.int64)
+        indices = numpy.concatenate([way["nodeIndices"][:-1] for way in ways])
+        x, y = kwargs["projection"].fromGeographicArrays(parser.nodes.lats[indices], parser.nodes.lons[indices])
+        coords = numpy.column_stack((x, y, numpy.zeros(len(x)))).astype(numpy.float32)
+
+        if kwargs["bm"]:  # a single mesh
+            # all buildings of the batch are added at once
+            mesh = createPolygonMesh("osm_buildings", coords, counts)
+            kwargs["bm"].from_mesh(mesh)
+            bpy.data.meshes.remove(mesh)
+            return
+
+        thickness = kwargs["thickness"] if ("thickness" in kwargs) else 0
+        starts = numpy.cumsum(counts) - counts
+        for way, start, count in zip(ways, starts, counts):
             tags = way["tags"]
-            thickness = kwargs["thickness"] if ("thickness" in kwargs) else 0
             osmId = way["id"]
             # compose object name
             name = osmId
@@ -268,34 +444,25 @@ class buildings:
             elif "name" in tags:
                 name = tags["name"]
 
-        bm = kwargs["bm"] if kwargs["bm"] else bmesh.new()
-        verts = []
-        for node in range(numNodes):
-            node = parser.nodes[wayNodes[node]]
-            v = kwargs["projection"].fromGeographic(node["lat"], node["lon"])
-            verts.append(bm.verts.new((v[0], v[1], 0)))
-
-        bm.faces.new(verts)
-
-        if not kwargs["bm"]:
-            thickness = kwargs["thickness"] if ("thickness" in kwargs) else 0
+            mesh = createPolygonMesh(osmId, coords[start:start + count], (count,))
             # extrude
             if thickness > 0:
+                bm = bmesh.new()
+                bm.from_mesh(mesh)
                 extrudeMesh(bm, thickness)
-
-            bm.normal_update()
-
-            mesh = bpy.data.meshes.new(osmId)
-            bm.to_mesh(mesh)
+                bm.normal_update()
+                bm.to_mesh(mesh)
+                bm.free()
 
             obj = bpy.data.objects.new(name, mesh)
             bpy.context.scene.objects.link(obj)
-            bpy.context.scene.update()
 
             # final adjustments
             obj.select = True
             # assign OSM tags to the blender object
             assignTags(obj, tags)
+        # a single update for the whole batch
+        bpy.context.scene.update()
 
 
 class highways:
@@ -321,10 +488,9 @@ class highways:
         bm = kwargs["bm"] if kwargs["bm"] else bmesh.new()
         verts = []
         prevVertex = None
+        x, y = parser.getCoordinates(way, kwargs["projection"])
         for node in range(numNodes):
-            node = parser.nodes[wayNodes[node]]
-            v = kwargs["projection"].fromGeographic(node["lat"], node["lon"])
-            v = bm.verts.new((v[0], v[1], 0))
+            v = bm.verts.new((x[node], y[node], 0))
             if prevVertex:
                 bm.edges.new([prevVertex, v])
             prevVertex = v
@@ -335,7 +501,6 @@ class highways:
 
             obj = bpy.data.objects.new(name, mesh)
             bpy.context.scene.objects.link(obj)
-            bpy.context.scene.update()
 
             # final adjustments
             obj.select = True
@@ -371,15 +536,34 @@ class buildings:
 
     @staticmethod
     def handler(way, parser, kwargs):
-        wayNodes = way["nodes"]
-        numNodes = len(wayNodes) - 1  # we need to skip the last node which is the same as the first ones
-        # a polygon must have at least 3 vertices
-        if numNodes < 3:
+        buildings.batchHandler([way], parser, kwargs)
+
+    @staticmethod
+    def batchHandler(ways, parser, kwargs):
+        # we need to skip the last node which is the same as the first ones
+        # a polygon must have at least 3 vertices, ways that pass through
+        # a node twice would give a polygon with duplicate vertices
+        ways = [way for way in ways
+                if len(way["nodes"]) - 1 >= 3 and len(set(way["nodes"][:-1])) == len(way["nodes"]) - 1]
+        if not ways:
             return
 
-        if not kwargs["bm"]:  # not a single mesh
+        counts = numpy.array([len(way["nodes"]) - 1 for way in ways], dtype=numpy.int64)
+        indices = numpy.concatenate([way["nodeIndices"][:-1] for way in ways])
+        x, y = kwargs["projection"].fromGeographicArrays(parser.nodes.lats[indices], parser.nodes.lons[indices])
+        coords = numpy.column_stack((x, y, numpy.zeros(len(x)))).astype(numpy.float32)
+
+        if kwargs["bm"]:  # a single mesh
+            # all buildings of the batch are added at once
+            mesh = createPolygonMesh("osm_buildings", coords, counts)
+            kwargs["bm"].from_mesh(mesh)
+            bpy.data.meshes.remove(mesh)
+            return
+
+        thickness = kwargs["thickness"] if ("thickness" in kwargs) else 0
+        starts = numpy.cumsum(counts) - counts
+        for way, start, count in zip(ways, starts, counts):
             tags = way["tags"]
-            thickness = kwargs["thickness"] if ("thickness" in kwargs) else 0
             osmId = way["id"]
             # compose object name
             name = osmId
@@ -388,34 +572,25 @@ class buildings:
             elif "name" in tags:
                 name = tags["name"]
 
-        bm = kwargs["bm"] if kwargs["bm"] else bmesh.new()
-        verts = []
-        for node in range(numNodes):
-            node = parser.nodes[wayNodes[node]]
-            v = kwargs["projection"].fromGeographic(node["lat"], node["lon"])
-            verts.append(bm.verts.new((v[0], v[1], 0)))
-
-        bm.faces.new(verts)
-
-        if not kwargs["bm"]:
-            thickness = kwargs["thickness"] if ("thickness" in kwargs) else 0
+            mesh = createPolygonMesh(osmId, coords[start:start + count], (count,))
             # extrude
             if thickness > 0:
+                bm = bmesh.new()
+                bm.from_mesh(mesh)
                 extrudeMesh(bm, thickness)
-
-            bm.normal_update()
-
-            mesh = bpy.data.meshes.new(osmId)
-            bm.to_mesh(mesh)
+                bm.normal_update()
+                bm.to_mesh(mesh)
+                bm.free()
 
             obj = bpy.data.objects.new(name, mesh)
             bpy.context.scene.objects.link(obj)
-            bpy.context.scene.update()
 
             # final adjustments
             obj.select = True
             # assign OSM tags to the blender object
             assignTags(obj, tags)
+        # a single update for the whole batch
+        bpy.context.scene.update()
 
 
 class highways:
@@ -441,10 +616,9 @@ class highways:
         bm = kwargs["bm"] if kwargs["bm"] else bmesh.new()
         verts = []
         prevVertex = None
+        x, y = parser.getCoordinates(way, kwargs["projection"])
         for node in range(numNodes):
-            node = parser.nodes[wayNodes[node]]
-            v = kwargs["projection"].fromGeographic(node["lat"], node["lon"])
-            v = bm.verts.new((v[0], v[1], 0))
+            v = bm.verts.new((x[node], y[node], 0))
             if prevVertex:
                 bm.edges.new([prevVertex, v])
             prevVertex = v
@@ -455,7 +629,6 @@ class highways:
 
             obj = bpy.data.objects.new(name, mesh)
             bpy.context.scene.objects.link(obj)
-            bpy.context.scene.update()
 
             # final adjustments
             obj.select = True
@@ -518,6 +691,17 @@ class ImportOsm(bpy.types.Operator, ImportHelper):
         default=0,
     )
 
+    useBbox = bpy.props.BoolProperty(
+        name="Import only an area",
+        description="Skip everything outside of the given latitudes and longitudes while reading the file",
+        default=False,
+    )
+
+    minLat = bpy.props.FloatProperty(name="Min latitude", min=-90, max=90, default=-90)
+    maxLat = bpy.props.FloatProperty(name="Max latitude", min=-90, max=90, default=90)
+    minLon = bpy.props.FloatProperty(name="Min longitude", min=-180, max=180, default=-180)
+    maxLon = bpy.props.FloatProperty(name="Max longitude", min=-180, max=180, default=180)
+
     def execute(self, context):
         # setting active object if there is no active object
         if context.mode != "OBJECT":
@@ -592,7 +776,8 @@ class ImportOsm(bpy.types.Operator, ImportHelper):
                         # wayHandlers = [handlers.buildings]
                         # wayHandlers = [handlers]
                         # wayHandlers = ["handlers"]
-                        wayHandlers=wayHandlers
+                        wayHandlers=wayHandlers,
+                        bbox=(self.minLat, self.minLon, self.maxLat, self.maxLon) if self.useBbox else None
                         )
 
         if "latitude" in scene and "longitude" in scene and not self.ignoreGeoreferencing:
@@ -618,6 +803,7 @@ class ImportOsm(bpy.types.Operator, ImportHelper):
             thickness=self.thickness,
             bm=self.bm  # if present, indicates the we need to create as single mesh
         )
+        scene.update()
 
 
 # Only needed if you want to add into a dynamic menu
@@ -1,9 +1,9 @@
 # -*- coding:utf-8 -*-
 import os
 import bpy
-import bmesh
 import math
 import mathutils
+import numpy
 from .shapefile import Reader as shpReader
 
 featureType = {
@@ -45,215 +45,163 @@ def dd2meters(val):
     return val * (ellpsGRS80.perimeter / 360)
 
 
-def getFeaturesType(shapes):
-    shpType = shapes[0].shapeType  # Shapetype of first feature, if this feature is null then shapefile will not be process...
-    # nt: Point features layer cannot be multipart
-    return featureType[shpType]
+def toNumpy(values, dtype):
+    # numpy.frombuffer doesn't accept empty buffers
+    if len(values) == 0:
+        return numpy.zeros(0, dtype=dtype)
+    return numpy.frombuffer(values, dtype=dtype)
 
 
-def buildGeoms(meshName, shapes, shpType, zValues, dx, dy, zExtrude, extrudeAxis, angCoords=False):
+def getPoints(columns, zValues=False, angCoords=False):
+    """Coordinates of all points of the shapefile columns as a (n, 3) array"""
+    xy = toNumpy(columns.points, numpy.float64).reshape(-1, 2)
+    pts = numpy.zeros((len(xy), 3))
+    if angCoords:
+        pts[:, :2] = dd2meters(xy)  # convert dd to meters
+    else:
+        pts[:, :2] = xy
+    if zValues:  # Z attributes data are user-defined priority
+        parts = toNumpy(columns.parts, numpy.int32)
+        shapeParts = toNumpy(columns.shapeParts, numpy.int32)
+        pts[:, 2] = numpy.repeat(zValues, numpy.diff(parts[shapeParts]))
+    elif columns.z is not None:
+        pts[:, 2] = toNumpy(columns.z, numpy.float64)
+    return pts
+
+
+def getRings(sizes):
+    """First loop of every ring and the next loop in its ring for every loop"""
+    starts = numpy.cumsum(sizes) - sizes
+    nextLoops = numpy.arange(sizes.sum()) + 1
+    nextLoops[starts + sizes - 1] = starts
+    return starts, nextLoops
+
+
+def buildGeoms(meshName, pts, parts, shpType, extrudeValues=None, extrudeAxis='Z'):
+    """
+    pts : shifted coordinates of the points as a (n, 3) array
+    parts : index of the first point of every part followed by the number of points
+    extrudeValues : extrusion offset of every part or None
+    """
     print("Process geometry...")
-    zGeom = False
-    mesh = False
+    starts, ends = parts[:-1], parts[1:]
+    nbPts = len(pts)
+    verts = pts
+    edges = numpy.zeros((0, 2), dtype=numpy.int64)
+    loops = numpy.zeros(0, dtype=numpy.int64)
+    sizes = numpy.zeros(0, dtype=numpy.int64)
 
     if (shpType == 'PointZ' or shpType == 'Point'):
-        if zValues:  # Z attributes data are user-defined priority
-            pts = ([(pt[0], pt[1], zValues[i]) for i, shape in enumerate(shapes) for pt in shape.points])
-        elif shpType[-1] == 'Z':
-            pts = ([(pt[0], pt[1], shape.z[0]) for shape in shapes for pt in shape.points])
-        else:
-            z = 0
-            pts = ([(pt[0], pt[1], z) for shape in shapes for pt in shape.points])
-        if angCoords:
-            pts = [(dd2meters(pt[0]) - dx, dd2meters(pt[1]) - dy, pt[2]) for pt in pts]  # shift coords & convert dd to meters
-        else:
-            pts = [(pt[0] - dx, pt[1] - dy, pt[2]) for pt in pts]  # shift coords
-        mesh = addMesh(meshName, pts, shpType, zExtrude)
+        if extrudeValues is not None:
+            top = pts.copy()
+            top[:, 2] += numpy.repeat(extrudeValues, ends - starts)  # normal = Z
+            verts = numpy.vstack((pts, top))
+            edges = numpy.column_stack((numpy.arange(nbPts), numpy.arange(nbPts) + nbPts))
 
     elif (shpType == 'PolyLine' or shpType == 'PolyLineZ'):
-        if shpType[-1] == 'Z' and not zValues:
-            zGeom = True
-        geoms = extractGeoms(shapes, zGeom, zFieldValues=zValues)
-        shiftGeom(geoms, dx, dy, angCoords)
-        #edges, initialGeoFeatureIdx = polylinesToLines(geoms)
-        mesh = addMesh(meshName, geoms, shpType, zExtrude, extrudeAxis)
+        # Split polylines to lines, a line starts at every point but the last of a part
+        isLineStart = numpy.ones(nbPts, dtype=bool)
+        isLineStart[ends[ends > starts] - 1] = False
+        lineStarts = numpy.nonzero(isLineStart)[0]
+        if extrudeValues is not None:
+            top = pts.copy()
+            top[:, 2] += numpy.repeat(extrudeValues, ends - starts)  # normal = Z
+            verts = numpy.vstack((pts, top))
+            loops = numpy.column_stack((lineStarts, lineStarts + 1, lineStarts + 1 + nbPts, lineStarts + nbPts)).ravel()
+            sizes = numpy.full(len(lineStarts), 4, dtype=numpy.int64)
+        else:
+            edges = numpy.column_stack((lineStarts, lineStarts + 1))
 
     elif (shpType == 'Polygon' or shpType == 'PolygonZ'):
-        if shpType[-1] == 'Z' and not zValues:
-            zGeom = True
-        geoms = extractGeoms(shapes, zGeom, zFieldValues=zValues, polygon=True)
-        shiftGeom(geoms, dx, dy, angCoords)
-        mesh = addMesh(meshName, geoms, shpType, zExtrude, extrudeAxis)
-
+        # According to the shapefile spec, polygons points are clockwise and polygon holes are counterclockwise
+        # in Blender face is up if points are in anticlockwise order
+        # so rings are reversed and their last point, the same as the first one, is excluded
+        sizes = (ends - starts - 1).astype(numpy.int64)
+        isFace = sizes >= 3  # needs 3 points to get face
+        sizes, ends = sizes[isFace], ends[isFace]
+        if extrudeValues is not None:
+            extrudeValues = numpy.asarray(extrudeValues, dtype=numpy.float64)[isFace]
+        ringStarts, nextLoops = getRings(sizes)
+        loops = numpy.repeat(ends - 1, sizes) - (numpy.arange(sizes.sum()) - numpy.repeat(ringStarts, sizes))
+        # if f.normal < 0: #this is a polygon hole, bmesh cannot handle polygon hole
+        if extrudeValues is not None:
+            if extrudeAxis == 'NORMAL':
+                # Newell's method gives the normal of every face
+                crosses = numpy.cross(pts[loops], pts[loops[nextLoops]])
+                normals = numpy.add.reduceat(crosses, ringStarts) if len(sizes) else crosses
+                lengths = numpy.sqrt((normals ** 2).sum(axis=1))
+                normals /= numpy.where(lengths > 0, lengths, 1)[:, None]
+                vects = normals * extrudeValues[:, None]
+            else:
+                vects = numpy.zeros((len(sizes), 3))
+                vects[:, 2] = extrudeValues
+            # The extruded face is the top, the original face is flipped to close the bottom
+            nbLoops = len(loops)
+            top = pts[loops] + numpy.repeat(vects, sizes, axis=0)
+            verts = numpy.vstack((pts, top))
+            topLoops = numpy.arange(nbLoops) + nbPts
+            bottomLoops = loops[numpy.repeat(ringStarts + sizes - 1, sizes) - (numpy.arange(nbLoops) - numpy.repeat(ringStarts, sizes))]
+            sideLoops = numpy.column_stack((loops, loops[nextLoops], topLoops[nextLoops], topLoops)).ravel()
+            loops = numpy.concatenate((bottomLoops, topLoops, sideLoops))
+            sizes = numpy.concatenate((sizes, sizes, numpy.full(nbLoops, 4, dtype=numpy.int64)))
+
+    mesh = addMesh(meshName, verts, edges, loops, sizes)
     print("Mesh created")
     return mesh
 
 
-def extractGeoms(shapes, zGeom=False, zFieldValues=False, polygon=False):
-    geoms = []
-    for i, geom in enumerate(shapes):
-        # Deal with multipart features
-        try:
-            partsIdx = geom.parts
-            # If the shape record has multiple parts this attribute contains the index of the first point of each part.
-            # If there is only one part then a list containing 0 is returned
-        except:  # prevent "_shape object has no attribute parts" error
-            partsIdx = [0]
-        nbParts = len(partsIdx)
-        geomPts = geom.points
-        nbPts = len(geomPts)
-        # Get Z values --> attributes data are user-defined priority
-        if zFieldValues:
-            z = zFieldValues[i]
-        elif zGeom:
-            zValues = geom.z
-        for j in range(nbParts):
-            pts = []
-            # find first and last part index
-            firstIdx = partsIdx[j]
-            if j + 1 == nbParts:
-                lastIdx = nbPts
-            else:
-                lastIdx = partsIdx[j + 1]
-            #
-            if zGeom and not zFieldValues:
-                z = zValues[firstIdx:lastIdx]
-            for k, pt in enumerate(geomPts[firstIdx:lastIdx]):
-                if zFieldValues:  # attributes data are user-defined priority
-                    thisZ = z
-                elif zGeom:
-                    thisZ = z[k]
-                else:
-                    thisZ = 0
-                pts.append((pt[0], pt[1], thisZ))
-            if polygon:
-                # According to the shapefile spec, polygons points are clockwise and polygon holes are counterclockwise
-                # in Blender face is up if points are in anticlockwise order
-                pts.reverse()  # face up
-                geoms.append(pts[:-1])  # exlude last point because it's the same of first pt
-            else:
-                geoms.append(pts)
-    return geoms
-
-
-def shiftGeom(geoms, dx, dy, angCoords=False):
-    for i, geom in enumerate(geoms):
-        if angCoords:
-            pts = [(dd2meters(pt[0]) - dx, dd2meters(pt[1]) - dy, pt[2]) for pt in geom]  # shift coords & convert dd to meters
-        else:
-            pts = [(pt[0] - dx, pt[1] - dy, pt[2]) for pt in geom]
-        geoms[i] = pts
-
-
-def polylinesToLines(geom):
-    edges = []
-    nbPts = len(geom)
-    for i in range(nbPts):
-        if i < nbPts - 1:
-            edges.append([geom[i], geom[i + 1]])
-    return edges
-
-
-def addMesh(name, geoms, shpType, extrudeValues, extrudeAxis='Z'):
+def mergeDoubles(verts, dist):
+    """
+    Merge the vertices that are in the same cell of a grid of size dist
+    Return the remaining vertices and the new index of every vertex
+    """
+    if len(verts) == 0:
+        return verts, numpy.zeros(0, dtype=numpy.int64)
+    cells = numpy.round(verts / dist).astype(numpy.int64)
+    order = numpy.lexsort((cells[:, 2], cells[:, 1], cells[:, 0]))
+    sortedCells = cells[order]
+    isFirst = numpy.ones(len(verts), dtype=bool)
+    isFirst[1:] = (sortedCells[1:] != sortedCells[:-1]).any(axis=1)
+    newIndices = numpy.empty(len(verts), dtype=numpy.int64)
+    newIndices[order] = numpy.cumsum(isFirst) - 1
+    return verts[order[isFirst]], newIndices
+
+
+def addMesh(name, verts, edges, loops, sizes):
     print("Create mesh...")
-    # Create an empty BMesh
-    bm = bmesh.new()
-    # Build bmesh
-    nbGeoms = len(geoms)
-    progress = -1
-    for i, geom in enumerate(geoms):
-        # progress bar
-        pourcent = round(((i + 1) * 100) / nbGeoms)
-        if pourcent in list(range(0, 110, 10)) and pourcent != progress:
-            progress = pourcent
-            print(str(pourcent) + '%')
-        # build geom
-        # POINT
-        if (shpType == 'PointZ' or shpType == 'Point'):
-            vert = bm.verts.new(geom)
-            # Extrusion
-            if extrudeValues:
-                offset = extrudeValues[i]
-                vect = (0, 0, offset)  # normal = Z
-                result = bmesh.ops.extrude_vert_indiv(bm, verts=[vert])
-                #verts=[elem for elem in result['geom'] if isinstance(elem, bmesh.types.BMVert)]
-                verts = result['verts']
-                # translate
-                bmesh.ops.translate(bm, verts=verts, vec=vect)
-        # LINES
-        if (shpType == 'PolyLine' or shpType == 'PolyLineZ'):
-            # Split polyline to lines
-            lines = polylinesToLines(geom)
-            # build edges
-            edges = []
-            ##edgesVerts = []
-            for line in lines:
-                verts = [bm.verts.new(pt) for pt in line]
-                edge = bm.edges.new(verts)
-                edges.append(edge)
-                # edgesVerts.extend(verts)
-            # Extrusion
-            if extrudeValues:
-                extrudeValue = extrudeValues[i]
-                if not extrudeValue:
-                    extrudeValue = 0
-                verts = extrudeEdgesBm(bm, edges, extrudeValue, extrudeAxis)
-                # edgesVerts.extend(verts)
-            # Merge edges to retrieve polyline
-            ##bmesh.ops.remove_doubles(bm, verts=edgesVerts, dist=0.0001)
-        # NGONS
-        if (shpType == 'Polygon' or shpType == 'PolygonZ'):
-            if len(geom) >= 3:  # needs 3 points to get face
-                pts = [bm.verts.new(pt) for pt in geom]
-                f = bm.faces.new(pts)
-                # if f.normal < 0: #this is a polygon hole, bmesh cannot handle polygon hole
-                # Extrusion
-                if extrudeValues:
-                    extrudeValue = extrudeValues[i]
-                    if not extrudeValue:
-                        extrudeValue = 0
-                    extrudeFacesBm(bm, f, extrudeValue, extrudeAxis)
-    # Finish up, write the bmesh to a new mesh
-    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
+    verts, newIndices = mergeDoubles(verts, 0.0001)
+    nbVerts = len(verts)
+    # Edges that collapsed or are there twice after merging
+    if len(edges):
+        edges = numpy.sort(newIndices[edges], axis=1)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        keys = numpy.unique(edges[:, 0] * nbVerts + edges[:, 1])
+        edges = numpy.column_stack((keys // nbVerts, keys % nbVerts))
+    # Merged vertices following each other in a face
+    if len(sizes):
+        loops = newIndices[loops]
+        ringStarts, nextLoops = getRings(sizes)
+        isKept = loops != loops[nextLoops]
+        sizes = numpy.bincount(numpy.repeat(numpy.arange(len(sizes)), sizes)[isKept], minlength=len(sizes))
+        loops = loops[isKept]
+        isFace = sizes >= 3
+        loops = loops[numpy.repeat(isFace, sizes)]
+        sizes = sizes[isFace]
+    # Write the arrays to a new mesh
     mesh = bpy.data.meshes.new(name)
-    bm.to_mesh(mesh)
-    bm.free()
+    mesh.vertices.add(nbVerts)
+    mesh.vertices.foreach_set('co', verts.astype(numpy.float32).ravel())
+    mesh.edges.add(len(edges))
+    mesh.edges.foreach_set('vertices', edges.astype(numpy.int32).ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set('vertex_index', loops.astype(numpy.int32))
+    mesh.polygons.add(len(sizes))
+    mesh.polygons.foreach_set('loop_start', (numpy.cumsum(sizes) - sizes).astype(numpy.int32))
+    mesh.polygons.foreach_set('loop_total', sizes.astype(numpy.int32))
+    mesh.update(calc_edges=True)
     return mesh
 
 
-def extrudeEdgesBm(bm, edges, offset, axis):  # Blender >= 2.65
-    # if axis == 'NORMAL'
-    # elif axis == 'Z':
-    vect = (0, 0, offset)  # normal = Z
-    result = bmesh.ops.extrude_edge_only(bm, edges=edges)
-    # geom type filter
-    verts = [elem for elem in result['geom'] if isinstance(elem, bmesh.types.BMVert)]
-    # translate
-    bmesh.ops.translate(bm, verts=verts, vec=vect)
-    return verts
-
-
-def extrudeFacesBm(bm, face, offset, axis):  # Blender >= 2.65
-    # update normal to avoid null vector
-    bm.normal_update()
-    # build translate vector
-    if axis == 'NORMAL':
-        normal = face.normal
-        vect = normal * offset
-    elif axis == 'Z':
-        vect = (0, 0, offset)
-    # make geom list for bmesh ops input --> [BMVert, BMEdge, BMFace]
-    geom = list(face.verts) + list(face.edges) + [face]
-    # extrude
-    result = bmesh.ops.extrude_face_region(bm, geom=geom)  # return dict {"geom":[BMVert, BMEdge, BMFace]}
-    # geom type filter
-    verts = [elem for elem in result['geom'] if isinstance(elem, bmesh.types.BMVert)]
-    ##edges=[elem for elem in result['geom'] if isinstance(elem, bmesh.types.BMEdge)]
-    ##faces=[elem for elem in result['geom'] if isinstance(elem, bmesh.types.BMFace)]
-    # translate
-    bmesh.ops.translate(bm, verts=verts, vec=vect)
-
-
 def placeObj(shpMesh, objName):
     bpy.ops.object.select_all(action='DESELECT')
     # create an object with that mesh
@@ -284,7 +232,7 @@ def update3dViews(nbLines, scaleSize):
 #------------------------------------------------------------------------
 
 from bpy_extras.io_utils import ImportHelper  # helper class defines filename and invoke() function which calls the file selector
-from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, FloatProperty
 from bpy.types import Operator
 
 
@@ -358,6 +306,16 @@ class IMPORT_SHP(Operator, ImportHelper):
         default=False
     )
     fieldObjName = StringProperty(name="Field name")
+    # Bounding box filter
+    useBbox = BoolProperty(
+        name="Bounding box",
+        description="Only import the features intersecting a bounding box given in the coordinates of the shapefile",
+        default=False
+    )
+    bboxXmin = FloatProperty(name="X min", precision=6)
+    bboxYmin = FloatProperty(name="Y min", precision=6)
+    bboxXmax = FloatProperty(name="X max", precision=6)
+    bboxYmax = FloatProperty(name="Y max", precision=6)
 
     def draw(self, context):
         # Function used by blender to draw the panel.
@@ -390,6 +348,15 @@ class IMPORT_SHP(Operator, ImportHelper):
         #
         layout.prop(self, 'angCoords')
         #
+        layout.prop(self, 'useBbox')
+        if self.useBbox:
+            row = layout.row(align=True)
+            row.prop(self, 'bboxXmin')
+            row.prop(self, 'bboxXmax')
+            row = layout.row(align=True)
+            row.prop(self, 'bboxYmin')
+            row.prop(self, 'bboxYmax')
+        #
         layout.prop(self, 'adjust3dView')
 
     def execute(self, context):
@@ -415,14 +382,30 @@ class IMPORT_SHP(Operator, ImportHelper):
             self.report({'ERROR'}, "Unable to read shapefile")
             print("Unable to read shapefile")
             return {'FINISHED'}
-        # Extract geoms
+        # Check shape type
+        shpType = featureType.get(shp.shapeType, 'Unknown')
+        print('Feature type : ' + shpType)
+        if shpType not in ['Point', 'PolyLine', 'Polygon', 'PointZ', 'PolyLineZ', 'PolygonZ']:
+            self.report({'ERROR'}, "Cannot process multipoint, multipointZ, pointM, polylineM, polygonM and multipatch feature type")
+            print("Cannot process multipoint, multipointZ, pointM, polylineM, polygonM and multipatch feature type")
+            return {'FINISHED'}
+        # Extract geoms, the .shx index allows to skip the features outside the bbox without reading them
+        if self.useBbox:
+            bbox = (self.bboxXmin, self.bboxYmin, self.bboxXmax, self.bboxYmax)
+        else:
+            bbox = None
         try:
-            shapes = shp.shapes()
-            shpType = getFeaturesType(shapes)
+            columns = shp.columns(bbox)
         except:
             self.report({'ERROR'}, "Unable to extract geometry")
             print("Unable to extract geometry")
             return {'FINISHED'}
+        nbFeatures = len(columns.indices)
+        print(str(nbFeatures) + ' features to import (null features ignored)')
+        if not nbFeatures:
+            self.report({'ERROR'}, "No feature to import")
+            print("No feature to import")
+            return {'FINISHED'}
         # Extract data
         if self.useFieldElev or self.useFieldExtrude or self.useFieldName:
             try:
@@ -431,39 +414,12 @@ class IMPORT_SHP(Operator, ImportHelper):
                 self.report({'ERROR'}, "Unable to read DBF table")
                 print("Unable to read DBF table")
                 return {'FINISHED'}
-        # Purge null geom
-        nbFeatures = len(shapes)
-        if self.useFieldElev or self.useFieldExtrude or self.useFieldName:
             try:
-                shapes, records = zip(*[(shape, records[i]) for i, shape in enumerate(shapes)])  # if len(shape.points) > 0])
+                records = [records[i] for i in columns.indices]
             except IndexError:
                 self.report({'ERROR'}, "Shapefiles reading error: number of shapes does not match number of table records.")
                 print("Shapefiles reading error: number of shapes does not match number of table records")
                 return {'FINISHED'}
-        else:
-            shapes = [shape for shape in shapes if len(shape.points) > 0]
-        print(str(nbFeatures - len(shapes)) + ' null features ignored')
-        # Check shape type
-        print('Feature type : ' + shpType)
-        if shpType not in ['Point', 'PolyLine', 'Polygon', 'PointZ', 'PolyLineZ', 'PolygonZ']:
-            self.report({'ERROR'}, "Cannot process multipoint, multipointZ, pointM, polylineM, polygonM and multipatch feature type")
-            print("Cannot process multipoint, multipointZ, pointM, polylineM, polygonM and multipatch feature type")
-            return {'FINISHED'}
-        # Calculate XY bbox
-        if (shpType == 'PointZ' or shpType == 'Point'):
-            pts = ([pt for shape in shapes for pt in shape.points])
-            xmin, xmax, ymin, ymax = min([pt[0] for pt in pts]), max([pt[0] for pt in pts]), min([pt[1] for pt in pts]), max([pt[1] for pt in pts])
-        else:
-            bbox = [shape.bbox for shape in shapes]  # xmin, ymin, xmax, ymax
-            xmin = min([box[0] for box in bbox])
-            xmax = max([box[2] for box in bbox])
-            ymin = min([box[1] for box in bbox])
-            ymax = max([box[3] for box in bbox])
-        if self.angCoords:
-            xmin, xmax, ymin, ymax = dd2meters(xmin), dd2meters(xmax), dd2meters(ymin), dd2meters(ymax)
-        bbox_dx = xmax - xmin
-        bbox_dy = ymax - ymin
-        center = (xmin + bbox_dx / 2, ymin + bbox_dy / 2)
         # Get obj names from field
         if self.useFieldName:
             try:
@@ -481,27 +437,13 @@ class IMPORT_SHP(Operator, ImportHelper):
                 self.report({'ERROR'}, "Unable to find elevation field")
                 print("Unable to find elevation field")
                 return {'FINISHED'}
-            # Get Z values
-            if (shpType == 'PointZ' or shpType == 'Point'):  # point layer has no attribute 'parts'
-                try:
-                    elevValues = [float(record[fieldIdx]) for record in records]
-                except ValueError:
-                    self.report({'ERROR'}, "Elevation values aren't numeric")
-                    print("Elevation values aren't numeric")
-                    return {'FINISHED'}
-            else:
-                try:
-                    #elevValues=[float(record[fieldIdx]) for i, record in enumerate(records) for part in range(len(shapes[i].parts))]
-                    # finally extractGeom funtion doesn't needs elevValues splited by parts
-                    elevValues = [float(record[fieldIdx]) for i, record in enumerate(records)]
-                except ValueError:
-                    self.report({'ERROR'}, "Elevation values aren't numeric")
-                    print("Elevation values aren't numeric")
-                    return {'FINISHED'}
-                except AttributeError:  # no attribute 'parts'
-                    self.report({'ERROR'}, "Shapefiles reading error")
-                    print("Shapefiles reading error")
-                    return {'FINISHED'}
+            # Get Z values, one per feature
+            try:
+                elevValues = [float(record[fieldIdx]) for record in records]
+            except ValueError:
+                self.report({'ERROR'}, "Elevation values aren't numeric")
+                print("Elevation values aren't numeric")
+                return {'FINISHED'}
         # Get Extrusion Values
         if self.useFieldExtrude:
             try:
@@ -510,65 +452,59 @@ class IMPORT_SHP(Operator, ImportHelper):
                 self.report({'ERROR'}, "Unable to find extrusion field")
                 print("Unable to find extrusion field")
                 return {'FINISHED'}
-            except AttributeError:
-                self.report({'ERROR'}, "No attribute parts")
-                print("No attribute parts")
+            # Get extrude values, one per feature
+            try:
+                extrudeValues = [float(record[fieldIdx]) for record in records]
+            except ValueError:
+                self.report({'ERROR'}, "Elevation values aren't numeric")
+                print("Elevation values aren't numeric")
                 return {'FINISHED'}
-            # Get extrude values
-            if (shpType == 'PointZ' or shpType == 'Point'):  # point layer has no attribute 'parts'
-                try:
-                    extrudeValues = [float(record[fieldIdx]) for record in records]
-                except ValueError:
-                    self.report({'ERROR'}, "Elevation values aren't numeric")
-                    print("Elevation values aren't numeric")
-                    return {'FINISHED'}
-            else:
-                try:
-                    extrudeValues = [float(record[fieldIdx]) for i, record in enumerate(records) for part in range(len(shapes[i].parts))]
-                except ValueError:
-                    self.report({'ERROR'}, "Elevation values aren't numeric")
-                    print("Elevation values aren't numeric")
-                    return {'FINISHED'}
-                except AttributeError:  # no attribute 'parts'
-                    self.report({'ERROR'}, "Shapefiles reading error")
-                    print("Shapefiles reading error")
-                    return {'FINISHED'}
+        # Get points coords (converted to meters) & calculate XY bbox
+        pts = getPoints(columns, elevValues, self.angCoords)
+        parts = toNumpy(columns.parts, numpy.int32)
+        shapeParts = toNumpy(columns.shapeParts, numpy.int32)
+        xmin, ymin = map(float, pts[:, :2].min(axis=0))
+        xmax, ymax = map(float, pts[:, :2].max(axis=0))
+        bbox_dx = xmax - xmin
+        bbox_dy = ymax - ymin
+        center = (xmin + bbox_dx / 2, ymin + bbox_dy / 2)
         # Get dx, dy
         scn = bpy.context.scene
         if self.useGeoref:
             dx, dy = scn["Georef X"], scn["Georef Y"]
         else:
             dx, dy = center[0], center[1]
+        # Shift coords
+        pts[:, 0] -= dx
+        pts[:, 1] -= dy
+        # Extrusion of every part
+        if extrudeValues:
+            extrudeValues = numpy.repeat(extrudeValues, numpy.diff(shapeParts))
+        else:
+            extrudeValues = None
         # Launch geometry builder
         if not self.separateObjects:  # create one object
-            mesh = buildGeoms(name, shapes, shpType, elevValues, dx, dy, extrudeValues, self.extrusionAxis, self.angCoords)
-            if not mesh:
-                print("Cannot process multipoint, multipointZ, pointM, polylineM, polygonM and multipatch feature type")
-                return {'FINISHED'}
+            mesh = buildGeoms(name, pts, parts, shpType, extrudeValues, self.extrusionAxis)
             # Place the mesh
             obj = placeObj(mesh, name)
         else:  # create multiple objects
-            for i, shape in enumerate(shapes):
+            for i in range(nbFeatures):
                 # get obj name
                 if self.useFieldName:
                     objName = nameValues[i]
                 else:
                     objName = name
-                # get elevation value
-                if self.useFieldElev:
-                    elevValue = [elevValues[i]]
-                else:
-                    elevValue = False
-                # get extrusion value
-                if self.useFieldExtrude:
-                    extrudeValue = [extrudeValues[i]]
+                # get the parts and points of the feature
+                firstPart, lastPart = shapeParts[i], shapeParts[i + 1]
+                shapePartsIdx = parts[firstPart:lastPart + 1]
+                shapePts = pts[shapePartsIdx[0]:shapePartsIdx[-1]]
+                # get extrusion values
+                if extrudeValues is not None:
+                    extrudeValue = extrudeValues[firstPart:lastPart]
                 else:
-                    extrudeValue = False
+                    extrudeValue = None
                 # build geom &place obj
-                mesh = buildGeoms(objName, [shape], shpType, elevValue, dx, dy, extrudeValue, self.extrusionAxis, self.angCoords)
-                if not mesh:
-                    print("Cannot process multipoint, multipointZ, pointM, polylineM, polygonM and multipatch feature type")
-                    return {'FINISHED'}
+                mesh = buildGeoms(objName, shapePts, shapePartsIdx - shapePartsIdx[0], shpType, extrudeValue, self.extrusionAxis)
                 obj = placeObj(mesh, objName)
         # Add custom properties define x & y translation to retrieve georeferenced model
         scn["Georef X"], scn["Georef Y"] = dx, dy
@@ -101,6 +101,23 @@ class _Array(array.array):
         return str(self.tolist())
 
 
+def _extend(arr, data):
+    """Appends the little endian values of a byte string to an array."""
+    if sys.byteorder == 'little':
+        if PYTHON3:
+            arr.frombytes(data)
+        else:
+            arr.fromstring(data)
+    else:
+        values = array.array(arr.typecode)
+        if PYTHON3:
+            values.frombytes(data)
+        else:
+            values.fromstring(data)
+        values.byteswap()
+        arr.extend(values)
+
+
 def signed_area(coords):
     """Return the signed area enclosed by a ring using the linear time
     algorithm at http://www.cgafaq.info/wiki/Polygon_Area. A value >= 0
@@ -200,6 +217,29 @@ class _Shape:
                     }
 
 
+class _Columns:
+
+    def __init__(self, shapeType=None):
+        """Stores the geometry of many shapes in flat typed
+        arrays instead of one _Shape object per shape, so large
+        shapefiles can be read without a python object per point.
+        indices is the record index of every shape, shapeParts
+        the index of the first part of every shape and parts the
+        index of the first point of every part, both followed by
+        the total count. points holds the x and y values of all
+        points one after another and z their z values for the
+        shape types with elevation, otherwise it is None."""
+        self.shapeType = shapeType
+        self.indices = _Array('i')
+        self.shapeParts = _Array('i', [0])
+        self.parts = _Array('i', [0])
+        self.points = _Array('d')
+        if shapeType in (11, 13, 15, 18, 31):
+            self.z = _Array('d')
+        else:
+            self.z = None
+
+
 class _ShapeRecord:
     """A shape object of any type."""
 
@@ -405,10 +445,17 @@ class Reader:
             numRecords = shxRecordLength // 8
             # Jump to the first record.
             shx.seek(100)
-            for r in range(numRecords):
-                # Offsets are 16-bit words just like the file length
-                self._offsets.append(unpack(">i", shx.read(4))[0] * 2)
-                shx.seek(shx.tell() + 4)
+            # Offset and content length of every record, both big
+            # endian and in 16-bit words just like the file length
+            index = array.array('i')
+            data = shx.read(numRecords * 8)
+            if PYTHON3:
+                index.frombytes(data)
+            else:
+                index.fromstring(data)
+            if sys.byteorder == 'little':
+                index.byteswap()
+            self._offsets = [offset * 2 for offset in index[::2]]
         if not i == None:
             return self._offsets[i]
 
@@ -451,6 +498,99 @@ class Reader:
         while shp.tell() < self.shpLength:
             yield self.__shape()
 
+    def __shapeOffsets(self):
+        """Returns the offsets of all shapes in the .shp file, from
+        the .shx index if available or else by walking the record
+        headers of the .shp file."""
+        self.__shapeIndex()
+        if self._offsets:
+            return self._offsets
+        shp = self.__getFileObj(self.shp)
+        shp.seek(0, 2)
+        self.shpLength = shp.tell()
+        offset = 100
+        offsets = []
+        while offset + 8 <= self.shpLength:
+            shp.seek(offset)
+            offsets.append(offset)
+            offset += 8 + unpack(">i", shp.read(8)[4:])[0] * 2
+        return offsets
+
+    def __columnsShape(self, columns, i, bbox):
+        """Appends the geometry of the shape at the current position
+        of the .shp file to columns unless it is a null shape or its
+        bounding box doesn't intersect bbox."""
+        f = self.shp
+        (recNum, recLength) = unpack(">2i", f.read(8))
+        length = 2 * recLength
+        # Shape type and bounding box are read first so that the
+        # points of skipped shapes are never read
+        content = f.read(min(length, 36))
+        if len(content) < 4:
+            return
+        shapeType = unpack("<i", content[:4])[0]
+        if shapeType == 0:
+            return
+        if shapeType in (1, 11, 21):
+            if len(content) < 20:
+                return
+            shapeBbox = unpack("<2d", content[4:20]) * 2
+        else:
+            if len(content) < 36:
+                return
+            shapeBbox = unpack("<4d", content[4:36])
+        if bbox and (shapeBbox[0] > bbox[2] or shapeBbox[2] < bbox[0] or
+                     shapeBbox[1] > bbox[3] or shapeBbox[3] < bbox[1]):
+            return
+        content += f.read(length - len(content))
+        parts = None
+        if shapeType in (1, 11, 21):
+            nPoints = 1
+            pointsStart = 4
+            zStart = 20
+        elif shapeType in (8, 18, 28):
+            nPoints = unpack("<i", content[36:40])[0]
+            pointsStart = 40
+            zStart = pointsStart + 16 * nPoints + 16
+        else:
+            (nParts, nPoints) = unpack("<2i", content[36:44])
+            parts = _Array('i')
+            _extend(parts, content[44:44 + 4 * nParts])
+            pointsStart = 44 + 4 * nParts
+            # Skip the part types of Multipatch - 31
+            if shapeType == 31:
+                pointsStart += 4 * nParts
+            zStart = pointsStart + 16 * nPoints + 16
+        pointsData = content[pointsStart:pointsStart + 16 * nPoints]
+        if nPoints <= 0 or len(pointsData) != 16 * nPoints:
+            return
+        first = len(columns.points) // 2
+        _extend(columns.points, pointsData)
+        if parts:
+            columns.parts.extend(first + p for p in parts[1:])
+        columns.parts.append(first + nPoints)
+        if columns.z is not None:
+            zData = content[zStart:zStart + 8 * nPoints]
+            if shapeType in (11, 13, 15, 18, 31) and len(zData) == 8 * nPoints:
+                _extend(columns.z, zData)
+            else:
+                columns.z.extend([0.0] * nPoints)
+        columns.shapeParts.append(len(columns.parts) - 1)
+        columns.indices.append(i)
+
+    def columns(self, bbox=None):
+        """Returns the geometry of all shapes as a _Columns object.
+        Null shapes and, if a bbox (xmin, ymin, xmax, ymax) is given,
+        the shapes whose bounding box doesn't intersect it are left out
+        without reading their points. The record index of every shape
+        that was read is kept in the indices attribute."""
+        shp = self.__getFileObj(self.shp)
+        columns = _Columns(self.shapeType)
+        for i, offset in enumerate(self.__shapeOffsets()):
+            shp.seek(offset)
+            self.__columnsShape(columns, i, bbox)
+        return columns
+
     def __dbfHeaderLength(self):
         """Retrieves the header length of a dbf file header."""
         if not self.__dbfHdrLength:
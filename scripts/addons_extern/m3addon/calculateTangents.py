@@ -151,9 +151,10 @@ def recalculateTangentsOfModel(model):
     vertexClassName = "VertexFormat" + hex(model.vFlags)
     vertexStructureDescription = m3.structures[vertexClassName].getVersion(0)
     numberOfVertices = round(len(model.vertices) / vertexStructureDescription.size)
-    m3VerticesToUpdate = vertexStructureDescription.createInstances(buffer=model.vertices, count=numberOfVertices)
+    m3VerticesToUpdate = vertexStructureDescription.createInstances(buffer=model.vertices, count=numberOfVertices, useArrays=True)
 
     recalculateTangentsOfDivisions(m3VerticesToUpdate, model.divisions)
+    model.vertices = vertexStructureDescription.instancesToBytes(m3VerticesToUpdate)
 
 
 def convert(inputPath, outputPath):
@@ -24,6 +24,10 @@ from xml.dom.minidom import Node
 import re
 from sys import stderr
 import struct
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def increaseToValidSectionSize(size):
@@ -42,9 +46,9 @@ class Section:
     def __init__(self):
         self.timesReferenced = 0
 
-    def determineContentField(self, checkExpectedValue):
+    def determineContentField(self, checkExpectedValue, useArrays=False):
         indexEntry = self.indexEntry
-        self.content = self.structureDescription.createInstances(buffer=self.rawBytes, count=indexEntry.repetitions, checkExpectedValue=checkExpectedValue)
+        self.content = self.structureDescription.createInstances(buffer=self.rawBytes, count=indexEntry.repetitions, checkExpectedValue=checkExpectedValue, useArrays=useArrays)
 
     def determineFieldRawBytes(self):
         minRawBytes = self.determineRawBytesWithData()
@@ -67,13 +71,15 @@ class Section:
         return self.structureDescription.countBytesRequiredForInstances(self.content)
 
     def resolveReferences(self, sections):
-        if not self.structureDescription.isPrimitive:
+        # Structures stored in arrays contain no references
+        if not self.structureDescription.isPrimitive and not isinstance(self.content, M3StructureArray):
             for object in self.content:
                 object.resolveReferences(sections)
 
 
 primitiveFieldTypeSizes = {"uint32": 4, "int32": 4, "uint16": 2, "int16": 2, "uint8": 1, "int8": 1, "float": 4, "tag": 4, "fixed8": 1}
 primitiveFieldTypeFormats = {"uint32": "I", "int32": "i", "uint16": "H", "int16": "h", "uint8": "B", "int8": "b", "float": "f", "tag": "4s", "fixed8": "B"}
+primitiveFieldTypeArrayFormats = {"uint32": "<u4", "int32": "<i4", "uint16": "<u2", "int16": "<i2", "uint8": "u1", "int8": "i1", "float": "<f4", "fixed8": "u1"}
 intTypes = {"uint32", "int32", "uint16", "int16", "uint8", "int8"}
 
 structureNamesOfPrimitiveTypes = set(["CHAR", "U8__", "REAL", "I16_", "U16_", "I32_", "U32_", "FLAG"])
@@ -139,6 +145,8 @@ class M3StructureDescription:
         self.size = specifiedSize
         self.isPrimitive = self.structureName in structureNamesOfPrimitiveTypes
         self.history = history
+        self.arrayType = None
+        self.arrayTypeDetermined = False
 
         # Validate the specified size:
         calculatedSize = 0
@@ -158,27 +166,60 @@ class M3StructureDescription:
     def createInstance(self, buffer=None, offset=0, checkExpectedValue=True):
         return M3Structure(self, buffer, offset, checkExpectedValue)
 
-    def createInstances(self, buffer, count, checkExpectedValue=True):
+    def createInstances(self, buffer, count, checkExpectedValue=True, useArrays=False):
+        """With useArrays structures without references get returned as M3StructureArray"""
         if self.isPrimitive:
             if self.structureName == "CHAR":
                 return buffer[:count - 1].decode("ASCII")
             elif self.structureName == "U8__":
                 return bytearray(buffer[:count])
             else:
-                structFormat = self.fields[0].structFormat
-                list = []
-                for offset in range(0, count * self.size, self.size):
-                    bytesOfOneEntry = buffer[offset:(offset + self.size)]
-                    intValue = structFormat.unpack(bytesOfOneEntry)[0]
-                    list.append(intValue)
-                return list
+                structFormat = struct.Struct("<%d%s" % (count, self.fields[0].formatCharacter))
+                return list(structFormat.unpack_from(buffer, 0))
+        elif useArrays and self.getArrayType() != None:
+            return self.createInstanceArray(buffer, count, checkExpectedValue)
         else:
-            list = []
+            instances = []
             instanceOffset = 0
             for i in range(count):
-                list.append(self.createInstance(buffer=buffer, offset=instanceOffset, checkExpectedValue=checkExpectedValue))
+                instances.append(self.createInstance(buffer=buffer, offset=instanceOffset, checkExpectedValue=checkExpectedValue))
                 instanceOffset += self.size
-            return list
+            return instances
+
+    def getArrayType(self):
+        """Returns the numpy type of the structure or None if it can't be stored in a numpy array"""
+        if not self.arrayTypeDetermined:
+            self.arrayTypeDetermined = True
+            if numpy != None and not self.isPrimitive:
+                fieldTypes = []
+                for field in self.fields:
+                    fieldType = field.getArrayType()
+                    if fieldType == None:
+                        return None
+                    fieldTypes.append((field.name, fieldType))
+                self.arrayType = numpy.dtype(fieldTypes)
+                assert self.arrayType.itemsize == self.size
+        return self.arrayType
+
+    def createInstanceArray(self, buffer, count, checkExpectedValue=True):
+        if count == 0:
+            array = numpy.zeros(0, dtype=self.getArrayType())
+        else:
+            array = numpy.frombuffer(buffer, dtype=self.getArrayType(), count=count).copy()
+        self.checkArrayValues(array, checkExpectedValue)
+        return M3StructureArray(self, array)
+
+    def checkArrayValues(self, array, checkExpectedValue):
+        for field in self.fields:
+            field.checkArrayValues(self, array[field.name], checkExpectedValue)
+
+    def fillArray(self, array, instances):
+        for field in self.fields:
+            field.setArrayValues(array, [getattr(instance, field.name) for instance in instances])
+
+    def setArrayElement(self, array, index, instance):
+        for field in self.fields:
+            field.setArrayValue(array, index, getattr(instance, field.name))
 
     def dumpOffsets(self):
         offset = 0
@@ -218,15 +259,19 @@ class M3StructureDescription:
             if type(instances) != bytes and type(instances) != bytearray:
                 raise Exception("Expected a byte array but it was a %s" % type(instances))
             return instances
+        elif isinstance(instances, M3StructureArray):
+            return bytearray(instances.array.tobytes())
+        elif len(instances) > 0 and self.getArrayType() != None:
+            array = numpy.zeros(len(instances), dtype=self.getArrayType())
+            self.fillArray(array, instances)
+            return bytearray(array.tobytes())
         else:
             rawBytes = bytearray(self.size * len(instances))
             offset = 0
 
             if self.isPrimitive:
-                structFormat = self.fields[0].structFormat
-                for value in instances:
-                    structFormat.pack_into(rawBytes, offset, value)
-                    offset += self.size
+                structFormat = struct.Struct("<%d%s" % (len(instances), self.fields[0].formatCharacter))
+                structFormat.pack_into(rawBytes, 0, *instances)
             else:
                 for value in instances:
                     value.writeToBuffer(rawBytes, offset)
@@ -291,6 +336,105 @@ class M3Structure:
         return field.getBitNameMaskPairs()
 
 
+class M3StructureView(M3Structure):
+    """A structure whose field values are stored in an element of a M3StructureArray.
+    The values get copied into the object when a field gets read the first time,
+    embedded structures are views too and get created when they get read"""
+
+    def __init__(self, structureArray, index):
+        self.__dict__.update(structureDescription=structureArray.structureDescription, _structureArray=structureArray, _index=index)
+
+    def __getattr__(self, name):
+        structureArray = self.__dict__.get("_structureArray")
+        if structureArray == None or not structureArray.structureDescription.hasField(name):
+            raise AttributeError("%s has no field called %s" % (type(self).__name__, name))
+        return structureArray.readFieldValue(self, name)
+
+    def __setattr__(self, name, value):
+        field = self.structureDescription.nameToFieldMap.get(name)
+        if field == None:
+            self.__dict__[name] = value
+        else:
+            self._structureArray.setFieldValue(field, self._index, value)
+
+    def writeToBuffer(self, buffer, offset):
+        buffer[offset:offset + self.structureDescription.size] = self._structureArray.array[self._index].tobytes()
+
+
+class M3StructureArray:
+    """A list like sequence of structures without references which are stored in a numpy array.
+    The values of a field get converted all at once when the field gets used the first time.
+    The elements are M3StructureView objects, which get created when they get accessed"""
+
+    def __init__(self, structureDescription, array):
+        self.structureDescription = structureDescription
+        self.array = array
+        self.fieldValues = {}
+        self.simpleFieldValues = None
+        self.views = [None] * len(array)
+
+    def __len__(self):
+        return len(self.views)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.views)))]
+        view = self.views[index]
+        if view is None:
+            index = range(len(self.views))[index]
+            view = M3StructureView(self, index)
+            self.views[index] = view
+        return view
+
+    def __setitem__(self, index, value):
+        index = range(len(self.views))[index]
+        for field in self.structureDescription.fields:
+            self.setFieldValue(field, index, getattr(value, field.name))
+
+    def __iter__(self):
+        for index in range(len(self.views)):
+            yield self[index]
+
+    def getFieldValues(self, fieldName):
+        """Returns the values of a field as list, which must not be modified.
+        For embedded structures a M3StructureArray gets returned"""
+        values = self.fieldValues.get(fieldName)
+        if values == None:
+            field = self.structureDescription.nameToFieldMap[fieldName]
+            values = field.arrayToValues(self.array[fieldName])
+            self.fieldValues[fieldName] = values
+        return values
+
+    def readFieldValue(self, view, fieldName):
+        values = self.getFieldValues(fieldName)
+        index = view._index
+        viewDict = view.__dict__
+        if isinstance(values, M3StructureArray):
+            viewDict[fieldName] = values[index]
+        else:
+            # all fields that aren't structures get read at once
+            if self.simpleFieldValues == None:
+                self.simpleFieldValues = []
+                for field in self.structureDescription.fields:
+                    fieldValues = self.getFieldValues(field.name)
+                    if not isinstance(fieldValues, M3StructureArray):
+                        self.simpleFieldValues.append((field.name, fieldValues))
+            for name, fieldValues in self.simpleFieldValues:
+                viewDict[name] = fieldValues[index]
+        return viewDict[fieldName]
+
+    def setFieldValue(self, field, index, value):
+        values = self.getFieldValues(field.name)
+        if isinstance(values, M3StructureArray):
+            values[index] = value
+            return
+        field.setArrayValue(self.array, index, value)
+        values[index] = field.arrayToValues(self.array[field.name][index:index + 1])[0]
+        view = self.views[index]
+        if view != None and field.name in view.__dict__:
+            view.__dict__[field.name] = values[index]
+
+
 class Field:
 
     def __init__(self, name, sinceVersion, tillVersion):
@@ -304,6 +448,13 @@ class Field:
     def resolveIndexReferences(self, owner, sections):
         pass
 
+    def getArrayType(self):
+        """Fields that can be stored in a numpy array return their numpy type"""
+        return None
+
+    def checkArrayValues(self, structureDescription, values, checkExpectedValue):
+        pass
+
 
 class TagField(Field):
 
@@ -312,23 +463,38 @@ class TagField(Field):
         self.structFormat = struct.Struct("<4B")
         self.size = 4
 
-    def readFromBuffer(self, owner, buffer, offset, checkExpectedValue):
-        b = self.structFormat.unpack_from(buffer, offset)
+    def bytesToString(self, b):
         if b[3] == 0:
-            s = chr(b[2]) + chr(b[1]) + chr(b[0])
+            return chr(b[2]) + chr(b[1]) + chr(b[0])
         else:
-            s = chr(b[3]) + chr(b[2]) + chr(b[1]) + chr(b[0])
-
-        setattr(owner, self.name, s)
+            return chr(b[3]) + chr(b[2]) + chr(b[1]) + chr(b[0])
 
-    def writeToBuffer(self, owner, buffer, offset):
-        s = getattr(owner, self.name)
+    def stringToBytes(self, s):
         if len(s) == 4:
-            b = (s[3] + s[2] + s[1] + s[0]).encode("ascii")
+            return (s[3] + s[2] + s[1] + s[0]).encode("ascii")
         else:
-            b = (s[2] + s[1] + s[0]).encode("ascii") + b"\x00"
+            return (s[2] + s[1] + s[0]).encode("ascii") + b"\x00"
+
+    def readFromBuffer(self, owner, buffer, offset, checkExpectedValue):
+        b = self.structFormat.unpack_from(buffer, offset)
+        setattr(owner, self.name, self.bytesToString(b))
+
+    def writeToBuffer(self, owner, buffer, offset):
+        b = self.stringToBytes(getattr(owner, self.name))
         return self.structFormat.pack_into(buffer, offset, b[0], b[1], b[2], b[3])
 
+    def getArrayType(self):
+        return ("u1", 4)
+
+    def arrayToValues(self, values):
+        return [self.bytesToString(b) for b in values.tolist()]
+
+    def setArrayValue(self, array, index, value):
+        array[self.name][index] = list(self.stringToBytes(value))
+
+    def setArrayValues(self, array, values):
+        array[self.name] = [list(self.stringToBytes(value)) for value in values]
+
     def setToDefault(self, owner):
         pass
 
@@ -351,7 +517,7 @@ class ReferenceField(Field):
 
         indexReference = indexMaker.getIndexReferenceTo(referencedObjects, self.referenceStructureDescription, structureDescription)
         isPrimitive = self.historyOfReferencedStructures != None and self.historyOfReferencedStructures.isPrimitive
-        if not isPrimitive:
+        if not isPrimitive and not isinstance(referencedObjects, M3StructureArray):
             for referencedObject in referencedObjects:
                 referencedObject.introduceIndexReferences(indexMaker)
         setattr(owner, self.name, indexReference)
@@ -396,6 +562,10 @@ class ReferenceField(Field):
         if self.historyOfReferencedStructures.isPrimitive:
             return self.historyOfReferencedStructures.getVersion(0)
 
+        if isinstance(l, M3StructureArray):
+            if len(l) == 0:
+                return None
+            return l.structureDescription
         if type(l) != list:
             raise Exception("%s: Expected a list, but was a %s" % (contextString, type(l)))
         if len(l) == 0:
@@ -403,7 +573,7 @@ class ReferenceField(Field):
 
         firstElement = l[0]
         contentClass = type(firstElement)
-        if contentClass != M3Structure:
+        if not issubclass(contentClass, M3Structure):
             raise Exception("%s: Expected a list to contain an M3Structure object and not a %s" % (contextString, contentClass))
         # Optional: Enable check:
         # if not contentClass.tagName == tagName:
@@ -489,12 +659,14 @@ class StructureReferenceField(ReferenceField):
         ReferenceField.__init__(self, name, referenceStructureDescription, historyOfReferencedStructures, sinceVersion, tillVersion)
 
     def validateContent(self, fieldContent, fieldPath):
-        if (type(fieldContent) != list):
+        if (type(fieldContent) != list) and not isinstance(fieldContent, M3StructureArray):
             raise Exception("%s is not a list, but a %s" % (fieldPath, type(fieldContent)))
         if len(fieldContent) > 0:
             structureDescription = self.getListContentStructureDefinition(fieldContent, fieldPath)
             if structureDescription.history != self.historyOfReferencedStructures:
                 raise Exception("Expected that %s is a list of %s and not %s" % (fieldPath, self.historyOfReferencedStructures.name, structureDescription.history.name))
+            if isinstance(fieldContent, M3StructureArray):
+                return  # the array can only contain values of the field types
             for itemIndex, item in enumerate(fieldContent):
                 structureDescription.validateInstance(item, "%s[%d]" % (fieldPath, itemIndex))
 
@@ -544,6 +716,21 @@ class EmbeddedStructureField(Field):
     def validateContent(self, fieldContent, fieldPath):
         self.structureDescription.validateInstance(fieldContent, fieldPath)
 
+    def getArrayType(self):
+        return self.structureDescription.getArrayType()
+
+    def arrayToValues(self, values):
+        return M3StructureArray(self.structureDescription, values)
+
+    def setArrayValue(self, array, index, value):
+        self.structureDescription.setArrayElement(array[self.name], index, value)
+
+    def setArrayValues(self, array, values):
+        self.structureDescription.fillArray(array[self.name], values)
+
+    def checkArrayValues(self, structureDescription, values, checkExpectedValue):
+        self.structureDescription.checkArrayValues(values, checkExpectedValue)
+
 
 class PrimitiveField(Field):
     """ Base class for IntField and FloatField """
@@ -551,7 +738,8 @@ class PrimitiveField(Field):
     def __init__(self, name, typeString, sinceVersion, tillVersion, defaultValue, expectedValue):
         Field.__init__(self, name, sinceVersion, tillVersion)
         self.size = primitiveFieldTypeSizes[typeString]
-        self.structFormat = struct.Struct("<" + primitiveFieldTypeFormats[typeString])
+        self.formatCharacter = primitiveFieldTypeFormats[typeString]
+        self.structFormat = struct.Struct("<" + self.formatCharacter)
         self.typeString = typeString
         self.defaultValue = defaultValue
         self.expectedValue = expectedValue
@@ -571,6 +759,25 @@ class PrimitiveField(Field):
     def setToDefault(self, owner):
         setattr(owner, self.name, self.defaultValue)
 
+    def getArrayType(self):
+        return primitiveFieldTypeArrayFormats[self.typeString]
+
+    def arrayToValues(self, values):
+        return values.tolist()
+
+    def setArrayValue(self, array, index, value):
+        array[self.name][index] = value
+
+    def setArrayValues(self, array, values):
+        array[self.name] = values
+
+    def checkArrayValues(self, structureDescription, values, checkExpectedValue):
+        if self.expectedValue != None:
+            unexpectedIndices = numpy.flatnonzero(values != self.expectedValue)
+            if len(unexpectedIndices) > 0:
+                value = values[unexpectedIndices[0]].item()
+                raise Exception("Expected that field %s of %s (V. %d) has always the value %s, but it was %s" % (self.name, structureDescription.structureName, structureDescription.structureVersion, self.expectedValue, value))
+
 
 class IntField(PrimitiveField):
     intTypeToMinValue = {"int16": (-(1 << 15)), "uint16": 0, "int32": (-(1 << 31)), "uint32": 0, "int8": -(1 << 7), "uint8": 0}
@@ -621,9 +828,15 @@ class Fixed8Field(PrimitiveField):
     def __init__(self, name, typeString, sinceVersion, tillVersion, defaultValue, expectedValue):
         PrimitiveField.__init__(self, name, typeString, sinceVersion, tillVersion, defaultValue, expectedValue)
 
+    def intToFloat(self, intValue):
+        return ((intValue / 255.0 * 2.0) - 1)
+
+    def floatToInt(self, floatValue):
+        return round((floatValue + 1) / 2.0 * 255.0)
+
     def readFromBuffer(self, owner, buffer, offset, checkExpectedValue):
         intValue = self.structFormat.unpack_from(buffer, offset)[0]
-        floatValue = ((intValue / 255.0 * 2.0) - 1)
+        floatValue = self.intToFloat(intValue)
 
         if checkExpectedValue and self.expectedValue != None and floatValue != self.expectedValue:
             structureName = owner.structureDescription.structureName
@@ -633,13 +846,30 @@ class Fixed8Field(PrimitiveField):
 
     def writeToBuffer(self, owner, buffer, offset):
         floatValue = getattr(owner, self.name)
-        intValue = round((floatValue + 1) / 2.0 * 255.0)
+        intValue = self.floatToInt(floatValue)
         return self.structFormat.pack_into(buffer, offset, intValue)
 
     def validateContent(self, fieldContent, fieldPath):
         if (type(fieldContent) != float):
             raise Exception("%s is not a float but a %s!" % (fieldPath, type(fieldContent)))
 
+    def arrayToValues(self, values):
+        return self.intToFloat(values).tolist()
+
+    def setArrayValue(self, array, index, value):
+        array[self.name][index] = self.floatToInt(value)
+
+    def setArrayValues(self, array, values):
+        # numpy rounds halves to even like round does
+        array[self.name] = numpy.round((numpy.array(values, dtype=numpy.float64) + 1) / 2.0 * 255.0)
+
+    def checkArrayValues(self, structureDescription, values, checkExpectedValue):
+        if checkExpectedValue and self.expectedValue != None:
+            unexpectedIndices = numpy.flatnonzero(self.intToFloat(values) != self.expectedValue)
+            if len(unexpectedIndices) > 0:
+                intValue = values[unexpectedIndices[0]].item()
+                raise Exception("Expected that field %s of %s (V. %d) has always the value %s, but it was %s" % (self.name, structureDescription.structureName, structureDescription.structureVersion, self.expectedValue, intValue))
+
 
 class UnknownBytesField(Field):
 
@@ -669,6 +899,26 @@ class UnknownBytesField(Field):
         if (type(fieldContent) != bytes) or (len(fieldContent) != self.size):
             raise Exception("%s is not an bytes object of size %s" % (fieldPath, self.size))
 
+    def getArrayType(self):
+        return ("u1", self.size)
+
+    def arrayToValues(self, values):
+        return [bytes(b) for b in values.tolist()]
+
+    def setArrayValue(self, array, index, value):
+        array[self.name][index] = numpy.frombuffer(value, dtype=numpy.uint8)
+
+    def setArrayValues(self, array, values):
+        array[self.name] = numpy.frombuffer(b"".join(values), dtype=numpy.uint8).reshape(len(values), self.size)
+
+    def checkArrayValues(self, structureDescription, values, checkExpectedValue):
+        if checkExpectedValue and self.expectedValue != None:
+            unexpected = (values != numpy.frombuffer(self.expectedValue, dtype=numpy.uint8)).any(axis=1)
+            unexpectedIndices = numpy.flatnonzero(unexpected)
+            if len(unexpectedIndices) > 0:
+                value = values[unexpectedIndices[0]].tobytes()
+                raise Exception("Expected that %sV%s.%s has always the value %s, but it was %s" % (structureDescription.structureName, structureDescription.structureVersion, self.name, self.expectedValue, value))
+
 
 class Visitor:
 
@@ -1105,7 +1355,7 @@ def resolveAllReferences(list, sections):
                 entry.resolveReferences(sections)
 
 
-def loadSections(filename, checkExpectedValue=True):
+def loadSections(filename, checkExpectedValue=True, useArrays=False):
     source = open(filename, "rb")
     try:
         MD34V11 = structures["MD34"].getVersion(11)
@@ -1148,7 +1398,7 @@ def loadSections(filename, checkExpectedValue=True):
 
             if structureDescription != None:
                 section.structureDescription = structureDescription
-                section.determineContentField(checkExpectedValue)
+                section.determineContentField(checkExpectedValue, useArrays)
             else:
                 guessedUnusedSectionBytes = 0
                 for i in range(1, 16):
@@ -1207,8 +1457,9 @@ def checkThatAllSectionsGotReferenced(sections):
         raise Exception("Unable to load all data: There were %d unreferenced sections. View log for details" % numberOfUnreferencedSections)
 
 
-def loadModel(filename, checkExpectedValue=True):
-    sections = loadSections(filename, checkExpectedValue)
+def loadModel(filename, checkExpectedValue=True, useArrays=False):
+    """With useArrays sections of structures without references get loaded as M3StructureArray objects"""
+    sections = loadSections(filename, checkExpectedValue, useArrays)
     resolveReferencesOfSections(sections)
     checkThatAllSectionsGotReferenced(sections)
     header = sections[0].content[0]
@@ -421,7 +421,7 @@ class Importer:
         if (self.rootDirectory == ""):
             self.rootDirectory = path.dirname(fileName)
         self.scene = scene
-        self.model = m3.loadModel(fileName)
+        self.model = m3.loadModel(fileName, useArrays=True)
         if contentToImport != "MESH_WITH_MATERIALS_ONLY":
             self.armature = bpy.data.armatures.new(name="Armature")
         scene.render.fps = FRAME_RATE
@@ -1251,7 +1251,24 @@ class Importer:
         vertexStructureDescription = m3.structures[vertexClassName].getVersion(0)
 
         numberOfVertices = len(self.model.vertices) // vertexStructureDescription.size
-        m3Vertices = vertexStructureDescription.createInstances(buffer=self.model.vertices, count=numberOfVertices)
+        m3Vertices = vertexStructureDescription.createInstances(buffer=self.model.vertices, count=numberOfVertices, useArrays=True)
+
+        # The values of all vertices get read field by field from the array:
+        positions = m3Vertices.getFieldValues("position")
+        normals = m3Vertices.getFieldValues("normal")
+        positionFields = [positions.getFieldValues("x"), positions.getFieldValues("y"), positions.getFieldValues("z")]
+        positionTuples = list(zip(*positionFields))
+        vertexIdFields = list(positionFields)
+        for fieldName in ["boneWeight0", "boneWeight1", "boneWeight2", "boneWeight3", "boneLookupIndex0", "boneLookupIndex1", "boneLookupIndex2", "boneLookupIndex3"]:
+            vertexIdFields.append(m3Vertices.getFieldValues(fieldName))
+        vertexIdFields.extend([normals.getFieldValues("x"), normals.getFieldValues("y"), normals.getFieldValues("z")])
+        # tuple of vertex data that makes a vertex unique
+        vertexIdTuples = list(zip(*vertexIdFields))
+        uvAttributeToCoordinatesMap = {}
+        for vertexUVAttribute in ["uv0", "uv1", "uv2", "uv3"]:
+            if vertexStructureDescription.hasField(vertexUVAttribute):
+                uvs = m3Vertices.getFieldValues(vertexUVAttribute)
+                uvAttributeToCoordinatesMap[vertexUVAttribute] = [(x / 2048.0, 1 - y / 2048.0) for x, y in zip(uvs.getFieldValues("x"), uvs.getFieldValues("y"))]
 
         for division in self.model.divisions:
             divisionFaceIndices = division.faces
@@ -1294,10 +1311,7 @@ class Importer:
                 # old (stored) vertex -> tuple of vertex data that makes the vertex unique
                 oldVertexIndexToTupleIdMap = {}
                 for vertexIndex in regionVertexIndices:
-                    m3Vertex = m3Vertices[vertexIndex]
-                    v = m3Vertex
-                    idTuple = (v.position.x, v.position.y, v.position.z, v.boneWeight0, v.boneWeight1, v.boneWeight2, v.boneWeight3, v.boneLookupIndex0, v.boneLookupIndex1, v.boneLookupIndex2, v.boneLookupIndex3, v.normal.x, v.normal.y, v.normal.z)
-                    oldVertexIndexToTupleIdMap[vertexIndex] = idTuple
+                    oldVertexIndexToTupleIdMap[vertexIndex] = vertexIdTuples[vertexIndex]
 
                 nonTrianglesCounter = 0
                 tranglesWithOldIndices = []
@@ -1324,9 +1338,7 @@ class Importer:
                     if newIndex == None:
                         newIndex = nextNewVertexIndex
                         nextNewVertexIndex += 1
-                        m3Vertex = m3Vertices[vertexIndex]
-                        position = (m3Vertex.position.x, m3Vertex.position.y, m3Vertex.position.z)
-                        vertexPositions.append(position)
+                        vertexPositions.append(positionTuples[vertexIndex])
                         vertexIdTupleToNewIndexMap[idTuple] = newIndex
                     oldVertexIndexToNewVertexIndexMap[vertexIndex] = newIndex
                     # store which old vertex indices where merged to a new one:
@@ -1376,10 +1388,11 @@ class Importer:
                     if vertexStructureDescription.hasField(vertexUVAttribute):
                         uvTexture = mesh.uv_textures.new()
                         uvLayer = mesh.uv_layers[len(mesh.uv_layers) - 1]
+                        uvCoordinates = uvAttributeToCoordinatesMap[vertexUVAttribute]
                         for faceIndex, polygon in enumerate(mesh.polygons):
                             oldIndices = tranglesWithOldIndices[faceIndex]
                             for i in range(3):
-                                uvLayer.data[polygon.loop_start + i].uv = toBlenderUVCoordinate(getattr(m3Vertices[oldIndices[i]], vertexUVAttribute))
+                                uvLayer.data[polygon.loop_start + i].uv = uvCoordinates[oldIndices[i]]
 
                         if False:  # old:
                             uvLayer = mesh.tessface_uv_textures.new()
@@ -42,8 +42,11 @@ from time import clock, sleep, strftime, gmtime
 import pstats
 import cProfile
 import multiprocessing
+from array import array
+import numpy
 
 mol_simrun = False
+mol_buffers = {}
 
 
 def define_props():
@@ -130,6 +133,64 @@ def define_props():
     bpy.types.Scene.mol_cpu = bpy.props.IntProperty(name="mol_cpu", description="Numbers of cpu's included for process the simulation", default=multiprocessing.cpu_count(), min=1, max=multiprocessing.cpu_count())
 
 
+class ParticleBuffers:
+    """Typed per particle buffers of one particle system, allocated once per simulation.
+    foreach_get fills them directly, cmolcore reads them like lists and the numpy
+    views share their memory for the vectorized alive state and mass."""
+
+    def __init__(self, parlen):
+        self.parlen = parlen
+        self.par_loc = array('f', bytes(12 * parlen))
+        self.par_vel = array('f', bytes(12 * parlen))
+        self.par_size = array('f', bytes(4 * parlen))
+        self.par_mass = array('f', bytes(4 * parlen))
+        self.par_alive = array('i', bytes(4 * parlen))
+        self.par_birth = array('f', bytes(4 * parlen))
+        self.par_die = array('f', bytes(4 * parlen))
+
+        self.size = numpy.frombuffer(self.par_size, dtype=numpy.float32)
+        self.mass = numpy.frombuffer(self.par_mass, dtype=numpy.float32)
+        self.alive = numpy.frombuffer(self.par_alive, dtype=numpy.int32)
+        self.birth = numpy.frombuffer(self.par_birth, dtype=numpy.float32)
+        self.die = numpy.frombuffer(self.par_die, dtype=numpy.float32)
+
+    def fill(self, psys, time):
+        psys.particles.foreach_get('location', self.par_loc)
+        psys.particles.foreach_get('velocity', self.par_vel)
+        self.fill_alive(psys, time)
+
+    def fill_alive(self, psys, time):
+        # alive_state is an enum, foreach_get can't read it, but it follows
+        # from the birth and death times: 2 = unborn, 0 = alive, 3 = dead
+        psys.particles.foreach_get('birth_time', self.par_birth)
+        psys.particles.foreach_get('die_time', self.par_die)
+        self.alive.fill(0)
+        self.alive[self.birth > time] = 2
+        self.alive[self.die <= time] = 3
+
+    def fill_mass(self, psys):
+        psys.particles.foreach_get('size', self.par_size)
+        if psys.settings.mol_density_active:
+            self.mass[:] = psys.settings.mol_density * (4 / 3 * pi * ((self.size / 2)**3))
+        else:
+            self.mass.fill(psys.settings.mass)
+
+
+def get_buffers(psys):
+    key = psys.as_pointer()
+    buffers = mol_buffers.get(key)
+    if buffers is None or buffers.parlen != len(psys.particles):
+        buffers = ParticleBuffers(len(psys.particles))
+        mol_buffers[key] = buffers
+    return buffers
+
+
+def particle_time(scene):
+    # frame_map_new is used to subdivide every frame into substeps
+    frame = scene.frame_current + scene.frame_subframe
+    return frame * scene.render.frame_map_old / scene.render.frame_map_new
+
+
 def pack_data(initiate):
     global mol_exportdata
     global mol_minsize
@@ -137,37 +198,26 @@ def pack_data(initiate):
     psyslen = 0
     parnum = 0
     scene = bpy.context.scene
+    time = particle_time(scene)
+    if initiate:
+        mol_buffers.clear()
     for obj in bpy.data.objects:
         for psys in obj.particle_systems:
             if psys.settings.mol_matter != "-1":
                 psys.settings.mol_density = float(psys.settings.mol_matter)
             if psys.settings.mol_active == True and len(psys.particles) > 0:
                 parlen = len(psys.particles)
-                par_loc = [0, 0, 0] * parlen
-                par_vel = [0, 0, 0] * parlen
-                par_size = [0] * parlen
-                par_alive = []
-                for par in psys.particles:
-                    parnum += 1
-                    if par.alive_state == "UNBORN":
-                        par_alive.append(2)
-                    if par.alive_state == "ALIVE":
-                        par_alive.append(0)
-                    if par.alive_state == "DEAD":
-                        par_alive.append(3)
-
-                psys.particles.foreach_get('location', par_loc)
-                psys.particles.foreach_get('velocity', par_vel)
+                parnum += parlen
+                buffers = get_buffers(psys)
+                buffers.fill(psys, time)
+                par_loc = buffers.par_loc
+                par_vel = buffers.par_vel
+                par_size = buffers.par_size
+                par_alive = buffers.par_alive
 
                 if initiate:
-                    par_mass = []
-
-                    if psys.settings.mol_density_active:
-                        for par in psys.particles:
-                            par_mass.append(psys.settings.mol_density * (4 / 3 * pi * ((par.size / 2)**3)))
-                    else:
-                        for par in psys.particles:
-                            par_mass.append(psys.settings.mass)
+                    buffers.fill_mass(psys)
+                    par_mass = buffers.par_mass
                     """
                     if scene.mol_timescale_active == True:
                         psys.settings.timestep = 1 / (scene.render.fps / scene.timescale)
@@ -177,9 +227,8 @@ def pack_data(initiate):
                     #psys.settings.count = psys.settings.count
                     psys.point_cache.frame_step = psys.point_cache.frame_step
                     psyslen += 1
-                    psys.particles.foreach_get('size', par_size)
-                    if mol_minsize > min(par_size):
-                        mol_minsize = min(par_size)
+                    if mol_minsize > buffers.size.min():
+                        mol_minsize = float(buffers.size.min())
 
                     if psys.settings.mol_link_samevalue:
                         psys.settings.mol_link_estiff = psys.settings.mol_link_stiff
@@ -589,6 +638,7 @@ class MolSimulate(bpy.types.Operator):
         mol_exportdata = []
         mol_exportdata = [[fps, mol_substep, 0, 0, cpu]]
         mol_stime = clock()
+        reset_timing()
         pack_data(True)
         #print("sys number",mol_exportdata[0][2])
         etime = clock()
@@ -717,6 +767,31 @@ class MolSetActiveUV(bpy.types.Operator):
         return {'FINISHED'}
 
 
+mol_timing = {}
+
+
+def reset_timing():
+    mol_timing.clear()
+    mol_timing.update(substeps=0, pack=0.0, simulate=0.0, inject=0.0, frame_set=0.0)
+
+
+def add_timing(name, stime):
+    etime = clock()
+    mol_timing[name] += etime - stime
+    return etime
+
+
+def print_timing():
+    # average time of the substeps since the last report
+    substeps = mol_timing["substeps"]
+    if substeps == 0:
+        return
+    print("      per substep (" + str(substeps) + "): " + ", ".join(
+        name + " " + str(round(mol_timing[name] / substeps * 1000, 2)) + " ms"
+        for name in ("pack", "simulate", "inject", "frame_set")))
+    reset_timing()
+
+
 class MolSimulateModal(bpy.types.Operator):
     """Operator which runs its self from a timer"""
     bl_idname = "wm.mol_simulate_modal"
@@ -771,6 +846,7 @@ class MolSimulateModal(bpy.types.Operator):
             scene.frame_set(frame=scene.frame_start)
 
             cmolcore.memfree()
+            mol_buffers.clear()
             mol_simrun = False
             print("--------------------------------------------------Molecular Sim end")
             return self.cancel(context)
@@ -778,13 +854,14 @@ class MolSimulateModal(bpy.types.Operator):
         if event.type == 'TIMER':
             if frame_current == scene.frame_start:
                 mol_stime = clock()
+                reset_timing()
             mol_exportdata = []
-            #stimex = clock()
+            stimex = clock()
             pack_data(False)
-            #print("packdata time",clock() - stimex,"sec")
+            stimex = add_timing("pack", stimex)
             mol_importdata = cmolcore.simulate(mol_exportdata)
+            stimex = add_timing("simulate", stimex)
             i = 0
-            #stimex = clock()
             for obj in bpy.data.objects:
                 for psys in obj.particle_systems:
                     if psys.settings.mol_active == True and len(psys.particles) > 0:
@@ -792,11 +869,13 @@ class MolSimulateModal(bpy.types.Operator):
                         # print(len(psys.particles))
                         psys.particles.foreach_set('velocity', mol_importdata[1][i])
                         i += 1
-            #print("inject new velocity time",clock() - stimex,"sec")
+            add_timing("inject", stimex)
+            mol_timing["substeps"] += 1
             framesubstep = frame_current / (mol_substep + 1)
             if framesubstep == int(framesubstep):
                 etime = clock()
                 print("    frame " + str(framesubstep + 1) + ":")
+                print_timing()
                 print("      links created:", mol_newlink)
                 if mol_totallink != 0:
                     print("      links broked :", mol_deadlink)
@@ -814,7 +893,9 @@ class MolSimulateModal(bpy.types.Operator):
             mol_deadlink += mol_importdata[3]
             mol_totallink = mol_importdata[4]
             mol_totaldeadlink = mol_importdata[5]
+            stimex = clock()
             scene.frame_set(frame=frame_current + 1)
+            add_timing("frame_set", stimex)
             if framesubstep == int(framesubstep):
                 etime2 = clock()
                 print("      Blender: " + str(round(etime2 - stime2, 3)) + " sec")
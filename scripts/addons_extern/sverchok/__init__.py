@@ -72,12 +72,12 @@ imported_modules = []
 # or parse it
 root_modules = ["menu", "node_tree", "data_structure", "core",
                 "utils", "ui", "nodes", "old_nodes"]
-core_modules = ["handlers", "update_system", "upgrade_nodes"]
+core_modules = ["handlers", "profiling", "update_system", "upgrade_nodes"]
 utils_modules = [
     # non UI tools
     "cad_module", "sv_bmesh_utils", "sv_viewer_utils", "sv_curve_utils",
     "voronoi", "sv_script", "sv_itertools", "script_importhelper",
-    "csg_core", "csg_geom", "sv_easing_functions",
+    "csg_core", "csg_geom", "csg_array", "sv_easing_functions",
     # UI text editor ui
     "text_editor_submenu", "text_editor_plugins",
     # UI operators
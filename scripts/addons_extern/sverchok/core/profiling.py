@@ -0,0 +1,243 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Per node profiling with a rolling history over updates.
+
+The update system hands every processed node set (the same data as
+update_system.graphs) to record_graph while profiling is enabled.
+The history can be exported as a chrome trace (chrome://tracing) or
+as a json summary.
+
+Usage from the command line on a saved file, sverchok must be enabled:
+
+blender -b file.blend --python-expr "from sverchok.core import profiling; profiling.profile_file('trace.json', updates=10)"
+'''
+
+import collections
+import json
+import os
+import sys
+
+import bpy
+
+from sverchok import data_structure
+
+ENABLED = False
+HISTORY_SIZE = 100
+
+# tree name -> deque of updates, each a list of node records
+history = collections.defaultdict(lambda: collections.deque(maxlen=HISTORY_SIZE))
+
+
+def set_profiling(state, history_size=None):
+    '''
+    Turn profiling on or off, changing the history size drops the history
+    '''
+    global ENABLED
+    global HISTORY_SIZE
+    ENABLED = state
+    if history_size and history_size != HISTORY_SIZE:
+        HISTORY_SIZE = history_size
+        reset_history()
+
+
+def reset_history(ng=None):
+    if ng:
+        history.pop(ng.name, None)
+    else:
+        history.clear()
+
+
+def data_size(data):
+    '''
+    (number of objects, number of items in objects) of socket data
+    '''
+    if not hasattr(data, "__len__"):
+        return 1, 1
+    items = 0
+    for obj in data:
+        items += len(obj) if hasattr(obj, "__len__") else 1
+    return len(data), items
+
+
+def output_size(node):
+    '''
+    Size of the data the node has in the socket cache, summed over outputs
+    '''
+    ng_data = data_structure.socket_data_cache.get(node.id_data.name, {})
+    objects, items = 0, 0
+    for socket in node.outputs:
+        data = ng_data.get(data_structure.socket_id(socket))
+        if data is not None:
+            o, i = data_size(data)
+            objects += o
+            items += i
+    return objects, items
+
+
+def record_graph(nodes, graph):
+    '''
+    Store one processed node set, graph is the list of node dicts built
+    in update_system.do_update_general
+    '''
+    records = []
+    for entry in graph:
+        record = dict(entry)
+        node = nodes.get(entry["name"])
+        if node:
+            record["objects"], record["items"] = output_size(node)
+        record.setdefault("thread", False)
+        record.setdefault("skipped", False)
+        records.append(record)
+    if records:
+        history[nodes.id_data.name].append(records)
+
+
+def node_statistics(tree_name):
+    '''
+    Per node statistics over the history of a tree:
+    {node name: {bl_idname, calls, skipped, total, mean, min, max, objects, items}}
+    '''
+    stats = {}
+    for update in history.get(tree_name, ()):
+        for record in update:
+            s = stats.get(record["name"])
+            if not s:
+                s = stats[record["name"]] = {
+                    "bl_idname": record["bl_idname"], "calls": 0, "skipped": 0,
+                    "total": 0.0, "min": float("inf"), "max": 0.0}
+            if record["skipped"]:
+                s["skipped"] += 1
+                continue
+            duration = record["duration"]
+            s["calls"] += 1
+            s["total"] += duration
+            s["min"] = min(s["min"], duration)
+            s["max"] = max(s["max"], duration)
+            s["objects"] = record.get("objects", 0)
+            s["items"] = record.get("items", 0)
+    for s in stats.values():
+        s["mean"] = s["total"] / s["calls"] if s["calls"] else 0.0
+        if not s["calls"]:
+            s["min"] = 0.0
+    return stats
+
+
+def chrome_trace(tree_names=None):
+    '''
+    History as chrome trace event dict, one process per tree
+    '''
+    events = []
+    names = tree_names or list(history.keys())
+    for pid, tree_name in enumerate(names):
+        events.append({"name": "process_name", "ph": "M", "pid": pid,
+                       "args": {"name": tree_name}})
+        for update_index, update in enumerate(history.get(tree_name, ())):
+            for record in update:
+                events.append({
+                    "name": record["name"],
+                    "cat": record["bl_idname"],
+                    "ph": "X",
+                    "ts": record["start"] * 1e6,
+                    "dur": record["duration"] * 1e6,
+                    "pid": pid,
+                    "tid": 1 if record["thread"] else 0,
+                    "args": {"update": update_index,
+                             "skipped": record["skipped"],
+                             "objects": record.get("objects", 0),
+                             "items": record.get("items", 0)}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path, tree_names=None):
+    with open(path, "w") as f:
+        json.dump(chrome_trace(tree_names), f)
+    return path
+
+
+def export_json(path, tree_names=None):
+    '''
+    Export per node statistics and the raw history
+    '''
+    names = tree_names or list(history.keys())
+    out = {name: {"statistics": node_statistics(name),
+                  "updates": [list(u) for u in history.get(name, ())]}
+           for name in names}
+    with open(path, "w") as f:
+        json.dump(out, f, indent=1)
+    return path
+
+
+def print_statistics(tree_name, limit=20):
+    stats = node_statistics(tree_name)
+    print("Profile of {}, {} updates".format(tree_name, len(history.get(tree_name, ()))))
+    order = sorted(stats.items(), key=lambda item: item[1]["total"], reverse=True)
+    for name, s in order[:limit]:
+        print("{:<30} {:>5} calls {:>9.4f} total {:>9.4f} mean {:>9.4f} max {:>8} items".format(
+            name, s["calls"], s["total"], s["mean"], s["max"], s.get("items", 0)))
+
+
+def profile_file(path, updates=1, tree_names=None, chrome=True):
+    '''
+    Process sverchok trees of the current file a number of times with
+    profiling on and export the result, for use with blender -b
+    '''
+    from sverchok.core import update_system
+    old_state = ENABLED
+    set_profiling(True)
+    reset_history()
+    trees = [ng for ng in update_system.sverchok_trees()
+             if not tree_names or ng.name in tree_names]
+    for ng in trees:
+        update_system.build_update_list(ng)
+        for i in range(updates):
+            update_system.process_tree(ng)
+    names = [ng.name for ng in trees]
+    for name in names:
+        print_statistics(name)
+    if chrome:
+        export_chrome_trace(path, names)
+    else:
+        export_json(path, names)
+    set_profiling(old_state)
+    return path
+
+
+def main():
+    '''
+    blender -b file.blend --python sverchok/core/profiling.py -- out.json [updates] [--json]
+    '''
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    chrome = "--json" not in argv
+    argv = [a for a in argv if a != "--json"]
+    path = argv[0] if argv else os.path.splitext(bpy.data.filepath)[0] + "_profile.json"
+    updates = int(argv[1]) if len(argv) > 1 else 1
+    profile_file(path, updates=updates, chrome=chrome)
+    print("Profile written to", path)
+
+
+def register():
+    addon = bpy.context.user_preferences.addons.get(data_structure.SVERCHOK_NAME)
+    if addon and hasattr(addon, "preferences"):
+        set_profiling(addon.preferences.profile_nodes, addon.preferences.profile_history)
+
+
+if __name__ == "__main__":
+    from sverchok.core import profiling
+    profiling.main()
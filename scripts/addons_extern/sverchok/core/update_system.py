@@ -17,6 +17,7 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import collections
+import concurrent.futures
 import time
 
 import bpy
@@ -24,6 +25,7 @@ from mathutils import Vector
 
 from sverchok import data_structure
 from sverchok.data_structure import SvNoDataError
+from sverchok.core import profiling
 import sverchok
 
 import traceback
@@ -31,6 +33,9 @@ import ast
 
 graphs = []
 
+# (threads, pool) for parallel update, created on demand
+executor = None
+
 no_data_color = (1, 0.3, 0)
 exception_color = (0.8, 0.0, 0)
 
@@ -45,6 +50,11 @@ def update_error_colors(self, context):
 update_cache = {}
 # cache for partial update lists
 partial_update_cache = {}
+# cache of node input fingerprints for incremental update
+node_fingerprint_cache = {}
+
+# rna properties every node has, not part of the node state
+_base_node_props = set()
 
 
 def make_dep_dict(node_tree, down=False):
@@ -257,6 +267,8 @@ def do_update_heat_map(node_list, nodes):
     if not times:
         return
     t_max = max(times)
+    if not t_max:
+        return
     addon_name = data_structure.SVERCHOK_NAME
     addon = bpy.context.user_preferences.addons.get(addon_name)
     if addon:
@@ -302,6 +314,136 @@ def reset_error_nodes(ng):
         del ng["error nodes"]
 
 
+def node_properties_fingerprint(node):
+    """
+    Fingerprint of the bpy properties defined by the node class
+    """
+    if not _base_node_props:
+        _base_node_props.update(p.identifier for p in bpy.types.Node.bl_rna.properties)
+    values = []
+    for prop in node.bl_rna.properties:
+        name = prop.identifier
+        if name in _base_node_props or prop.type in {'POINTER', 'COLLECTION'}:
+            continue
+        value = getattr(node, name, None)
+        if getattr(prop, "is_array", False):
+            value = value[:]
+        elif isinstance(value, set):
+            # enum flags
+            value = sorted(value)
+        values.append((name, value))
+    return data_structure.data_fingerprint(values)
+
+
+def node_fingerprint(node):
+    """
+    Fingerprint the state a node will process, the fingerprints of the
+    data on its linked inputs, the values of unlinked inputs and its properties.
+    Returns None if the node must be processed.
+    """
+    if getattr(node, "sv_volatile", False) or not node.outputs:
+        return None
+    ng_fingerprints = data_structure.socket_fingerprint_cache.get(node.id_data.name, {})
+    inputs = []
+    for socket in node.inputs:
+        if socket.is_linked:
+            other = data_structure.get_other_socket(socket)
+            if not other:
+                return None
+            fingerprint = ng_fingerprints.get(data_structure.socket_id(other))
+            if fingerprint is None:
+                return None
+        elif hasattr(socket, "sv_get"):
+            try:
+                fingerprint = data_structure.data_fingerprint(socket.sv_get(default=None))
+            except Exception:
+                return None
+            if fingerprint is None:
+                return None
+        else:
+            fingerprint = None
+        inputs.append((socket.identifier, fingerprint))
+    props = node_properties_fingerprint(node)
+    if props is None:
+        return None
+    return data_structure.data_fingerprint((inputs, props))
+
+
+def has_cached_outputs(node):
+    """
+    Check that every linked output of the node still has data in the socket cache
+    """
+    ng_data = data_structure.socket_data_cache.get(node.id_data.name, {})
+    for socket in node.outputs:
+        if socket.is_linked and data_structure.socket_id(socket) not in ng_data:
+            return False
+    return True
+
+
+def reset_fingerprints(ng=None):
+    """
+    Forget node fingerprints, for a node group or for all
+    """
+    if ng:
+        node_fingerprint_cache[ng.name] = {}
+    else:
+        node_fingerprint_cache.clear()
+
+
+def check_fingerprint(node, fingerprints):
+    """
+    Fingerprint the node for incremental update, returns the fingerprint
+    and if the node is unchanged since its last process.
+    """
+    fingerprint = node_fingerprint(node)
+    if (fingerprint is not None and fingerprints.get(node.name) == fingerprint and
+            has_cached_outputs(node)):
+        return fingerprint, True
+    # only valid after a successful process
+    fingerprints.pop(node.name, None)
+    return fingerprint, False
+
+
+def update_node(node, fingerprints=None):
+    """
+    Process a single node, if fingerprints are passed the node is skipped
+    when its fingerprint is unchanged.
+    Returns the duration of the update or None if the node was skipped.
+    """
+    start = time.perf_counter()
+    fingerprint = None
+    if fingerprints is not None:
+        fingerprint, unchanged = check_fingerprint(node, fingerprints)
+        if unchanged:
+            return None
+    if hasattr(node, "process"):
+        node.process()
+    if fingerprint is not None:
+        fingerprints[node.name] = fingerprint
+    return time.perf_counter() - start
+
+
+def timed_compute(compute, args):
+    """
+    Runs the data only part of a parallel node in a worker thread,
+    returns (result, duration)
+    """
+    start = time.perf_counter()
+    result = compute(args)
+    return result, time.perf_counter() - start
+
+
+def get_fingerprints(ng):
+    """
+    Node fingerprints of the node group if incremental update is on
+    """
+    if not data_structure.INCREMENTAL_UPDATE:
+        return None
+    if ng.name not in node_fingerprint_cache:
+        node_fingerprint_cache[ng.name] = {}
+    return node_fingerprint_cache[ng.name]
+
+
 def do_update_general(node_list, nodes, procesed_nodes=set()):
     """
     General update function for node set
@@ -310,7 +452,9 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
     timings = []
     graph = []
     total_time = 0
+    skipped = 0
     done_nodes = set(procesed_nodes)
+    fingerprints = get_fingerprints(nodes.id_data)
 
     for node_name in node_list:
         if node_name in done_nodes:
@@ -318,9 +462,16 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
         try:
             node = nodes[node_name]
             start = time.perf_counter()
-            if hasattr(node, "process"):
-                node.process()
-            delta = time.perf_counter() - start
+            delta = update_node(node, fingerprints)
+            if delta is None:
+                skipped += 1
+                timings.append(0.0)
+                graph.append({"name": node_name,
+                              "bl_idname": node.bl_idname,
+                              "start": start,
+                              "duration": 0.0,
+                              "skipped": True})
+                continue
             total_time += delta
             if data_structure.DEBUG_MODE:
                 print("Processed  {} in: {:.4f}".format(node_name, delta))
@@ -337,14 +488,164 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
             print("Node {0} had exception {1}".format(node_name, err))
             return None
     graphs.append(graph)
+    if profiling.ENABLED:
+        profiling.record_graph(nodes, graph)
     if data_structure.DEBUG_MODE:
         print("Node set updated in: {:.4f} seconds".format(total_time))
+        if fingerprints is not None:
+            print("Skipped {} unchanged nodes".format(skipped))
+        stats = data_structure.get_copy_stats(nodes.id_data)
+        print("Socket data copied: {bytes} bytes in {copies} copies, {shared} shared reads".format(**stats))
     return timings
 
 
+def make_dependency_levels(node_list, deps):
+    """
+    Split a sorted update list into levels, the nodes of a level only
+    depend on nodes in earlier levels and can be processed in any order.
+    Dependencies outside of the list are considered done.
+    """
+    node_level = {}
+    levels = []
+    for name in node_list:
+        level = 1 + max((node_level[dep] for dep in deps[name] if dep in node_level), default=-1)
+        node_level[name] = level
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(name)
+    return levels
+
+
+def is_parallel_node(node):
+    """
+    Nodes may run in a worker thread if they declare sv_parallel and split
+    their process into sv_gather, sv_compute and sv_write. Only sv_compute
+    runs in the worker, it gets plain data and must not touch blender data.
+    """
+    return (getattr(node, "sv_parallel", False) and not getattr(node, "sv_volatile", False) and
+            all(hasattr(node, attr) for attr in ("sv_gather", "sv_compute", "sv_write")))
+
+
+def get_executor():
+    global executor
+    threads = data_structure.PARALLEL_THREADS
+    if executor is None or executor[0] != threads:
+        if executor:
+            executor[1].shutdown(wait=True)
+        executor = (threads, concurrent.futures.ThreadPoolExecutor(max_workers=threads))
+    return executor[1]
+
+
+def do_update_parallel(node_list, nodes, deps=None):
+    """
+    Update function for node set that computes the parallel nodes of
+    each dependency level concurrently. Sockets, properties and the
+    fingerprints are only read and written in the main thread, the
+    other nodes of the level are processed there while the workers run.
+    """
+    ng = nodes.id_data
+    if deps is None:
+        deps = make_dep_dict(ng)
+    if not deps:
+        # no valid dependencies, keep the sorted order
+        return do_update_general(node_list, nodes)
+    fingerprints = get_fingerprints(ng)
+    durations = {}
+    graph = []
+    total_start = time.perf_counter()
+
+    for level in make_dependency_levels(node_list, deps):
+        level_nodes = [nodes[name] for name in level]
+        workers = [node for node in level_nodes if is_parallel_node(node)]
+        if len(workers) < 2:
+            workers = []
+        worker_names = {node.name for node in workers}
+        futures = {}
+        errors = []
+        for node in workers:
+            start = time.perf_counter()
+            try:
+                fingerprint = None
+                if fingerprints is not None:
+                    fingerprint, unchanged = check_fingerprint(node, fingerprints)
+                    if unchanged:
+                        durations[node.name] = None
+                        graph.append({"name": node.name,
+                                      "bl_idname": node.bl_idname,
+                                      "start": start,
+                                      "duration": 0.0,
+                                      "skipped": True})
+                        continue
+                args = node.sv_gather()
+            except Exception as err:
+                errors.append((node.name, err))
+                break
+            if args is None:
+                # nothing to compute for this node
+                if fingerprint is not None:
+                    fingerprints[node.name] = fingerprint
+                durations[node.name] = time.perf_counter() - start
+                continue
+            future = get_executor().submit(timed_compute, node.sv_compute, args)
+            futures[node.name] = (start, fingerprint, future)
+
+        for node in level_nodes:
+            if errors:
+                break
+            if node.name in worker_names:
+                continue
+            start = time.perf_counter()
+            try:
+                durations[node.name] = update_node(node, fingerprints)
+            except Exception as err:
+                errors.append((node.name, err))
+                break
+            graph.append({"name": node.name,
+                          "bl_idname": node.bl_idname,
+                          "start": start,
+                          "duration": durations[node.name] or 0.0})
+
+        for name, (start, fingerprint, future) in futures.items():
+            node = nodes[name]
+            try:
+                result, duration = future.result()
+                if errors:
+                    continue
+                write_start = time.perf_counter()
+                node.sv_write(result)
+                duration += time.perf_counter() - write_start
+            except Exception as err:
+                errors.append((name, err))
+                continue
+            if fingerprint is not None:
+                fingerprints[name] = fingerprint
+            durations[name] = duration
+            graph.append({"name": name,
+                          "bl_idname": node.bl_idname,
+                          "start": start,
+                          "duration": duration,
+                          "thread": True})
+        if errors:
+            for name, err in errors:
+                update_error_nodes(ng, name, err)
+                traceback.print_tb(err.__traceback__)
+                print("Node {0} had exception {1}".format(name, err))
+            return None
+
+    graphs.append(graph)
+    if profiling.ENABLED:
+        profiling.record_graph(nodes, graph)
+    if data_structure.DEBUG_MODE:
+        total_time = time.perf_counter() - total_start
+        print("Node set updated in: {:.4f} seconds (parallel)".format(total_time))
+    return [durations.get(name) or 0.0 for name in node_list]
+
+
 def do_update(node_list, nodes):
     if data_structure.HEAT_MAP:
         do_update_heat_map(node_list, nodes)
+    elif data_structure.PARALLEL_UPDATE:
+        do_update_parallel(node_list, nodes)
     else:
         do_update_general(node_list, nodes)
 
@@ -369,6 +670,7 @@ def build_update_list(ng=None):
         update_cache[ng.name] = out
         partial_update_cache[ng.name] = {}
         data_structure.reset_socket_cache(ng)
+        reset_fingerprints(ng)
 
 
 def process_to_node(node):
@@ -447,11 +749,17 @@ def process_tree(ng=None):
     elif ng.bl_idname == "SverchCustomTreeType" and ng.sv_process:
         update_list = update_cache.get(ng.name)
         reset_error_nodes(ng)
+        # copy stats are per full tree update
+        data_structure.reset_copy_stats(ng)
         if not update_list:
             build_update_list(ng)
             update_list = update_cache.get(ng.name)
-        for l in update_list:
-            do_update(l, ng.nodes)
+        if data_structure.PARALLEL_UPDATE and not data_structure.HEAT_MAP:
+            # separate node sets have no common dependencies, schedule them together
+            do_update_parallel([name for l in update_list for name in l], ng.nodes)
+        else:
+            for l in update_list:
+                do_update(l, ng.nodes)
     else:
         pass
 
@@ -20,15 +20,23 @@ from functools import reduce
 from math import radians
 import itertools
 import time
+import array
+import hashlib
+import struct
 import ast
+import sys
 import bpy
 from mathutils import Vector, Matrix
+import numpy as np
 
 global bmesh_mapping, per_cache
 
 DEBUG_MODE = False
 HEAT_MAP = False
 RELOAD_EVENT = False
+INCREMENTAL_UPDATE = False
+PARALLEL_UPDATE = False
+PARALLEL_THREADS = 4
 
 # this is set correctly later.
 SVERCHOK_NAME = "sverchok"
@@ -39,6 +47,10 @@ temp_handle = {}
 # cache_nodes = {}
 # socket cache
 socket_data_cache = {}
+# fingerprints of socket data, only filled in incremental update mode
+socket_fingerprint_cache = {}
+# per node group counters of socket data copied and shared on read
+socket_copy_stats = {}
 # for viewer baker node cache
 cache_viewer_baker = {}
 sv_Vars = {}
@@ -200,6 +212,8 @@ def repeat_last(lst):
 
 # longest list matching [[1,2,3,4,5], [10,11]] -> [[1,2,3,4,5], [10,11,11,11,11]]
 def match_long_repeat(lsts):
+    if any(isinstance(l, np.ndarray) for l in lsts):
+        return mixed_match_long_repeat(lsts)
     max_l = 0
     tmp = []
     for l in lsts:
@@ -212,6 +226,34 @@ def match_long_repeat(lsts):
     return list(map(list, zip(*zip(*tmp))))
 
 
+# repeat the last item of an array along the first axis up to length
+def array_repeat_last(a, length):
+    d = length - len(a)
+    if d > 0 and len(a):
+        a = np.concatenate((a, np.repeat(a[-1:], d, axis=0)))
+    return a
+
+
+# longest list matching for arrays, the last item along the first axis is repeated
+def numpy_match_long_repeat(lsts):
+    arrays = [np.asarray(l) for l in lsts]
+    max_l = max(len(a) for a in arrays)
+    return [array_repeat_last(a, max_l) for a in arrays]
+
+
+# longest list matching when some of the lists are arrays, arrays stay
+# arrays and the other lists, which may be ragged, stay lists
+def mixed_match_long_repeat(lsts):
+    max_l = max(len(l) for l in lsts)
+    out = []
+    for l in lsts:
+        if isinstance(l, np.ndarray):
+            out.append(array_repeat_last(l, max_l))
+        else:
+            out.append(list(itertools.islice(repeat_last(l), max_l)))
+    return out
+
+
 # longest list matching, cycle [[1,2,3,4,5] ,[10,11]] -> [[1,2,3,4,5] ,[10,11,10,11,10]]
 def match_long_cycle(lsts):
     max_l = 0
@@ -495,6 +537,8 @@ def dataStandart(data, dept, nominal_dept):
 def levelsOflist(lst):
     level = 1
     for n in lst:
+        if isinstance(n, np.ndarray):
+            return level + n.ndim
         if n and isinstance(n, (list, tuple)):
             level += levelsOflist(n)
         return level
@@ -568,13 +612,57 @@ def Matrix_rotation(prop, list=False):
 
 
 def Vector_generate(prop):
-    return [[Vector(v) for v in obj] for obj in prop]
+    return [[Vector(v) for v in (obj.tolist() if isinstance(obj, np.ndarray) else obj)] for obj in prop]
 
 
 def Vector_degenerate(prop):
     return [[v[0:3] for v in obj] for obj in prop]
 
 
+#####################################################
+################### numpy magic #####################
+#####################################################
+
+# sockets can carry numpy arrays instead of nested lists, one array
+# per object, (n, 3) for vertices, (n, 2) or (n, k) for edges and
+# polygons, (n, 4, 4) for matrices and (n,) for numbers.
+# nodes that can read arrays set sv_accepts_numpy = True, all other
+# nodes get plain lists from SvGetSocket.
+
+
+def is_numpy_data(data):
+    """
+    True if data is an array or a list with arrays as first items
+    """
+    while isinstance(data, (list, tuple)) and data:
+        data = data[0]
+    return isinstance(data, np.ndarray)
+
+
+def sv_to_array(obj, dtype=np.float64):
+    """
+    Convert data of one object to an array, arrays are passed as is.
+    Ragged data, like polygons with different vertex count, stays a list.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj if obj.dtype == dtype else obj.astype(dtype)
+    try:
+        return np.array(obj, dtype=dtype)
+    except ValueError:
+        return obj
+
+
+def sv_to_list(data):
+    """
+    Convert arrays in socket data to nested lists
+    """
+    if isinstance(data, np.ndarray):
+        return data.tolist()
+    if isinstance(data, (list, tuple)) and is_numpy_data(data):
+        return [sv_to_list(d) for d in data]
+    return data
+
+
 def Edg_pol_generate(prop):
     edg_pol_out = []
     if len(prop[0][0]) == 2:
@@ -860,6 +948,9 @@ def sverchok_debug(mode):
 def setup_init():
     global DEBUG_MODE
     global HEAT_MAP
+    global INCREMENTAL_UPDATE
+    global PARALLEL_UPDATE
+    global PARALLEL_THREADS
     global SVERCHOK_NAME
     import sverchok
     SVERCHOK_NAME = sverchok.__name__
@@ -867,6 +958,9 @@ def setup_init():
     if addon:
         DEBUG_MODE = addon.preferences.show_debug
         HEAT_MAP = addon.preferences.heat_map
+        INCREMENTAL_UPDATE = addon.preferences.incremental_update
+        PARALLEL_UPDATE = addon.preferences.parallel_update
+        PARALLEL_THREADS = addon.preferences.parallel_threads
     else:
         print("Setup of preferences failed")
 
@@ -898,6 +992,71 @@ def heat_map_state(state):
                     setattr(node, 'use_custom_color', use)
             ng.sv_user_colors = ""
 
+#####################################################
+###########  incremental update system   ############
+#####################################################
+
+
+def incremental_update_state(state):
+    """
+    Turn incremental update on or off. Fingerprints are only
+    maintained while it is on, so they are dropped on every switch.
+    """
+    global INCREMENTAL_UPDATE
+    INCREMENTAL_UPDATE = state
+    socket_fingerprint_cache.clear()
+
+
+class _Unfingerprintable(Exception):
+    pass
+
+
+def data_fingerprint(data):
+    """
+    Content digest of socket data, equal only for equal data.
+    Arrays are digested by their raw bytes, nested lists element wise.
+    Returns None for data it can't fingerprint, nodes reading such
+    data are never skipped.
+    """
+    md5 = hashlib.md5()
+    try:
+        _feed_fingerprint(md5, data)
+    except _Unfingerprintable:
+        return None
+    return md5.digest()
+
+
+def _feed_fingerprint(md5, data):
+    data_type = type(data)
+    if data is None:
+        md5.update(b"N")
+    elif data_type is bool:
+        md5.update(b"T" if data else b"F")
+    elif data_type is int:
+        md5.update(b"i" + str(data).encode() + b";")
+    elif data_type is float:
+        md5.update(b"f" + struct.pack("d", data))
+    elif data_type in (str, bytes):
+        raw = data.encode("utf-8") if data_type is str else data
+        md5.update((b"s" if data_type is str else b"b") + struct.pack("Q", len(raw)) + raw)
+    elif data_type in (list, tuple):
+        md5.update((b"l" if data_type is list else b"t") + struct.pack("Q", len(data)))
+        # plain lists of floats, the usual number lists, at once
+        if data and all(type(d) is float for d in data):
+            md5.update(b"d" + array.array("d", data).tobytes())
+        else:
+            for d in data:
+                _feed_fingerprint(md5, d)
+    elif isinstance(data, np.ndarray):
+        if data.dtype.hasobject:
+            raise _Unfingerprintable()
+        md5.update(b"A" + data.dtype.str.encode() + str(data.shape).encode())
+        md5.update(np.ascontiguousarray(data).tobytes())
+    elif isinstance(data, np.generic):
+        md5.update(b"g" + data.dtype.str.encode() + data.tobytes())
+    else:
+        raise _Unfingerprintable()
+
 #####################################################
 ############### update system magic! ################
 #####################################################
@@ -1133,8 +1292,10 @@ def SvSetSocketAnyType(self, socket_name, out):
 
 
 def sv_deep_copy(lst):
+    if isinstance(lst, np.ndarray):
+        return lst.copy()
     if isinstance(lst, (list, tuple)):
-        if lst and not isinstance(lst[0], (list, tuple)):
+        if lst and not isinstance(lst[0], (list, tuple, np.ndarray)):
             return lst[:]
         return [sv_deep_copy(l) for l in lst]
     return lst
@@ -1171,9 +1332,72 @@ def SvSetSocket(socket, out):
     if s_ng not in socket_data_cache:
         socket_data_cache[s_ng] = {}
     socket_data_cache[s_ng][s_id] = out
+    if INCREMENTAL_UPDATE:
+        if s_ng not in socket_fingerprint_cache:
+            socket_fingerprint_cache[s_ng] = {}
+        socket_fingerprint_cache[s_ng][s_id] = data_fingerprint(out)
+
+
+def sv_deep_copy_sized(lst):
+    """
+    Same as sv_deep_copy but also returns the number of bytes
+    of the containers created, the items themselves are shared.
+    """
+    if isinstance(lst, np.ndarray):
+        out = lst.copy()
+        return out, out.nbytes
+    if isinstance(lst, (list, tuple)):
+        if lst and not isinstance(lst[0], (list, tuple, np.ndarray)):
+            out = lst[:]
+            return out, (sys.getsizeof(out) if out is not lst else 0)
+        out = []
+        size = 0
+        for l in lst:
+            item, item_size = sv_deep_copy_sized(l)
+            out.append(item)
+            size += item_size
+        return out, size + sys.getsizeof(out)
+    return lst, 0
+
+
+def count_socket_read(ng_name, copied_bytes=None):
+    """
+    Record a socket read for the node group, copied_bytes is None
+    when the data was shared by reference
+    """
+    if ng_name not in socket_copy_stats:
+        socket_copy_stats[ng_name] = {"copies": 0, "bytes": 0, "shared": 0}
+    stats = socket_copy_stats[ng_name]
+    if copied_bytes is None:
+        stats["shared"] += 1
+    else:
+        stats["copies"] += 1
+        stats["bytes"] += copied_bytes
+
+
+def get_copy_stats(ng):
+    """
+    Socket read statistics of node group since the last reset,
+    dict with number of copies, bytes copied and number of shared reads
+    """
+    return dict(socket_copy_stats.get(ng.name, {"copies": 0, "bytes": 0, "shared": 0}))
+
+
+def reset_copy_stats(ng=None):
+    if ng:
+        socket_copy_stats.pop(ng.name, None)
+    else:
+        socket_copy_stats.clear()
 
 
 def SvGetSocket(socket, deepcopy=True):
+    """
+    Get data from the socket linked to socket.
+    Data is copied unless deepcopy is False or the node declares
+    sv_mutates_inputs = False, in that case the data is shared with
+    all other readers and must be treated as read only.
+    Arrays are converted to lists unless the node declares sv_accepts_numpy.
+    """
     global socket_data_cache
     global DEBUG_MODE
     if socket.is_linked:
@@ -1184,9 +1408,16 @@ def SvGetSocket(socket, deepcopy=True):
             raise LookupError
         if s_id in socket_data_cache[s_ng]:
             out = socket_data_cache[s_ng][s_id]
-            if deepcopy:
-                return sv_deep_copy(out)
+            if not getattr(socket.node, "sv_accepts_numpy", False) and is_numpy_data(out):
+                out = sv_to_list(out)
+                count_socket_read(s_ng, sys.getsizeof(out))
+                return out
+            if deepcopy and getattr(socket.node, "sv_mutates_inputs", True):
+                out, size = sv_deep_copy_sized(out)
+                count_socket_read(s_ng, size)
+                return out
             else:
+                count_socket_read(s_ng)
                 return out
         else:
             if DEBUG_MODE:
@@ -1206,6 +1437,7 @@ def reset_socket_cache(ng):
     """
     global socket_data_cache
     socket_data_cache[ng.name] = {}
+    socket_fingerprint_cache[ng.name] = {}
 
 
 ####################################
@@ -221,6 +221,9 @@ class SvNodeTreeCommon(object):
     def get_update_lists(self):
         return get_update_lists(self)
 
+    def get_copy_stats(self):
+        return data_structure.get_copy_stats(self)
+
 
 class SverchCustomTree(NodeTree, SvNodeTreeCommon):
     ''' Sverchok - architectural node programming of geometry in low level '''
@@ -296,6 +299,19 @@ class SverchGroupTree(NodeTree, SvNodeTreeCommon):
 
 class SverchCustomTreeNode:
 
+    # set on nodes that split process into sv_gather, sv_compute and
+    # sv_write, parallel update then runs sv_compute in a worker thread
+    sv_parallel = False
+    # nodes that never modify data read from their inputs can set
+    # this to False, they then share the data instead of copying it
+    sv_mutates_inputs = True
+    # nodes that can read numpy arrays from their inputs, see
+    # numpy magic in data_structure, others get lists
+    sv_accepts_numpy = False
+    # nodes that read blender data, the frame or anything else outside
+    # of their input sockets, incremental update never skips these
+    sv_volatile = False
+
     @classmethod
     def poll(cls, ntree):
         return ntree.bl_idname in ['SverchCustomTreeType', 'SverchGroupTreeType']
@@ -89,6 +89,7 @@ class AreaNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'AreaNode'
     bl_label = 'Area'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_mutates_inputs = False
 
     per_face = BoolProperty(name='per_face',
                             default=True,
@@ -31,6 +31,7 @@ class SvBBoxNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvBBoxNode'
     bl_label = 'Bounding box'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_mutates_inputs = False
 
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', 'Vertices')
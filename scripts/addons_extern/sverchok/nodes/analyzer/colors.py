@@ -28,6 +28,7 @@ class SvVertexColorNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvVertexColorNode'
     bl_label = 'Vertex colors'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     vertex_color = StringProperty(default='', update=updateNode)
     clear = BoolProperty(name='clear c', default=True, update=updateNode)
@@ -191,6 +191,7 @@ class SvImageComponentsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvImageComponentsNode'
     bl_label = 'Image Components'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     # node storage, reference by the hash of self.
     node_dict = {}
@@ -26,6 +26,7 @@ class SvRayCastNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvRayCastSceneNode'
     bl_label = 'scene_raycast'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def sv_init(self, context):
         si, so = self.inputs.new, self.outputs.new
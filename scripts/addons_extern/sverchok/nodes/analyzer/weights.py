@@ -27,6 +27,7 @@ class SvVertexGroupNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvVertexGroupNode'
     bl_label = 'Vertex group weights'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     fade_speed = FloatProperty(name='fade', default=2, update=updateNode)
     clear = BoolProperty(name='clear w', default=True, update=updateNode)
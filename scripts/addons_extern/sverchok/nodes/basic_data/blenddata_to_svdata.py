@@ -27,6 +27,7 @@ class SvObjectToMeshNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvObjectToMeshNode'
     bl_label = 'Object ID Out'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     modifiers = BoolProperty(name='Modifiers', default=False, update=updateNode)
 
@@ -40,6 +40,7 @@ class SvDupliInstancesMK3(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvDupliInstancesMK3'
     bl_label = 'Dupli Instances MK3'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def set_child_quota(self, context):
         updateNode(self, context)
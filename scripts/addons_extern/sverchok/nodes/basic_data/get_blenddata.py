@@ -27,6 +27,7 @@ class SvGetDataObjectNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGetDataObjectNode'
     bl_label = 'Object ID Get'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     M = ['actions', 'brushes', 'filepath', 'grease_pencil', 'groups',
          'images', 'libraries', 'linestyles', 'masks', 'materials',
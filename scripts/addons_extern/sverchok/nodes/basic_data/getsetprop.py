@@ -154,6 +154,7 @@ class SvGetPropNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGetPropNode'
     bl_label = 'Get'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     bad_prop = BoolProperty(default=False)
 
@@ -156,6 +156,7 @@ class SvGroupNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
     bl_idname = 'SvGroupNode'
     bl_label = 'Group'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     group_name = StringProperty()
 
@@ -237,6 +238,7 @@ class SvIterationNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
     bl_idname = 'SvIterationNode'
     bl_label = 'Group Inputs'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     iter_count = IntProperty(name="Count")
     group_name = StringProperty()
@@ -301,6 +303,7 @@ class SvGroupInputsNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
     bl_idname = 'SvGroupInputsNode'
     bl_label = 'Group Inputs'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def get_sockets(self):
         yield self.outputs, "outputs"
@@ -310,6 +313,7 @@ class SvGroupOutputsNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
     bl_idname = 'SvGroupOutputsNode'
     bl_label = 'Group outputs'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def get_sockets(self):
         yield self.inputs, "inputs"
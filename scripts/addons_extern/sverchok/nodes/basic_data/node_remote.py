@@ -55,6 +55,7 @@ class SvNodeRemoteNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvNodeRemoteNode'
     bl_label = 'Sv Node Remote'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     activate = BoolProperty(
         default=True,
@@ -33,6 +33,7 @@ class SvObjRemoteNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvObjRemoteNode'
     bl_label = 'Sv Obj Remote'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     activate = BoolProperty(
         default=True,
@@ -114,6 +114,7 @@ class ObjectsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ObjectsNode'
     bl_label = 'Objects_in'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def hide_show_versgroups(self, context):
         if self.vergroups and not ('Vers_grouped' in self.outputs):
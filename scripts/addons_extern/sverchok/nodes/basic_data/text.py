@@ -105,6 +105,7 @@ class SvTextInNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvTextInNode'
     bl_label = 'Text Input'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     csv_data = {}
     list_data = {}
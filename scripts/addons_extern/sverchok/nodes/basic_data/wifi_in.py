@@ -38,6 +38,7 @@ class WifiInNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'WifiInNode'
     bl_label = 'Wifi input'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def change_var_name(self, context):
         # no change
@@ -31,6 +31,7 @@ class WifiOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'WifiOutNode'
     bl_label = 'Wifi output'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     var_name = StringProperty(name='var_name',
                               default='')
@@ -27,6 +27,7 @@ class Sv3DviewPropsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'Sv3DviewPropsNode'
     bl_label = 'Sv 3Dview Props Node'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def draw_buttons(self, context, layout):
         context = bpy.context
@@ -27,6 +27,7 @@ class SvFrameInfoNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvFrameInfoNode'
     bl_label = 'Frame Info'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def sv_init(self, context):
         self.outputs.new('StringsSocket', "Current Frame", "Current Frame")
@@ -165,6 +165,7 @@ class IndexViewerNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'IndexViewerNode'
     bl_label = 'Index Viewer Draw'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_mutates_inputs = False
 
     # node id
     n_id = StringProperty(default='', options={'SKIP_SAVE'})
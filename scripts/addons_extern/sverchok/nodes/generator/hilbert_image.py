@@ -28,6 +28,7 @@ class HilbertImageNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'HilbertImageNode'
     bl_label = 'HilbertImage'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def images(self, context):
         return [tuple(3 * [im.name]) for im in bpy.data.images]
@@ -29,6 +29,7 @@ class ImageNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ImageNode'
     bl_label = 'Image'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def images(self, context):
         return [tuple(3 * [im.name]) for im in bpy.data.images]
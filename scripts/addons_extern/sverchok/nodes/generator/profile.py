@@ -450,6 +450,7 @@ class SvProfileNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvProfileNode'
     bl_label = 'ProfileNode'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def mode_change(self, context):
         if not (self.selected_axis == self.current_axis):
@@ -161,6 +161,7 @@ class SvScriptNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScriptNode'
     bl_label = 'Script Generator'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def avail_templates(self, context):
         fullpath = [sv_path, "node_scripts", "templates"]
@@ -114,6 +114,7 @@ class SvScriptNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScriptNodeMK2'
     bl_label = 'Script Node 2'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_volatile = True
 
     def avail_templates(self, context):
         templates_path = os.path.join(sv_path, "node_scripts", "SN2-templates")
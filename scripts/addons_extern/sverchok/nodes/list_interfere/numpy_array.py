@@ -33,6 +33,7 @@ class SvNumpyArrayNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvNumpyArrayNode'
     bl_label = 'numpy_props'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_parallel = True
 
     Modes = ['tolist', 'conj', 'flatten', 'reshape', 'repeat', 'resize',
              'transpose', 'swapaxes', 'squeeze', 'partition', 'searchsorted', 'round',
@@ -49,12 +50,23 @@ class SvNumpyArrayNode(bpy.types.Node, SverchCustomTreeNode):
         layout.prop(self, "Mod", "Get")
         layout.prop(self, "st", text="args")
 
-    def process(self):
+    def sv_gather(self):
         if self.outputs['Value'].is_linked:
-            L = self.inputs['List'].sv_get()
-            L = numpy.array(L) if not isinstance(L, numpy.ndarray) else L
-            Ln = eval("L." + self.Mod + "(" + self.st + ")")
-            self.outputs['Value'].sv_set(Ln)
+            return self.inputs['List'].sv_get(), self.Mod, self.st
+
+    @staticmethod
+    def sv_compute(args):
+        L, mode, st = args
+        L = numpy.array(L) if not isinstance(L, numpy.ndarray) else L
+        return eval("L." + mode + "(" + st + ")")
+
+    def sv_write(self, Ln):
+        self.outputs['Value'].sv_set(Ln)
+
+    def process(self):
+        args = self.sv_gather()
+        if args is not None:
+            self.sv_write(self.sv_compute(args))
 
     def update_socket(self, context):
         self.update()
@@ -17,12 +17,15 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+from bpy.props import BoolProperty
 from mathutils import Matrix, Vector
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode, VerticesSocket, MatrixSocket
 from sverchok.data_structure import (Vector_generate, Vector_degenerate,
                                      Matrix_generate, updateNode,
-                                     SvGetSocketAnyType, SvSetSocketAnyType)
+                                     SvGetSocketAnyType, SvSetSocketAnyType,
+                                     is_numpy_data, sv_to_array)
 
 
 class MatrixApplyNode(bpy.types.Node, SverchCustomTreeNode):
@@ -30,25 +33,53 @@ class MatrixApplyNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'MatrixApplyNode'
     bl_label = 'Apply matrix for vectors'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_mutates_inputs = False
+    sv_accepts_numpy = True
+
+    output_numpy = BoolProperty(
+        name="Output NumPy",
+        description="Output numpy arrays, also used when inputs are arrays",
+        default=False, update=updateNode)
 
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vectors", "Vectors")
         self.inputs.new('MatrixSocket', "Matrixes", "Matrixes")
         self.outputs.new('VerticesSocket', "Vectors", "Vectors")
 
+    def draw_buttons_ext(self, context, layout):
+        layout.prop(self, "output_numpy")
+
     def process(self):
         # inputs
         if self.outputs['Vectors'].is_linked:
             vecs_ = SvGetSocketAnyType(self, self.inputs['Vectors'])
-            vecs = Vector_generate(vecs_)
-
             mats_ = SvGetSocketAnyType(self, self.inputs['Matrixes'])
+
+            if self.output_numpy or is_numpy_data(vecs_) or is_numpy_data(mats_):
+                SvSetSocketAnyType(self, 'Vectors', self.vecscorrect_np(vecs_, mats_))
+                return
+
+            vecs = Vector_generate(vecs_)
             mats = Matrix_generate(mats_)
 
             vectors_ = self.vecscorrect(vecs, mats)
             vectors = Vector_degenerate(vectors_)
             SvSetSocketAnyType(self, 'Vectors', vectors)
 
+    def vecscorrect_np(self, vecs, mats):
+        mats = np.array(mats, dtype=np.float64).reshape(-1, 4, 4)
+        out = []
+        lengthve = len(vecs) - 1
+        for i, m in enumerate(mats):
+            v = sv_to_array(vecs[min(i, lengthve)])
+            if v.ndim < 2:
+                # empty objects
+                v = v.reshape(-1, 3)
+            v = v[:, :3]
+            res = v.dot(m[:3, :3].T) + m[:3, 3]
+            out.append(res if self.output_numpy else res.tolist())
+        return out
+
     def vecscorrect(self, vecs, mats):
         out = []
         lengthve = len(vecs) - 1
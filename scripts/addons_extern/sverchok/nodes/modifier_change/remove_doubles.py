@@ -17,12 +17,14 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-from bpy.props import FloatProperty
+from bpy.props import FloatProperty, EnumProperty, BoolProperty
 import bmesh
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, Vector_generate, repeat_last,
-                                     SvSetSocketAnyType, SvGetSocketAnyType)
+                                     SvSetSocketAnyType, SvGetSocketAnyType,
+                                     sv_to_array)
 
 #
 # Remove Doubles
@@ -70,6 +72,63 @@ def remove_doubles(vertices, faces, d, find_doubles=False):
     return (verts, edges, faces, doubles)
 
 
+def remove_doubles_np(vertices, faces, d, find_doubles=False):
+    '''
+    Weld vertices that fall in the same cell of a grid with size d.
+    Faster than bmesh but vertices closer than d that are on
+    different sides of a cell border are kept apart.
+    '''
+    if not len(faces) or not len(vertices):
+        return False
+
+    verts = sv_to_array(vertices)
+    keys = np.round(verts / max(d, 1e-12)).astype(np.int64)
+    # stable sort, the first vertex of each group has the lowest index
+    order = np.lexsort(keys.T[::-1])
+    new_group = np.any(keys[order][1:] != keys[order][:-1], axis=1)
+    group = np.concatenate(([0], np.cumsum(new_group)))
+    first = order[np.concatenate(([0], np.nonzero(new_group)[0] + 1))]
+    # number groups in the original order of their first vertex
+    first_order = np.argsort(first)
+    remap = np.empty_like(first_order)
+    remap[first_order] = np.arange(len(first_order))
+    index = np.empty(len(verts), dtype=np.int64)
+    index[order] = remap[group]
+    first = first[first_order]
+    verts_out = verts[first]
+
+    if find_doubles:
+        merged = np.ones(len(verts), dtype=bool)
+        merged[first] = False
+        doubles = verts[merged]
+    else:
+        doubles = verts[:0]
+
+    faces = sv_to_array(faces, dtype=np.int64)
+    if isinstance(faces, np.ndarray):
+        faces = index[faces]
+    else:
+        faces = [index[f] for f in faces]
+
+    edges_out = set()
+    faces_out = []
+    face_keys = set()
+    for face in faces:
+        # drop vertices merged with their neighbour
+        face = [int(i) for k, i in enumerate(face) if i != face[k - 1]]
+        if len(face) == 2 and face[0] != face[1]:
+            edges_out.add(tuple(sorted(face)))
+        elif len(set(face)) > 2:
+            key = tuple(sorted(face))
+            if key in face_keys:
+                continue
+            face_keys.add(key)
+            faces_out.append(face)
+            edges_out.update(tuple(sorted((face[k - 1], i))) for k, i in enumerate(face))
+
+    return (verts_out, [list(e) for e in sorted(edges_out)], faces_out, doubles)
+
+
 class SvRemoveDoublesNode(bpy.types.Node, SverchCustomTreeNode):
     '''Remove doubles'''
     bl_idname = 'SvRemoveDoublesNode'
@@ -80,6 +139,19 @@ class SvRemoveDoublesNode(bpy.types.Node, SverchCustomTreeNode):
                              default=0.001, precision=3, min=0,
                              update=updateNode)
 
+    modes = [
+        ("BMESH", "BMesh", "Remove doubles with bmesh", 0),
+        ("NUMPY", "NumPy", "Weld vertices on a grid with numpy, faster on dense meshes", 1),
+    ]
+
+    mode = EnumProperty(name='Mode', items=modes, default='BMESH', update=updateNode)
+
+    output_numpy = BoolProperty(
+        name="Output NumPy", description="Output vertices as numpy arrays in NumPy mode",
+        default=False, update=updateNode)
+
+    sv_accepts_numpy = True
+
     def sv_init(self, context):
         self.inputs.new('StringsSocket', 'Distance').prop_name = 'distance'
         self.inputs.new('VerticesSocket', 'Vertices', 'Vertices')
@@ -92,7 +164,11 @@ class SvRemoveDoublesNode(bpy.types.Node, SverchCustomTreeNode):
 
     def draw_buttons(self, context, layout):
         #layout.prop(self, 'distance', text="Distance")
-        pass
+        layout.prop(self, 'mode', expand=True)
+
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, 'output_numpy')
 
     def process(self):
         if not any([s.is_linked for s in self.outputs]):
@@ -101,7 +177,10 @@ class SvRemoveDoublesNode(bpy.types.Node, SverchCustomTreeNode):
         if 'Vertices' in self.inputs and self.inputs['Vertices'].is_linked and \
            'PolyEdge' in self.inputs and self.inputs['PolyEdge'].is_linked:
 
-            verts = Vector_generate(SvGetSocketAnyType(self, self.inputs['Vertices']))
+            numpy_mode = self.mode == 'NUMPY'
+            verts = SvGetSocketAnyType(self, self.inputs['Vertices'])
+            if not numpy_mode:
+                verts = Vector_generate(verts)
             polys = SvGetSocketAnyType(self, self.inputs['PolyEdge'])
             if 'Distance' in self.inputs:
                 distance = self.inputs['Distance'].sv_get()[0]
@@ -116,7 +195,10 @@ class SvRemoveDoublesNode(bpy.types.Node, SverchCustomTreeNode):
             d_out = []
 
             for v, p, d in zip(verts, polys, repeat_last(distance)):
-                res = remove_doubles(v, p, d, has_double_out)
+                if numpy_mode:
+                    res = remove_doubles_np(v, p, d, has_double_out)
+                else:
+                    res = remove_doubles(v, p, d, has_double_out)
                 if not res:
                     return
                 verts_out.append(res[0])
@@ -124,6 +206,10 @@ class SvRemoveDoublesNode(bpy.types.Node, SverchCustomTreeNode):
                 polys_out.append(res[2])
                 d_out.append(res[3])
 
+            if numpy_mode and not self.output_numpy:
+                verts_out = [v.tolist() for v in verts_out]
+                d_out = [v.tolist() for v in d_out]
+
             if 'Vertices' in self.outputs and self.outputs['Vertices'].is_linked:
                 SvSetSocketAnyType(self, 'Vertices', verts_out)
 
@@ -27,6 +27,7 @@ from sverchok.data_structure import updateNode
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 
 from sverchok.utils.csg_core import CSG
+from sverchok.utils import csg_array
 
 
 def Boolean(VA, PA, VB, PB, operation):
@@ -53,13 +54,15 @@ def Boolean(VA, PA, VB, PB, operation):
 
     sys.setrecursionlimit(recursionlimit)
 
+    vertex_index = {}
     for polygon in polygons:
         indices = []
         for v in polygon.vertices:
-            pos = [v.pos.x, v.pos.y, v.pos.z]
-            if not pos in vertices:
-                vertices.append(pos)
-            index = vertices.index(pos)
+            pos = (v.pos.x, v.pos.y, v.pos.z)
+            index = vertex_index.get(pos)
+            if index is None:
+                index = vertex_index[pos] = len(vertices)
+                vertices.append(list(pos))
             indices.append(index)
 
         faces.append(indices)
@@ -67,6 +70,62 @@ def Boolean(VA, PA, VB, PB, operation):
     return [vertices], [faces]
 
 
+def Boolean_array(VA, PA, VB, PB, operation):
+    if not all([VA, PA, VB, PB]):
+        return False, False
+
+    vertices, faces = csg_array.boolean(VA, PA, VB, PB, operation)
+    return [vertices], [faces]
+
+
+def Boolean_bmesh(VA, PA, VB, PB, operation):
+    '''
+    Boolean modifier on temporary objects, for input the BSP engines
+    handle badly (non convex or many coplanar faces)
+    '''
+    if not all([VA, PA, VB, PB]):
+        return False, False
+
+    modifier_operation = {'ITX': 'INTERSECT', 'JOIN': 'UNION', 'DIFF': 'DIFFERENCE'}
+    scene = bpy.context.scene
+    temp = []
+    try:
+        for name, verts, polys in (('sv_csg_a', VA, PA), ('sv_csg_b', VB, PB)):
+            bm = bmesh_from_pydata(verts, [], polys)
+            me = bpy.data.meshes.new(name)
+            bm.to_mesh(me)
+            bm.free()
+            obj = bpy.data.objects.new(name, me)
+            scene.objects.link(obj)
+            temp.append((obj, me))
+
+        obj_a, obj_b = temp[0][0], temp[1][0]
+        mod = obj_a.modifiers.new('sv_csg', 'BOOLEAN')
+        mod.operation = modifier_operation[operation]
+        mod.object = obj_b
+        obj_b.hide = True
+        scene.update()
+
+        result = obj_a.to_mesh(scene, True, 'PREVIEW')
+        vertices = [v.co[:] for v in result.vertices]
+        faces = [list(p.vertices) for p in result.polygons]
+        bpy.data.meshes.remove(result)
+    finally:
+        for obj, me in temp:
+            scene.objects.unlink(obj)
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(me)
+
+    return [vertices], [faces]
+
+
+engines = {
+    'CSG': Boolean,
+    'ARRAY': Boolean_array,
+    'BMESH': Boolean_bmesh
+}
+
+
 class SvCSGBooleanNode(bpy.types.Node, SverchCustomTreeNode):
     '''CSG Boolean Node'''
     bl_idname = 'SvCSGBooleanNode'
@@ -85,6 +144,18 @@ class SvCSGBooleanNode(bpy.types.Node, SverchCustomTreeNode):
         default="ITX",
         update=updateNode)
 
+    engine_options = [
+        ("ARRAY", "Array CSG", "BSP tree CSG on flat arrays, scales to large meshes", 0),
+        ("CSG", "Python CSG", "Original BSP tree CSG on python objects", 1),
+        ("BMESH", "Blender", "Boolean modifier on temporary objects", 2)
+    ]
+
+    engine = EnumProperty(
+        items=engine_options,
+        description="implementation of the boolean operation",
+        default="CSG",
+        update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', 'Verts A')
         self.inputs.new('StringsSocket', 'Polys A')
@@ -93,10 +164,13 @@ class SvCSGBooleanNode(bpy.types.Node, SverchCustomTreeNode):
 
         self.outputs.new('VerticesSocket', 'Vertices', 'Vertices')
         self.outputs.new('StringsSocket', 'Polygons', 'Polygons')
+        # existing trees keep the python engine, new nodes use arrays
+        self.engine = "ARRAY"
 
     def draw_buttons(self, context, layout):
         row = layout.row()
         row.prop(self, 'selected_mode', expand=True)
+        layout.prop(self, 'engine', text='')
 
     def process(self):
         for i in range(4):
@@ -111,7 +185,8 @@ class SvCSGBooleanNode(bpy.types.Node, SverchCustomTreeNode):
         VB = self.inputs['Verts B'].sv_get()[0]
         PB = self.inputs['Polys B'].sv_get()[0]
 
-        verts_out, polys_out = Boolean(VA, PA, VB, PB, self.selected_mode)
+        boolean = engines[self.engine]
+        verts_out, polys_out = boolean(VA, PA, VB, PB, self.selected_mode)
 
         self.outputs['Vertices'].sv_set(verts_out)
         self.outputs['Polygons'].sv_set(polys_out)
@@ -17,11 +17,21 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-from bpy.props import FloatProperty
+from bpy.props import FloatProperty, EnumProperty
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, SvSetSocketAnyType, SvGetSocketAnyType
-from sverchok.utils.voronoi import Site, computeVoronoiDiagram, computeDelaunayTriangulation
+from sverchok.utils.voronoi import voronoi_2d, delaunay_2d, voronoi_cells_3d
+
+
+def cell_edges(faces):
+    edges = set()
+    for face in faces:
+        for i in range(len(face)):
+            a, b = face[i - 1], face[i]
+            edges.add((a, b) if a < b else (b, a))
+    return sorted(edges)
 
 
 class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
@@ -34,78 +44,84 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
                          default=1.0, min=0,
                          options={'ANIMATABLE'}, update=updateNode)
 
+    modes = [
+        ("2D", "2D", "Voronoi edges of the points in xy plane", 0),
+        ("3D", "3D Cells", "Voronoi cell of every point clipped to the bounding box", 1)
+    ]
+
+    mode = EnumProperty(items=modes, default="2D", update=updateNode,
+                        description="2d diagram or one closed cell per point")
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vertices", "Vertices")
  #       self.inputs.new('StringsSocket', "Clipping", "Clipping")
         self.outputs.new('VerticesSocket', "Vertices", "Vertices")
         self.outputs.new('StringsSocket', "Edges", "Edges")
-#        self.outputs.new('StringsSocket', "Polygons", "Polygons")
-# Polygon output does not work right now. Should be fixed
+        self.outputs.new('StringsSocket', "Polygons", "Polygons")
 
     def draw_buttons(self, context, layout):
+        layout.row().prop(self, "mode", expand=True)
         layout.prop(self, "clip", text="Clipping")
 
+    def voronoi_2d(self, obj):
+        pts = np.array(obj, dtype=np.float64)[:, :2]
+        diagram = voronoi_2d(pts)
+
+        # clipping box to bounding box.
+        bb_min = pts.min(axis=0) - self.clip
+        bb_max = pts.max(axis=0) + self.clip
+        verts = np.zeros((len(diagram.vertices), 3))
+        verts[:, :2] = np.minimum(np.maximum(diagram.vertices, bb_min), bb_max)
+        return verts.tolist(), diagram.finite_edges().tolist()
+
+    def voronoi_3d(self, obj):
+        pts = np.array(obj, dtype=np.float64)
+        bb_min = pts.min(axis=0) - self.clip
+        bb_max = pts.max(axis=0) + self.clip
+        verts, edges, polys = [], [], []
+        # empty cells (coincident points) stay as empty objects,
+        # so the cells match the input points by index
+        for cell_verts, cell_faces in voronoi_cells_3d(pts, bb_min, bb_max):
+            verts.append(cell_verts.tolist())
+            edges.append(cell_edges(cell_faces))
+            polys.append(cell_faces)
+        return verts, edges, polys
+
     def process(self):
-        # inputs
-        if 'Edges' in self.outputs and self.outputs['Edges'].is_linked or \
-           'Vertices' in self.outputs and self.outputs['Vertices'].is_linked:
-
-            if 'Vertices' in self.inputs and self.inputs['Vertices'].is_linked:
-                points_in = SvGetSocketAnyType(self, self.inputs['Vertices'])
-
-            pts_out = []
-    #        polys_out = []
-            edges_out = []
-            for obj in points_in:
-                pt_list = []
-                x_max = obj[0][0]
-                x_min = obj[0][0]
-                y_min = obj[0][1]
-                y_max = obj[0][1]
-                # creates points in format for voronoi library, throwing away z
-                for pt in obj:
-                    x, y = pt[0], pt[1]
-                    x_max = max(x, x_max)
-                    x_min = min(x, x_min)
-                    y_max = max(y, y_max)
-                    y_min = min(x, x_min)
-                    pt_list.append(Site(pt[0], pt[1]))
-
-                res = computeVoronoiDiagram(pt_list)
-
-                edges = res[2]
-                delta = self.clip
-                x_max = x_max + delta
-                y_max = y_max + delta
-
-                x_min = x_min - delta
-                y_min = y_min - delta
-
-                # clipping box to bounding box.
-                pts_tmp = []
-                for pt in res[0]:
-                    x, y = pt[0], pt[1]
-                    if x < x_min:
-                        x = x_min
-                    if x > x_max:
-                        x = x_max
-
-                    if y < y_min:
-                        y = y_min
-                    if y > y_max:
-                        y = y_max
-                    pts_tmp.append((x, y, 0))
-
-                pts_out.append(pts_tmp)
-
-                edges_out.append([(edge[1], edge[2]) for edge in edges if -1 not in edge])
-
-            # outputs
-            if 'Vertices' in self.outputs and self.outputs['Vertices'].links:
-                SvSetSocketAnyType(self, 'Vertices', pts_out)
-
-            if 'Edges' in self.outputs and self.outputs['Edges'].links:
-                SvSetSocketAnyType(self, 'Edges', edges_out)
+        outputs = self.outputs
+        if not any(s.is_linked for s in outputs):
+            return
+        if not self.inputs['Vertices'].is_linked:
+            return
+        points_in = SvGetSocketAnyType(self, self.inputs['Vertices'])
+
+        pts_out = []
+        edges_out = []
+        polys_out = []
+        for obj in points_in:
+            if not obj:
+                continue
+            if self.mode == '3D':
+                # one object per cell
+                verts, edges, polys = self.voronoi_3d(obj)
+                pts_out.extend(verts)
+                edges_out.extend(edges)
+                polys_out.extend(polys)
+            else:
+                verts, edges = self.voronoi_2d(obj)
+                pts_out.append(verts)
+                edges_out.append(edges)
+                polys_out.append([])
+
+        # outputs
+        if outputs['Vertices'].is_linked:
+            SvSetSocketAnyType(self, 'Vertices', pts_out)
+
+        if outputs['Edges'].is_linked:
+            SvSetSocketAnyType(self, 'Edges', edges_out)
+
+        if 'Polygons' in outputs and outputs['Polygons'].is_linked:
+            SvSetSocketAnyType(self, 'Polygons', polys_out)
 
     def update_socket(self, context):
         self.update()
@@ -133,9 +149,7 @@ class DelaunayTriangulation2DNode(bpy.types.Node, SverchCustomTreeNode):
 
         for obj in points_in:
 
-            pt_list = [Site(pt[0], pt[1]) for pt in obj]
-            res = computeDelaunayTriangulation(pt_list)
-            tris_out.append([tri for tri in res if -1 not in tri])
+            tris_out.append(delaunay_2d(obj).tolist() if obj else [])
 
         if 'Polygons' in self.outputs and self.outputs['Polygons'].is_linked:
             SvSetSocketAnyType(self, 'Polygons', tris_out)
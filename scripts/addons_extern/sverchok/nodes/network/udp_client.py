@@ -27,6 +27,7 @@ class UdpClientNode(bpy.types.Node, SverchCustomTreeNode):
 
     bl_idname = 'UdpClientNode'
     bl_label = 'UdpClient'
+    sv_volatile = True
 
     def send(self, context):
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
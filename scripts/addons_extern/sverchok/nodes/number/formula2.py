@@ -20,6 +20,7 @@ import parser
 
 import bpy
 from bpy.props import BoolProperty, StringProperty
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (sv_Vars, updateNode, multi_socket, changable_sockets,
@@ -32,6 +33,20 @@ from math import acos, acosh, asin, asinh, atan, atan2, \
     isnan, ldexp, lgamma, log, log10, log1p, log2, modf, \
     pi, pow, radians, sin, sinh, sqrt, tan, tanh, trunc
 
+# names of math functions for evaluating a formula on whole arrays
+numpy_names = {
+    'acos': np.arccos, 'acosh': np.arccosh, 'asin': np.arcsin, 'asinh': np.arcsinh,
+    'atan': np.arctan, 'atan2': np.arctan2, 'atanh': np.arctanh, 'ceil': np.ceil,
+    'copysign': np.copysign, 'cos': np.cos, 'cosh': np.cosh, 'degrees': np.degrees,
+    'e': np.e, 'exp': np.exp, 'expm1': np.expm1, 'fabs': np.fabs, 'floor': np.floor,
+    'fmod': np.fmod, 'hypot': np.hypot, 'isfinite': np.isfinite, 'isinf': np.isinf,
+    'isnan': np.isnan, 'ldexp': np.ldexp, 'log': np.log, 'log10': np.log10,
+    'log1p': np.log1p, 'log2': np.log2, 'pi': np.pi, 'pow': np.power,
+    'radians': np.radians, 'sin': np.sin, 'sinh': np.sinh, 'sqrt': np.sqrt,
+    'tan': np.tan, 'tanh': np.tanh, 'trunc': np.trunc, 'abs': np.abs,
+    'min': np.minimum, 'max': np.maximum, 'np': np,
+}
+
 
 class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
     ''' Formula2 '''
@@ -46,6 +61,15 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
                          default='')
     newsock = BoolProperty(name='newsock',
                            default=False)
+    vectorize = BoolProperty(name='Vectorize',
+                             description='Evaluate the formula once per list with numpy, '
+                                         'only element wise functions can be used',
+                             default=False,
+                             update=updateNode)
+    output_numpy = BoolProperty(name='Output NumPy',
+                                description='Output numpy arrays when vectorized',
+                                default=False,
+                                update=updateNode)
 
     base_name = 'n'
     multi_socket_type = 'StringsSocket'
@@ -53,6 +77,13 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         layout.prop(self, "formula", text="")
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, "vectorize")
+        row = layout.row()
+        row.active = self.vectorize
+        row.prop(self, "output_numpy")
+
     def sv_init(self, context):
         self.inputs.new('StringsSocket', "X", "X")
         self.inputs.new('StringsSocket', "n[0]", "n[0]")
@@ -104,7 +135,10 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
                 list_temp = dataSpoil([list_mult[i - 1]], diflevel - 1)
                 list_mult[i - 1] = dataCorrect(list_temp, nominal_dept=2)
         # print(list_mult)
-        r = self.inte(vecs, code_formula, list_mult, 3)
+        if self.vectorize:
+            r = self.inte_numpy(vecs, code_formula, list_mult)
+        else:
+            r = self.inte(vecs, code_formula, list_mult, 3)
         result = dataCorrect(r, nominal_dept=min((levels[0] - 1), 2))
 
         SvSetSocketAnyType(self, 'Result', result)
@@ -123,6 +157,25 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
             out.append(out1)
         return out
 
+    def inte_numpy(self, list_x, formula, list_n):
+        ''' calc whole lists in formula '''
+        out = []
+        new_list_n = self.normalize(list_n, list_x)
+        names = dict(numpy_names)
+        for v, values in sv_Vars.items():
+            if v[:6] != 'sv_typ':
+                names[v] = np.array(values)
+        for j, x_obj in enumerate(list_x):
+            out1 = []
+            for k, x_lis in enumerate(x_obj):
+                X = np.array(x_lis, dtype=np.float64)
+                n = [np.array(nitem[j][k][:len(X)], dtype=np.float64) for nitem in new_list_n]
+                res = eval(formula, names, {'x': X, 'X': X, 'n': n, 'N': n})
+                res = np.zeros_like(X) + res
+                out1.append(res if self.output_numpy else res.tolist())
+            out.append(out1)
+        return out
+
     def calc_item(self, x, formula, nlist, j, k, q):
         X = x
         n = []
@@ -17,7 +17,8 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-from bpy.props import IntProperty, EnumProperty, FloatProperty, StringProperty
+from bpy.props import IntProperty, EnumProperty, FloatProperty, StringProperty, BoolProperty
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, match_long_repeat
@@ -59,6 +60,28 @@ def frange_step(start, step, count):
         start += step
 
 
+def frange_np(start, stop, step):
+    '''numpy version of frange'''
+    if start == stop:
+        stop += 1
+    step = max(1e-5, abs(step))
+    if start > stop:
+        step = -step
+    return np.arange(start, stop, step)
+
+
+def frange_count_np(start, stop, count):
+    '''numpy version of frange_count'''
+    return np.linspace(start, stop, max(int(count), 2))
+
+
+def frange_step_np(start, step, count):
+    '''numpy version of frange_step'''
+    if abs(step) < 1e-5:
+        step = 1
+    return start + step * np.arange(int(count))
+
+
 class SvGenFloatRange(bpy.types.Node, SverchCustomTreeNode):
     ''' Generator range list of floats'''
     bl_idname = 'SvGenFloatRange'
@@ -114,6 +137,10 @@ class SvGenFloatRange(bpy.types.Node, SverchCustomTreeNode):
 
     mode = EnumProperty(items=modes, default='FRANGE', update=mode_change)
 
+    output_numpy = BoolProperty(
+        name="Output NumPy", description="Output numpy arrays",
+        default=False, update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('StringsSocket', "Start").prop_name = 'start_'
         self.inputs.new('StringsSocket', "Step").prop_name = 'stop_'
@@ -124,18 +151,30 @@ class SvGenFloatRange(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         layout.prop(self, "mode", expand=True)
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, "output_numpy")
+
     func_dict = {'FRANGE': frange,
                  'FRANGE_COUNT': frange_count,
                  'FRANGE_STEP': frange_step}
 
+    func_dict_np = {'FRANGE': frange_np,
+                    'FRANGE_COUNT': frange_count_np,
+                    'FRANGE_STEP': frange_step_np}
+
     def process(self):
         inputs = self.inputs
         outputs = self.outputs
         if not outputs[0].is_linked:
             return
         param = [inputs[i].sv_get()[0] for i in range(3)]
-        f = self.func_dict[self.mode]
-        out = [list(f(*args)) for args in zip(*match_long_repeat(param))]
+        if self.output_numpy:
+            f = self.func_dict_np[self.mode]
+            out = [f(*args) for args in zip(*match_long_repeat(param))]
+        else:
+            f = self.func_dict[self.mode]
+            out = [list(f(*args)) for args in zip(*match_long_repeat(param))]
         outputs['Range'].sv_set(out)
 
 
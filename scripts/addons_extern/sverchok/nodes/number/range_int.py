@@ -17,7 +17,8 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-from bpy.props import IntProperty, EnumProperty, StringProperty
+from bpy.props import IntProperty, EnumProperty, StringProperty, BoolProperty
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, match_long_repeat
@@ -55,6 +56,25 @@ def countRange(start=0, step=1, count=10):
     return list(range(start, stop, step))
 
 
+def intRange_np(start=0, step=1, stop=1):
+    '''numpy version of intRange'''
+    if start == stop:
+        return np.array([], dtype=np.int64)
+    step = max(step, 1)
+    if stop < start:
+        step *= -1
+    return np.arange(start, stop, step, dtype=np.int64)
+
+
+def countRange_np(start=0, step=1, count=10):
+    '''numpy version of countRange'''
+    count = max(count, 0)
+    if count == 0:
+        return np.array([], dtype=np.int64)
+    stop = (count * step) + start
+    return np.arange(start, stop, step, dtype=np.int64)
+
+
 class GenListRangeInt(bpy.types.Node, SverchCustomTreeNode):
     ''' Generator range list of ints '''
     bl_idname = 'GenListRangeIntNode'
@@ -101,6 +121,10 @@ class GenListRangeInt(bpy.types.Node, SverchCustomTreeNode):
 
     mode = EnumProperty(items=modes, default='LAZYRANGE', update=mode_change)
 
+    output_numpy = BoolProperty(
+        name="Output NumPy", description="Output numpy arrays",
+        default=False, update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('StringsSocket', "Start").prop_name = 'start_'
         self.inputs.new('StringsSocket', "Step").prop_name = 'step_'
@@ -111,9 +135,16 @@ class GenListRangeInt(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         layout.prop(self, "mode", expand=True)
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, "output_numpy")
+
     func_dict = {'LAZYRANGE': intRange,
                  'COUNTRANGE': countRange}
 
+    func_dict_np = {'LAZYRANGE': intRange_np,
+                    'COUNTRANGE': countRange_np}
+
     def process(self):
         inputs = self.inputs
         outputs = self.outputs
@@ -121,7 +152,10 @@ class GenListRangeInt(bpy.types.Node, SverchCustomTreeNode):
             return
 
         param = [inputs[i].sv_get()[0] for i in range(3)]
-        f = self.func_dict[self.mode]
+        if self.output_numpy:
+            f = self.func_dict_np[self.mode]
+        else:
+            f = self.func_dict[self.mode]
         out = [f(*args) for args in zip(*match_long_repeat(param))]
         outputs['Range'].sv_set(out)
 
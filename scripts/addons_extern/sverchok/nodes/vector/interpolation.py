@@ -101,6 +101,7 @@ class SvInterpolationNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvInterpolationNode'
     bl_label = 'Vector Interpolation'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_parallel = True
 
     t_in = FloatProperty(name="t",
                          default=.5, min=0, max=1, precision=5,
@@ -121,35 +122,45 @@ class SvInterpolationNode(bpy.types.Node, SverchCustomTreeNode):
         # pass
         layout.prop(self, 'mode', expand=True)
 
-    def process(self):
+    def sv_gather(self):
         if 'Vertices' not in self.outputs:
-            return
-        if not any((s.is_linked for s in self.outputs)):
-            return
-
-        if self.inputs['Vertices'].is_linked:
-            verts = SvGetSocketAnyType(self, self.inputs['Vertices'])
-            verts = dataCorrect(verts)
-            t_ins = self.inputs['Interval'].sv_get()
-            verts_out = []
-            for v, t_in in zip(verts, repeat_last(t_ins)):
-                pts = np.array(v).T
-                tmp = np.apply_along_axis(np.linalg.norm, 0, pts[:, :-1] - pts[:, 1:])
-                t = np.insert(tmp, 0, 0).cumsum()
-                t = t / t[-1]
-                t_corr = [min(1, max(t_c, 0)) for t_c in t_in]
-                # this should also be numpy
-                if self.mode == 'LIN':
-                    out = [np.interp(t_corr, t, pts[i]) for i in range(3)]
-                    verts_out.append(list(zip(*out)))
-                else:  # SPL
-                    spl = cubic_spline(v, t)
-                    out = eval_spline(spl, t, t_corr)
-                    verts_out.append(out)
-
-            if 'Vertices' in self.outputs and self.outputs['Vertices'].is_linked:
-                SvSetSocketAnyType(self, 'Vertices', verts_out)
+            return None
+        if not self.outputs['Vertices'].is_linked:
+            return None
+        if not self.inputs['Vertices'].is_linked:
+            return None
+        verts = SvGetSocketAnyType(self, self.inputs['Vertices'])
+        verts = dataCorrect(verts)
+        t_ins = self.inputs['Interval'].sv_get()
+        return verts, t_ins, self.mode
+
+    @staticmethod
+    def sv_compute(args):
+        verts, t_ins, mode = args
+        verts_out = []
+        for v, t_in in zip(verts, repeat_last(t_ins)):
+            pts = np.array(v).T
+            tmp = np.apply_along_axis(np.linalg.norm, 0, pts[:, :-1] - pts[:, 1:])
+            t = np.insert(tmp, 0, 0).cumsum()
+            t = t / t[-1]
+            t_corr = [min(1, max(t_c, 0)) for t_c in t_in]
+            # this should also be numpy
+            if mode == 'LIN':
+                out = [np.interp(t_corr, t, pts[i]) for i in range(3)]
+                verts_out.append(list(zip(*out)))
+            else:  # SPL
+                spl = cubic_spline(v, t)
+                out = eval_spline(spl, t, t_corr)
+                verts_out.append(out)
+        return verts_out
+
+    def sv_write(self, verts_out):
+        SvSetSocketAnyType(self, 'Vertices', verts_out)
 
+    def process(self):
+        args = self.sv_gather()
+        if args is not None:
+            self.sv_write(self.sv_compute(args))
 
 def register():
     bpy.utils.register_class(SvInterpolationNode)
@@ -23,10 +23,13 @@ import bpy
 from bpy.props import EnumProperty, BoolProperty, StringProperty
 from mathutils import Vector
 from mathutils.noise import noise_vector, cell_vector, noise, cell
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode, VerticesSocket, StringsSocket
 from sverchok.data_structure import (fullList, levelsOflist, updateNode,
-                                     SvSetSocketAnyType, SvGetSocketAnyType)
+                                     SvSetSocketAnyType, SvGetSocketAnyType,
+                                     match_long_repeat, is_numpy_data, sv_to_array,
+                                     numpy_match_long_repeat)
 
 '''
 using slice [:] to generate 3-tuple instead of .to_tuple()
@@ -64,6 +67,57 @@ vector_out = {
 }
 
 
+def np_length(u):
+    return np.sqrt(np.einsum('ij,ij->i', u, u))
+
+
+def np_dot(u, v):
+    return np.einsum('ij,ij->i', u, v)
+
+
+def np_normalize(u):
+    length = np_length(u)
+    length[length == 0] = 1
+    return u / length[:, np.newaxis]
+
+
+def np_angle(u, v):
+    cos = np_dot(u, v) / (np_length(u) * np_length(v))
+    return np.arccos(np.clip(cos, -1, 1))
+
+
+def np_project(u, v):
+    return v * (np_dot(u, v) / np_dot(v, v))[:, np.newaxis]
+
+
+def np_reflect(u, v):
+    n = np_normalize(v)
+    return u - 2 * n * np_dot(u, n)[:, np.newaxis]
+
+
+# vectorized versions, u and v are (n, 3) arrays, s is (n,)
+scalar_out_np = {
+    "DOT": np_dot,
+    "DISTANCE": lambda u, v: np_length(u - v),
+    "ANGLE RAD": np_angle,
+    "ANGLE DEG": lambda u, v: np.degrees(np_angle(u, v)),
+    "LEN": np_length,
+}
+
+vector_out_np = {
+    "CROSS": np.cross,
+    "ADD": np.add,
+    "SUB": np.subtract,
+    "REFLECT": np_reflect,
+    "PROJECT": np_project,
+    "SCALAR": lambda u, s: u * s[:, np.newaxis],
+    "1/SCALAR": lambda u, s: u / s[:, np.newaxis],
+    "NORMALIZE": np_normalize,
+    "NEG": np.negative,
+    "COMPONENT-WISE": np.multiply,
+}
+
+
 class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
 
     ''' VectorMath Node '''
@@ -118,9 +172,20 @@ class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
     scalar_output_socket = BoolProperty()
     current_op = StringProperty(default="CROSS")
 
+    output_numpy = BoolProperty(
+        name="Output NumPy",
+        description="Output numpy arrays, also used when inputs are arrays",
+        default=False, update=updateNode)
+
+    sv_accepts_numpy = True
+
     def draw_buttons(self, context, layout):
         layout.prop(self, "items_", "Functions:")
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, "output_numpy")
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "U", "u")
         self.inputs.new('VerticesSocket', "V", "v")
@@ -213,6 +278,9 @@ class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
         scalars = ["SCALAR", "1/SCALAR", "ROUND"]
         result = []
 
+        if self.process_numpy(u, leve):
+            return
+
         # vector-output
         if 'W' in outputs and outputs['W'].is_linked:
 
@@ -285,6 +353,46 @@ class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
             if result:
                 SvSetSocketAnyType(self, 'out', result)
 
+    def process_numpy(self, u, leve):
+        '''
+        vectorized path, used for objects of vectors when the node outputs
+        arrays or gets them. returns False if the operation has to go
+        through the per vector functions.
+        '''
+        inputs = self.inputs
+        operation = self.items_
+        numpy_in = is_numpy_data(u)
+        if not (self.output_numpy or numpy_in) or leve != 3:
+            return False
+        if operation in vector_out_np:
+            func, out_name = vector_out_np[operation], 'W'
+        elif operation in scalar_out_np:
+            func, out_name = scalar_out_np[operation], 'out'
+        else:
+            return False
+        if out_name not in self.outputs:
+            return False
+
+        args = [u]
+        if len(inputs) == 2:
+            socket = inputs[-1]
+            if not socket.is_linked:
+                return True
+            b = SvGetSocketAnyType(self, socket, deepcopy=False)
+            if not b:
+                return True
+            args.append(b)
+
+        result = []
+        # match objects by repeating the last, then items inside each object
+        for objects in zip(*match_long_repeat([list(a) for a in args])):
+            arrays = numpy_match_long_repeat([sv_to_array(o) for o in objects])
+            res = func(*arrays)
+            result.append(res if self.output_numpy else res.tolist())
+
+        SvSetSocketAnyType(self, out_name, result)
+        return True
+
     '''
     apply f to all values recursively
     - fx and fxy do full list matching by length
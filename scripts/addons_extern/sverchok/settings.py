@@ -1,10 +1,11 @@
 import bpy
 from bpy.types import AddonPreferences
-from bpy.props import BoolProperty, FloatVectorProperty, EnumProperty
+from bpy.props import BoolProperty, FloatVectorProperty, EnumProperty, IntProperty
 
 from sverchok import data_structure
 from sverchok.core import handlers
 from sverchok.core import update_system
+from sverchok.core import profiling
 from sverchok.utils import sv_panels_tools
 from sverchok.ui import color_def
 
@@ -19,6 +20,17 @@ class SverchokPreferences(AddonPreferences):
     def update_heat_map(self, context):
         data_structure.heat_map_state(self.heat_map)
 
+    def update_incremental(self, context):
+        data_structure.incremental_update_state(self.incremental_update)
+        update_system.reset_fingerprints()
+
+    def update_profiling(self, context):
+        profiling.set_profiling(self.profile_nodes, self.profile_history)
+
+    def update_parallel(self, context):
+        data_structure.PARALLEL_UPDATE = self.parallel_update
+        data_structure.PARALLEL_THREADS = self.parallel_threads
+
     def set_frame_change(self, context):
         handlers.set_frame_change(self.frame_change_mode)
 
@@ -46,6 +58,36 @@ class SverchokPreferences(AddonPreferences):
         default=(0.8, 0.0, 0), subtype='COLOR',
         update=update_system.update_error_colors)
 
+    incremental_update = BoolProperty(
+        name="Incremental update",
+        description="Skip nodes whose inputs and properties did not change since the last update",
+        default=False, subtype='NONE',
+        update=update_incremental)
+
+    parallel_update = BoolProperty(
+        name="Parallel update",
+        description="Process independent nodes that support it in worker threads",
+        default=False, subtype='NONE',
+        update=update_parallel)
+
+    parallel_threads = IntProperty(
+        name="Threads",
+        description="Number of worker threads for parallel update",
+        default=4, min=1, max=64,
+        update=update_parallel)
+
+    profile_nodes = BoolProperty(
+        name="Profile nodes",
+        description="Keep a history of node timings, see sverchok.core.profiling",
+        default=False, subtype='NONE',
+        update=update_profiling)
+
+    profile_history = IntProperty(
+        name="History",
+        description="Number of node set updates kept in the profiling history",
+        default=100, min=1, max=10000,
+        update=update_profiling)
+
     #  heat map settings
     heat_map = BoolProperty(
         name="Heat map",
@@ -150,6 +192,12 @@ class SverchokPreferences(AddonPreferences):
         col.prop(self, "show_icons")
         col.prop(self, "over_sized_buttons")
         col.prop(self, "enable_live_objin", text='Enable Live Object-In')
+        col.prop(self, "incremental_update")
+        row1 = col.row()
+        row1.prop(self, "parallel_update")
+        sub = row1.row()
+        sub.active = self.parallel_update
+        sub.prop(self, "parallel_threads")
         col.separator()
 
         col.label(text="Sverchok node theme settings")
@@ -186,6 +234,12 @@ class SverchokPreferences(AddonPreferences):
         row1.prop(self, "exception_color")
         row1.prop(self, "no_data_color")
 
+        row1 = col.row()
+        row1.prop(self, "profile_nodes")
+        sub = row1.row()
+        sub.active = self.profile_nodes
+        sub.prop(self, "profile_history")
+
         col.prop(self, "heat_map")
         row1 = col.row()
         row1.active = self.heat_map
@@ -0,0 +1,401 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Array backed BSP tree CSG, same algorithm as csg_core / csg_geom
+(a port of csg.js) but polygons are stored in flat numpy arrays:
+
+- all vertices live in one growable VertexPool
+- a PolygonBatch is a set of polygons, concatenated vertex indices
+  (loops), vertex count per polygon and a plane per polygon
+- a plane classifies every vertex of a batch in one call, only the
+  polygons spanning the plane are split in python
+- building and clipping the BSP tree is iterative, no recursion limit
+
+Input polygons must be convex, as for csg_core.
+'''
+
+import numpy as np
+
+EPSILON = 1e-5
+
+COPLANAR = 0
+FRONT = 1
+BACK = 2
+SPANNING = 3
+
+
+class VertexPool(object):
+    '''
+    Growable (n, 3) array of vertex positions
+    '''
+
+    def __init__(self, verts=None):
+        verts = np.zeros((0, 3)) if verts is None else np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+        self.size = len(verts)
+        self.data = np.empty((max(16, 2 * self.size), 3))
+        self.data[:self.size] = verts
+
+    def append(self, points):
+        '''
+        Add (k, 3) points, returns their indices
+        '''
+        k = len(points)
+        if self.size + k > len(self.data):
+            data = np.empty((max(2 * len(self.data), self.size + k), 3))
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+        self.data[self.size:self.size + k] = points
+        self.size += k
+        return np.arange(self.size - k, self.size)
+
+    @property
+    def array(self):
+        return self.data[:self.size]
+
+
+class PolygonBatch(object):
+    '''
+    Polygons as concatenated vertex indices into a VertexPool
+    '''
+
+    def __init__(self, loops, counts, normals, ws):
+        self.loops = np.asarray(loops, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+        self.ws = np.asarray(ws, dtype=np.float64)
+        self.starts = np.cumsum(self.counts) - self.counts
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], np.zeros((0, 3)), [])
+
+    @classmethod
+    def from_pydata(cls, pool, faces):
+        '''
+        Batch of faces indexing pool, planes by Newell's method,
+        degenerate faces are dropped
+        '''
+        faces = [f for f in faces if len(f) > 2]
+        if not faces:
+            return cls.empty()
+        counts = np.array([len(f) for f in faces], dtype=np.int64)
+        loops = np.fromiter((i for f in faces for i in f), dtype=np.int64, count=int(counts.sum()))
+        starts = np.cumsum(counts) - counts
+        co = pool.array[loops]
+        # next vertex of every loop, wrapping around each polygon
+        nxt = np.arange(len(loops)) + 1
+        nxt[starts + counts - 1] = starts
+        normals = np.add.reduceat(np.cross(co, co[nxt]), starts, axis=0)
+        length = np.sqrt((normals ** 2).sum(axis=1))
+        keep = length > 1e-12
+        normals = normals[keep] / length[keep, np.newaxis]
+        batch = cls(loops, counts, np.zeros((len(counts), 3)), np.zeros(len(counts)))
+        batch = batch.take(np.nonzero(keep)[0])
+        batch.normals = normals
+        batch.ws = (normals * pool.array[batch.loops[batch.starts]]).sum(axis=1)
+        return batch
+
+    def __len__(self):
+        return len(self.counts)
+
+    def take(self, indices):
+        '''
+        New batch with the polygons at indices
+        '''
+        indices = np.asarray(indices, dtype=np.int64)
+        if not len(indices):
+            return PolygonBatch.empty()
+        if len(indices) == len(self.counts):
+            return self
+        counts = self.counts[indices]
+        starts = self.starts[indices]
+        new_starts = np.cumsum(counts) - counts
+        offsets = np.repeat(starts - new_starts, counts)
+        loops = self.loops[offsets + np.arange(int(counts.sum()))]
+        return PolygonBatch(loops, counts, self.normals[indices], self.ws[indices])
+
+    def flipped(self):
+        '''
+        New batch with reversed vertex order and flipped planes
+        '''
+        if not len(self):
+            return self
+        starts = np.repeat(self.starts, self.counts)
+        ends = np.repeat(self.starts + self.counts - 1, self.counts)
+        index = starts + ends - np.arange(len(self.loops))
+        return PolygonBatch(self.loops[index], self.counts, -self.normals, -self.ws)
+
+    @staticmethod
+    def concat(batches):
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return PolygonBatch.empty()
+        if len(batches) == 1:
+            return batches[0]
+        return PolygonBatch(
+            np.concatenate([b.loops for b in batches]),
+            np.concatenate([b.counts for b in batches]),
+            np.concatenate([b.normals for b in batches]),
+            np.concatenate([b.ws for b in batches]))
+
+    def polygons(self):
+        '''
+        List of vertex index lists
+        '''
+        return np.split(self.loops, self.starts[1:]) if len(self) else []
+
+
+def split_batch(pool, normal, w, batch):
+    '''
+    Split all polygons of batch by the plane (normal, w).
+    Returns batches (coplanar_front, coplanar_back, front, back)
+    '''
+    empty = PolygonBatch.empty()
+    if not len(batch):
+        return empty, empty, empty, empty
+    dist = pool.array[batch.loops].dot(normal) - w
+    types = np.where(dist < -EPSILON, BACK, np.where(dist > EPSILON, FRONT, COPLANAR))
+    poly_types = np.bitwise_or.reduceat(types, batch.starts)
+
+    # most batches deep in the tree are on one side of the plane
+    if (poly_types == FRONT).all():
+        return empty, empty, batch, empty
+    if (poly_types == BACK).all():
+        return empty, empty, empty, batch
+
+    coplanar = poly_types == COPLANAR
+    facing = batch.normals.dot(normal) > 0
+    coplanar_front = batch.take(np.nonzero(coplanar & facing)[0])
+    coplanar_back = batch.take(np.nonzero(coplanar & ~facing)[0])
+    front = [batch.take(np.nonzero(poly_types == FRONT)[0])]
+    back = [batch.take(np.nonzero(poly_types == BACK)[0])]
+
+    spanning = np.nonzero(poly_types == SPANNING)[0]
+    if len(spanning):
+        front.append(split_spanning(pool, normal, w, batch, spanning, types, dist, True))
+        back.append(split_spanning(pool, normal, w, batch, spanning, types, dist, False))
+
+    return coplanar_front, coplanar_back, PolygonBatch.concat(front), PolygonBatch.concat(back)
+
+
+def split_spanning(pool, normal, w, batch, spanning, types, dist, keep_front):
+    '''
+    Fragments of the spanning polygons on one side of the plane
+    '''
+    drop = BACK if keep_front else FRONT
+    loops, counts, parents, new_points = [], [], [], []
+    new_index = pool.size
+    for p in spanning:
+        start = batch.starts[p]
+        end = start + batch.counts[p]
+        fragment = []
+        for i in range(start, end):
+            j = i + 1 if i + 1 < end else start
+            ti, tj = types[i], types[j]
+            if ti != drop:
+                fragment.append(batch.loops[i])
+            if (ti | tj) == SPANNING:
+                vi = batch.loops[i]
+                vj = batch.loops[j]
+                t = dist[i] / (dist[i] - dist[j])
+                a = pool.data[vi]
+                new_points.append(a + (pool.data[vj] - a) * t)
+                fragment.append(new_index)
+                new_index += 1
+        if len(fragment) >= 3:
+            loops.extend(fragment)
+            counts.append(len(fragment))
+            parents.append(p)
+    if new_points:
+        pool.append(np.array(new_points))
+    if not counts:
+        return PolygonBatch.empty()
+    return PolygonBatch(loops, counts, batch.normals[parents], batch.ws[parents])
+
+
+class BSPNode(object):
+    '''
+    Node of a BSP tree, only the splitting plane and the children
+    '''
+    __slots__ = ('normal', 'w', 'front', 'back')
+
+    def __init__(self, normal, w):
+        self.normal = normal
+        self.w = w
+        self.front = None
+        self.back = None
+
+
+class BSPTree(object):
+    '''
+    Unlike csg_geom.CSGNode the polygons are not kept per tree node but
+    in one batch for the whole tree, clip_to then clips them all in a
+    single pass down the other tree. Only the order of the polygons
+    differs from the node wise storage.
+    '''
+
+    def __init__(self, pool, batch=None):
+        self.pool = pool
+        self.root = None
+        self.polygons = PolygonBatch.empty()
+        if batch is not None:
+            self.build(batch)
+
+    def nodes(self):
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.front:
+                stack.append(node.front)
+            if node.back:
+                stack.append(node.back)
+
+    def build(self, batch):
+        if not len(batch):
+            return
+        if self.root is None:
+            self.root = BSPNode(batch.normals[0].copy(), batch.ws[0])
+        kept = [self.polygons]
+        stack = [(self.root, batch)]
+        while stack:
+            node, batch = stack.pop()
+            co_front, co_back, front, back = split_batch(self.pool, node.normal, node.w, batch)
+            kept.append(co_front)
+            kept.append(co_back)
+            for side, part in (('front', front), ('back', back)):
+                if not len(part):
+                    continue
+                child = getattr(node, side)
+                if child is None:
+                    if len(part) == 1:
+                        # a single polygon is coplanar with its own node
+                        setattr(node, side, BSPNode(part.normals[0].copy(), part.ws[0]))
+                        kept.append(part)
+                        continue
+                    child = BSPNode(part.normals[0].copy(), part.ws[0])
+                    setattr(node, side, child)
+                stack.append((child, part))
+        self.polygons = PolygonBatch.concat(kept)
+
+    def invert(self):
+        self.polygons = self.polygons.flipped()
+        for node in self.nodes():
+            node.normal = -node.normal
+            node.w = -node.w
+            node.front, node.back = node.back, node.front
+
+    def clip_polygons(self, batch):
+        '''
+        Remove the parts of batch that are inside this tree
+        '''
+        if self.root is None:
+            return batch
+        result = []
+        stack = [(self.root, batch)]
+        while stack:
+            node, batch = stack.pop()
+            if not len(batch):
+                continue
+            co_front, co_back, front, back = split_batch(self.pool, node.normal, node.w, batch)
+            front = PolygonBatch.concat([co_front, front])
+            back = PolygonBatch.concat([co_back, back])
+            if node.front:
+                stack.append((node.front, front))
+            else:
+                result.append(front)
+            if node.back:
+                stack.append((node.back, back))
+        return PolygonBatch.concat(result)
+
+    def clip_to(self, other):
+        self.polygons = other.clip_polygons(self.polygons)
+
+    def all_polygons(self):
+        return self.polygons
+
+
+def boolean(verts_a, faces_a, verts_b, faces_b, operation):
+    '''
+    operation is 'ITX', 'JOIN' or 'DIFF', like the csg_boolean node.
+    Returns (vertices, faces) with coincident vertices welded.
+    '''
+    verts_a = np.asarray(verts_a, dtype=np.float64).reshape(-1, 3)
+    verts_b = np.asarray(verts_b, dtype=np.float64).reshape(-1, 3)
+    pool = VertexPool(np.concatenate((verts_a, verts_b)))
+    offset = len(verts_a)
+    batch_a = PolygonBatch.from_pydata(pool, faces_a)
+    batch_b = PolygonBatch.from_pydata(pool, [[i + offset for i in f] for f in faces_b])
+
+    a = BSPTree(pool, batch_a)
+    b = BSPTree(pool, batch_b)
+    if operation == 'JOIN':
+        a.clip_to(b)
+        b.clip_to(a)
+        b.invert()
+        b.clip_to(a)
+        b.invert()
+        a.build(b.all_polygons())
+    elif operation == 'DIFF':
+        a.invert()
+        a.clip_to(b)
+        b.clip_to(a)
+        b.invert()
+        b.clip_to(a)
+        b.invert()
+        a.build(b.all_polygons())
+        a.invert()
+    elif operation == 'ITX':
+        a.invert()
+        b.clip_to(a)
+        b.invert()
+        a.clip_to(b)
+        b.clip_to(a)
+        a.build(b.all_polygons())
+        a.invert()
+    else:
+        raise ValueError("Unknown operation {}".format(operation))
+    return weld(pool, a.all_polygons())
+
+
+def weld(pool, batch, precision=1e-6):
+    '''
+    Vertices and faces of batch, vertices at the same position within
+    precision are merged and unused vertices dropped
+    '''
+    if not len(batch):
+        return [], []
+    used = np.unique(batch.loops)
+    co = pool.array[used]
+    keys = np.round(co / precision).astype(np.int64)
+    order = np.lexsort(keys.T[::-1])
+    new_group = np.any(keys[order][1:] != keys[order][:-1], axis=1)
+    group = np.concatenate(([0], np.cumsum(new_group)))
+    first = order[np.concatenate(([0], np.nonzero(new_group)[0] + 1))]
+    remap = np.empty(pool.size, dtype=np.int64)
+    remap[used[order]] = group
+    loops = remap[batch.loops]
+
+    faces = []
+    for face in np.split(loops, batch.starts[1:]):
+        # welding can make neighbours equal
+        face = [int(i) for k, i in enumerate(face) if i != face[k - 1]]
+        if len(face) > 2:
+            faces.append(face)
+    return co[first].tolist(), faces
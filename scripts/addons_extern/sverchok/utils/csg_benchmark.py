@@ -0,0 +1,130 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Scaling benchmark of the CSG Boolean node engines.
+
+Two overlapping uv spheres of growing resolution go through every
+operation with each engine. The enclosed volume of the results is
+compared to the one of the array engine to catch wrong output. An
+engine is left out of bigger sizes once a run took longer than
+--max-time seconds.
+
+blender -b --python-expr "import sverchok.utils.csg_benchmark as b; b.main()" -- \\
+    --segments 8,16,32,64,128 --engines CSG,ARRAY,BMESH --output csg.json
+'''
+
+import argparse
+import json
+import math
+import sys
+import time
+
+from sverchok.nodes.modifier_make.csg_boolean import engines
+
+
+def uv_sphere(segments, center=(0.0, 0.0, 0.0), radius=1.0):
+    '''
+    Closed uv sphere with segments around and segments // 2 rings
+    '''
+    cx, cy, cz = center
+    rings = max(2, segments // 2)
+    verts = [(cx, cy, cz + radius)]
+    for i in range(1, rings):
+        theta = math.pi * i / rings
+        for j in range(segments):
+            phi = 2 * math.pi * j / segments
+            verts.append((cx + radius * math.sin(theta) * math.cos(phi),
+                          cy + radius * math.sin(theta) * math.sin(phi),
+                          cz + radius * math.cos(theta)))
+    verts.append((cx, cy, cz - radius))
+    bottom = len(verts) - 1
+
+    faces = [[0, 1 + j, 1 + (j + 1) % segments] for j in range(segments)]
+    for i in range(rings - 2):
+        row = 1 + i * segments
+        for j in range(segments):
+            a, b = row + j, row + (j + 1) % segments
+            faces.append([a, a + segments, b + segments, b])
+    row = 1 + (rings - 2) * segments
+    faces.extend([row + (j + 1) % segments, row + j, bottom] for j in range(segments))
+    return verts, faces
+
+
+def volume(verts, faces):
+    '''
+    Signed volume enclosed by the faces, fan triangulated
+    '''
+    total = 0.0
+    for face in faces:
+        x0, y0, z0 = verts[face[0]]
+        for k in range(1, len(face) - 1):
+            x1, y1, z1 = verts[face[k]]
+            x2, y2, z2 = verts[face[k + 1]]
+            total += (x0 * (y1 * z2 - z1 * y2) - y0 * (x1 * z2 - z1 * x2) + z0 * (x1 * y2 - y1 * x2))
+    return total / 6.0
+
+
+def run(segments=(8, 16, 32, 64), engine_names=('CSG', 'ARRAY'),
+        operations=('ITX', 'JOIN', 'DIFF'), max_time=30.0):
+    results = []
+    slow = set()
+    for seg in segments:
+        va, pa = uv_sphere(seg)
+        vb, pb = uv_sphere(seg, center=(0.6, 0.3, 0.2))
+        for operation in operations:
+            reference = None
+            for name in engine_names:
+                if name in slow:
+                    continue
+                start = time.perf_counter()
+                verts, faces = engines[name](va, pa, vb, pb, operation)
+                duration = time.perf_counter() - start
+                result = {
+                    'engine': name, 'operation': operation, 'segments': seg,
+                    'input_faces': len(pa) + len(pb), 'output_faces': len(faces[0]),
+                    'time': duration, 'volume': volume(verts[0], faces[0])}
+                if name == 'ARRAY':
+                    reference = result['volume']
+                results.append(result)
+                if duration > max_time:
+                    slow.add(name)
+                print('{engine:<6} {operation:<5} {segments:>4} segments {input_faces:>7} faces in '
+                      '{output_faces:>7} out {time:>9.4f}s volume {volume:.5f}'.format(**result))
+            for result in results:
+                if reference is not None and result['segments'] == seg and result['operation'] == operation:
+                    result['volume_error'] = abs(result['volume'] - reference)
+    return results
+
+
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description='Benchmark the CSG Boolean engines')
+    parser.add_argument('--segments', default='8,16,32,64')
+    parser.add_argument('--engines', default='CSG,ARRAY')
+    parser.add_argument('--operations', default='ITX,JOIN,DIFF')
+    parser.add_argument('--max-time', type=float, default=30.0)
+    parser.add_argument('--output', help='json file for the results')
+    args = parser.parse_args(argv)
+
+    results = run([int(s) for s in args.segments.split(',')],
+                  args.engines.split(','), args.operations.split(','), args.max_time)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+        print('Results written to', args.output)
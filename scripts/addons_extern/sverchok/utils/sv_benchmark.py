@@ -0,0 +1,209 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Headless benchmark of the layouts in json_examples.
+
+Each layout is imported the same way as the import operator does, then
+evaluated a number of times for every scale of a sweep. The scale
+multiplies integer count like properties (count, divisions, ...) of the
+nodes. Tree times, per node times from sverchok.core.profiling and the
+python peak memory are written to a json report. A previous report can
+be passed to flag regressions.
+
+blender -b --python-expr "import sverchok.utils.sv_benchmark as b; b.main()" -- \\
+    --output report.json --runs 5 --scales 1,2,4 --compare old_report.json Spiral WAFEL_minimal
+'''
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+import bpy
+
+import sverchok
+from sverchok.core import update_system, profiling
+from sverchok.utils.sv_IO_panel_tools import import_tree
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(sverchok.__file__), 'json_examples')
+
+# integer properties that control the amount of geometry
+SCALE_PROPS = re.compile(r'(count|num|div|subd|segment|vert|ring|res|step|iter)', re.IGNORECASE)
+
+
+def example_files(names=None):
+    files = sorted(f for f in os.listdir(EXAMPLES_DIR) if f.endswith('.json'))
+    if names:
+        files = [f for f in files if any(name in f for name in names)]
+    return [os.path.join(EXAMPLES_DIR, f) for f in files]
+
+
+def scale_tree(ng, scale):
+    '''
+    Multiply count like integer properties of all nodes, returns
+    number of properties changed
+    '''
+    if scale == 1:
+        return 0
+    changed = 0
+    for node in ng.nodes:
+        for prop in node.bl_rna.properties:
+            if prop.type != 'INT' or getattr(prop, 'is_array', False):
+                continue
+            if not SCALE_PROPS.search(prop.identifier):
+                continue
+            value = getattr(node, prop.identifier)
+            if value <= 0:
+                continue
+            new_value = min(int(value * scale), prop.hard_max)
+            if new_value != value:
+                setattr(node, prop.identifier, new_value)
+                changed += 1
+    return changed
+
+
+def load_layout(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    ng = bpy.data.node_groups.new(name='bench_' + name, type='SverchCustomTreeType')
+    try:
+        import_tree(ng, path)
+    except Exception:
+        bpy.data.node_groups.remove(ng)
+        raise
+    return ng
+
+
+def benchmark_tree(ng, runs):
+    '''
+    Evaluate the whole tree runs times, returns times and python peak memory.
+    Memory is traced in a separate first run, tracing slows down the timed runs
+    '''
+    update_system.build_update_list(ng)
+    tracemalloc.start()
+    try:
+        update_system.process_tree(ng)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    times = []
+    profiling.reset_history(ng)
+    for i in range(runs):
+        update_system.build_update_list(ng)
+        start = time.perf_counter()
+        update_system.process_tree(ng)
+        times.append(time.perf_counter() - start)
+    return times, peak
+
+
+def benchmark_file(path, runs=5, scales=(1,)):
+    '''
+    Benchmark one layout over the scale sweep, one result dict per scale
+    '''
+    results = []
+    for scale in scales:
+        ng = None
+        try:
+            ng = load_layout(path)
+            ng.freeze(hard=True)
+            changed = scale_tree(ng, scale)
+            ng.unfreeze(hard=True)
+            times, peak = benchmark_tree(ng, runs)
+            results.append({
+                'layout': os.path.basename(path),
+                'scale': scale,
+                'scaled_props': changed,
+                'nodes': len(ng.nodes),
+                'times': times,
+                'min': min(times),
+                'mean': statistics.mean(times),
+                'median': statistics.median(times),
+                'peak_memory': peak,
+                'node_stats': profiling.node_statistics(ng.name)})
+        except Exception as err:
+            results.append({'layout': os.path.basename(path), 'scale': scale, 'error': str(err)})
+        finally:
+            if ng is not None:
+                bpy.data.node_groups.remove(ng)
+    return results
+
+
+def run(names=None, runs=5, scales=(1,)):
+    old_state = profiling.ENABLED
+    profiling.set_profiling(True)
+    report = {
+        'blender': bpy.app.version_string,
+        'sverchok': list(sverchok.bl_info['version']),
+        'runs': runs,
+        'scales': list(scales),
+        'results': []}
+    try:
+        for path in example_files(names):
+            print('Benchmarking', os.path.basename(path))
+            for result in benchmark_file(path, runs, scales):
+                report['results'].append(result)
+                if 'error' in result:
+                    print('  scale {scale}: failed, {error}'.format(**result))
+                else:
+                    print('  scale {scale}: min {min:.4f}s median {median:.4f}s peak {peak_memory} bytes'.format(**result))
+    finally:
+        profiling.set_profiling(old_state)
+    return report
+
+
+def compare(report, old_report, threshold=1.2):
+    '''
+    List of (layout, scale, old, new) where the median time grew by more than threshold
+    '''
+    old = {(r['layout'], r['scale']): r for r in old_report['results'] if 'error' not in r}
+    regressions = []
+    for r in report['results']:
+        prev = old.get((r['layout'], r['scale']))
+        if prev and 'error' not in r and r['median'] > prev['median'] * threshold:
+            regressions.append((r['layout'], r['scale'], prev['median'], r['median']))
+    return regressions
+
+
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description='Benchmark sverchok json_examples')
+    parser.add_argument('layouts', nargs='*', help='parts of layout file names, all if empty')
+    parser.add_argument('--output', default='sv_benchmark.json')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--scales', default='1', help='comma separated scale sweep, 1,2,4')
+    parser.add_argument('--compare', help='previous report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    scales = [float(s) for s in args.scales.split(',')]
+    report = run(args.layouts, args.runs, scales)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print('Report written to', args.output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for layout, scale, old, new in regressions:
+            print('Regression {} scale {}: {:.4f}s -> {:.4f}s'.format(layout, scale, old, new))
+        if regressions:
+            sys.exit(1)
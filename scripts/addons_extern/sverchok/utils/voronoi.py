@@ -34,311 +34,50 @@
 # modified output,downloaded from:
 # http://svn.osgeo.org/qgis/trunk/qgis/python/plugins/fTools/tools/voronoi.py
 #
-#############################################################################
-
-
-def usage():
-    print("""
-voronoi - compute Voronoi diagram or Delaunay triangulation
-
-voronoi [-t -p -d]  [filename]
-
-Voronoi reads from filename (or standard input if no filename given) for a set 
-of points in the plane and writes either the Voronoi diagram or the Delaunay 
-triangulation to the standard output.  Each input line should consist of two 
-real numbers, separated by white space.
-
-If option -t is present, the Delaunay triangulation is produced. 
-Each output line is a triple i j k, which are the indices of the three points
-in a Delaunay triangle. Points are numbered starting at 0.
-
-If option -t is not present, the Voronoi diagram is produced.  
-There are four output record types.
-
-s a b      indicates that an input point at coordinates a b was seen.
-l a b c    indicates a line with equation ax + by = c.
-v a b      indicates a vertex at a b.
-e l v1 v2  indicates a Voronoi segment which is a subsegment of line number l
-           with endpoints numbered v1 and v2.  If v1 or v2 is -1, the line 
-           extends to infinity.
-
-Other options include:
-
-d    Print debugging info
-
-p    Produce output suitable for input to plot (1), rather than the forms 
-     described above.
-
-On unsorted data uniformly distributed in the unit square, voronoi uses about 
-20n+140 bytes of storage.
-
-AUTHOR
-Steve J. Fortune (1987) A Sweepline Algorithm for Voronoi Diagrams,
-Algorithmica 2, 153-174.
-""")
-
+# Rewritten for sverchok: sites are sorted with numpy and referred to by
+# index, edges live in parallel lists, circle events are kept in a heapq
+# with lazy deletion instead of the bucketed linked lists, and output is streamed
+# into flat arrays. 3D Voronoi cells clipped to a box were added.
+#
 #############################################################################
 #
-# For programmatic use two functions are available:
+# For programmatic use:
 #
-#   computeVoronoiDiagram(points)
+#   voronoi_2d(points) -> VoronoiDiagram
 #
-#        Takes a list of point objects (which must have x and y fields).
-#        Returns a 3-tuple of:
+#        points is a sequence of (x, y, ...) or an (n, >=2) array.
+#        The result holds numpy arrays:
+#           vertices    (v, 2) Voronoi vertices
+#           lines       (l, 3) line equations a*x + b*y = c
+#           edges       (e, 2) vertex indices of the Voronoi edges,
+#                       -1 where the edge extends to infinity
+#           edge_lines  (e,)   line index of each edge
+#           edge_sites  (e, 2) input points each edge separates
+#           triangles   (t, 3) Delaunay triangles as input point indices
 #
-#           (1) a list of 2-tuples, which are the x,y coordinates of the
-#               Voronoi diagram vertices
-#           (2) a list of 3-tuples (a,b,c) which are the equations of the
-#               lines in the Voronoi diagram: a*x + b*y = c
-#           (3) a list of 3-tuples, (l, v1, v2) representing edges of the
-#               Voronoi diagram.  l is the index of the line, v1 and v2 are
-#               the indices of the vetices at the end of the edge.  If
-#               v1 or v2 is -1, the line extends to infinity.
+#   delaunay_2d(points) -> (t, 3) array of input point indices
 #
-#   computeDelaunayTriangulation(points):
+#   voronoi_cells_3d(points, bounds_min, bounds_max)
+#        -> list of (vertices (n, 3) array, faces list) per input point
 #
-#        Takes a list of point objects (which must have x and y fields).
-#        Returns a list of 3-tuples: the indices of the points that form a
-#        Delaunay triangle.
+#   computeVoronoiDiagram(points) and computeDelaunayTriangulation(points)
+#   keep the interface of the original module, points must have x and y.
 #
 #############################################################################
-import math
-import sys
-import getopt
-TOLERANCE = 1e-9
-BIG_FLOAT = 1e38
-
-
-def cmp(x, y):
-    return x.__cmp__(y)
 
-#------------------------------------------------------------------
-
-
-class Context(object):
-
-    def __init__(self):
-        self.doPrint = 0
-        self.debug = 0
-        self.plot = 0
-        self.triangulate = False
-        self.vertices = []    # list of vertex 2-tuples: (x,y)
-        self.lines = []    # equation of line 3-tuple (a b c), for the equation of the line a*x+b*y = c
-        self.edges = []    # edge 3-tuple: (line index, vertex 1 index, vertex 2 index)   if either vertex index is -1, the edge extends to infiinity
-        self.triangles = []    # 3-tuple of vertex indices
-        self.polygons = {}    # a dict of site:[edges] pairs
-
-    def circle(self, x, y, rad):
-        pass
-
-    def clip_line(self, edge):
-        pass
-
-    def line(self, x0, y0, x1, y1):
-        pass
-
-    def outSite(self, s):
-        if(self.debug):
-            print("site (%d) at %f %f" % (s.sitenum, s.x, s.y))
-        elif(self.triangulate):
-            pass
-        elif(self.plot):
-            self.circle(s.x, s.y, cradius)
-        elif(self.doPrint):
-            print("s %f %f" % (s.x, s.y))
-
-    def outVertex(self, s):
-        self.vertices.append((s.x, s.y))
-        if(self.debug):
-            print("vertex(%d) at %f %f" % (s.sitenum, s.x, s.y))
-        elif(self.triangulate):
-            pass
-        elif(self.doPrint and not self.plot):
-            print("v %f %f" % (s.x, s.y))
-
-    def outTriple(self, s1, s2, s3):
-        self.triangles.append((s1.sitenum, s2.sitenum, s3.sitenum))
-        if(self.debug):
-            print("circle through left=%d right=%d bottom=%d" % (s1.sitenum, s2.sitenum, s3.sitenum))
-        elif(self.triangulate and self.doPrint and not self.plot):
-            print("%d %d %d" % (s1.sitenum, s2.sitenum, s3.sitenum))
-
-    def outBisector(self, edge):
-        self.lines.append((edge.a, edge.b, edge.c))
-        if(self.debug):
-            print("line(%d) %gx+%gy=%g, bisecting %d %d" % (edge.edgenum, edge.a, edge.b, edge.c, edge.reg[0].sitenum, edge.reg[1].sitenum))
-        elif(self.triangulate):
-            if(self.plot):
-                self.line(edge.reg[0].x, edge.reg[0].y, edge.reg[1].x, edge.reg[1].y)
-        elif(self.doPrint and not self.plot):
-            print("l %f %f %f" % (edge.a, edge.b, edge.c))
-
-    def outEdge(self, edge):
-        sitenumL = -1
-        if edge.ep[Edge.LE] is not None:
-            sitenumL = edge.ep[Edge.LE].sitenum
-        sitenumR = -1
-        if edge.ep[Edge.RE] is not None:
-            sitenumR = edge.ep[Edge.RE].sitenum
-        if edge.reg[0].sitenum not in self.polygons:
-            self.polygons[edge.reg[0].sitenum] = []
-        if edge.reg[1].sitenum not in self.polygons:
-            self.polygons[edge.reg[1].sitenum] = []
-        self.polygons[edge.reg[0].sitenum].append((edge.edgenum, sitenumL, sitenumR))
-        self.polygons[edge.reg[1].sitenum].append((edge.edgenum, sitenumL, sitenumR))
-        self.edges.append((edge.edgenum, sitenumL, sitenumR))
-        if(not self.triangulate):
-            if self.plot:
-                self.clip_line(edge)
-            elif(self.doPrint):
-                print("e %d" % edge.edgenum, end=' ')
-                print(" %d " % sitenumL, end=' ')
-                print("%d" % sitenumR)
-
-#------------------------------------------------------------------
-
-
-def voronoi(siteList, context):
-    try:
-        edgeList = EdgeList(siteList.xmin, siteList.xmax, len(siteList))
-        priorityQ = PriorityQueue(siteList.ymin, siteList.ymax, len(siteList))
-        siteIter = siteList.iterator()
-
-        bottomsite = next(siteIter)
-        context.outSite(bottomsite)
-        newsite = next(siteIter)
-        minpt = Site(-BIG_FLOAT, -BIG_FLOAT)
-        while True:
-            if not priorityQ.isEmpty():
-                minpt = priorityQ.getMinPt()
-
-            if (newsite and (priorityQ.isEmpty() or cmp(newsite, minpt) < 0)):
-                # newsite is smallest -  this is a site event
-                context.outSite(newsite)
-
-                # get first Halfedge to the LEFT and RIGHT of the new site
-                lbnd = edgeList.leftbnd(newsite)
-                rbnd = lbnd.right
-
-                # if this halfedge has no edge, bot = bottom site (whatever that is)
-                # create a new edge that bisects
-                bot = lbnd.rightreg(bottomsite)
-                edge = Edge.bisect(bot, newsite)
-                context.outBisector(edge)
-
-                # create a new Halfedge, setting its pm field to 0 and insert
-                # this new bisector edge between the left and right vectors in
-                # a linked list
-                bisector = Halfedge(edge, Edge.LE)
-                edgeList.insert(lbnd, bisector)
-
-                # if the new bisector intersects with the left edge, remove
-                # the left edge's vertex, and put in the new one
-                p = lbnd.intersect(bisector)
-                if p is not None:
-                    priorityQ.delete(lbnd)
-                    priorityQ.insert(lbnd, p, newsite.distance(p))
-
-                # create a new Halfedge, setting its pm field to 1
-                # insert the new Halfedge to the right of the original bisector
-                lbnd = bisector
-                bisector = Halfedge(edge, Edge.RE)
-                edgeList.insert(lbnd, bisector)
-
-                # if this new bisector intersects with the right Halfedge
-                p = bisector.intersect(rbnd)
-                if p is not None:
-                    # push the Halfedge into the ordered linked list of vertices
-                    priorityQ.insert(bisector, p, newsite.distance(p))
-
-                newsite = next(siteIter)
-
-            elif not priorityQ.isEmpty():
-                # intersection is smallest - this is a vector (circle) event
-
-                # pop the Halfedge with the lowest vector off the ordered list of
-                # vectors.  Get the Halfedge to the left and right of the above HE
-                # and also the Halfedge to the right of the right HE
-                lbnd = priorityQ.popMinHalfedge()
-                llbnd = lbnd.left
-                rbnd = lbnd.right
-                rrbnd = rbnd.right
-
-                # get the Site to the left of the left HE and to the right of
-                # the right HE which it bisects
-                bot = lbnd.leftreg(bottomsite)
-                top = rbnd.rightreg(bottomsite)
-
-                # output the triple of sites, stating that a circle goes through them
-                mid = lbnd.rightreg(bottomsite)
-                context.outTriple(bot, top, mid)
-
-                # get the vertex that caused this event and set the vertex number
-                # couldn't do this earlier since we didn't know when it would be processed
-                v = lbnd.vertex
-                siteList.setSiteNumber(v)
-                context.outVertex(v)
-
-                # set the endpoint of the left and right Halfedge to be this vector
-                if lbnd.edge.setEndpoint(lbnd.pm, v):
-                    context.outEdge(lbnd.edge)
-
-                if rbnd.edge.setEndpoint(rbnd.pm, v):
-                    context.outEdge(rbnd.edge)
-
-                # delete the lowest HE, remove all vertex events to do with the
-                # right HE and delete the right HE
-                edgeList.delete(lbnd)
-                priorityQ.delete(rbnd)
-                edgeList.delete(rbnd)
-
-                # if the site to the left of the event is higher than the Site
-                # to the right of it, then swap them and set 'pm' to RIGHT
-                pm = Edge.LE
-                if bot.y > top.y:
-                    bot, top = top, bot
-                    pm = Edge.RE
-
-                # Create an Edge (or line) that is between the two Sites.  This
-                # creates the formula of the line, and assigns a line number to it
-                edge = Edge.bisect(bot, top)
-                context.outBisector(edge)
-
-                # create a HE from the edge
-                bisector = Halfedge(edge, pm)
-
-                # insert the new bisector to the right of the left HE
-                # set one endpoint to the new edge to be the vector point 'v'
-                # If the site to the left of this bisector is higher than the right
-                # Site, then this endpoint is put in position 0; otherwise in pos 1
-                edgeList.insert(llbnd, bisector)
-                if edge.setEndpoint(Edge.RE - pm, v):
-                    context.outEdge(edge)
-
-                # if left HE and the new bisector don't intersect, then delete
-                # the left HE, and reinsert it
-                p = llbnd.intersect(bisector)
-                if p is not None:
-                    priorityQ.delete(llbnd)
-                    priorityQ.insert(llbnd, p, bot.distance(p))
+import heapq
+import math
+from array import array
 
-                # if right HE and the new bisector don't intersect, then reinsert it
-                p = bisector.intersect(rrbnd)
-                if p is not None:
-                    priorityQ.insert(bisector, p, bot.distance(p))
-            else:
-                break
+import numpy as np
 
-        he = edgeList.leftend.right
-        while he is not edgeList.rightend:
-            context.outEdge(he.edge)
-            he = he.right
-        Edge.EDGE_NUM = 0
-    except Exception as err:
-        print("#Voronoi error#")
-        print(str(err))
+TOLERANCE = 1e-9
+BIG_FLOAT = 1e38
 
-#------------------------------------------------------------------
+LE = 0
+RE = 1
+NO_EDGE = -1
+DELETED = -2
 
 
 def isEqual(a, b, relativeError=TOLERANCE):
@@ -346,258 +85,227 @@ def isEqual(a, b, relativeError=TOLERANCE):
     norm = max(abs(a), abs(b))
     return (norm < relativeError) or (abs(a - b) < (relativeError * norm))
 
-#------------------------------------------------------------------
-
 
 class Site(object):
+    '''
+    Input point of computeVoronoiDiagram / computeDelaunayTriangulation
+    '''
+    __slots__ = ('x', 'y', 'sitenum')
 
     def __init__(self, x=0.0, y=0.0, sitenum=0):
         self.x = x
         self.y = y
         self.sitenum = sitenum
 
-    def dump(self):
-        print("Site #%d (%g, %g)" % (self.sitenum, self.x, self.y))
-
-    def __lt__(self, other):
-        if self.y < other.y:
-            return 1
-        elif self.y > other.y:
-            return 0
-        elif self.x < other.x:
-            return 1
-        elif self.x > other.x:
-            return 0
-
     def __str__(self):
         return str((self.x, self.y))
 
-    def __cmp__(self, other):
-        if self.y < other.y:
-            return -1
-        elif self.y > other.y:
-            return 1
-        elif self.x < other.x:
-            return -1
-        elif self.x > other.x:
-            return 1
-        else:
-            return 0
-
-    def distance(self, other):
-        dx = self.x - other.x
-        dy = self.y - other.y
-        return math.sqrt(dx * dx + dy * dy)
-
-#------------------------------------------------------------------
-
-
-class Edge(object):
-    LE = 0
-    RE = 1
-    EDGE_NUM = 0
-    DELETED = {}   # marker value
-
-    def __init__(self):
-        self.a = 0.0
-        self.b = 0.0
-        self.c = 0.0
-        self.ep = [None, None]
-        self.reg = [None, None]
-        self.edgenum = 0
-
-    def dump(self):
-        print("(#%d a=%g, b=%g, c=%g)" % (self.edgenum, self.a, self.b, self.c))
-        print("ep", self.ep)
-        print("reg", self.reg)
-
-    def setEndpoint(self, lrFlag, site):
-        self.ep[lrFlag] = site
-        if self.ep[Edge.RE - lrFlag] is None:
-            return False
-        return True
-
-    @staticmethod
-    def bisect(s1, s2):
-        newedge = Edge()
-        newedge.reg[0] = s1  # store the sites that this edge is bisecting
-        newedge.reg[1] = s2
-
-        # to begin with, there are no endpoints on the bisector - it goes to infinity
-        # ep[0] and ep[1] are None
-
-        # get the difference in x dist between the sites
-        dx = float(s2.x - s1.x)
-        dy = float(s2.y - s1.y)
-        adx = abs(dx)  # make sure that the difference in positive
-        ady = abs(dy)
-
-        # get the slope of the line
-        newedge.c = float(s1.x * dx + s1.y * dy + (dx * dx + dy * dy) * 0.5)
-        if adx > ady:
-            # set formula of line, with x fixed to 1
-            newedge.a = 1.0
-            newedge.b = dy / dx
-            newedge.c /= dx
-        else:
-            # set formula of line, with y fixed to 1
-            newedge.b = 1.0
-            newedge.a = dx / dy
-            newedge.c /= dy
-
-        newedge.edgenum = Edge.EDGE_NUM
-        Edge.EDGE_NUM += 1
-        return newedge
-
 
-#------------------------------------------------------------------
 class Halfedge(object):
+    __slots__ = ('left', 'right', 'edge', 'pm', 'vx', 'vy', 'ystar', 'event')
 
-    def __init__(self, edge=None, pm=Edge.LE):
-        self.left = None   # left Halfedge in the edge list
+    def __init__(self, edge=NO_EDGE, pm=LE):
+        self.left = None    # left Halfedge in the edge list
         self.right = None   # right Halfedge in the edge list
-        self.qnext = None   # priority queue linked list pointer
-        self.edge = edge   # edge list Edge
+        self.edge = edge    # index of the edge, NO_EDGE or DELETED
         self.pm = pm
-        self.vertex = None  # Site()
+        self.vx = 0.0       # pending circle event vertex
+        self.vy = 0.0
         self.ystar = BIG_FLOAT
+        self.event = 0      # id of the pending event in the queue, 0 if none
+
+
+class VoronoiDiagram(object):
+    '''
+    Output arrays of voronoi_2d, see the module header
+    '''
+
+    def __init__(self, vertices, lines, edges, edge_lines, edge_sites, triangles):
+        self.vertices = vertices
+        self.lines = lines
+        self.edges = edges
+        self.edge_lines = edge_lines
+        self.edge_sites = edge_sites
+        self.triangles = triangles
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 2)), np.zeros((0, 3)), np.zeros((0, 2), dtype=np.int64),
+                   np.zeros(0, dtype=np.int64), np.zeros((0, 2), dtype=np.int64),
+                   np.zeros((0, 3), dtype=np.int64))
+
+    def finite_edges(self):
+        '''
+        (k, 2) vertex indices of the edges with both ends
+        '''
+        return self.edges[(self.edges >= 0).all(axis=1)]
+
+
+class _Sweep(object):
+    '''
+    Fortune's sweep over sites sorted by (y, x). A site is its index in
+    that order, so comparing sites is comparing ints.
+    '''
+
+    def __init__(self, xs, ys):
+        self.xs = xs
+        self.ys = ys
+        nsites = len(xs)
+
+        # edges, parallel lists indexed by edge number
+        self.ea = []
+        self.eb = []
+        self.ec = []
+        self.reg0 = []
+        self.reg1 = []
+        self.ep0 = []
+        self.ep1 = []
+        self.done = []
+
+        # streamed output
+        self.vert_x = array('d')
+        self.vert_y = array('d')
+        self.out_edges = array('l')
+        self.out_v1 = array('l')
+        self.out_v2 = array('l')
+        self.triangles = array('l')
+
+        # beach line, doubly linked halfedges with Fortune's bucket hash
+        xmin, xmax = min(xs), max(xs)
+        self.xmin = xmin
+        self.deltax = float(xmax - xmin) or 1.0
+        self.hashsize = int(2 * math.sqrt(nsites + 4))
+        self.hash = [None] * self.hashsize
+        self.leftend = Halfedge()
+        self.rightend = Halfedge()
+        self.leftend.right = self.rightend
+        self.rightend.left = self.leftend
+        self.hash[0] = self.leftend
+        self.hash[-1] = self.rightend
 
-    def dump(self):
-        print("Halfedge--------------------------")
-        print("left: ", self.left)
-        print("right: ", self.right)
-        print("edge: ", self.edge)
-        print("pm: ", self.pm)
-        print("vertex: ", end=' ')
-        if self.vertex:
-            self.vertex.dump()
+        # circle events (ystar, x, event id, halfedge)
+        self.queue = []
+        self.event_count = 0
+
+    # edges
+
+    def bisect(self, s1, s2):
+        xs, ys = self.xs, self.ys
+        dx = xs[s2] - xs[s1]
+        dy = ys[s2] - ys[s1]
+        c = xs[s1] * dx + ys[s1] * dy + (dx * dx + dy * dy) * 0.5
+        if abs(dx) > abs(dy):
+            # set formula of line, with x fixed to 1
+            a, b, c = 1.0, dy / dx, c / dx
         else:
-            print("None")
-        print("ystar: ", self.ystar)
-
-    def __cmp__(self, other):
-        if self.ystar > other.ystar:
-            return 1
-        elif self.ystar < other.ystar:
-            return -1
-        elif self.vertex.x > other.vertex.x:
-            return 1
-        elif self.vertex.x < other.vertex.x:
-            return -1
+            # set formula of line, with y fixed to 1
+            a, b, c = dx / dy, 1.0, c / dy
+        self.ea.append(a)
+        self.eb.append(b)
+        self.ec.append(c)
+        self.reg0.append(s1)
+        self.reg1.append(s2)
+        self.ep0.append(-1)
+        self.ep1.append(-1)
+        self.done.append(False)
+        return len(self.ea) - 1
+
+    def set_endpoint(self, edge, lr, vertex):
+        if lr == LE:
+            self.ep0[edge] = vertex
+            complete = self.ep1[edge] != -1
         else:
-            return 0
-
-    def leftreg(self, default):
-        if not self.edge:
+            self.ep1[edge] = vertex
+            complete = self.ep0[edge] != -1
+        if complete:
+            self.out_edge(edge)
+
+    def out_edge(self, edge):
+        if not self.done[edge]:
+            self.done[edge] = True
+            self.out_edges.append(edge)
+            self.out_v1.append(self.ep0[edge])
+            self.out_v2.append(self.ep1[edge])
+
+    # halfedges
+
+    def leftreg(self, he, default):
+        if he.edge < 0:
             return default
-        elif self.pm == Edge.LE:
-            return self.edge.reg[Edge.LE]
-        else:
-            return self.edge.reg[Edge.RE]
+        return self.reg0[he.edge] if he.pm == LE else self.reg1[he.edge]
 
-    def rightreg(self, default):
-        if not self.edge:
+    def rightreg(self, he, default):
+        if he.edge < 0:
             return default
-        elif self.pm == Edge.LE:
-            return self.edge.reg[Edge.RE]
-        else:
-            return self.edge.reg[Edge.LE]
-
-    # returns True if p is to right of halfedge self
-    def isPointRightOf(self, pt):
-        e = self.edge
-        topsite = e.reg[1]
-        right_of_site = pt.x > topsite.x
-
-        if(right_of_site and self.pm == Edge.LE):
+        return self.reg1[he.edge] if he.pm == LE else self.reg0[he.edge]
+
+    def is_right_of(self, he, px, py):
+        '''
+        True if the point is right of the halfedge
+        '''
+        e = he.edge
+        top = self.reg1[e]
+        tx, ty = self.xs[top], self.ys[top]
+        right_of_site = px > tx
+        if right_of_site and he.pm == LE:
             return True
-
-        if(not right_of_site and self.pm == Edge.RE):
+        if not right_of_site and he.pm == RE:
             return False
 
-        if(e.a == 1.0):
-            dyp = pt.y - topsite.y
-            dxp = pt.x - topsite.x
-            fast = 0
-            if ((not right_of_site and e.b < 0.0) or (right_of_site and e.b >= 0.0)):
-                above = dyp >= e.b * dxp
+        a, b = self.ea[e], self.eb[e]
+        if a == 1.0:
+            dyp = py - ty
+            dxp = px - tx
+            fast = False
+            if (not right_of_site and b < 0.0) or (right_of_site and b >= 0.0):
+                above = dyp >= b * dxp
                 fast = above
             else:
-                above = pt.x + pt.y * e.b > e.c
-                if(e.b < 0.0):
+                above = px + py * b > self.ec[e]
+                if b < 0.0:
                     above = not above
-                if (not above):
-                    fast = 1
-            if (not fast):
-                dxs = topsite.x - (e.reg[0]).x
-                above = e.b * (dxp * dxp - dyp * dyp) < dxs * dyp * (1.0 + 2.0 * dxp / dxs + e.b * e.b)
-                if(e.b < 0.0):
+                if not above:
+                    fast = True
+            if not fast:
+                dxs = tx - self.xs[self.reg0[e]]
+                above = b * (dxp * dxp - dyp * dyp) < dxs * dyp * (1.0 + 2.0 * dxp / dxs + b * b)
+                if b < 0.0:
                     above = not above
-        else:  # e.b == 1.0
-            yl = e.c - e.a * pt.x
-            t1 = pt.y - yl
-            t2 = pt.x - topsite.x
-            t3 = yl - topsite.y
+        else:  # b == 1.0
+            yl = self.ec[e] - a * px
+            t1 = py - yl
+            t2 = px - tx
+            t3 = yl - ty
             above = t1 * t1 > t2 * t2 + t3 * t3
-
-        if(self.pm == Edge.LE):
-            return above
-        else:
-            return not above
-
-    #--------------------------
-    # create a new site where the Halfedges el1 and el2 intersect
-    def intersect(self, other):
-        e1 = self.edge
-        e2 = other.edge
-        if (e1 is None) or (e2 is None):
+        return above if he.pm == LE else not above
+
+    def intersect(self, he1, he2):
+        '''
+        Point where the halfedges intersect or None
+        '''
+        e1, e2 = he1.edge, he2.edge
+        if e1 < 0 or e2 < 0:
             return None
-
         # if the two edges bisect the same parent return None
-        if e1.reg[1] is e2.reg[1]:
+        r1, r2 = self.reg1[e1], self.reg1[e2]
+        if r1 == r2:
             return None
-
-        d = e1.a * e2.b - e1.b * e2.a
+        d = self.ea[e1] * self.eb[e2] - self.eb[e1] * self.ea[e2]
         if isEqual(d, 0.0):
             return None
 
-        xint = (e1.c * e2.b - e2.c * e1.b) / d
-        yint = (e2.c * e1.a - e1.c * e2.a) / d
-        if(cmp(e1.reg[1], e2.reg[1]) < 0):
-            he = self
-            e = e1
+        xint = (self.ec[e1] * self.eb[e2] - self.ec[e2] * self.eb[e1]) / d
+        yint = (self.ec[e2] * self.ea[e1] - self.ec[e1] * self.ea[e2]) / d
+        if r1 < r2:
+            he, site = he1, r1
         else:
-            he = other
-            e = e2
-
-        rightOfSite = xint >= e.reg[1].x
-        if((rightOfSite and he.pm == Edge.LE) or
-           (not rightOfSite and he.pm == Edge.RE)):
+            he, site = he2, r2
+        right_of_site = xint >= self.xs[site]
+        if (right_of_site and he.pm == LE) or (not right_of_site and he.pm == RE):
             return None
+        return xint, yint
 
-        # create a new site at the point of intersection - this is a new
-        # vector event waiting to happen
-        return Site(xint, yint)
-
-
-#------------------------------------------------------------------
-class EdgeList(object):
-
-    def __init__(self, xmin, xmax, nsites):
-        if xmin > xmax:
-            xmin, xmax = xmax, xmin
-        self.hashsize = int(2 * math.sqrt(nsites + 4))
-
-        self.xmin = xmin
-        self.deltax = float(xmax - xmin)
-        self.hash = [None] * self.hashsize
-
-        self.leftend = Halfedge()
-        self.rightend = Halfedge()
-        self.leftend.right = self.rightend
-        self.rightend.left = self.leftend
-        self.hash[0] = self.leftend
-        self.hash[-1] = self.rightend
+    # beach line
 
     def insert(self, left, he):
         he.left = left
@@ -608,218 +316,386 @@ class EdgeList(object):
     def delete(self, he):
         he.left.right = he.right
         he.right.left = he.left
-        he.edge = Edge.DELETED
+        he.edge = DELETED
 
-    # Get entry from hash table, pruning any deleted nodes
     def gethash(self, b):
-        if(b < 0 or b >= self.hashsize):
+        '''
+        Entry of the hash table, pruning deleted halfedges
+        '''
+        if b < 0 or b >= self.hashsize:
             return None
         he = self.hash[b]
-        if he is None or he.edge is not Edge.DELETED:
+        if he is None or he.edge != DELETED:
             return he
-
-        #  Hash table points to deleted half edge.  Patch as necessary.
         self.hash[b] = None
         return None
 
-    def leftbnd(self, pt):
-        # Use hash table to get close to desired halfedge
-        bucket = int(((pt.x - self.xmin) / self.deltax * self.hashsize))
-
-        if(bucket < 0):
-            bucket = 0
-
-        if(bucket >= self.hashsize):
-            bucket = self.hashsize - 1
+    def leftbnd(self, px, py):
+        # use hash table to get close to desired halfedge
+        bucket = int((px - self.xmin) / self.deltax * self.hashsize)
+        bucket = min(max(bucket, 0), self.hashsize - 1)
 
         he = self.gethash(bucket)
-        if(he is None):
+        if he is None:
             i = 1
             while True:
                 he = self.gethash(bucket - i)
-                if (he is not None):
+                if he is not None:
                     break
                 he = self.gethash(bucket + i)
-                if (he is not None):
+                if he is not None:
                     break
                 i += 1
 
-        # Now search linear list of halfedges for the corect one
-        if (he is self.leftend) or (he is not self.rightend and he.isPointRightOf(pt)):
+        # now search linear list of halfedges for the correct one
+        if he is self.leftend or (he is not self.rightend and self.is_right_of(he, px, py)):
             he = he.right
-            while he is not self.rightend and he.isPointRightOf(pt):
+            while he is not self.rightend and self.is_right_of(he, px, py):
                 he = he.right
             he = he.left
         else:
             he = he.left
-            while (he is not self.leftend and not he.isPointRightOf(pt)):
+            while he is not self.leftend and not self.is_right_of(he, px, py):
                 he = he.left
 
-        # Update hash table and reference counts
-        if(bucket > 0 and bucket < self.hashsize - 1):
+        if 0 < bucket < self.hashsize - 1:
             self.hash[bucket] = he
         return he
 
+    # event queue
+
+    def push_event(self, he, point, site):
+        vx, vy = point
+        dx = self.xs[site] - vx
+        dy = self.ys[site] - vy
+        he.vx = vx
+        he.vy = vy
+        he.ystar = vy + math.sqrt(dx * dx + dy * dy)
+        self.event_count += 1
+        he.event = self.event_count
+        heapq.heappush(self.queue, (he.ystar, vx, self.event_count, he))
+
+    def drop_event(self, he):
+        he.event = 0
+
+    def min_event(self):
+        '''
+        First valid event of the queue without popping it, None if empty
+        '''
+        queue = self.queue
+        while queue:
+            entry = queue[0]
+            if entry[3].event == entry[2]:
+                return entry
+            heapq.heappop(queue)
+        return None
 
-#------------------------------------------------------------------
-class PriorityQueue(object):
-
-    def __init__(self, ymin, ymax, nsites):
-        self.ymin = ymin
-        self.deltay = ymax - ymin
-        self.hashsize = int(4 * math.sqrt(nsites))
-        self.count = 0
-        self.minidx = 0
-        self.hash = []
-        for i in range(self.hashsize):
-            self.hash.append(Halfedge())
-
-    def __len__(self):
-        return self.count
-
-    def isEmpty(self):
-        return self.count == 0
-
-    def insert(self, he, site, offset):
-        he.vertex = site
-        he.ystar = site.y + offset
-        last = self.hash[self.getBucket(he)]
-        next = last.qnext
-        while((next is not None) and cmp(he, next) > 0):
-            last = next
-            next = last.qnext
-        he.qnext = last.qnext
-        last.qnext = he
-        self.count += 1
+    # sweep
 
-    def delete(self, he):
-        if (he.vertex is not None):
-            last = self.hash[self.getBucket(he)]
-            while last.qnext is not he:
-                last = last.qnext
-            last.qnext = he.qnext
-            self.count -= 1
-            he.vertex = None
-
-    def getBucket(self, he):
-        bucket = int(((he.ystar - self.ymin) / self.deltay) * self.hashsize)
-        if bucket < 0:
-            bucket = 0
-        if bucket >= self.hashsize:
-            bucket = self.hashsize - 1
-        if bucket < self.minidx:
-            self.minidx = bucket
-        return bucket
-
-    def getMinPt(self):
-        while(self.hash[self.minidx].qnext is None):
-            self.minidx += 1
-        he = self.hash[self.minidx].qnext
-        x = he.vertex.x
-        y = he.ystar
-        return Site(x, y)
-
-    def popMinHalfedge(self):
-        curr = self.hash[self.minidx].qnext
-        self.hash[self.minidx].qnext = curr.qnext
-        self.count -= 1
-        return curr
+    def run(self):
+        xs, ys = self.xs, self.ys
+        nsites = len(xs)
+        bottomsite = 0
+        newsite = 1
+        while True:
+            event = self.min_event()
+            if newsite < nsites and (event is None or
+                                     ys[newsite] < event[0] or
+                                     (ys[newsite] == event[0] and xs[newsite] < event[1])):
+                # site event
+                nx, ny = xs[newsite], ys[newsite]
+                lbnd = self.leftbnd(nx, ny)
+                rbnd = lbnd.right
 
+                # create a new edge that bisects the site below and the new one
+                bot = self.rightreg(lbnd, bottomsite)
+                edge = self.bisect(bot, newsite)
 
-#------------------------------------------------------------------
-class SiteList(object):
+                bisector = Halfedge(edge, LE)
+                self.insert(lbnd, bisector)
 
-    def __init__(self, pointList):
-        self.__sites = []
-        self.__sitenum = 0
+                # if the new bisector intersects with the left edge, remove
+                # the left edge's vertex, and put in the new one
+                p = self.intersect(lbnd, bisector)
+                if p is not None:
+                    self.drop_event(lbnd)
+                    self.push_event(lbnd, p, newsite)
 
-        self.__xmin = pointList[0].x
-        self.__ymin = pointList[0].y
-        self.__xmax = pointList[0].x
-        self.__ymax = pointList[0].y
-        for i, pt in enumerate(pointList):
-            self.__sites.append(Site(pt.x, pt.y, i))
-            if pt.x < self.__xmin:
-                self.__xmin = pt.x
-            if pt.y < self.__ymin:
-                self.__ymin = pt.y
-            if pt.x > self.__xmax:
-                self.__xmax = pt.x
-            if pt.y > self.__ymax:
-                self.__ymax = pt.y
-        self.__sites.sort()
+                lbnd = bisector
+                bisector = Halfedge(edge, RE)
+                self.insert(lbnd, bisector)
 
-    def setSiteNumber(self, site):
-        site.sitenum = self.__sitenum
-        self.__sitenum += 1
+                p = self.intersect(bisector, rbnd)
+                if p is not None:
+                    self.push_event(bisector, p, newsite)
 
-    class Iterator(object):
+                newsite += 1
 
-        def __init__(this, lst): this.generator = (s for s in lst)
+            elif event is not None:
+                # circle event
+                heapq.heappop(self.queue)
+                lbnd = event[3]
+                lbnd.event = 0
+                llbnd = lbnd.left
+                rbnd = lbnd.right
+                rrbnd = rbnd.right
 
-        def __iter__(this): return this
+                bot = self.leftreg(lbnd, bottomsite)
+                top = self.rightreg(rbnd, bottomsite)
+                mid = self.rightreg(lbnd, bottomsite)
+                self.triangles.extend((bot, top, mid))
 
-        def __next__(this):
-            try:
-                return next(this.generator)
-            except StopIteration:
-                return None
+                self.vert_x.append(lbnd.vx)
+                self.vert_y.append(lbnd.vy)
+                v = len(self.vert_x) - 1
 
-    def iterator(self):
-        return SiteList.Iterator(self.__sites)
+                self.set_endpoint(lbnd.edge, lbnd.pm, v)
+                self.set_endpoint(rbnd.edge, rbnd.pm, v)
 
-    def __iter__(self):
-        return SiteList.Iterator(self.__sites)
+                self.delete(lbnd)
+                self.drop_event(rbnd)
+                self.delete(rbnd)
 
-    def __len__(self):
-        return len(self.__sites)
+                pm = LE
+                if ys[bot] > ys[top]:
+                    bot, top = top, bot
+                    pm = RE
 
-    def _getxmin(self): return self.__xmin
+                edge = self.bisect(bot, top)
+                bisector = Halfedge(edge, pm)
+                self.insert(llbnd, bisector)
+                self.set_endpoint(edge, RE - pm, v)
 
-    def _getymin(self): return self.__ymin
+                p = self.intersect(llbnd, bisector)
+                if p is not None:
+                    self.drop_event(llbnd)
+                    self.push_event(llbnd, p, bot)
+
+                p = self.intersect(bisector, rrbnd)
+                if p is not None:
+                    self.push_event(bisector, p, bot)
+            else:
+                break
+
+        he = self.leftend.right
+        while he is not self.rightend:
+            self.out_edge(he.edge)
+            he = he.right
 
-    def _getxmax(self): return self.__xmax
 
-    def _getymax(self): return self.__ymax
-    xmin = property(_getxmin)
-    ymin = property(_getymin)
-    xmax = property(_getxmax)
-    ymax = property(_getymax)
+def _sorted_sites(points):
+    '''
+    Unique 2d sites sorted by (y, x) and their input indices
+    '''
+    pts = np.asarray(points, dtype=np.float64)
+    if pts.ndim != 2 or len(pts) == 0:
+        return None, None
+    pts = pts[:, :2]
+    order = np.lexsort((pts[:, 0], pts[:, 1]))
+    pts = pts[order]
+    keep = np.ones(len(pts), dtype=bool)
+    keep[1:] = np.any(pts[1:] != pts[:-1], axis=1)
+    return pts[keep], order[keep]
+
+
+def voronoi_2d(points):
+    '''
+    Voronoi diagram and Delaunay triangulation of 2d points, z is ignored.
+    Coincident points are merged, the first one is used.
+    '''
+    sites, index = _sorted_sites(points)
+    if sites is None or len(sites) < 2:
+        return VoronoiDiagram.empty()
+
+    sweep = _Sweep(sites[:, 0].tolist(), sites[:, 1].tolist())
+    sweep.run()
+
+    def int_array(a):
+        return np.frombuffer(a, dtype=np.dtype(a.typecode)).astype(np.int64) if len(a) else np.zeros(0, dtype=np.int64)
+
+    vertices = np.column_stack((np.frombuffer(sweep.vert_x, dtype=np.float64),
+                                np.frombuffer(sweep.vert_y, dtype=np.float64))) if len(sweep.vert_x) else np.zeros((0, 2))
+    lines = np.column_stack((sweep.ea, sweep.eb, sweep.ec)) if sweep.ea else np.zeros((0, 3))
+    edge_lines = int_array(sweep.out_edges)
+    edges = np.column_stack((int_array(sweep.out_v1), int_array(sweep.out_v2))).reshape(-1, 2)
+    regions = np.column_stack((sweep.reg0, sweep.reg1)).astype(np.int64).reshape(-1, 2)
+    edge_sites = index[regions[edge_lines]] if len(edge_lines) else np.zeros((0, 2), dtype=np.int64)
+    triangles = index[int_array(sweep.triangles).reshape(-1, 3)]
+    return VoronoiDiagram(vertices, lines, edges, edge_lines, edge_sites, triangles)
+
+
+def delaunay_2d(points):
+    '''
+    (t, 3) array of input point indices
+    '''
+    return voronoi_2d(points).triangles
 
 
-#    siteList = SiteList(points)
-#     context  = Context()
-#     voronoi(siteList,context)
-#     return (context.vertices,context.lines,context.edges)
+#------------------------------------------------------------------
+# 3d cells
+
+def _clip_cell(verts, faces, normal, offset, eps):
+    '''
+    Clip a convex cell by the half space normal . x <= offset.
+    faces are lists of vertex indices counterclockwise seen from outside.
+    '''
+    dist = verts.dot(normal) - offset
+    if (dist <= eps).all():
+        return verts, faces
+    if (dist > eps).all():
+        return verts[:0], []
+
+    new_points = []
+    cut = {}
+    n = len(verts)
+    # python lists index much faster than arrays in the loops below
+    inside = (dist <= eps).tolist()
+    on_plane = (np.abs(dist) <= eps)
+    cap = set(np.nonzero(on_plane)[0].tolist())
+    dist = dist.tolist()
+
+    def cut_point(u, v):
+        key = (u, v) if u < v else (v, u)
+        index = cut.get(key)
+        if index is None:
+            t = dist[u] / (dist[u] - dist[v])
+            new_points.append(verts[u] + (verts[v] - verts[u]) * t)
+            index = cut[key] = n + len(new_points) - 1
+        return index
+
+    new_faces = []
+    for face in faces:
+        new_face = []
+        count = len(face)
+        for k in range(count):
+            u = face[k]
+            v = face[(k + 1) % count]
+            if inside[u]:
+                new_face.append(u)
+            if inside[u] != inside[v]:
+                # a vertex on the plane is the cut point itself
+                if inside[u] and dist[u] >= -eps:
+                    continue
+                if inside[v] and dist[v] >= -eps:
+                    continue
+                w = cut_point(u, v)
+                new_face.append(w)
+                cap.add(w)
+        if len(new_face) >= 3:
+            new_faces.append(new_face)
+
+    if new_points:
+        verts = np.concatenate((verts, np.array(new_points)))
+
+    cap = list(cap)
+    if len(cap) >= 3:
+        co = verts[cap]
+        center = co.mean(axis=0)
+        # in plane basis, counterclockwise seen from +normal (outside)
+        axis_u = co[0] - center
+        axis_u -= normal * axis_u.dot(normal) / normal.dot(normal)
+        axis_u /= np.linalg.norm(axis_u) or 1.0
+        nx, ny, nz = normal / np.linalg.norm(normal)
+        ux, uy, uz = axis_u
+        axis_v = np.array((ny * uz - nz * uy, nz * ux - nx * uz, nx * uy - ny * ux))
+        rel = co - center
+        angles = np.arctan2(rel.dot(axis_v), rel.dot(axis_u))
+        new_faces.append([cap[i] for i in np.argsort(angles)])
+
+    # drop unused vertices
+    used = sorted(set(i for face in new_faces for i in face))
+    remap = {old: new for new, old in enumerate(used)}
+    return verts[used], [[remap[i] for i in face] for face in new_faces]
+
+
+def _box(bounds_min, bounds_max):
+    x0, y0, z0 = bounds_min
+    x1, y1, z1 = bounds_max
+    verts = np.array([(x0, y0, z0), (x1, y0, z0), (x1, y1, z0), (x0, y1, z0),
+                      (x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1)], dtype=np.float64)
+    faces = [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4],
+             [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+    return verts, faces
+
+
+def voronoi_cells_3d(points, bounds_min, bounds_max, neighbours=32):
+    '''
+    Voronoi cell of every point clipped to the box bounds_min, bounds_max.
+    A box cell is cut by the bisector planes of the other points in order
+    of distance until the next plane is further away than the cell
+    (security radius), so the result is exact. Returns a list of
+    (vertices (n, 3) array, faces) in input order, coincident points get
+    an empty cell after the first one.
+    '''
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    count = len(pts)
+    box_verts, box_faces = _box(bounds_min, bounds_max)
+    size = float(np.linalg.norm(np.subtract(bounds_max, bounds_min))) or 1.0
+    eps = size * 1e-9
+
+    cells = []
+    for i in range(count):
+        p = pts[i]
+        verts, faces = box_verts, box_faces
+        if count > 1:
+            sq_dist = ((pts - p) ** 2).sum(axis=1)
+            k = min(neighbours, count - 1)
+            near = np.argpartition(sq_dist, k)[:k + 1]
+            near = near[np.argsort(sq_dist[near])]
+            checked = 0
+            while True:
+                for j in near[checked:]:
+                    if j == i:
+                        continue
+                    d2 = sq_dist[j]
+                    if d2 == 0.0:
+                        if j < i:
+                            verts, faces = verts[:0], []
+                        continue
+                    radius2 = ((verts - p) ** 2).sum(axis=1).max() if len(verts) else 0.0
+                    # planes further than the furthest cell vertex can not cut
+                    if d2 > 4.0 * radius2:
+                        break
+                    normal = pts[j] - p
+                    offset = normal.dot((pts[j] + p) * 0.5)
+                    verts, faces = _clip_cell(verts, faces, normal, offset, eps)
+                    if not faces:
+                        break
+                else:
+                    if len(near) < count:
+                        # all neighbours used and the cell may still be cut
+                        checked = len(near)
+                        near = np.argsort(sq_dist)
+                        continue
+                break
+        cells.append((verts, faces))
+    return cells
 
 
 #------------------------------------------------------------------
+# interface of the original module
+
 def computeVoronoiDiagram(points):
     """ Takes a list of point objects (which must have x and y fields).
         Returns a 3-tuple of:
 
-           (1) a list of 2-tuples, which are the x,y coordinates of the 
+           (1) a list of 2-tuples, which are the x,y coordinates of the
                Voronoi diagram vertices
-           (2) a list of 3-tuples (a,b,c) which are the equations of the
-               lines in the Voronoi diagram: a*x + b*y = c
-           (3) a list of 3-tuples, (l, v1, v2) representing edges of the 
+           (2) a dict of site index: list of edges around the site
+           (3) a list of 3-tuples, (l, v1, v2) representing edges of the
                Voronoi diagram.  l is the index of the line, v1 and v2 are
-               the indices of the vetices at the end of the edge.  If 
+               the indices of the vetices at the end of the edge.  If
                v1 or v2 is -1, the line extends to infinity.
     """
-
-#    siteList = SiteList(points)
-#     context  = Context()
-#     voronoi(siteList,context)
-#     return (context.vertices,context.lines,context.edges)
-
-    siteList = SiteList(points)
-    context = Context()
-    context.triangulate = True
-    voronoi(siteList, context)
-    return (context.vertices, context.polygons, context.edges)
-
-#------------------------------------------------------------------
+    if not points:
+        return [], {}, []
+    diagram = voronoi_2d([(p.x, p.y) for p in points])
+    edges = [tuple(e) for e in np.column_stack((diagram.edge_lines, diagram.edges)).tolist()]
+    polygons = {}
+    for edge, (s1, s2) in zip(edges, diagram.edge_sites.tolist()):
+        polygons.setdefault(s1, []).append(edge)
+        polygons.setdefault(s2, []).append(edge)
+    return [tuple(v) for v in diagram.vertices.tolist()], polygons, edges
 
 
 def computeDelaunayTriangulation(points):
@@ -827,51 +703,6 @@ def computeDelaunayTriangulation(points):
         Returns a list of 3-tuples: the indices of the points that form a
         Delaunay triangle.
     """
-#   original function in comment
-#    siteList = SiteList(points)
-#     context  = Context()
-#     context.triangulate = true
-#     voronoi(siteList,context)
-#     return context.triangles
-
-    siteList = SiteList(points)
-    context = Context()
-    context.triangulate = True
-    voronoi(siteList, context)
-    return context.triangles
-
-#-----------------------------------------------------------------------------
-# if __name__=="__main__":
-#     try:
-#         optlist,args = getopt.getopt(sys.argv[1:],"thdp")
-#     except getopt.GetoptError:
-#         usage()
-#         sys.exit(2)
-#
-#     doHelp = 0
-#     c = Context()
-#     c.doPrint = 1
-#     for opt in optlist:
-#         if opt[0] == "-d":  c.debug = 1
-#         if opt[0] == "-p":  c.plot  = 1
-#         if opt[0] == "-t":  c.triangulate = 1
-#         if opt[0] == "-h":  doHelp = 1
-#
-#     if not doHelp:
-#         pts = []
-#         fp = sys.stdin
-#         if len(args) > 0:
-#             fp = open(args[0],'r')
-#         for line in fp:
-#             fld = line.split()
-#             x = float(fld[0])
-#             y = float(fld[1])
-#             pts.append(Site(x,y))
-#         if len(args) > 0: fp.close()
-#
-#     if doHelp or len(pts) == 0:
-#         usage()
-#         sys.exit(2)
-#
-#     sl = SiteList(pts)
-#     voronoi(sl,c)
+    if not points:
+        return []
+    return [tuple(t) for t in delaunay_2d([(p.x, p.y) for p in points]).tolist()]
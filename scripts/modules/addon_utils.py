@@ -26,6 +26,9 @@ __all__ = (
     "disable",
     "reset_all",
     "module_bl_info",
+    "discovery_report",
+    "enable_deferred",
+    "enable_report",
 )
 
 import bpy as _bpy
@@ -35,15 +38,71 @@ error_duplicates = False
 error_encoding = False
 addons_fake_modules = {}
 
+# on-disk cache of the bl_info of every addon file, keyed by the file path
+# and validated with the modification time and size of the file,
+# so only new or changed files have to be parsed again.
+_bl_info_index = None
+_bl_info_index_changed = False
+_bl_info_index_name = "addons_bl_info_index.pickle"
+_bl_info_index_version = 1
+
+# discovery cost of the last 'modules_refresh' call for every search path
+_discovery_report = []
+
+# import and register() time in seconds of every addon enabled this session
+_enable_timings = {}
+
+# classes and ui entries every addon registered the last time it was
+# enabled, used to create proxies for addons whose loading is deferred.
+_deferred_manifest = None
+_deferred_manifest_changed = False
+_deferred_manifest_name = "addons_deferred_manifest.pickle"
+_deferred_manifest_version = 3
+# recording what addons register costs time, it's only done when
+# deferring is used at all, otherwise the manifest isn't needed
+_deferred_record = False
+
+# proxies of the addons that are deferred at the moment
+_deferred_addons = {}
+# addons to load (and operators to call) after the next scene update
+_deferred_requests = []
+
 
 # called only once at startup, avoids calling 'reset_all', correct but slower.
+#
+# Environment variables for the startup:
+# BLENDER_ADDONS_DEFER: comma separated names of addons that are only
+#   loaded when their operators, panels or menus are used,
+#   'ALL' defers every addon that registers nothing but user interface.
+# BLENDER_ADDONS_PROFILE: file path for a report of the import and
+#   register() time of every addon, '-' prints it.
 def _initialize():
+    import os
     path_list = paths()
     for path in path_list:
         _bpy.utils._sys_path_ensure(path)
+
+    global _deferred_record
+    defer = os.environ.get("BLENDER_ADDONS_DEFER", "")
+    defer_all = defer.strip().upper() == "ALL"
+    defer_names = {name.strip() for name in defer.split(",")}
+    _deferred_record = bool(defer.strip())
+
     for addon in _user_preferences.addons:
+        if defer_all:
+            if enable_deferred(addon.module, only_ui=True):
+                continue
+        elif addon.module in defer_names:
+            if enable_deferred(addon.module):
+                continue
         enable(addon.module)
 
+    _deferred_manifest_save()
+
+    profile = os.environ.get("BLENDER_ADDONS_PROFILE", "")
+    if profile:
+        enable_report(filepath=None if profile == "-" else profile)
+
 
 def paths():
     # RELEASE SCRIPTS: official scripts distributed in Blender releases
@@ -57,15 +116,106 @@ def paths():
     return addon_paths
 
 
+def _config_filepath(name):
+    try:
+        path = _bpy.utils.user_resource('CONFIG', create=True)
+    except:
+        path = ""
+    if not path:
+        return None
+    import os
+    return os.path.join(path, name)
+
+
+def _config_data_load(name, version):
+    # pickled dictionary from the config directory, None if not available
+    filepath = _config_filepath(name)
+    if filepath is None:
+        return None
+
+    import pickle
+    try:
+        with open(filepath, "rb") as file_data:
+            data = pickle.load(file_data)
+        if data.get("version") == version:
+            return data["entries"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print("Error reading %r, rebuilding: %s" % (filepath, e))
+    return None
+
+
+def _config_data_save(name, version, entries):
+    filepath = _config_filepath(name)
+    if filepath is None:
+        return False
+
+    import os
+    import pickle
+    data = {"version": version, "entries": entries}
+    filepath_tmp = filepath + ".tmp"
+    try:
+        with open(filepath_tmp, "wb") as file_data:
+            pickle.dump(data, file_data, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(filepath_tmp, filepath)
+    except Exception as e:
+        print("Error writing %r: %s" % (filepath, e))
+        return False
+    return True
+
+
+def _bl_info_index_load():
+    global _bl_info_index
+    if _bl_info_index is None:
+        _bl_info_index = _config_data_load(_bl_info_index_name,
+                                           _bl_info_index_version) or {}
+    return _bl_info_index
+
+
+def _bl_info_index_save():
+    global _bl_info_index_changed
+    if _bl_info_index_changed:
+        if _config_data_save(_bl_info_index_name,
+                             _bl_info_index_version,
+                             _bl_info_index):
+            _bl_info_index_changed = False
+
+
+def discovery_report(*, print_report=True):
+    """
+    Returns the cost of finding the addons in the last refresh.
+
+    :arg print_report: Print a table with the timings.
+    :type print_report: bool
+    :return: one dictionary for each search path with the keys
+       'path', 'modules', 'indexed', 'parsed' and 'time' (seconds).
+    :rtype: list of dicts
+    """
+    if print_report:
+        print("%8s %8s %8s %10s  %s" %
+              ("modules", "indexed", "parsed", "time (ms)", "path"))
+        for item in _discovery_report:
+            print("%8d %8d %8d %10.2f  %s" %
+                  (item["modules"], item["indexed"], item["parsed"],
+                   item["time"] * 1000.0, item["path"]))
+    return [item.copy() for item in _discovery_report]
+
+
 def modules_refresh(module_cache=addons_fake_modules):
     global error_duplicates
     global error_encoding
+    global _bl_info_index_changed
     import os
+    import time
 
     error_duplicates = False
     error_encoding = False
 
     path_list = paths()
+    bl_info_index = _bl_info_index_load()
+    bl_info_index_stale = set(bl_info_index.keys())
+    del _discovery_report[:]
 
     # fake module importing
     def fake_module(mod_name, mod_path, speedy=True, force_support=None):
@@ -143,6 +293,8 @@ def modules_refresh(module_cache=addons_fake_modules):
                 traceback.print_exc()
                 raise
 
+            index_store(mod_path, mod.bl_info)
+
             if force_support is not None:
                 mod.bl_info["support"] = force_support
 
@@ -150,11 +302,53 @@ def modules_refresh(module_cache=addons_fake_modules):
         else:
             print("fake_module: addon missing 'bl_info' "
                   "gives bad performance!: %r" % mod_path)
+            index_store(mod_path, None)
             return None
 
+    def index_store(mod_path, bl_info):
+        global _bl_info_index_changed
+        try:
+            stat = os.stat(mod_path)
+        except OSError:
+            return
+        # a copy, the bl_info of the module is changed when it's displayed
+        if bl_info is not None:
+            bl_info = bl_info.copy()
+        bl_info_index[mod_path] = (stat.st_mtime, stat.st_size, bl_info)
+        _bl_info_index_changed = True
+
+    # fake module from the index, 'Ellipsis' when the file has to be parsed
+    def fake_module_indexed(mod_name, mod_path, force_support=None):
+        entry = bl_info_index.get(mod_path)
+        if entry is None:
+            return Ellipsis
+        try:
+            stat = os.stat(mod_path)
+        except OSError:
+            return Ellipsis
+        mtime, size, bl_info = entry
+        if mtime != stat.st_mtime or size != stat.st_size:
+            return Ellipsis
+        if bl_info is None:
+            return None
+
+        import ast
+        ModuleType = type(ast)
+        mod = ModuleType(mod_name)
+        mod.bl_info = bl_info.copy()
+        mod.__file__ = mod_path
+        mod.__time__ = mtime
+
+        if force_support is not None:
+            mod.bl_info["support"] = force_support
+
+        return mod
+
     modules_stale = set(module_cache.keys())
 
     for path in path_list:
+        time_start = time.time()
+        report = {"path": path, "modules": 0, "indexed": 0, "parsed": 0}
 
         # force all contrib addons to be 'TESTING'
         if path.endswith(("addons_contrib", "addons_extern" )):
@@ -164,6 +358,8 @@ def modules_refresh(module_cache=addons_fake_modules):
 
         for mod_name, mod_path in _bpy.path.module_names(path):
             modules_stale.discard(mod_name)
+            bl_info_index_stale.discard(mod_path)
+            report["modules"] += 1
             mod = module_cache.get(mod_name)
             if mod:
                 if mod.__file__ != mod_path:
@@ -182,17 +378,38 @@ def modules_refresh(module_cache=addons_fake_modules):
                     mod = None
 
             if mod is None:
-                mod = fake_module(mod_name,
-                                  mod_path,
-                                  force_support=force_support)
+                mod = fake_module_indexed(mod_name,
+                                          mod_path,
+                                          force_support=force_support)
+                if mod is Ellipsis:
+                    mod = fake_module(mod_name,
+                                      mod_path,
+                                      force_support=force_support)
+                    report["parsed"] += 1
+                else:
+                    report["indexed"] += 1
                 if mod:
                     module_cache[mod_name] = mod
 
+        report["time"] = time.time() - time_start
+        _discovery_report.append(report)
+
     # just in case we get stale modules, not likely
     for mod_stale in modules_stale:
         del module_cache[mod_stale]
     del modules_stale
 
+    # forget files that were removed or are not in the search paths anymore
+    for mod_path in bl_info_index_stale:
+        del bl_info_index[mod_path]
+        _bl_info_index_changed = True
+    del bl_info_index_stale
+
+    _bl_info_index_save()
+
+    if _bpy.app.debug_python:
+        discovery_report()
+
 
 def modules(module_cache=addons_fake_modules, *, refresh=True):
     if refresh or ((module_cache is addons_fake_modules) and modules._is_first):
@@ -219,6 +436,10 @@ def check(module_name):
     import sys
     loaded_default = module_name in _user_preferences.addons
 
+    # deferred addons count as loaded, they are loaded when used
+    if module_name in _deferred_addons:
+        return loaded_default, True
+
     mod = sys.modules.get(module_name)
     loaded_state = ((mod is not None) and
                     getattr(mod, "__addon_enabled__", Ellipsis))
@@ -274,6 +495,7 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
 
     import os
     import sys
+    import time
     from bpy_restrict_state import RestrictBlend
 
     if handle_error is None:
@@ -281,6 +503,10 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
             import traceback
             traceback.print_exc()
 
+    # the real addon replaces its proxies
+    if module_name in _deferred_addons:
+        _deferred_proxies_remove(module_name)
+
     # reload if the mtime changes
     mod = sys.modules.get(module_name)
     # chances of the file _not_ existing are low, but it could be removed
@@ -327,6 +553,7 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
     with RestrictBlend():
 
         # 1) try import
+        time_start = time.time()
         try:
             mod = __import__(module_name)
             mod.__time__ = os.path.getmtime(mod.__file__)
@@ -346,8 +573,15 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
         # removed, addons need to handle own registration now.
 
         # 3) try run the modules register function
+        time_import = time.time() - time_start
+        time_start = time.time()
+        recorder = None
         try:
-            mod.register()
+            if _deferred_record:
+                with _RegistrationRecorder() as recorder:
+                    mod.register()
+            else:
+                mod.register()
         except Exception as ex:
             print("Exception in module register(): %r" %
                   getattr(mod, "__file__", module_name))
@@ -361,6 +595,12 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
     mod.__addon_enabled__ = True
     mod.__addon_persistent__ = persistent
 
+    _enable_timings[module_name] = (time_import, time.time() - time_start)
+    if recorder is not None:
+        _deferred_manifest_store(mod, recorder)
+        if default_set:
+            _deferred_manifest_save()
+
     if _bpy.app.debug_python:
         print("\taddon_utils.enable", mod.__name__)
 
@@ -387,6 +627,14 @@ def disable(module_name, *, default_set=False, handle_error=None):
 
     mod = sys.modules.get(module_name)
 
+    # a deferred addon was never loaded, removing the proxies is enough
+    if module_name in _deferred_addons:
+        _deferred_proxies_remove(module_name)
+        mod = None
+        if default_set:
+            _addon_remove(module_name)
+        return
+
     # possible this addon is from a previous session and didn't load a
     # module this time. So even if the module is not found, still disable
     # the addon in the user prefs.
@@ -412,6 +660,381 @@ def disable(module_name, *, default_set=False, handle_error=None):
         print("\taddon_utils.disable", module_name)
 
 
+def enable_report(*, print_report=True, filepath=None):
+    """
+    Returns the import and register() time of the addons enabled in this
+    session, slowest first.
+
+    :arg print_report: Print a table with the timings.
+    :type print_report: bool
+    :arg filepath: Also write the table to this file.
+    :type filepath: string
+    :return: (module_name, import_time, register_time) tuples in seconds.
+    :rtype: list of tuples
+    """
+    report = sorted(((name, time_import, time_register)
+                     for name, (time_import, time_register)
+                     in _enable_timings.items()),
+                    key=lambda item: item[1] + item[2], reverse=True)
+
+    lines = ["%10s %10s %10s  %s" %
+             ("import", "register", "total (ms)", "addon")]
+    for name, time_import, time_register in report:
+        lines.append("%10.2f %10.2f %10.2f  %s" %
+                     (time_import * 1000.0, time_register * 1000.0,
+                      (time_import + time_register) * 1000.0, name))
+    lines.append("%10.2f %10.2f %10.2f  total" %
+                 tuple(sum(values) * 1000.0 for values in (
+                     [item[1] for item in report],
+                     [item[2] for item in report],
+                     [item[1] + item[2] for item in report])))
+    if _deferred_addons:
+        lines.append("deferred: " + ", ".join(sorted(_deferred_addons)))
+
+    if print_report:
+        print("\n".join(lines))
+    if filepath:
+        try:
+            with open(filepath, "w", encoding="utf-8") as file_report:
+                file_report.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print("Error writing addon report %r: %s" % (filepath, e))
+    return report
+
+
+# Deferred Addons
+#
+# When deferring is used (BLENDER_ADDONS_DEFER), the operators, panels and
+# menus an enabled addon registers and the menus, panels and headers it
+# appends to are recorded. A deferred addon is not imported,
+# instead small proxy classes with the same identifiers are registered.
+# Using one of them (running the operator, drawing the panel or menu)
+# loads the real addon after the next scene update, which replaces them.
+# Addons that use anything the proxies can't stand in for (operator
+# properties, keymaps, panel polls, properties added to Blender types or
+# classes registered past 'bpy.utils.register_class') are never deferred.
+
+class _RegistrationRecorder:
+    # records what an addons register() function adds to Blender
+    def __init__(self):
+        self.classes = []
+        # menus, panels and headers the addon appended draw functions to
+        self.ui_extended = set()
+        self.handlers_changed = False
+        self.keymaps_changed = False
+        self.properties_added = False
+        self.unrecorded_classes = False
+
+    def __enter__(self):
+        recorder = self
+        utils = _bpy.utils
+        types = _bpy.types
+
+        self._register_class = register_class_orig = utils.register_class
+        # own attributes of the ui types, the functions are usually inherited
+        self._ui_attributes = {}
+
+        def register_class(cls):
+            register_class_orig(cls)
+            recorder.classes.append(cls)
+        utils.register_class = register_class
+
+        for ui_type in (types.Menu, types.Panel, types.Header):
+            for attr in ("append", "prepend"):
+                self._ui_attributes[ui_type, attr] = ui_type.__dict__.get(attr)
+                function_orig = getattr(ui_type, attr).__func__
+
+                def extend(cls, draw_func, function_orig=function_orig):
+                    recorder.ui_extended.add(cls.__name__)
+                    return function_orig(cls, draw_func)
+                setattr(ui_type, attr, classmethod(extend))
+
+        self._handler_amount = self._count_handlers()
+        self._keymap_item_amount = self._count_keymap_items()
+        self._property_amounts = self._count_properties()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _bpy.utils.register_class = self._register_class
+        for (ui_type, attr), value in self._ui_attributes.items():
+            if value is None:
+                delattr(ui_type, attr)
+            else:
+                setattr(ui_type, attr, value)
+        self.handlers_changed = self._handler_amount != self._count_handlers()
+        self.keymaps_changed = self._keymap_item_amount != self._count_keymap_items()
+
+        # types that are new but not recorded were registered with a
+        # 'register_class' imported before the recorder replaced it
+        property_amounts = self._count_properties()
+        recorded = set()
+        for cls in self.classes:
+            recorded.add(cls.__name__)
+            rna = getattr(cls, "bl_rna", None)
+            if rna is not None:
+                recorded.add(rna.identifier)
+        for name, amount in property_amounts.items():
+            old_amount = self._property_amounts.get(name)
+            if old_amount is None:
+                if name not in recorded:
+                    self.unrecorded_classes = True
+            elif amount != old_amount:
+                self.properties_added = True
+
+    @staticmethod
+    def _count_handlers():
+        handlers = _bpy.app.handlers
+        return sum(len(getattr(handlers, name)) for name in dir(handlers)
+                   if isinstance(getattr(handlers, name), list))
+
+    @staticmethod
+    def _count_keymap_items():
+        keyconfig = _bpy.context.window_manager.keyconfigs.addon
+        if keyconfig is None:
+            return 0
+        return sum(len(keymap.keymap_items) for keymap in keyconfig.keymaps)
+
+    @staticmethod
+    def _count_properties():
+        # amount of rna properties of every type in 'bpy.types'
+        types = _bpy.types
+        amounts = {}
+        for name in dir(types):
+            rna = getattr(getattr(types, name, None), "bl_rna", None)
+            if rna is not None:
+                amounts[name] = len(rna.properties)
+        return amounts
+
+
+def _deferred_manifest_load():
+    global _deferred_manifest
+    if _deferred_manifest is None:
+        _deferred_manifest = _config_data_load(_deferred_manifest_name,
+                                               _deferred_manifest_version) or {}
+    return _deferred_manifest
+
+
+def _deferred_manifest_save():
+    global _deferred_manifest_changed
+    if _deferred_manifest_changed:
+        if _config_data_save(_deferred_manifest_name,
+                             _deferred_manifest_version,
+                             _deferred_manifest):
+            _deferred_manifest_changed = False
+
+
+_panel_attributes = ("bl_label", "bl_space_type", "bl_region_type",
+                     "bl_context", "bl_category", "bl_options")
+
+
+def _deferred_manifest_store(mod, recorder):
+    global _deferred_manifest_changed
+    types = _bpy.types
+    operators, panels, menus, others = [], [], [], []
+    # operator properties and panel polls can't be proxied
+    proxyable = not (recorder.keymaps_changed or
+                     recorder.properties_added or
+                     recorder.unrecorded_classes)
+
+    for cls in recorder.classes:
+        if issubclass(cls, types.Operator):
+            if len(cls.bl_rna.properties) > 1:
+                # every operator has 'rna_type'
+                proxyable = False
+            operators.append({
+                "bl_idname": cls.bl_idname,
+                "bl_label": getattr(cls, "bl_label", cls.bl_idname),
+                "bl_description": getattr(cls, "bl_description", ""),
+                "bl_options": set(getattr(cls, "bl_options", ())),
+            })
+        elif issubclass(cls, types.Panel):
+            panel = {attr: getattr(cls, attr) for attr in _panel_attributes
+                     if hasattr(cls, attr)}
+            panel["bl_idname"] = getattr(cls, "bl_idname", cls.__name__)
+            panels.append(panel)
+            if callable(getattr(cls, "poll", None)):
+                proxyable = False
+        elif issubclass(cls, types.Menu):
+            menus.append({
+                "bl_idname": getattr(cls, "bl_idname", cls.__name__),
+                "bl_label": getattr(cls, "bl_label", ""),
+            })
+        else:
+            others.append(cls.__name__)
+
+    _deferred_manifest_load()[mod.__name__] = {
+        "file": mod.__file__,
+        "time": mod.__time__,
+        "name": getattr(mod, "bl_info", {}).get("name", mod.__name__),
+        "operators": operators,
+        "panels": panels,
+        "menus": menus,
+        "ui_extended": sorted(recorder.ui_extended),
+        # only addons that add nothing but user interface are safe
+        # to defer automatically, others may define data or handlers
+        "only_ui": not others and not recorder.handlers_changed,
+        "proxyable": proxyable,
+    }
+    _deferred_manifest_changed = True
+
+
+def enable_deferred(module_name, *, only_ui=False):
+    """
+    Enables an addon without importing it. Proxies for its operators,
+    panels and menus are registered instead, the addon is loaded the
+    first time one of them is used. This needs a record of an earlier
+    session in which the addon was enabled normally.
+
+    :arg module_name: the name of the addon and module.
+    :type module_name: string
+    :arg only_ui: Only defer when the addon registered nothing but
+       operators, panels and menus the last time.
+    :type only_ui: bool
+    :return: True when the addon is deferred, otherwise it has to be
+       enabled normally.
+    :rtype: bool
+    """
+    import os
+    import sys
+
+    if module_name in _deferred_addons:
+        return True
+    if module_name in sys.modules:
+        return False
+
+    entry = _deferred_manifest_load().get(module_name)
+    if entry is None:
+        return False
+    if only_ui and not entry["only_ui"]:
+        return False
+    if not entry["proxyable"]:
+        return False
+    if not (entry["operators"] or entry["panels"] or
+            entry["menus"] or entry["ui_extended"]):
+        # nothing could ever load it
+        return False
+    try:
+        if os.path.getmtime(entry["file"]) != entry["time"]:
+            return False
+    except OSError:
+        return False
+
+    proxies = []
+    try:
+        for proxy in _deferred_proxies_create(module_name, entry):
+            proxies.append(proxy)
+            if isinstance(proxy, tuple):
+                proxy[0].append(proxy[1])
+            else:
+                _bpy.utils.register_class(proxy)
+    except Exception as ex:
+        print("Error registering the proxies of %r, loading it: %s" %
+              (module_name, ex))
+        _deferred_addons[module_name] = proxies
+        _deferred_proxies_remove(module_name)
+        return False
+
+    _deferred_addons[module_name] = proxies
+    if not proxies:
+        # the ui it extended doesn't exist anymore
+        _deferred_proxies_remove(module_name)
+        return False
+    if _bpy.app.debug_python:
+        print("\taddon_utils.enable_deferred", module_name)
+    return True
+
+
+def _deferred_proxies_create(module_name, entry):
+    # proxy classes and (ui type, draw_func) pairs for the ui entries
+    types = _bpy.types
+    addon_name = entry["name"]
+
+    def operator_call_create(idname):
+        # the python idname, 'self.bl_idname' may be the rna identifier
+        def operator_call(self, context, *args):
+            _deferred_request(module_name, (idname, {
+                key: getattr(context, key, None) for key in
+                ("window", "screen", "area", "region", "scene")}))
+            return {'CANCELLED'}
+        return operator_call
+
+    def draw_loading(self, context):
+        self.layout.label("Loading %s..." % addon_name)
+        _deferred_request(module_name)
+
+    for operator in entry["operators"]:
+        attributes = dict(operator)
+        attributes["execute"] = attributes["invoke"] = \
+            operator_call_create(operator["bl_idname"])
+        category, op_name = operator["bl_idname"].split(".", 1)
+        class_name = category.upper() + "_OT_" + op_name
+        yield type(class_name, (types.Operator,), attributes)
+
+    for panel in entry["panels"]:
+        attributes = dict(panel)
+        attributes["draw"] = draw_loading
+        yield type(panel["bl_idname"], (types.Panel,), attributes)
+
+    for menu in entry["menus"]:
+        attributes = dict(menu)
+        attributes["draw"] = draw_loading
+        yield type(menu["bl_idname"], (types.Menu,), attributes)
+
+    for ui_name in entry["ui_extended"]:
+        ui_type = getattr(types, ui_name, None)
+        if ui_type is not None:
+            yield (ui_type, draw_loading)
+
+
+def _deferred_proxies_remove(module_name):
+    for proxy in _deferred_addons.pop(module_name, ()):
+        try:
+            if isinstance(proxy, tuple):
+                proxy[0].remove(proxy[1])
+            else:
+                _bpy.utils.unregister_class(proxy)
+        except Exception as ex:
+            print("Error removing a proxy of %r: %s" % (module_name, ex))
+
+
+def _deferred_request(module_name, operator_call=None):
+    # registering classes is not allowed while drawing,
+    # so the addon is loaded after the next scene update
+    request = (module_name, operator_call)
+    if request not in _deferred_requests:
+        _deferred_requests.append(request)
+    handlers = _bpy.app.handlers.scene_update_post
+    if _deferred_handler not in handlers:
+        handlers.append(_deferred_handler)
+
+
+@_bpy.app.handlers.persistent
+def _deferred_handler(scene):
+    _bpy.app.handlers.scene_update_post.remove(_deferred_handler)
+    requests = _deferred_requests[:]
+    del _deferred_requests[:]
+
+    for module_name, operator_call in requests:
+        if module_name in _deferred_addons:
+            if _bpy.app.debug_python:
+                print("\taddon_utils loading deferred", module_name)
+            enable(module_name)
+        if operator_call is None:
+            continue
+
+        # run the operator of the real addon in place of the proxy
+        idname, override = operator_call
+        override = {key: value for key, value in override.items()
+                    if value is not None}
+        try:
+            category, name = idname.split(".", 1)
+            operator = getattr(getattr(_bpy.ops, category), name)
+            operator(override, 'INVOKE_DEFAULT')
+        except Exception as ex:
+            print("Error running %r after loading %r: %s" %
+                  (idname, module_name, ex))
+
+
 def reset_all(*, reload_scripts=False):
     """
     Sets the addon state based on the user preferences.
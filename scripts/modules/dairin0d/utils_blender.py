@@ -21,6 +21,10 @@ import bmesh
 
 import time
 
+import array
+import zlib
+import collections
+
 import mathutils
 from mathutils import Color, Vector, Euler, Quaternion, Matrix
 
@@ -62,37 +66,146 @@ class ToggleObjectMode:
 
 # =============================== MESH CACHE =============================== #
 #============================================================================#
-class MeshCacheItem:
-    def __init__(self):
-        self.variants = {}
-    
-    def __getitem__(self, variant):
-        return self.variants[variant][0]
+class SharedMeshCacheEntry:
+    __slots__ = ("state", "obj", "mesh", "size", "pins")
     
-    def __setitem__(self, variant, conversion):
-        obj, converted = conversion
+    def __init__(self, state, obj):
         mesh = obj.data
         #mesh.update(calc_tessface=True)
         #mesh.calc_tessface()
         mesh.calc_normals()
         
-        self.variants[variant] = (obj, converted, mesh)
+        self.state = state
+        self.obj = obj
+        self.mesh = mesh
+        self.size = SharedMeshCacheEntry.estimate_size(mesh)
+        self.pins = 0
     
-    def __contains__(self, variant):
-        return variant in self.variants
+    @staticmethod
+    def estimate_size(mesh):
+        # rough amount of bytes Blender allocates for the mesh and its derived data
+        return (len(mesh.vertices) * 64 + len(mesh.edges) * 32 +
+                len(mesh.loops) * 48 + len(mesh.polygons) * 48 + 4096)
     
     def dispose(self):
-        for obj, converted, mesh in self.variants.values():
-            if not converted: continue
-            if obj and obj.name: bpy.data.objects.remove(obj)
-            if mesh and mesh.name: bpy.data.meshes.remove(mesh)
-        self.variants = None
+        obj, mesh = self.obj, self.mesh
+        self.obj = self.mesh = None
+        if obj and obj.name: bpy.data.objects.remove(obj)
+        if mesh and mesh.name: bpy.data.meshes.remove(mesh)
+
+class SharedMeshCache:
+    """
+    Process-wide store of converted meshes, shared by all MeshCache instances.
+    An entry is reused as long as the state of its object (transform-independent
+    object settings, modifier stack, geometry of the data) stays the same.
+    Least recently used entries are removed when the memory budget is exceeded,
+    except the ones that a MeshCache instance still uses.
+    """
+    
+    def __init__(self, budget=256*1024*1024):
+        self.entries = collections.OrderedDict()
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.scene_pointer = None
+    
+    def get(self, key, state):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        if entry.state != state:
+            self.misses += 1
+            # if it's still in use, the MeshCache that uses it disposes it
+            self.remove(key)
+            return None
+        
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def add(self, key, entry):
+        old_entry = self.entries.pop(key, None)
+        if old_entry: self._forget(old_entry)
+        self.entries[key] = entry
+        self.size += entry.size
+        self.trim()
+    
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry: self._forget(entry)
+    
+    def _forget(self, entry):
+        self.size -= entry.size
+        if entry.pins == 0: entry.dispose()
+    
+    def trim(self):
+        if self.size <= self.budget: return
+        for key, entry in list(self.entries.items()):
+            if self.size <= self.budget: break
+            if entry.pins > 0: continue
+            self.remove(key)
+            self.evictions += 1
+    
+    def set_scene(self, scene):
+        """Entries converted in another scene are not reused, free them"""
+        scene_pointer = scene.as_pointer()
+        if scene_pointer == self.scene_pointer: return
+        if self.scene_pointer is not None: self.clear()
+        self.scene_pointer = scene_pointer
+    
+    def set_budget(self, budget):
+        self.budget = budget
+        self.trim()
+    
+    def clear(self, dispose=True):
+        """
+        dispose=False only forgets the entries, for cases when
+        Blender has already freed the data (undo, loading files)
+        """
+        if dispose:
+            for key in list(self.entries.keys()):
+                self.remove(key)
+        self.entries.clear()
+        self.size = 0
+    
+    def statistics(self):
+        return dict(entries=len(self.entries), size=self.size, budget=self.budget,
+                    hits=self.hits, misses=self.misses, evictions=self.evictions)
+
+shared_mesh_cache = SharedMeshCache()
+
+@bpy.app.handlers.persistent
+def _shared_mesh_cache_reset(*args):
+    # the temporary objects and meshes don't exist anymore
+    shared_mesh_cache.clear(dispose=False)
+
+@bpy.app.handlers.persistent
+def _shared_mesh_cache_free(*args):
+    # the temporary objects have no users, but their meshes would
+    # be saved, and they are of no use in the next file
+    shared_mesh_cache.clear()
+    shared_mesh_cache.scene_pointer = None
+
+for _handlers, _function in ((bpy.app.handlers.load_pre, _shared_mesh_cache_free),
+                             (bpy.app.handlers.save_pre, _shared_mesh_cache_free),
+                             (bpy.app.handlers.undo_post, _shared_mesh_cache_reset),
+                             (bpy.app.handlers.redo_post, _shared_mesh_cache_reset)):
+    for _handler in list(_handlers):
+        if getattr(_handler, "__name__", "") in (_shared_mesh_cache_reset.__name__, _shared_mesh_cache_free.__name__):
+            _handlers.remove(_handler) # module was reloaded
+    _handlers.append(_function)
+del _handlers, _function
 
 class MeshCache:
     """
-    Keeps a cache of mesh equivalents of requested objects.
-    It is assumed that object's data does not change while
-    the cache is in use.
+    Gives access to mesh equivalents of requested objects.
+    The conversions are kept in a shared, memory limited cache
+    and reused while the objects don't change. Conversions this
+    instance returned stay valid until clear() is called.
     """
     
     variants_enum = {'RAW', 'PREVIEW', 'RENDER'}
@@ -112,26 +225,48 @@ class MeshCache:
     conversible_types = {'MESH', 'CURVE', 'SURFACE', 'FONT',
                          'META', 'ARMATURE', 'LATTICE'}
     
-    def __init__(self, scene, convert_types=None):
+    # modifiers whose result depends on the frame even without animation data
+    time_dependent_modifiers = {'WAVE', 'OCEAN', 'EXPLODE', 'PARTICLE_SYSTEM', 'CLOTH',
+                                'SOFT_BODY', 'FLUID_SIMULATION', 'DYNAMIC_PAINT', 'SMOKE',
+                                'MESH_CACHE', 'COLLISION'}
+    
+    def __init__(self, scene, convert_types=None, shared=None):
         self.scene = scene
         self.convert_types = convert_types or self.conversible_types
-        self.cached = {}
+        self.shared = (shared_mesh_cache if shared is None else shared)
+        self.shared.set_scene(scene)
+        self.cached = {} # obj -> {variant: entry}
+        self._pending = None
     
     def __del__(self):
         self.clear()
     
     def clear(self, expect_zero_users=False):
-        for cache_item in self.cached.values():
-            if not cache_item: continue
-            try:
-                cache_item.dispose()
-            except RuntimeError:
-                if expect_zero_users: raise
+        shared_entries = self.shared.entries
+        for variants in self.cached.values():
+            if not variants: continue
+            for entry in variants.values():
+                entry.pins -= 1
+                if entry.pins > 0: continue
+                if entry.obj and (shared_entries.get(self._key_of(entry)) is entry): continue
+                try:
+                    # not (or no longer) in the shared cache
+                    entry.dispose()
+                except RuntimeError:
+                    if expect_zero_users: raise
         self.cached.clear()
+        self.shared.trim()
+    
+    def _key_of(self, entry):
+        return entry.state[0]
     
     def __delitem__(self, obj):
-        cache_item = self.cached.pop(obj, None)
-        if cache_item: cache_item.dispose()
+        variants = self.cached.pop(obj, None)
+        if not variants: return
+        for entry in variants.values():
+            entry.pins -= 1
+            self.shared.remove(self._key_of(entry))
+            if (entry.pins == 0) and entry.obj: entry.dispose()
     
     def __contains__(self, obj):
         return obj in self.cached
@@ -149,28 +284,103 @@ class MeshCache:
         # Make sure the variant is proper for this type of object
         variant = self.variants_normalization[obj.type].get(variant, variant)
         
-        if obj in self.cached:
-            cache_item = self.cached[obj]
-            try:
-                # cache_item is None if object isn't conversible to mesh
-                return (None if (cache_item is None) else cache_item[variant])
-            except KeyError:
-                pass
-        else:
-            cache_item = None
+        variants = self.cached.get(obj)
+        if variants is not None:
+            entry = variants.get(variant)
+            if entry: return entry.obj
+        elif obj in self.cached:
+            return None # object isn't conversible to mesh
         
         if not ((self.convert_types == 'ALL') or (obj.type in self.convert_types)):
             self.cached[obj] = None
             return None
         
-        if not cache_item:
-            cache_item = MeshCacheItem()
-            self.cached[obj] = cache_item
+        if self._can_reuse(obj, variant, reuse): return obj
         
-        conversion = self._convert(obj, variant, reuse)
-        cache_item[variant] = conversion
+        state = self._get_state(obj, variant)
+        entry = (None if state is None else self.shared.get(state[0], state))
+        if entry:
+            # the conversion doesn't depend on the transform
+            if entry.obj.matrix_world != obj.matrix_world:
+                entry.obj.matrix_world = obj.matrix_world
+        else:
+            tmp_obj, converted = self._convert(obj, variant, reuse)
+            if not converted: return tmp_obj
+            entry = SharedMeshCacheEntry(state or ((None,),), tmp_obj)
+            if state is not None: self.shared.add(state[0], entry)
+        
+        entry.pins += 1
+        self.cached.setdefault(obj, {})[variant] = entry
+        return entry.obj
+    
+    def prefetch(self, objs, variant='PREVIEW', reuse=True):
+        """
+        Converts all objects with a single scene update instead of one per object
+        """
+        if self._pending is not None:
+            for obj in objs: self.get(obj, variant, reuse)
+            return
+        
+        self._pending = []
+        try:
+            for obj in objs: self.get(obj, variant, reuse)
+        finally:
+            pending, self._pending = self._pending, None
+            self._update_objects(pending)
+    
+    def _can_reuse(self, obj, variant, reuse):
+        if (obj.type != 'MESH') or (not reuse): return False
+        if obj.mode in ('EDIT', 'SCULPT'): return False
+        return (variant == 'RAW') or (len(obj.modifiers) == 0)
+    
+    def _get_state(self, obj, variant):
+        """
+        Everything the converted mesh depends on, None if it can't be
+        determined cheaply (the conversion is not shared then).
+        The first element is the key of the entry in the shared cache.
+        """
+        obj_type = obj.type
+        data = obj.data
+        if obj_type not in ('MESH', 'CURVE', 'SURFACE', 'FONT', 'META'): return None
+        if obj.mode in ('EDIT', 'SCULPT'): return None # edit data is not in obj.data yet
+        
+        key = (obj.as_pointer(), variant, self.scene.as_pointer())
+        state = [key, obj.name, obj_type, data.as_pointer(), data.name]
+        
+        time_dependent = bool(obj.animation_data or data.animation_data)
+        if variant != 'RAW':
+            for md in obj.modifiers:
+                # the geometry and pose of target objects, the content of
+                # textures and the world transform are not tracked
+                if _references_ids(md, ('Object', 'Texture')): return None
+                if (getattr(md, "texture_coords", None) == 'GLOBAL') or getattr(md, "use_transform", False): return None
+                if md.type in self.time_dependent_modifiers: time_dependent = True
+                state.append(_rna_state(md))
         
-        return conversion[0]
+        if obj_type == 'MESH':
+            state.append(_mesh_geometry_state(data))
+            if (variant != 'RAW') and obj.modifiers and obj.vertex_groups:
+                # weights are used by many modifiers
+                state.append(_vertex_weights_state(data))
+            shape_keys = data.shape_keys
+            if shape_keys:
+                time_dependent |= bool(shape_keys.animation_data)
+                state.append(tuple((kb.value, kb.mute) for kb in shape_keys.key_blocks))
+                state.append(obj.active_shape_key_index)
+                state.append(obj.show_only_shape_key)
+        elif obj_type in ('CURVE', 'SURFACE', 'FONT'):
+            if (variant != 'RAW') and _references_ids(data, ('Object',)): return None # bevel/taper objects
+            state.append(_rna_state(data))
+            for spline in data.splines:
+                state.append(_rna_state(spline))
+                state.append(_collection_state(spline.bezier_points, ("co", "handle_left", "handle_right"), 3))
+                state.append(_collection_state(spline.points, ("co",), 4))
+        elif obj_type == 'META':
+            state.append(_rna_state(data))
+            state.extend(_rna_state(element) for element in data.elements)
+        
+        if time_dependent: state.append(self.scene.frame_current)
+        return tuple(state)
     
     def _convert(self, obj, variant, reuse=True):
         obj_type = obj.type
@@ -295,12 +505,93 @@ class MeshCache:
         
         # Make Blender recognize object as having geometry
         # (is there a simpler way to do this?)
-        self.scene.objects.link(tmp_obj)
-        self.scene.update()
-        # We don't need this object in scene
-        self.scene.objects.unlink(tmp_obj)
+        if self._pending is None:
+            self._update_objects([tmp_obj])
+        else:
+            self._pending.append(tmp_obj)
         
         return tmp_obj
+    
+    def _update_objects(self, objs):
+        if not objs: return
+        scene_objects = self.scene.objects
+        for obj in objs:
+            scene_objects.link(obj)
+        self.scene.update()
+        # We don't need these objects in scene
+        for obj in objs:
+            scene_objects.unlink(obj)
+
+_rna_state_names = {}
+def _rna_state(bpy_data):
+    """Values of all simple properties (and names of referenced IDs) of an RNA struct"""
+    rna_type = bpy_data.bl_rna
+    names = _rna_state_names.get(rna_type.identifier)
+    if names is None:
+        names = tuple(prop.identifier for prop in rna_type.properties
+                      if (prop.identifier != "rna_type") and (prop.type != 'COLLECTION'))
+        _rna_state_names[rna_type.identifier] = names
+    
+    values = []
+    for name in names:
+        value = getattr(bpy_data, name, None)
+        if isinstance(value, bpy.types.ID):
+            value = value.name
+        elif isinstance(value, bpy.types.bpy_struct):
+            value = None
+        elif isinstance(value, set):
+            value = tuple(sorted(value))
+        elif not isinstance(value, (bool, int, float, str)) and (value is not None):
+            try:
+                value = tuple(value)
+            except TypeError:
+                value = None
+        values.append(value)
+    return tuple(values)
+
+_rna_id_pointers = {}
+def _references_ids(bpy_data, id_types):
+    """Whether an RNA struct points to IDs of the given types (modifier targets, textures, bevel objects)"""
+    rna_type = bpy_data.bl_rna
+    pointers = _rna_id_pointers.get(rna_type.identifier)
+    if pointers is None:
+        pointers = tuple((prop.identifier, prop.fixed_type.identifier) for prop in rna_type.properties
+                         if prop.type == 'POINTER')
+        _rna_id_pointers[rna_type.identifier] = pointers
+    return any(getattr(bpy_data, name, None) for name, id_type in pointers if id_type in id_types)
+
+def _vertex_weights_state(mesh):
+    """Checksum of the vertex group weights of all vertices"""
+    values = array.array('f')
+    for vertex in mesh.vertices:
+        for group in vertex.groups:
+            values.append(group.group)
+            values.append(group.weight)
+        values.append(-1.0)
+    return zlib.crc32(values.tobytes())
+
+def _collection_state(collection, attributes, size):
+    """Checksum of float vector attributes of all items in the collection"""
+    amount = len(collection)
+    if amount == 0: return 0
+    checksum = amount
+    values = array.array('f', bytes(4 * amount * size))
+    for attribute in attributes:
+        collection.foreach_get(attribute, values)
+        checksum = zlib.crc32(values.tobytes(), checksum)
+    return checksum
+
+def _mesh_geometry_state(mesh):
+    checksum = _collection_state(mesh.vertices, ("co",), 3)
+    return (len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops), checksum,
+            _integer_checksum(mesh.edges, "vertices", 2), _integer_checksum(mesh.loops, "vertex_index", 1))
+
+def _integer_checksum(collection, attribute, size):
+    amount = len(collection)
+    if amount == 0: return 0
+    values = array.array('i', bytes(4 * amount * size))
+    collection.foreach_get(attribute, values)
+    return zlib.crc32(values.tobytes())
 
 # =============================== MESH BAKER =============================== #
 #============================================================================#
@@ -2015,10 +2306,11 @@ class BlUtil:
             
             exclude = {(scene.objects.get(obj) if isinstance(obj, str) else obj) for obj in exclude}
             
+            objs = [obj for obj in scene.objects if obj not in exclude]
             mesh_cache = MeshCache(scene)
-            for obj in scene.objects:
-                if obj in exclude: continue
-                
+            mesh_cache.prefetch(objs)
+            mesh_cache.prefetch([obj for obj in objs if obj.mode == 'EDIT'], 'RAW')
+            for obj in objs:
                 m = m_to * obj.matrix_world
                 
                 mesh_obj = mesh_cache.get(obj)
@@ -2031,8 +2323,8 @@ class BlUtil:
                     mesh_obj = mesh_cache.get(obj, 'RAW')
                     if mesh_obj and mesh_obj.data.vertices:
                         points.extend(m * v.co for v in mesh_obj.data.vertices)
-                
-                mesh_cache.clear() # don't waste memory
+            
+            mesh_cache.clear() # conversions stay in the shared cache within its budget
             
             if not points: return (None, None) # maybe use numpy? (if 2.70 has it included)
             points_iter = iter(points)
@@ -2083,15 +2375,17 @@ class BlUtil:
                     for item, select_names in Selection(context):
                         points.append(m * item.co_deform)
             else: # OBJECT, POSE
+                objs = [obj for obj, select_names in Selection(context)]
                 mesh_cache = MeshCache(context.scene)
-                for obj, select_names in Selection(context):
+                mesh_cache.prefetch(objs)
+                for obj in objs:
                     m = m_to * obj.matrix_world
                     mesh_obj = mesh_cache.get(obj)
                     if mesh_obj and mesh_obj.data.vertices:
                         points.extend(m * v.co for v in mesh_obj.data.vertices)
                     else:
                         points.append(m * Vector())
-                    mesh_cache.clear() # don't waste memory
+                mesh_cache.clear() # conversions stay in the shared cache within its budget
             
             if not points: return (None, None) # maybe use numpy? (if 2.70 has it included)
             points_iter = iter(points)